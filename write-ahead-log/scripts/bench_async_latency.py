@@ -0,0 +1,98 @@
+"""asyncio 이벤트 루프 지연 벤치마크: 쓰기 부하 중 루프가 얼마나 늦게 깨어나는지
+
+1ms마다 깨어나는 ticker 태스크의 지연(예정 시각 대비 늦은 정도)을 쓰기 부하와 함께 측정한다.
+- sync:     코루틴에서 KVStore.put을 바로 호출 (fsync 동안 루프가 멈춤)
+- executor: put마다 run_in_executor (그룹 커밋 켬). 스레드 hop이 쓰기마다 생김
+- async:    AsyncKVStore (전용 sync 스레드가 대기 중인 쓰기를 fsync 한 번으로 묶음)
+
+실행:
+  .venv/bin/python write-ahead-log/scripts/bench_async_latency.py [--writers 32] [--duration 2]
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.async_kv_store import AsyncKVStore
+from src.kv_store import KVStore
+from src.wal_record import WALFormat
+
+TICK_SECONDS = 0.001
+
+
+async def ticker(lags: list[float], stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        expected = time.perf_counter() + TICK_SECONDS
+        await asyncio.sleep(TICK_SECONDS)
+        lags.append(max(time.perf_counter() - expected, 0.0))
+
+
+async def run_mode(mode: str, data_dir: Path, writers: int, duration: float, value: str) -> tuple[float, list[float]]:
+    store = KVStore(data_dir=data_dir, wal_format=WALFormat.BINARY, group_commit=mode == "executor")
+    async_store = AsyncKVStore(store) if mode == "async" else None
+    loop = asyncio.get_running_loop()
+    stop = asyncio.Event()
+    counts = [0] * writers
+
+    async def writer(worker: int) -> None:
+        i = 0
+        while not stop.is_set():
+            key = f"w{worker}-{i}"
+            if mode == "sync":
+                store.put(key, value)
+                await asyncio.sleep(0)
+            elif mode == "executor":
+                await loop.run_in_executor(None, store.put, key, value)
+            else:
+                await async_store.put(key, value)
+            i += 1
+        counts[worker] = i
+
+    lags: list[float] = []
+    tasks = [asyncio.ensure_future(ticker(lags, stop))]
+    tasks += [asyncio.ensure_future(writer(worker)) for worker in range(writers)]
+    start = time.perf_counter()
+    await asyncio.sleep(duration)
+    stop.set()
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - start
+
+    if async_store is not None:
+        await async_store.close()
+    else:
+        store.close()
+    return sum(counts) / elapsed, lags
+
+
+def percentile(values: list[float], p: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * p), len(ordered) - 1)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--writers", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=2.0)
+    parser.add_argument("--value-size", type=int, default=100)
+    parser.add_argument("--modes", nargs="+", default=["sync", "executor", "async"])
+    args = parser.parse_args()
+
+    print(f"writers={args.writers} duration={args.duration}s tick={TICK_SECONDS * 1000:.0f}ms")
+    for mode in args.modes:
+        with tempfile.TemporaryDirectory() as tmp:
+            rate, lags = asyncio.run(run_mode(mode, Path(tmp), args.writers, args.duration, "v" * args.value_size))
+        print(
+            f"{mode:<9} writes/s={rate:>9,.0f}  loop lag ms: "
+            f"p50={statistics.median(lags) * 1000:6.2f} p99={percentile(lags, 0.99) * 1000:6.2f} "
+            f"max={max(lags) * 1000:7.2f}  ticks={len(lags)}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""동시 읽기/쓰기 벤치마크: reader 스레드 수별 읽기 처리량 (쓰기 부하 유무)
+
+get은 락 없이 읽기 뷰 튜플 (active, frozen, tables)를 한 번 읽고 따라가므로
+writer가 store 락을 잡고 fsync 하는 동안에도 기다리지 않는다.
+비교용 locked 모드는 get마다 store 락을 잡아서, 읽기가 writer의 fsync 뒤에 줄 서는 경우를 보여준다.
+
+GIL 때문에 CPU 기준 처리량은 reader 수에 비례해 늘지 않는다.
+여기서 보려는 것은 쓰기 부하가 걸려도 읽기 처리량이 무너지지 않는지다.
+반대로 reader가 GIL을 계속 쥐고 있으면 fsync에서 돌아온 writer가 GIL을 기다리느라 writes/s가 떨어진다.
+
+실행:
+  .venv/bin/python write-ahead-log/scripts/bench_concurrent_reads.py [--readers 1 2 4 8] [--duration 2] [--lsm]
+      [--block-cache-mb 64]
+"""
+
+import argparse
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.block_cache import ClockBlockCache
+from src.kv_store import KVStore
+from src.wal_record import RecordType, WALRecord
+
+
+def prefill(store: KVStore, keys: list[str], value: str) -> None:
+    # 한 키마다 fsync 하지 않도록 배치로 채운다
+    for i in range(0, len(keys), 1000):
+        store.write_batch([WALRecord(RecordType.PUT, key, value) for key in keys[i:i + 1000]])
+
+
+def run(store: KVStore, keys: list[str], readers: int, duration: float, write: bool, locked: bool) -> tuple[float, float]:
+    stop = threading.Event()
+    read_counts = [0] * readers
+    write_count = 0
+
+    def reader(index: int) -> None:
+        n = len(keys)
+        i = index * 7919
+        count = 0
+        while not stop.is_set():
+            for _ in range(100):
+                key = keys[i % n]
+                if locked:
+                    with store._lock:
+                        store.get(key)
+                else:
+                    store.get(key)
+                i += 31
+            count += 100
+        read_counts[index] = count
+
+    def writer() -> None:
+        nonlocal write_count
+        i = 0
+        while not stop.is_set():
+            store.put(keys[i % len(keys)], f"value{i}")
+            i += 1
+        write_count = i
+
+    threads = [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+    if write:
+        threads.append(threading.Thread(target=writer))
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    return sum(read_counts) / duration, write_count / duration
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--readers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--duration", type=float, default=2.0)
+    parser.add_argument("--keys", type=int, default=10_000)
+    parser.add_argument("--value-size", type=int, default=100)
+    parser.add_argument("--lsm", action="store_true", help="절반을 SSTable로 flush 해서 테이블 조회까지 포함")
+    parser.add_argument("--block-cache-mb", type=int, default=0, help="LSM 모드에서 쓸 블록 캐시 크기 (0이면 없음)")
+    args = parser.parse_args()
+
+    keys = [f"key_{i:08d}" for i in range(args.keys)]
+    with tempfile.TemporaryDirectory() as tmp:
+        store = KVStore(
+            data_dir=Path(tmp),
+            memtable_flush_bytes=1 << 30 if args.lsm else None,
+            block_cache=ClockBlockCache(args.block_cache_mb << 20) if args.block_cache_mb else None,
+        )
+        prefill(store, keys[: args.keys // 2], "v" * args.value_size)
+        if args.lsm:
+            store.checkpoint()
+        prefill(store, keys[args.keys // 2:], "v" * args.value_size)
+
+        print(f"keys={args.keys} duration={args.duration}s lsm={args.lsm} block_cache_mb={args.block_cache_mb}")
+        for readers in args.readers:
+            for locked in (False, True):
+                idle, _ = run(store, keys, readers, args.duration, write=False, locked=locked)
+                loaded, writes = run(store, keys, readers, args.duration, write=True, locked=locked)
+                mode = "locked" if locked else "lock-free"
+                print(
+                    f"readers={readers:<3} {mode:<9} "
+                    f"reads/s idle={idle:12,.0f} with-writer={loaded:12,.0f} ({loaded / idle:5.2f}x) "
+                    f"writes/s={writes:8,.0f}"
+                )
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Raft 클러스터 쓰기 처리량/커밋 지연 벤치마크
+
+노드 N개를 각각 프로세스로 띄우고(python -m src.raft), writer 스레드들이 RaftClient로 leader에 PUT 한다.
+writer 수와 파이프라이닝 깊이(--max-inflight)별로 writes/s와 put 지연 p50/p99를 출력한다.
+참고용으로 같은 디스크에서 fsync 한 번에 걸리는 시간도 잰다 (커밋 지연 ≈ 왕복 한 번 + fsync 한 번).
+
+실행:
+  .venv/bin/python write-ahead-log/scripts/bench_raft.py [--nodes 3] [--writers 1 8 32] [--inflight 1 4] [--duration 2]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_DIR))
+
+from src.raft import RaftClient
+
+
+def start_cluster(base_dir: Path, nodes: int, max_inflight: int) -> list[subprocess.Popen]:
+    cluster = ",".join(f"{i}={base_dir / f'raft-{i}.sock'}" for i in range(1, nodes + 1))
+    processes = []
+    for node_id in range(1, nodes + 1):
+        process = subprocess.Popen(
+            [
+                sys.executable, "-m", "src.raft", "--id", str(node_id), "--cluster", cluster,
+                "--data-dir", str(base_dir / f"node-{node_id}"), "--unix", str(base_dir / f"kv-{node_id}.sock"),
+                "--max-inflight", str(max_inflight),
+            ],
+            cwd=PROJECT_DIR, stdout=subprocess.PIPE, text=True,
+        )
+        process.stdout.readline()
+        processes.append(process)
+    return processes
+
+
+def run(base_dir: Path, nodes: int, writers: int, max_inflight: int, duration: float) -> tuple[float, float, float]:
+    processes = start_cluster(base_dir, nodes, max_inflight)
+    client = RaftClient({i: base_dir / f"kv-{i}.sock" for i in range(1, nodes + 1)}, pool_size=writers)
+    try:
+        # leader 선출을 기다린다
+        client.put("warmup", "x")
+        latencies: list[list[float]] = [[] for _ in range(writers)]
+        stop = threading.Event()
+
+        def writer(worker: int):
+            i = 0
+            while not stop.is_set():
+                begin = time.perf_counter()
+                client.put(f"w{worker}-{i}", "v" * 100)
+                latencies[worker].append(time.perf_counter() - begin)
+                i += 1
+
+        threads = [threading.Thread(target=writer, args=(worker,)) for worker in range(writers)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        time.sleep(duration)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+    finally:
+        client.close()
+        for process in processes:
+            process.terminate()
+            process.wait()
+
+    samples = sorted(latency for worker in latencies for latency in worker)
+    p99 = samples[int(len(samples) * 0.99)]
+    return len(samples) / elapsed, statistics.median(samples) * 1000, p99 * 1000
+
+
+def fsync_latency(directory: Path, rounds: int = 200) -> float:
+    path = directory / "fsync-probe"
+    with open(path, "wb") as f:
+        begin = time.perf_counter()
+        for _ in range(rounds):
+            f.write(b"x" * 128)
+            f.flush()
+            os.fsync(f.fileno())
+        elapsed = time.perf_counter() - begin
+    path.unlink()
+    return elapsed / rounds * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--nodes", type=int, default=3)
+    parser.add_argument("--writers", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--inflight", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--duration", type=float, default=2.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"fsync: {fsync_latency(Path(tmp)):.3f} ms")
+    print(f"{'writers':>7} {'inflight':>8} {'writes/s':>10} {'p50 ms':>8} {'p99 ms':>8}")
+    for writers in args.writers:
+        for max_inflight in args.inflight:
+            with tempfile.TemporaryDirectory() as tmp:
+                rate, p50, p99 = run(Path(tmp), args.nodes, writers, max_inflight, args.duration)
+            print(f"{writers:>7} {max_inflight:>8} {rate:>10.0f} {p50:>8.2f} {p99:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
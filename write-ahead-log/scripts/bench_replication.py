@@ -0,0 +1,101 @@
+"""복제 ack 모드별 쓰기 처리량/지연 벤치마크
+
+leader KVStore(그룹 커밋) 하나와 follower 프로세스 여러 개를 localhost Unix 소켓으로 잇고,
+writer 스레드들이 leader에 PUT 한다. ack 모드마다 writes/s와 put 지연 p50/p99를 출력한다.
+- async: leader fsync만 기다린다
+- one / quorum: follower fsync ack까지 기다린다
+
+실행:
+  .venv/bin/python write-ahead-log/scripts/bench_replication.py [--followers 2] [--writers 8] [--duration 2]
+"""
+
+import argparse
+import multiprocessing
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.kv_store import KVStore
+from src.replication import ReplicationFollower, ReplicationLeader
+
+
+def follower_process(data_dir: Path, address: Path, stop) -> None:
+    data_dir.mkdir()
+    follower = ReplicationFollower(data_dir, address, retry_interval=0.05)
+    stop.wait()
+    follower.close()
+
+
+def run(base_dir: Path, ack_mode: str, followers: int, writers: int, duration: float) -> tuple[float, float, float]:
+    leader_dir = base_dir / "leader"
+    leader_dir.mkdir()
+    store = KVStore(data_dir=leader_dir, group_commit=True)
+    address = base_dir / "repl.sock"
+    leader = ReplicationLeader(store, address, ack_mode=ack_mode, followers=followers)
+
+    stop_followers = multiprocessing.Event()
+    processes = [
+        multiprocessing.Process(target=follower_process, args=(base_dir / f"f{i}", address, stop_followers))
+        for i in range(followers)
+    ]
+    for process in processes:
+        process.start()
+    deadline = time.monotonic() + 10
+    while len(leader.follower_lsns()) < followers:
+        if time.monotonic() > deadline:
+            raise RuntimeError("followers did not connect")
+        time.sleep(0.01)
+
+    latencies: list[list[float]] = [[] for _ in range(writers)]
+    stop = threading.Event()
+
+    def writer(worker: int):
+        i = 0
+        while not stop.is_set():
+            begin = time.perf_counter()
+            store.put(f"w{worker}-{i}", "v" * 100)
+            latencies[worker].append(time.perf_counter() - begin)
+            i += 1
+
+    threads = [threading.Thread(target=writer, args=(worker,)) for worker in range(writers)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    leader.close()
+    store.close()
+    stop_followers.set()
+    for process in processes:
+        process.join()
+
+    samples = sorted(latency for worker in latencies for latency in worker)
+    p99 = samples[int(len(samples) * 0.99)]
+    return len(samples) / elapsed, statistics.median(samples) * 1000, p99 * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--followers", type=int, default=2)
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=2.0)
+    args = parser.parse_args()
+
+    print(f"{'ack mode':>8} {'writes/s':>10} {'p50 ms':>8} {'p99 ms':>8}")
+    for ack_mode in ("async", "one", "quorum"):
+        with tempfile.TemporaryDirectory() as tmp:
+            rate, p50, p99 = run(Path(tmp), ack_mode, args.followers, args.writers, args.duration)
+        print(f"{ack_mode:>8} {rate:>10.0f} {p50:>8.2f} {p99:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
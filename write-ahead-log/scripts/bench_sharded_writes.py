@@ -0,0 +1,75 @@
+"""샤딩 쓰기 처리량 벤치마크: shard 수별 writes/s
+
+writer 스레드 여러 개가 각자 key를 PUT 한다 (PUT마다 fsync).
+KVStore 하나는 락 하나로 append + fsync를 직렬화하므로 writer가 늘어도 fsync는 한 번에 하나뿐이고,
+shard를 나누면 서로 다른 WAL 파일의 fsync가 겹칠 수 있다.
+
+실행:
+  .venv/bin/python write-ahead-log/scripts/bench_sharded_writes.py [--shards 1 2 4 8] [--writers 8] [--duration 2]
+      [--dirs /mnt/disk1 /mnt/disk2]   # 지정하면 shard 디렉터리를 돌아가며 심볼릭 링크로 배치
+"""
+
+import argparse
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.sharded_kv_store import ShardedKVStore, shard_dir_name
+from src.wal_record import WALFormat
+
+
+def run(data_dir: Path, shards: int, writers: int, duration: float, value_size: int, dirs: list[Path]) -> float:
+    for index in range(shards):
+        if dirs:
+            target = Path(tempfile.mkdtemp(dir=dirs[index % len(dirs)]))
+            (data_dir / shard_dir_name(index)).symlink_to(target)
+
+    store = ShardedKVStore(data_dir, num_shards=shards, wal_format=WALFormat.BINARY)
+    value = "v" * value_size
+    counts = [0] * writers
+    stop = threading.Event()
+
+    def writer(worker: int):
+        i = 0
+        while not stop.is_set():
+            store.put(f"w{worker}-{i}", value)
+            i += 1
+        counts[worker] = i
+
+    threads = [threading.Thread(target=writer, args=(worker,)) for worker in range(writers)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    store.close()
+    return sum(counts) / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--shards", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=2.0)
+    parser.add_argument("--value-size", type=int, default=100)
+    parser.add_argument("--dirs", type=Path, nargs="*", default=[])
+    args = parser.parse_args()
+
+    print(f"writers={args.writers} duration={args.duration}s")
+    baseline = None
+    for shards in args.shards:
+        with tempfile.TemporaryDirectory() as tmp:
+            rate = run(Path(tmp), shards, args.writers, args.duration, args.value_size, args.dirs)
+        baseline = baseline or rate
+        print(f"shards={shards:<3} writes/s={rate:>10,.0f} ({rate / baseline:4.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
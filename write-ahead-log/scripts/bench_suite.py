@@ -0,0 +1,478 @@
+"""KVStore/WAL 벤치마크 모음 + 커밋 간 비교
+
+벤치마크마다 ops/s, 지연 p50/p99/p999(µs), fsync/s, op당 기록 바이트를 재서 JSON으로 남기고,
+두 JSON을 비교해 회귀를 찾는다.
+
+- put / get / delete: 단일 스레드(매번 fsync)와 멀티 스레드(그룹 커밋)
+- ycsb-a ~ ycsb-f: YCSB 코어 워크로드 (zipfian key 분포, D는 최근 key 위주)
+    A 읽기 50 / 갱신 50     B 읽기 95 / 갱신 5     C 읽기 100
+    D 읽기 95 / 삽입 5      E 짧은 scan 95 / 삽입 5  F 읽기 50 / 읽고-고쳐-쓰기 50
+- value-size: value 크기별 put
+- durability: 내구성 모드(always / interval / none)별 put
+- wal-sync: WAL 파일 할당/쓰기 방식별 put (append / preallocate / recycle / direct, direct는 interval 모드도).
+  작은 세그먼트 + 체크포인트로 롤링을 자주 일으킨다
+- recovery: WAL 크기별 재시작(복구) 시간
+- checkpoint: key 수별 checkpoint() 시간
+
+측정 방법
+- 지연은 op마다 perf_counter_ns로 잰다 (멀티 스레드면 GIL 대기 포함)
+- fsync 수는 실행 동안 os.fsync/os.fdatasync를 세는 래퍼로 센다
+- 기록 바이트는 /proc/self/io의 wchar(write 계열 시스템 호출로 넘긴 바이트, 체크포인트/SSTable 포함) 차이.
+  /proc이 없으면 null이고, WAL 증가분(wal_bytes_per_op)은 어디서나 나온다
+
+실행:
+  .venv/bin/python write-ahead-log/scripts/bench_suite.py run [--quick] [--only put ycsb-a ...] [--json out.json]
+  .venv/bin/python write-ahead-log/scripts/bench_suite.py compare base.json new.json [--threshold 0.1]
+compare는 ops/s가 threshold 비율 이상 떨어졌거나 p99가 그만큼 늘어난 항목을 표시하고, 있으면 종료 코드 1.
+"""
+
+import argparse
+import bisect
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from collections.abc import Callable
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.kv_store import KVStore
+from src.segmented_wal import SegmentedWAL
+from src.wal import Durability
+from src.wal_record import RecordType, WALFormat, WALRecord
+
+SCHEMA_VERSION = 1
+PROC_IO = Path("/proc/self/io")
+
+
+# --- 측정 도구 ---
+
+class SyncCounter:
+    """실행 동안 os.fsync/os.fdatasync 호출 수를 센다 (모듈들이 호출 시점에 os.fsync를 찾으므로 바꿔 끼우면 된다)"""
+
+    def __init__(self):
+        self.count = 0
+        self._originals = {}
+
+    def __enter__(self) -> "SyncCounter":
+        for name in ("fsync", "fdatasync"):
+            original = getattr(os, name, None)
+            if original is None:
+                continue
+            self._originals[name] = original
+
+            def counted(fd, _original=original):
+                self.count += 1
+                return _original(fd)
+
+            setattr(os, name, counted)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        for name, original in self._originals.items():
+            setattr(os, name, original)
+
+
+def written_bytes() -> int | None:
+    try:
+        for line in PROC_IO.read_text().splitlines():
+            if line.startswith("wchar:"):
+                return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def percentile(sorted_samples: list[int], fraction: float) -> float:
+    if not sorted_samples:
+        return 0.0
+    return sorted_samples[min(len(sorted_samples) - 1, int(len(sorted_samples) * fraction))] / 1000
+
+
+class Measurement:
+    """한 구간의 op 수, 시간, op별 지연, fsync 수, 기록 바이트를 모아 결과 dict로 만든다"""
+
+    def __init__(self, store: KVStore | None = None):
+        self._store = store
+        self._syncs = SyncCounter()
+        self.latencies: list[int] = []
+
+    def __enter__(self) -> "Measurement":
+        self._syncs.__enter__()
+        self._bytes = written_bytes()
+        self._lsn = self._store.lsn if self._store is not None else None
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.seconds = time.perf_counter() - self._start
+        self._syncs.__exit__(exc_type, exc_val, exc_tb)
+        end_bytes = written_bytes()
+        self.bytes = None if self._bytes is None or end_bytes is None else end_bytes - self._bytes
+        self.wal_bytes = None if self._lsn is None else self._store.lsn - self._lsn
+
+    def result(self, name: str, params: dict, ops: int | None = None) -> dict:
+        ops = len(self.latencies) if ops is None else ops
+        samples = sorted(self.latencies)
+        return {
+            "id": name + "".join(f" {key}={value}" for key, value in params.items()),
+            "name": name,
+            "params": params,
+            "ops": ops,
+            "seconds": round(self.seconds, 6),
+            "ops_per_sec": round(ops / self.seconds, 1) if self.seconds else 0.0,
+            "p50_us": percentile(samples, 0.50),
+            "p99_us": percentile(samples, 0.99),
+            "p999_us": percentile(samples, 0.999),
+            "fsyncs_per_sec": round(self._syncs.count / self.seconds, 1) if self.seconds else 0.0,
+            "bytes_per_op": round(self.bytes / ops, 1) if self.bytes is not None and ops else None,
+            "wal_bytes_per_op": round(self.wal_bytes / ops, 1) if self.wal_bytes is not None and ops else None,
+        }
+
+
+def run_threads(threads: int, worker: Callable[[int, list[int]], None]) -> list[int]:
+    """worker(index, latencies)를 threads개 스레드에서 돌리고 지연을 모아 반환"""
+    per_thread: list[list[int]] = [[] for _ in range(threads)]
+    if threads == 1:
+        worker(0, per_thread[0])
+        return per_thread[0]
+    workers = [threading.Thread(target=worker, args=(i, per_thread[i])) for i in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return [latency for latencies in per_thread for latency in latencies]
+
+
+def open_store(data_dir: Path, threads: int, **options) -> KVStore:
+    return KVStore(data_dir=data_dir, group_commit=threads > 1, wal_format=WALFormat.BINARY, **options)
+
+
+def key_name(i: int) -> str:
+    return f"user{i:010d}"
+
+
+def load(store: KVStore, records: int, value: str) -> None:
+    for start in range(0, records, 1000):
+        store.write_batch([WALRecord(RecordType.PUT, key_name(i), value) for i in range(start, min(records, start + 1000))])
+
+
+# --- key 분포 (YCSB) ---
+
+class ZipfianGenerator:
+    """[0, items) 정수를 zipfian 분포로 뽑는다 (YCSB ZipfianGenerator, Gray et al.의 방법)
+
+    zeta를 한 번 계산해 두고, items가 늘면(삽입) 늘어난 만큼만 더한다.
+    """
+
+    def __init__(self, items: int, theta: float = 0.99, rng: random.Random | None = None):
+        self._theta = theta
+        self._rng = rng or random.Random(0)
+        self._alpha = 1 / (1 - theta)
+        self._zeta2 = 1 + 0.5 ** theta
+        self._items = 0
+        self._zetan = 0.0
+        self._grow(items)
+
+    def _grow(self, items: int) -> None:
+        for i in range(self._items + 1, items + 1):
+            self._zetan += 1 / i ** self._theta
+        self._items = items
+        self._eta = (1 - (2 / items) ** (1 - self._theta)) / (1 - self._zeta2 / self._zetan)
+
+    def next(self, items: int | None = None) -> int:
+        if items is not None and items > self._items:
+            self._grow(items)
+        u = self._rng.random()
+        uz = u * self._zetan
+        if uz < 1:
+            return 0
+        if uz < self._zeta2:
+            return 1
+        return int(self._items * (self._eta * u - self._eta + 1) ** self._alpha)
+
+
+class ScrambledZipfian:
+    """인기 key가 key 공간 앞쪽에 몰리지 않도록 zipfian 순위를 해시로 흩는다 (YCSB 기본 분포)"""
+
+    def __init__(self, items: int, rng: random.Random):
+        self._items = items
+        self._zipfian = ZipfianGenerator(items, rng=rng)
+
+    def next(self) -> int:
+        rank = self._zipfian.next()
+        return (rank * 0x9E3779B97F4A7C15 >> 7) % self._items
+
+
+class LatestGenerator:
+    """가장 최근에 삽입된 key일수록 자주 뽑는다 (YCSB D)"""
+
+    def __init__(self, counter: list[int], rng: random.Random):
+        self._counter = counter
+        self._zipfian = ZipfianGenerator(counter[0], rng=rng)
+
+    def next(self) -> int:
+        items = self._counter[0]
+        return max(0, items - 1 - self._zipfian.next(items))
+
+
+# YCSB 코어 워크로드: (op, 비율) 누적 분포와 key 분포
+WORKLOADS = {
+    "a": ([("read", 0.5), ("update", 0.5)], "zipfian"),
+    "b": ([("read", 0.95), ("update", 0.05)], "zipfian"),
+    "c": ([("read", 1.0)], "zipfian"),
+    "d": ([("read", 0.95), ("insert", 0.05)], "latest"),
+    "e": ([("scan", 0.95), ("insert", 0.05)], "zipfian"),
+    "f": ([("read", 0.5), ("rmw", 0.5)], "zipfian"),
+}
+MAX_SCAN_LENGTH = 100
+
+
+def ycsb(base_dir: Path, workload: str, records: int, ops: int, threads: int, value_size: int) -> dict:
+    mix, distribution = WORKLOADS[workload]
+    ops_names = [name for name, _ in mix]
+    cumulative = []
+    total = 0.0
+    for _, fraction in mix:
+        total += fraction
+        cumulative.append(total)
+
+    store = open_store(base_dir, threads)
+    value = "v" * value_size
+    load(store, records, value)
+    # 삽입된 key 수. 스레드끼리 공유 (GIL 아래에서 증가)
+    inserted = [records]
+    insert_lock = threading.Lock()
+
+    def worker(index: int, latencies: list[int]) -> None:
+        rng = random.Random(index)
+        keys = LatestGenerator(inserted, rng) if distribution == "latest" else ScrambledZipfian(records, rng)
+        for _ in range(ops // threads):
+            op = ops_names[bisect.bisect_left(cumulative, rng.random() * total)]
+            begin = time.perf_counter_ns()
+            if op == "read":
+                store.get(key_name(keys.next()))
+            elif op == "update":
+                store.put(key_name(keys.next()), value)
+            elif op == "insert":
+                with insert_lock:
+                    key = inserted[0]
+                    inserted[0] += 1
+                store.put(key_name(key), value)
+            elif op == "scan":
+                length = rng.randint(1, MAX_SCAN_LENGTH)
+                scanner = store.scan(key_name(keys.next()))
+                for _ in zip(range(length), scanner):
+                    pass
+            else:
+                key = key_name(keys.next())
+                current = store.get(key) or ""
+                store.put(key, current[:value_size - 1] + "x")
+            latencies.append(time.perf_counter_ns() - begin)
+
+    with Measurement(store) as measurement:
+        measurement.latencies = run_threads(threads, worker)
+    store.close()
+    return measurement.result(f"ycsb-{workload}", {"records": records, "threads": threads, "value_size": value_size})
+
+
+# --- 벤치마크 ---
+
+def bench_point_ops(base_dir: Path, name: str, ops: int, threads: int, value_size: int, **options) -> dict:
+    store = open_store(base_dir, threads, **options)
+    value = "v" * value_size
+    if name in ("get", "delete"):
+        load(store, ops, value)
+
+    def worker(index: int, latencies: list[int]) -> None:
+        for i in range(index, ops, threads):
+            key = key_name(i)
+            begin = time.perf_counter_ns()
+            if name == "put":
+                store.put(key, value)
+            elif name == "get":
+                store.get(key)
+            else:
+                store.delete(key)
+            latencies.append(time.perf_counter_ns() - begin)
+
+    with Measurement(store) as measurement:
+        measurement.latencies = run_threads(threads, worker)
+    store.close()
+    params = {"threads": threads, "value_size": value_size}
+    params.update((key, getattr(value, "value", value)) for key, value in options.items())
+    return measurement.result(name, params)
+
+
+def bench_recovery(base_dir: Path, records: int, value_size: int) -> dict:
+    # put마다 fsync 하지 않도록 WAL에 직접 기록
+    wal = SegmentedWAL(base_dir, wal_format=WALFormat.BINARY)
+    value = "v" * value_size
+    for i in range(records):
+        wal.append(WALRecord(RecordType.PUT, key_name(i % (records // 2 + 1)), value))
+    wal.sync()
+    log_bytes = wal.end_lsn
+    wal.close()
+
+    with Measurement() as measurement:
+        store = KVStore(data_dir=base_dir)
+    store.close()
+    result = measurement.result("recovery", {"records": records, "value_size": value_size}, ops=records)
+    result["log_bytes"] = log_bytes
+    return result
+
+
+def bench_checkpoint(base_dir: Path, keys: int, value_size: int) -> dict:
+    store = open_store(base_dir, 1)
+    load(store, keys, "v" * value_size)
+    with Measurement(store) as measurement:
+        store.checkpoint()
+    store.close()
+    return measurement.result("checkpoint", {"keys": keys, "value_size": value_size}, ops=keys)
+
+
+def suite(quick: bool) -> list[tuple[str, Callable[[Path], dict]]]:
+    """(그룹 이름, 임시 디렉터리를 받아 결과 하나를 만드는 함수) 목록"""
+    ops = 500 if quick else 5_000
+    records = 1_000 if quick else 20_000
+    threads = 8
+    cases: list[tuple[str, Callable[[Path], dict]]] = []
+    for name in ("put", "get", "delete"):
+        for n in (1, threads):
+            cases.append((name, lambda d, name=name, n=n: bench_point_ops(d, name, ops, n, 100)))
+    for workload in WORKLOADS:
+        for n in (1, threads):
+            cases.append((
+                f"ycsb-{workload}", lambda d, w=workload, n=n: ycsb(d, w, records, ops, n, 100),
+            ))
+    for durability in Durability:
+        for n in (1, threads):
+            cases.append((
+                "durability", lambda d, mode=durability, n=n: bench_point_ops(d, "put", ops, n, 100, durability=mode),
+            ))
+    # append: 커밋마다 파일이 커진다 (fsync가 크기 메타데이터까지 기록)
+    # preallocate: 세그먼트를 미리 할당하고 fdatasync. 새 세그먼트는 매번 새로 할당
+    # recycle: 체크포인트가 지운 세그먼트를 0으로 채워 재활용
+    # direct: 재활용 + 정렬 이중 버퍼 O_DIRECT/O_DSYNC 쓰기. interval 모드는 preallocate와 비교
+    recycle = {"wal_preallocate_bytes": 1 << 20, "wal_recycle_segments": 2}
+    wal_sync = {
+        "append": {},
+        "preallocate": {"wal_preallocate_bytes": 1 << 20, "wal_recycle_segments": 0},
+        "recycle": recycle,
+        "direct": {**recycle, "wal_direct_io": True},
+        "recycle-interval": {**recycle, "durability": Durability.INTERVAL},
+        "direct-interval": {**recycle, "wal_direct_io": True, "durability": Durability.INTERVAL},
+    }
+    for options in wal_sync.values():
+        for n in (1, threads):
+            cases.append((
+                "wal-sync",
+                lambda d, options=options, n=n: bench_point_ops(
+                    d, "put", ops * 2, n, 100, wal_segment_size=1 << 20, checkpoint_wal_bytes=1 << 20, **options,
+                ),
+            ))
+    for size in (16, 256, 4096) if quick else (16, 256, 4096, 65536):
+        cases.append(("value-size", lambda d, size=size: bench_point_ops(d, "put", ops // 2, 1, size)))
+    for size in (10_000,) if quick else (10_000, 100_000, 500_000):
+        cases.append(("recovery", lambda d, size=size: bench_recovery(d, size, 100)))
+    for size in (10_000,) if quick else (10_000, 100_000, 500_000):
+        cases.append(("checkpoint", lambda d, size=size: bench_checkpoint(d, size, 100)))
+    return cases
+
+
+def metadata() -> dict:
+    project = Path(__file__).resolve().parents[1]
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=project, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "schema": SCHEMA_VERSION,
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def run_suite(args: argparse.Namespace) -> None:
+    results = []
+    for group, case in suite(args.quick):
+        if args.only and group not in args.only:
+            continue
+        with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+            result = case(Path(tmp))
+        results.append(result)
+        bytes_per_op = "-" if result["bytes_per_op"] is None else f"{result['bytes_per_op']:.0f}"
+        print(
+            f"{result['id']:<45} {result['ops_per_sec']:>11,.0f} ops/s  p50 {result['p50_us']:>9.1f}  "
+            f"p99 {result['p99_us']:>9.1f}  p999 {result['p999_us']:>9.1f} µs  "
+            f"fsync/s {result['fsyncs_per_sec']:>8,.0f}  B/op {bytes_per_op:>7}",
+            flush=True,
+        )
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"meta": metadata(), "results": results}, f, indent=2)
+        print(f"wrote {args.json}")
+
+
+def compare(args: argparse.Namespace) -> int:
+    with open(args.base) as f:
+        base = {result["id"]: result for result in json.load(f)["results"]}
+    with open(args.new) as f:
+        new = json.load(f)["results"]
+
+    regressions = 0
+    print(f"{'benchmark':<45} {'ops/s':>23} {'p99 µs':>25}")
+    for result in new:
+        old = base.get(result["id"])
+        if old is None:
+            print(f"{result['id']:<45} (new)")
+            continue
+        throughput = result["ops_per_sec"] / old["ops_per_sec"] - 1 if old["ops_per_sec"] else 0.0
+        p99 = result["p99_us"] / old["p99_us"] - 1 if old["p99_us"] else 0.0
+        # recovery/checkpoint는 op별 지연이 없으므로 처리량만 본다
+        regressed = throughput < -args.threshold or (old["p99_us"] and p99 > args.threshold)
+        regressions += bool(regressed)
+        print(
+            f"{result['id']:<45} {old['ops_per_sec']:>9,.0f} -> {result['ops_per_sec']:>9,.0f} {throughput:>+6.1%} "
+            f"{old['p99_us']:>8.1f} -> {result['p99_us']:>8.1f} {p99:>+6.1%}"
+            f"{'  REGRESSION' if regressed else ''}"
+        )
+    print(f"{regressions} regression(s) beyond {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    commands = parser.add_subparsers(dest="command", required=True)
+    run = commands.add_parser("run", help="벤치마크를 실행한다")
+    run.add_argument("--quick", action="store_true", help="작은 크기로 빠르게 (스모크 테스트용)")
+    run.add_argument("--only", nargs="+", help="그룹 이름: put get delete ycsb-a ... durability wal-sync value-size recovery checkpoint")
+    run.add_argument("--json", type=Path, help="결과를 JSON으로 저장할 경로")
+    run.add_argument("--dir", type=Path, help="데이터 디렉터리를 만들 위치 (측정할 디스크)")
+    diff = commands.add_parser("compare", help="두 결과 JSON을 비교한다")
+    diff.add_argument("base", type=Path)
+    diff.add_argument("new", type=Path)
+    diff.add_argument("--threshold", type=float, default=0.1)
+    args = parser.parse_args()
+
+    if args.command == "run":
+        run_suite(args)
+    else:
+        sys.exit(compare(args))
+
+
+if __name__ == "__main__":
+    main()
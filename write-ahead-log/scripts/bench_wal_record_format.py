@@ -0,0 +1,60 @@
+"""WAL 레코드 포맷 벤치마크: JSON + SHA-256 vs 바이너리 + CRC32
+
+레코드당 바이트 수와 encode/decode 초당 레코드 수를 비교한다.
+
+실행:
+  .venv/bin/python write-ahead-log/scripts/bench_wal_record_format.py [--records N] [--value-size B]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.wal_record import RecordType, WALRecord
+
+
+def bench(name: str, records: list[WALRecord], encode, decode) -> None:
+    start = time.perf_counter()
+    encoded = [encode(r) for r in records]
+    encode_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for data in encoded:
+        decode(data)
+    decode_elapsed = time.perf_counter() - start
+
+    total_bytes = sum(len(data) for data in encoded)
+    payload_bytes = sum(len(r.key) + len(r.value or "") for r in records)
+    n = len(records)
+
+    print(
+        f"{name:<8} "
+        f"bytes/record={total_bytes / n:8.1f} "
+        f"overhead/record={(total_bytes - payload_bytes) / n:6.1f} "
+        f"encode={n / encode_elapsed:12,.0f} rec/s "
+        f"decode={n / decode_elapsed:12,.0f} rec/s"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--records", type=int, default=100_000)
+    parser.add_argument("--value-size", type=int, default=100)
+    args = parser.parse_args()
+
+    value = "v" * args.value_size
+    records = [
+        WALRecord(RecordType.PUT, f"key_{i:08d}", value) if i % 10 else WALRecord(RecordType.DEL, f"key_{i:08d}")
+        for i in range(args.records)
+    ]
+
+    print(f"records={args.records} value_size={args.value_size}")
+    bench("json", records, WALRecord.serialize, WALRecord.deserialize)
+    bench("binary", records, WALRecord.serialize_binary, WALRecord.deserialize_binary)
+
+
+if __name__ == "__main__":
+    main()
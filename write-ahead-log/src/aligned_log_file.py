@@ -0,0 +1,203 @@
+"""정렬된 이중 버퍼로 O_DIRECT + O_DSYNC 쓰기를 하는 WAL 파일 (미리 할당된 바이너리 WAL 전용)
+
+WAL은 보통 레코드를 Python 파일 버퍼 → 페이지 캐시 → 디스크 순으로 복사한 뒤 fsync 한다.
+AlignedLogFile은 mmap 익명 메모리(페이지 정렬)에 레코드를 모아 O_DIRECT로 바로 내리고,
+O_DSYNC라서 pwrite가 반환되면 fdatasync 없이도 디스크에 있다.
+
+- 버퍼 두 개: 하나에 레코드를 채우는 동안 다른 하나를 쓴다 (seal → 쓰기)
+  - flush(): 쓰기 슬롯이 비어 있으면 채우던 버퍼를 봉인(seal)하고 다른 버퍼로 넘어간다. 쓰지는 않는다
+  - wait(): 봉인된 버퍼와 지금까지 채운 내용을 모두 쓴다. 호출한 스레드가 직접 pwrite 한다
+    (커밋마다 sync 하는 모드는 스레드 전환 없이 쓰고, INTERVAL/NONE의 백그라운드 sync는 store 락 밖에서 쓴다)
+- O_DIRECT는 오프셋/길이/메모리 주소가 블록 단위로 정렬되어야 한다. 그래서 마지막 블록은 0으로 채워 통째로 쓰고,
+  그 블록의 앞부분은 다음 버퍼로 옮겨 다음 쓰기에서 다시 쓴다. 파일이 미리 할당되어 0으로 차 있어야 하는 이유
+- O_DIRECT를 지원하지 않는 파일시스템(tmpfs 등)이나 플랫폼이면 O_DSYNC만으로 연다 (direct=False)
+
+쓰기가 한 번 실패하면 어디까지 디스크에 갔는지 알 수 없으므로 이후 호출은 모두 같은 OSError로 실패한다.
+"""
+import mmap
+import os
+import threading
+
+from pathlib import Path
+
+# O_DIRECT 정렬 단위 (대부분 장치의 논리 블록 크기 이상)
+ALIGNMENT = 4096
+DEFAULT_BUFFER_BYTES = 1024 * 1024
+
+
+def _align_down(value: int) -> int:
+    return value & ~(ALIGNMENT - 1)
+
+
+def _align_up(value: int) -> int:
+    return _align_down(value + ALIGNMENT - 1)
+
+
+class AlignedLogFile:
+    """position부터 이어 쓰는 파일 객체 (WAL이 쓰는 write/flush/tell/truncate/seek/fileno/close만 제공)"""
+
+    def __init__(self, path: Path, position: int, buffer_bytes: int = DEFAULT_BUFFER_BYTES):
+        if buffer_bytes <= 0 or buffer_bytes % ALIGNMENT:
+            raise ValueError(f"buffer_bytes must be a positive multiple of {ALIGNMENT}")
+
+        flags = os.O_RDWR | getattr(os, "O_DSYNC", os.O_SYNC)
+        self.direct = hasattr(os, "O_DIRECT")
+        try:
+            self._fd = os.open(path, flags | (os.O_DIRECT if self.direct else 0))
+        except OSError:
+            if not self.direct:
+                raise
+            self.direct = False
+            self._fd = os.open(path, flags)
+
+        self._capacity = buffer_bytes
+        self._buffers = [mmap.mmap(-1, buffer_bytes), mmap.mmap(-1, buffer_bytes)]
+        # 버퍼마다 0이 아닐 수 있는 앞부분 길이 (다시 채울 때 그만큼만 0으로 지운다)
+        self._used = [0, 0]
+        # 채우는 중인 버퍼: 파일의 _fill_start(정렬됨)부터 _fill_len 바이트. 앞의 _fill_clean 바이트는 이미 봉인된 내용
+        self._fill = 0
+        self._fill_start = 0
+        self._fill_len = 0
+        self._fill_clean = 0
+        # 다음에 쓸 파일 위치 (봉인해도 바뀌지 않는다)
+        self._end = 0
+        # 봉인되어 쓰기를 기다리는 버퍼 (버퍼 번호, 파일 오프셋, 길이)
+        self._pending: tuple[int, int, int] | None = None
+        self._error: OSError | None = None
+        self._closed = False
+        # _io_lock: pwrite는 한 번에 하나 (pwrite 동안 GIL을 놓으므로 _lock은 잡지 않는다)
+        # _lock: 버퍼 상태. 순서는 항상 _io_lock → _lock
+        self._io_lock = threading.RLock()
+        self._lock = threading.Lock()
+        self._load(position)
+
+    def fileno(self) -> int:
+        return self._fd
+
+    def tell(self) -> int:
+        return self._end
+
+    def write(self, data: bytes) -> int:
+        self._check_error()
+        view = memoryview(data)
+        while view:
+            with self._lock:
+                n = min(self._capacity - self._fill_len, len(view))
+                self._buffers[self._fill][self._fill_len:self._fill_len + n] = view[:n]
+                self._fill_len += n
+                self._end += n
+                self._used[self._fill] = max(self._used[self._fill], self._fill_len)
+                view = view[n:]
+                if self._fill_len < self._capacity:
+                    continue
+                if self._pending is None:
+                    self._seal()
+                    continue
+            # 두 버퍼가 모두 찼다. 봉인된 버퍼를 써야 자리가 난다
+            self._write_pending()
+        return len(data)
+
+    def flush(self) -> None:
+        """쓰기 슬롯이 비어 있으면 채운 내용을 봉인한다 (디스크에 쓰는 것은 wait)"""
+        self._check_error()
+        with self._lock:
+            if self._pending is None and self._fill_len > self._fill_clean:
+                self._seal()
+
+    def wait(self) -> None:
+        """지금까지 write 한 내용을 모두 디스크에 쓴다 (O_DSYNC라 반환되면 영구 반영)"""
+        with self._io_lock:
+            self._check_error()
+            if self._closed:
+                return
+            self._write_pending()
+            with self._lock:
+                if self._fill_len > self._fill_clean:
+                    self._seal()
+            self._write_pending()
+
+    def truncate(self, size: int) -> None:
+        self.wait()
+        os.ftruncate(self._fd, size)
+
+    def seek(self, position: int) -> None:
+        """position부터 이어 쓴다. 그 앞에 쓴 내용은 모두 디스크에 있어야 한다 (rollback은 truncate 다음에 호출)"""
+        self.wait()
+        with self._io_lock:
+            self._load(position)
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        try:
+            self.wait()
+        finally:
+            with self._io_lock:
+                self._closed = True
+                os.close(self._fd)
+                for buffer in self._buffers:
+                    buffer.close()
+
+    # 이어 쓸 블록을 파일에서 읽어 채우는 버퍼의 앞부분으로 둔다 (position 뒤는 0)
+    def _load(self, position: int) -> None:
+        start = _align_down(position)
+        buffer = self._buffers[self._fill]
+        with memoryview(buffer) as view:
+            if self.direct:
+                read = os.preadv(self._fd, [view[:ALIGNMENT]], start)
+            else:
+                data = os.pread(self._fd, ALIGNMENT, start)
+                view[:len(data)] = data
+                read = len(data)
+        keep = position - start
+        dirty = max(self._used[self._fill], read)
+        if dirty > keep:
+            buffer[keep:dirty] = bytes(dirty - keep)
+        self._used[self._fill] = keep
+        self._fill_start = start
+        self._fill_len = self._fill_clean = keep
+        self._end = position
+
+    # self._lock을 잡은 상태에서 호출 (쓰기 슬롯이 비어 있어야 함)
+    # 채우던 버퍼를 쓰기 대기로 넘기고 다른 버퍼로 바꾼다. 마지막 불완전 블록은 다음 쓰기에서 다시 쓰도록 옮겨 둔다
+    def _seal(self) -> None:
+        sealed, start, length = self._fill, self._fill_start, self._fill_len
+        self._pending = (sealed, start, length)
+
+        end = start + length
+        next_start = _align_down(end)
+        carry = end - next_start
+        other = 1 - sealed
+        buffer = self._buffers[other]
+        buffer[:carry] = self._buffers[sealed][next_start - start:length]
+        if self._used[other] > carry:
+            buffer[carry:self._used[other]] = bytes(self._used[other] - carry)
+        self._used[other] = carry
+
+        self._fill = other
+        self._fill_start = next_start
+        self._fill_len = self._fill_clean = carry
+
+    def _write_pending(self) -> None:
+        with self._io_lock:
+            with self._lock:
+                pending = self._pending
+            if pending is None:
+                return
+            index, offset, length = pending
+            size = _align_up(length)
+            try:
+                with memoryview(self._buffers[index]) as view:
+                    written = 0
+                    while written < size:
+                        written += os.pwrite(self._fd, view[written:size], offset + written)
+            except OSError as e:
+                # 이후 호출이 다시 올릴 오류. 트레이스백은 버려서 버퍼 조각을 붙잡지 않는다 (close에서 mmap을 닫아야 함)
+                self._error = e.with_traceback(None)
+                raise self._error
+            with self._lock:
+                self._pending = None
+
+    def _check_error(self) -> None:
+        if self._error is not None:
+            raise self._error
@@ -0,0 +1,145 @@
+"""asyncio용 KVStore 래퍼
+
+KVStore.put은 fsync가 끝날 때까지 호출한 스레드를 막으므로, 이벤트 루프에서 부르면 루프 전체가 멈춘다.
+AsyncKVStore는
+- 쓰기를 전용 sync 스레드의 대기열에 넣고 future만 기다린다. sync 스레드는 대기열에 쌓인 쓰기를
+  모두 꺼내 KVStore.commit() 한 번(append N번 + fsync 1번)으로 커밋한다.
+  fsync가 도는 동안 들어온 쓰기는 다음 fsync에 함께 묶인다 (그룹 커밋과 같은 효과, 스레드는 하나)
+- 읽기는 memtable에서 끝나면 스레드를 거치지 않고 바로 반환하고, SSTable을 읽어야 할 때만 읽기 스레드 풀에 넘긴다
+
+    store = AsyncKVStore(KVStore(data_dir=path))
+    await store.put("k", "v")
+    await store.get("k")
+    await store.close()
+
+커밋 결과를 기다리던 태스크가 취소되어도 이미 대기열에 들어간 쓰기는 커밋된다.
+"""
+import asyncio
+import queue
+import threading
+
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+
+from src.kv_store import KVStore
+from src.wal_record import RecordType, WALRecord
+
+_STOP = object()
+
+
+class _PendingWrite:
+    def __init__(self, record: WALRecord, loop: asyncio.AbstractEventLoop, future: asyncio.Future):
+        self.record = record
+        self.loop = loop
+        self.future = future
+
+
+def _set_result(future: asyncio.Future, error: BaseException | None) -> None:
+    # 루프 스레드에서 호출. 기다리던 쪽이 취소했으면 결과를 버린다
+    if future.cancelled():
+        return
+    if error is None:
+        future.set_result(None)
+    else:
+        future.set_exception(error)
+
+
+class AsyncKVStore:
+    def __init__(self, store: KVStore, max_batch_size: int = 1024, read_threads: int = 4):
+        """store의 소유권을 넘겨받는다 (close()가 store도 닫는다)"""
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self._store = store
+        self._max_batch_size = max_batch_size
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._read_executor = ThreadPoolExecutor(max_workers=read_threads, thread_name_prefix="kv-async-read")
+        self._closed = False
+        self._sync_thread = threading.Thread(target=self._sync_loop, name="kv-async-sync", daemon=True)
+        self._sync_thread.start()
+
+    @property
+    def store(self) -> KVStore:
+        return self._store
+
+    async def get(self, key: str) -> str | None:
+        found, value = self._store.get_from_memory(key)
+        if found:
+            return value
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._read_executor, self._store.get, key)
+
+    async def put(self, key: str, value: str) -> None:
+        if not key:
+            raise ValueError("key cannot be empty")
+        if not isinstance(value, str):
+            raise TypeError("value must be a str")
+        await self._submit(WALRecord(RecordType.PUT, key, value))
+
+    async def delete(self, key: str) -> None:
+        if not key:
+            raise ValueError("key cannot be empty")
+        await self._submit(WALRecord(RecordType.DEL, key))
+
+    async def write_batch(self, operations: Iterable[WALRecord]) -> None:
+        """여러 PUT/DEL을 BATCH 레코드 하나로 원자적으로 커밋한다"""
+        records = list(operations)
+        for record in records:
+            if record.record_type not in (RecordType.PUT, RecordType.DEL):
+                raise ValueError(f"unsupported record type in batch: {record.record_type}")
+            if not record.key:
+                raise ValueError("key cannot be empty")
+            if record.record_type == RecordType.PUT and not isinstance(record.value, str):
+                raise TypeError("value must be a str")
+        if records:
+            await self._submit(WALRecord.batch(records))
+
+    async def close(self) -> None:
+        """대기 중인 쓰기를 모두 커밋한 뒤 sync 스레드와 store를 닫는다"""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._sync_thread.join)
+        self._read_executor.shutdown(wait=True)
+        await loop.run_in_executor(None, self._store.close)
+
+    async def _submit(self, record: WALRecord) -> None:
+        if self._closed:
+            raise RuntimeError("store is closed")
+        # 잘못된 레코드 하나가 같이 모인 다른 쓰기까지 실패시키지 않도록 큐에 넣기 전에 거부한다
+        self._store.check_record(record)
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._queue.put(_PendingWrite(record, loop, future))
+        await future
+
+    def _sync_loop(self) -> None:
+        stopping = False
+        while not stopping:
+            # 첫 쓰기가 올 때까지 블록하고, 그 사이 쌓인 것은 기다리지 않고 모두 가져간다
+            first = self._queue.get()
+            if first is _STOP:
+                return
+            batch = [first]
+            while len(batch) < self._max_batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            error = None
+            try:
+                self._store.commit([pending.record for pending in batch])
+            except Exception as e:
+                error = e
+            for pending in batch:
+                try:
+                    pending.loop.call_soon_threadsafe(_set_result, pending.future, error)
+                except RuntimeError:
+                    # 기다리던 루프가 이미 닫힘
+                    pass
@@ -0,0 +1,148 @@
+"""SSTable 블록 캐시
+
+디코드된 블록을 바이트 예산 안에서 메모리에 들고 있어서, 같은 블록을 반복해서 읽을 때
+pread와 디코드를 건너뛴다. 인스턴스 하나를 여러 KVStore(block_cache=...)가 함께 쓸 수 있다.
+
+- LRUBlockCache: 가장 오래 안 쓴 블록부터 내보낸다. 조회할 때마다 순서를 갱신
+- ClockBlockCache: CLOCK(second chance). 조회는 참조 비트만 세우고 순서는 건드리지 않으므로
+  락 없이 조회한다. 여러 reader 스레드가 캐시 히트끼리 줄 서지 않는다
+
+charge는 블록의 디스크 크기로 어림한다 (디코드된 str 객체의 실제 메모리는 이보다 크다).
+"""
+import threading
+
+from collections import OrderedDict, deque
+from collections.abc import Hashable
+
+
+class BlockCache:
+    def __init__(self, capacity_bytes: int):
+        if capacity_bytes <= 0:
+            raise ValueError("capacity_bytes must be positive")
+        self._capacity = capacity_bytes
+        self._usage = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._inserts = 0
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def usage(self) -> int:
+        return self._usage
+
+    def get(self, key: Hashable) -> object | None:
+        with self._lock:
+            value = self._lookup(key)
+            if value is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+            return value
+
+    def insert(self, key: Hashable, value: object, charge: int) -> None:
+        # 예산보다 큰 블록은 다른 블록을 전부 밀어내기만 하므로 캐시하지 않음
+        if charge > self._capacity:
+            return
+        with self._lock:
+            if self._contains(key):
+                return
+            while self._usage + charge > self._capacity:
+                self._usage -= self._evict_one()
+                self._evictions += 1
+            self._store(key, value, charge)
+            self._usage += charge
+            self._inserts += 1
+
+    def stats(self) -> dict[str, float]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                "evictions": self._evictions,
+                "inserts": self._inserts,
+                "usage_bytes": self._usage,
+                "capacity_bytes": self._capacity,
+            }
+
+    # 아래는 self._lock을 잡은 상태에서 호출
+    def _lookup(self, key: Hashable) -> object | None:
+        raise NotImplementedError
+
+    def _contains(self, key: Hashable) -> bool:
+        raise NotImplementedError
+
+    def _store(self, key: Hashable, value: object, charge: int) -> None:
+        raise NotImplementedError
+
+    def _evict_one(self) -> int:
+        """블록 하나를 내보내고 그 charge를 반환"""
+        raise NotImplementedError
+
+
+class LRUBlockCache(BlockCache):
+    def __init__(self, capacity_bytes: int):
+        super().__init__(capacity_bytes)
+        self._entries: OrderedDict[Hashable, tuple[object, int]] = OrderedDict()
+
+    def _lookup(self, key: Hashable) -> object | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def _contains(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def _store(self, key: Hashable, value: object, charge: int) -> None:
+        self._entries[key] = (value, charge)
+
+    def _evict_one(self) -> int:
+        _, (_, charge) = self._entries.popitem(last=False)
+        return charge
+
+
+class ClockBlockCache(BlockCache):
+    def __init__(self, capacity_bytes: int):
+        super().__init__(capacity_bytes)
+        # key -> [value, charge, 참조 비트]. 시곗바늘은 ring의 왼쪽 끝
+        self._entries: dict[Hashable, list] = {}
+        self._ring: deque[Hashable] = deque()
+
+    # dict 조회와 리스트 원소 대입은 각각 원자적이므로 락 없이 조회한다
+    # 내보내는 중인 블록의 참조 비트를 세우는 경합은 그 블록이 한 바퀴 더 남는 정도로 끝난다
+    # hit/miss 카운터도 락 없이 올리므로 근삿값이다
+    def get(self, key: Hashable) -> object | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self._misses += 1
+            return None
+        entry[2] = True
+        self._hits += 1
+        return entry[0]
+
+    def _contains(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def _store(self, key: Hashable, value: object, charge: int) -> None:
+        self._entries[key] = [value, charge, False]
+        self._ring.append(key)
+
+    def _evict_one(self) -> int:
+        # 참조 비트가 선 블록은 비트를 내리고 한 바퀴 더 기회를 준다
+        while True:
+            key = self._ring.popleft()
+            entry = self._entries[key]
+            if entry[2]:
+                entry[2] = False
+                self._ring.append(key)
+                continue
+            del self._entries[key]
+            return entry[1]
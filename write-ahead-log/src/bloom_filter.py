@@ -0,0 +1,66 @@
+"""SSTable용 Bloom filter
+
+테이블에 없는 key를 블록을 읽지 않고 걸러내기 위한 비트 배열.
+- bits_per_key가 클수록 거짓 양성률이 낮아진다 (10비트/key면 약 1%)
+- 해시 함수 k개는 64비트 해시 하나를 두 32비트로 나눈 double hashing(h1 + i*h2)으로 만든다
+
+직렬화: num_hashes(u8) | padding(3) | num_bits(u32) | bits
+"""
+import hashlib
+import math
+import struct
+
+FILTER_HEADER = struct.Struct("<B3xI")
+DEFAULT_BITS_PER_KEY = 10
+
+
+def key_hash(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+class BloomFilter:
+    def __init__(self, num_bits: int, num_hashes: int, bits: bytearray | None = None):
+        self._num_bits = max(num_bits, 8)
+        self._num_hashes = num_hashes
+        self._bits = bits if bits is not None else bytearray((self._num_bits + 7) // 8)
+
+    @classmethod
+    def for_hashes(cls, hashes: list[int], bits_per_key: int) -> "BloomFilter":
+        """key_hash 값 목록으로 bits_per_key 크기의 필터를 만든다"""
+        # 거짓 양성률을 최소로 만드는 해시 개수: bits_per_key * ln 2
+        num_hashes = min(max(int(round(bits_per_key * math.log(2))), 1), 30)
+        bloom = cls(len(hashes) * bits_per_key, num_hashes)
+        for h in hashes:
+            bloom._add_hash(h)
+        return bloom
+
+    def add(self, key: str) -> None:
+        self._add_hash(key_hash(key))
+
+    def might_contain(self, key: str) -> bool:
+        """False면 key는 확실히 없음. True면 있을 수도 있음"""
+        h = key_hash(key)
+        h1, h2 = h & 0xFFFFFFFF, h >> 32
+        bits, num_bits = self._bits, self._num_bits
+        for i in range(self._num_hashes):
+            bit = (h1 + i * h2) % num_bits
+            if not bits[bit >> 3] & (1 << (bit & 7)):
+                return False
+        return True
+
+    def _add_hash(self, h: int) -> None:
+        h1, h2 = h & 0xFFFFFFFF, h >> 32
+        for i in range(self._num_hashes):
+            bit = (h1 + i * h2) % self._num_bits
+            self._bits[bit >> 3] |= 1 << (bit & 7)
+
+    def to_bytes(self) -> bytes:
+        return FILTER_HEADER.pack(self._num_hashes, self._num_bits) + bytes(self._bits)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "BloomFilter":
+        num_hashes, num_bits = FILTER_HEADER.unpack_from(data, 0)
+        bits = bytearray(data[FILTER_HEADER.size:])
+        if len(bits) != (num_bits + 7) // 8:
+            raise ValueError("bloom filter size mismatch")
+        return cls(num_bits, num_hashes, bits)
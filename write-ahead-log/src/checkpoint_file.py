@@ -0,0 +1,147 @@
+"""스트리밍 바이너리 체크포인트 파일
+
+전체 상태를 JSON 문자열 하나로 만들지 않고, 정렬된 key/value 엔트리를 청크 단위로 흘려 쓴다.
+읽을 때도 엔트리를 하나씩 흘려 읽으므로 피크 메모리가 (데이터셋 + 청크 버퍼) 수준에 머문다.
+
+파일 구조:
+    header: magic(4) | version(1) | padding(3)
+    entry*: key_len(u32) | value_len(u32) | key | value   (key 오름차순)
+    footer: count(u64) | lsn(u64) | crc32(u32) | magic(4)
+- crc32: 모든 엔트리 바이트의 CRC32
+- lsn: 이 체크포인트가 커버하는 WAL 위치 (이 LSN 이전 레코드는 모두 반영됨)
+"""
+import os
+import struct
+import zlib
+
+from collections.abc import Iterable, Iterator, Mapping
+from pathlib import Path
+
+from src.memtable import TOMBSTONE
+
+CHECKPOINT_MAGIC = b"KVCP"
+CHECKPOINT_VERSION = 1
+CHECKPOINT_HEADER = CHECKPOINT_MAGIC + struct.pack("<B3x", CHECKPOINT_VERSION)
+ENTRY_HEADER = struct.Struct("<II")
+FOOTER = struct.Struct("<QQI4s")
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+
+class CheckpointCorruptedError(Exception):
+    pass
+
+
+class CheckpointFooter:
+    def __init__(self, count: int, lsn: int, checksum: int):
+        self.count = count
+        self.lsn = lsn
+        self.checksum = checksum
+
+
+def write_checkpoint(
+    path: Path,
+    data: Mapping[str, str],
+    lsn: int,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> CheckpointFooter:
+    """data를 key 순으로 정렬해 path에 쓰고 fsync 한다 (원자적 교체는 호출자가 rename으로 처리)"""
+    # 전체 items를 복사하지 않고 key 참조만 정렬
+    return write_checkpoint_entries(path, ((key, data[key]) for key in sorted(data)), lsn, chunk_size)
+
+
+def write_checkpoint_entries(
+    path: Path,
+    entries: Iterable[tuple[str, object]],
+    lsn: int,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> CheckpointFooter:
+    """이미 key 순서인 (key, value)를 흘려 받아 path에 쓰고 fsync 한다 (scan 결과를 통째로 모으지 않을 때)"""
+    checksum = 0
+    count = 0
+    buffer = bytearray()
+
+    with open(path, "wb") as f:
+        f.write(CHECKPOINT_HEADER)
+
+        for key, value in entries:
+            # 시점 스냅샷 때문에 memtable에 남아 있는 삭제 표시
+            if value is TOMBSTONE:
+                continue
+            key_bytes = key.encode("utf-8")
+            value_bytes = value.encode("utf-8")
+            buffer += ENTRY_HEADER.pack(len(key_bytes), len(value_bytes))
+            buffer += key_bytes
+            buffer += value_bytes
+            count += 1
+
+            if len(buffer) >= chunk_size:
+                checksum = zlib.crc32(buffer, checksum)
+                f.write(buffer)
+                buffer.clear()
+
+        checksum = zlib.crc32(buffer, checksum)
+        f.write(buffer)
+        f.write(FOOTER.pack(count, lsn, checksum, CHECKPOINT_MAGIC))
+        f.flush()
+        os.fsync(f.fileno())
+
+    return CheckpointFooter(count, lsn, checksum)
+
+
+def read_footer(path: Path) -> CheckpointFooter:
+    with open(path, "rb") as f:
+        header = f.read(len(CHECKPOINT_HEADER))
+        if header != CHECKPOINT_HEADER:
+            raise CheckpointCorruptedError("invalid checkpoint header")
+
+        size = f.seek(0, os.SEEK_END)
+        if size < len(CHECKPOINT_HEADER) + FOOTER.size:
+            raise CheckpointCorruptedError("checkpoint is too short")
+
+        f.seek(size - FOOTER.size)
+        count, lsn, checksum, magic = FOOTER.unpack(f.read(FOOTER.size))
+        if magic != CHECKPOINT_MAGIC:
+            raise CheckpointCorruptedError("invalid checkpoint footer")
+
+    return CheckpointFooter(count, lsn, checksum)
+
+
+def iter_checkpoint(path: Path, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[tuple[str, str]]:
+    """(key, value)를 key 순서대로 흘려 읽는다
+
+    끝까지 읽은 뒤 개수/체크섬이 footer와 다르면 CheckpointCorruptedError.
+    호출자는 끝까지 소비한 뒤에만 결과를 신뢰해야 한다.
+    """
+    footer = read_footer(path)
+    entries_end = path.stat().st_size - FOOTER.size
+
+    checksum = 0
+    count = 0
+    with open(path, "rb", buffering=chunk_size) as f:
+        f.seek(len(CHECKPOINT_HEADER))
+        position = len(CHECKPOINT_HEADER)
+
+        while position < entries_end:
+            header = f.read(ENTRY_HEADER.size)
+            if len(header) < ENTRY_HEADER.size or position + ENTRY_HEADER.size > entries_end:
+                raise CheckpointCorruptedError("truncated entry header")
+            key_len, value_len = ENTRY_HEADER.unpack(header)
+
+            body = f.read(key_len + value_len)
+            position += ENTRY_HEADER.size + len(body)
+            if len(body) < key_len + value_len or position > entries_end:
+                raise CheckpointCorruptedError("truncated entry")
+
+            checksum = zlib.crc32(body, zlib.crc32(header, checksum))
+            count += 1
+            yield body[:key_len].decode("utf-8"), body[key_len:].decode("utf-8")
+
+    if count != footer.count or checksum != footer.checksum:
+        raise CheckpointCorruptedError("checkpoint checksum mismatch")
+
+
+def load_checkpoint(path: Path) -> tuple[dict[str, str], int]:
+    """체크포인트 전체를 dict로 읽고 (data, lsn)을 반환"""
+    data = dict(iter_checkpoint(path))
+    return data, read_footer(path).lsn
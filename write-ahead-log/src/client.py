@@ -0,0 +1,265 @@
+"""KV 서버 클라이언트 (연결 풀 + 파이프라이닝)
+
+    client = KVClient("/tmp/kv.sock")          # 또는 KVClient(("127.0.0.1", 7070))
+    client.put("k", "v")
+    client.get("k")
+    for key, value in client.scan("a", "b"):   # 서버에서 페이지 단위로 가져온다
+        ...
+    with client.pipeline() as pipe:            # 요청을 모아 한 번에 보내고 응답을 한 번에 받는다
+        pipe.put("k1", "v1")
+        pipe.get("k2")
+    pipe.results                               # [None, "v2"]
+
+- 연결은 pool_size개까지 필요할 때 만들고 재사용한다. 스레드마다 하나씩 빌려 쓰고 돌려준다
+- fork한 자식 프로세스는 부모의 연결을 공유하면 응답이 섞이므로, pid가 바뀌면 풀을 새로 시작한다
+"""
+import os
+import queue
+import socket
+import threading
+
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+from src.memtable import prefix_end
+from src.protocol import (
+    BodyReader,
+    Op,
+    Status,
+    decode_frames,
+    decode_scan_response,
+    encode_batch,
+    encode_frame,
+    encode_scan_request,
+    encode_str,
+)
+from src.wal_record import WALRecord
+
+RECV_SIZE = 256 * 1024
+
+
+class ServerError(Exception):
+    """서버가 요청 처리에 실패함 (메시지는 서버 쪽 예외)"""
+
+
+class _Connection:
+    def __init__(self, address: str | Path | tuple[str, int], timeout: float | None):
+        if isinstance(address, tuple):
+            self._sock = socket.create_connection(address, timeout=timeout)
+            self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        else:
+            self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._sock.settimeout(timeout)
+            self._sock.connect(str(address))
+        self._buffer = bytearray()
+        self._next_id = 0
+
+    def call(self, requests: list[tuple[int, bytes]]) -> list[tuple[int, bytes]]:
+        """(op, body) 요청들을 한 번에 보내고 (status, body) 응답을 순서대로 반환"""
+        first_id = self._next_id
+        self._next_id = (self._next_id + len(requests)) & 0xFFFFFFFF
+        self._sock.sendall(b"".join(
+            encode_frame((first_id + i) & 0xFFFFFFFF, op, body) for i, (op, body) in enumerate(requests)
+        ))
+
+        responses = []
+        while len(responses) < len(requests):
+            data = self._sock.recv(RECV_SIZE)
+            if not data:
+                raise ConnectionError("server closed the connection")
+            self._buffer += data
+            for request_id, status, body in decode_frames(self._buffer):
+                if request_id != (first_id + len(responses)) & 0xFFFFFFFF:
+                    raise ConnectionError("response out of order")
+                responses.append((status, body))
+        return responses
+
+    def close(self) -> None:
+        self._sock.close()
+
+
+def _result(op: int, status: int, body: bytes) -> str | None:
+    if status == Status.ERROR:
+        raise ServerError(BodyReader(body).str())
+    if op == Op.GET and status == Status.OK:
+        return BodyReader(body).str()
+    return None
+
+
+class KVClient:
+    def __init__(self, address: str | Path | tuple[str, int], pool_size: int = 8, timeout: float | None = 30.0):
+        if pool_size < 1:
+            raise ValueError("pool_size must be at least 1")
+        self._address = address
+        self._pool_size = pool_size
+        self._timeout = timeout
+        self._lock = threading.Lock()
+        self._reset_pool()
+
+    def __enter__(self) -> "KVClient":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def get(self, key: str) -> str | None:
+        return self._call([(Op.GET, encode_str(key))])[0]
+
+    def put(self, key: str, value: str) -> None:
+        self._call([(Op.PUT, encode_str(key) + encode_str(value))])
+
+    def delete(self, key: str) -> None:
+        self._call([(Op.DELETE, encode_str(key))])
+
+    def write_batch(self, operations: Iterable[WALRecord]) -> None:
+        """PUT/DEL 레코드들을 서버의 write_batch 하나로 원자적으로 커밋"""
+        self._call([(Op.BATCH, encode_batch(list(operations)))])
+
+    def ping(self) -> None:
+        self._call([(Op.PING, b"")])
+
+    def scan(
+        self, start: str | None = None, end: str | None = None, reverse: bool = False, page_size: int = 1000,
+    ) -> Iterator[tuple[str, str]]:
+        """서버에서 page_size개씩 가져오는 제너레이터. 페이지 사이에는 연결을 붙잡지 않는다
+
+        페이지마다 따로 읽으므로 전체 결과가 한 시점의 상태라는 보장은 없다.
+        """
+        while True:
+            request = encode_scan_request(start, end, reverse, page_size)
+            with self._connection() as connection:
+                (status, body), = connection.call([(Op.SCAN, request)])
+            _result(Op.SCAN, status, body)
+            entries, more = decode_scan_response(body)
+            yield from entries
+            if not more or not entries:
+                return
+            # 다음 페이지는 마지막 key 바로 다음부터 (역순이면 바로 앞까지)
+            last_key = entries[-1][0]
+            if reverse:
+                end = last_key
+            else:
+                start = last_key + "\0"
+
+    def prefix(self, prefix: str, reverse: bool = False, page_size: int = 1000) -> Iterator[tuple[str, str]]:
+        return self.scan(prefix, prefix_end(prefix), reverse, page_size)
+
+    def pipeline(self) -> "Pipeline":
+        return Pipeline(self)
+
+    def close(self) -> None:
+        """풀의 연결을 모두 닫는다 (빌려 간 연결은 돌려줄 때 닫힘)"""
+        with self._lock:
+            self._closed = True
+            while True:
+                try:
+                    self._idle.get_nowait().close()
+                except queue.Empty:
+                    break
+
+    def _call(self, requests: list[tuple[int, bytes]]) -> list[str | None]:
+        with self._connection() as connection:
+            responses = connection.call(requests)
+        # 응답을 모두 받은 뒤 첫 오류를 올린다 (연결은 이미 다음 요청을 받을 수 있는 상태)
+        return [_result(op, status, body) for (op, _), (status, body) in zip(requests, responses)]
+
+    def _connection(self) -> "_Lease":
+        return _Lease(self)
+
+    def _reset_pool(self) -> None:
+        self._pid = os.getpid()
+        self._idle: queue.LifoQueue[_Connection] = queue.LifoQueue()
+        self._created = 0
+        self._closed = False
+
+    def _acquire(self) -> _Connection:
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("client is closed")
+            if self._pid != os.getpid():
+                # 부모 프로세스의 소켓은 닫지 않고 버린다 (닫으면 부모 쪽 연결에도 영향)
+                self._reset_pool()
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                pass
+            create = self._created < self._pool_size
+            if create:
+                self._created += 1
+
+        if create:
+            try:
+                return _Connection(self._address, self._timeout)
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+        try:
+            return self._idle.get(timeout=self._timeout)
+        except queue.Empty:
+            raise TimeoutError("no idle connection in the pool")
+
+    def _release(self, connection: _Connection, broken: bool) -> None:
+        with self._lock:
+            if broken or self._closed or self._pid != os.getpid():
+                connection.close()
+                if self._pid == os.getpid():
+                    self._created -= 1
+                return
+        self._idle.put(connection)
+
+
+class _Lease:
+    """풀에서 연결 하나를 빌려 with 블록 동안 쓴다. 통신 중 예외가 나면 그 연결은 버린다"""
+
+    def __init__(self, client: KVClient):
+        self._client = client
+        self._connection: _Connection | None = None
+
+    def __enter__(self) -> _Connection:
+        self._connection = self._client._acquire()
+        return self._connection
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self._client._release(self._connection, broken=exc_type is not None)
+
+
+class Pipeline:
+    """요청을 모아 두었다가 execute()에서 한 연결로 한 번에 보낸다
+
+    with 블록이 예외 없이 끝나면 execute() 한다. 결과는 요청 순서대로 results에 담긴다
+    (get은 값, 나머지는 None). 서버 오류가 있으면 모든 응답을 받은 뒤 첫 오류를 ServerError로 올린다.
+    """
+
+    def __init__(self, client: KVClient):
+        self._client = client
+        self._requests: list[tuple[int, bytes]] = []
+        self.results: list[str | None] = []
+
+    def __enter__(self) -> "Pipeline":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        if exc_type is None:
+            self.execute()
+
+    def __len__(self) -> int:
+        return len(self._requests)
+
+    def get(self, key: str) -> None:
+        self._requests.append((Op.GET, encode_str(key)))
+
+    def put(self, key: str, value: str) -> None:
+        self._requests.append((Op.PUT, encode_str(key) + encode_str(value)))
+
+    def delete(self, key: str) -> None:
+        self._requests.append((Op.DELETE, encode_str(key)))
+
+    def write_batch(self, operations: Iterable[WALRecord]) -> None:
+        self._requests.append((Op.BATCH, encode_batch(list(operations))))
+
+    def execute(self) -> list[str | None]:
+        requests, self._requests = self._requests, []
+        if requests:
+            self.results = self._client._call(requests)
+        return self.results
@@ -0,0 +1,225 @@
+"""SSTable 컴팩션
+
+flush가 쌓은 테이블을 병합해서
+- 같은 key의 오래된 버전(더 최신 테이블에 가려진 값)을 버리고
+- 더 오래된 테이블에 가릴 값이 없는 tombstone을 버린다.
+
+어떤 테이블을 언제 병합할지는 전략이 정한다.
+- LeveledCompaction: L0(flush 결과)가 쌓이면 L1로, 각 레벨이 크기 상한을 넘으면 다음 레벨로 내린다.
+  L1 이상은 레벨 안에서 key 범위가 겹치지 않아 읽기 증폭이 작고, 대신 쓰기 증폭이 크다
+- SizeTieredCompaction: 크기가 비슷한 테이블이 min_threshold개 모이면 하나로 합친다.
+  쓰기 증폭이 작고, 대신 같은 key가 여러 테이블에 남아 읽기/공간 증폭이 크다
+
+컴팩션 쓰기는 RateLimiter로 초당 바이트를 제한해서 포그라운드 WAL fsync가 디스크를 뺏기지 않게 한다.
+"""
+import threading
+import time
+
+from collections.abc import Callable, Iterator
+from pathlib import Path
+
+from src.bloom_filter import DEFAULT_BITS_PER_KEY
+from src.manifest import TableMeta, table_file_name
+from src.memtable import TOMBSTONE, merge_scans
+from src.sstable import DEFAULT_BLOCK_SIZE, SSTable, write_sstable
+
+DEFAULT_TARGET_FILE_SIZE = 2 * 1024 * 1024
+
+
+class CompactionTask:
+    """inputs를 병합해 output_level에 쓴다. target_file_size가 있으면 그 크기마다 출력 테이블을 나눈다"""
+
+    def __init__(self, inputs: list[TableMeta], output_level: int, target_file_size: int | None = None):
+        self.inputs = inputs
+        self.output_level = output_level
+        self.target_file_size = target_file_size
+
+
+class CompactionStrategy:
+    def pick(self, tables: list[TableMeta]) -> CompactionTask | None:
+        """할 일이 없으면 None"""
+        raise NotImplementedError
+
+
+class LeveledCompaction(CompactionStrategy):
+    def __init__(
+        self,
+        l0_trigger: int = 4,
+        base_level_bytes: int = 10 * 1024 * 1024,
+        level_multiplier: int = 10,
+        target_file_size: int = DEFAULT_TARGET_FILE_SIZE,
+    ):
+        self.l0_trigger = l0_trigger
+        self.base_level_bytes = base_level_bytes
+        self.level_multiplier = level_multiplier
+        self.target_file_size = target_file_size
+
+    def max_level_bytes(self, level: int) -> int:
+        return self.base_level_bytes * self.level_multiplier ** (level - 1)
+
+    def pick(self, tables: list[TableMeta]) -> CompactionTask | None:
+        levels: dict[int, list[TableMeta]] = {}
+        for table in tables:
+            levels.setdefault(table.level, []).append(table)
+
+        # L0 테이블끼리는 key 범위가 겹치므로 전부 함께, 겹치는 L1 테이블과 병합
+        l0 = levels.get(0, [])
+        if len(l0) >= self.l0_trigger:
+            return self._with_overlapping(l0, levels.get(1, []), 1)
+
+        for level in sorted(level for level in levels if level >= 1):
+            if sum(table.size for table in levels[level]) > self.max_level_bytes(level):
+                # 가장 오래된 테이블 하나를 다음 레벨로 내린다
+                oldest = min(levels[level], key=lambda table: table.seq)
+                return self._with_overlapping([oldest], levels.get(level + 1, []), level + 1)
+        return None
+
+    def _with_overlapping(self, upper: list[TableMeta], lower: list[TableMeta], output_level: int) -> CompactionTask:
+        keys = [key for table in upper for key in (table.min_key, table.max_key) if key is not None]
+        overlapping = []
+        if keys:
+            overlapping = [table for table in lower if table.overlaps(min(keys), max(keys))]
+        return CompactionTask(upper + overlapping, output_level, self.target_file_size)
+
+
+class SizeTieredCompaction(CompactionStrategy):
+    def __init__(
+        self,
+        min_threshold: int = 4,
+        max_threshold: int = 32,
+        bucket_low: float = 0.5,
+        bucket_high: float = 1.5,
+        min_table_size: int = 1024 * 1024,
+    ):
+        self.min_threshold = min_threshold
+        self.max_threshold = max_threshold
+        self.bucket_low = bucket_low
+        self.bucket_high = bucket_high
+        # 이보다 작은 테이블은 크기 차이와 무관하게 같은 버킷으로 본다
+        self.min_table_size = min_table_size
+
+    def pick(self, tables: list[TableMeta]) -> CompactionTask | None:
+        # 최신 순서가 어긋나지 않도록 seq 순으로 연속된 테이블만 묶는다
+        ordered = sorted(tables, key=lambda table: table.seq)
+        bucket: list[TableMeta] = []
+        for table in ordered:
+            if bucket and not self._fits(bucket, table):
+                if len(bucket) >= self.min_threshold:
+                    break
+                bucket = []
+            bucket.append(table)
+            if len(bucket) >= self.max_threshold:
+                break
+
+        if len(bucket) >= self.min_threshold:
+            return CompactionTask(bucket, 0)
+        return None
+
+    def _fits(self, bucket: list[TableMeta], table: TableMeta) -> bool:
+        if table.size < self.min_table_size and all(t.size < self.min_table_size for t in bucket):
+            return True
+        average = sum(t.size for t in bucket) / len(bucket)
+        return self.bucket_low * average <= table.size <= self.bucket_high * average
+
+
+class RateLimiter:
+    """토큰 버킷. request(n)은 초당 bytes_per_second를 넘지 않도록 필요한 만큼 잠든다"""
+
+    def __init__(self, bytes_per_second: int, burst_bytes: int | None = None):
+        if bytes_per_second <= 0:
+            raise ValueError("bytes_per_second must be positive")
+        self._rate = bytes_per_second
+        self._burst = burst_bytes if burst_bytes is not None else bytes_per_second
+        self._available = float(self._burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def request(self, n: int) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self._available = min(self._burst, self._available + (now - self._last) * self._rate)
+            self._last = now
+            self._available -= n
+            wait = -self._available / self._rate if self._available < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+
+
+class CompactionStats:
+    """쓰기 증폭 계산용 누적 바이트 (프로세스 시작 이후)
+
+    write_amplification = (WAL + flush + 컴팩션 출력 바이트) / 사용자가 쓴 key+value 바이트
+    """
+
+    def __init__(self):
+        self.user_bytes = 0
+        self.wal_bytes = 0
+        self.flush_bytes = 0
+        self.compaction_read_bytes = 0
+        self.compaction_write_bytes = 0
+        self.compactions = 0
+
+    @property
+    def write_amplification(self) -> float:
+        if self.user_bytes == 0:
+            return 0.0
+        return (self.wal_bytes + self.flush_bytes + self.compaction_write_bytes) / self.user_bytes
+
+    def to_dict(self) -> dict[str, float]:
+        return {
+            "user_bytes": self.user_bytes,
+            "wal_bytes": self.wal_bytes,
+            "flush_bytes": self.flush_bytes,
+            "compaction_read_bytes": self.compaction_read_bytes,
+            "compaction_write_bytes": self.compaction_write_bytes,
+            "compactions": self.compactions,
+            "write_amplification": self.write_amplification,
+        }
+
+
+def run_compaction(
+    directory: Path,
+    task: CompactionTask,
+    readers: dict[int, SSTable],
+    older_tables: list[TableMeta],
+    allocate_table_id: Callable[[], int],
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    bloom_bits_per_key: int = DEFAULT_BITS_PER_KEY,
+    rate_limiter: RateLimiter | None = None,
+) -> list[TableMeta]:
+    """task의 입력을 병합해 새 테이블 파일을 쓰고 (manifest 등록은 호출자 몫) 그 목록을 반환
+
+    older_tables: 입력보다 오래된 테이블. 이들과 key 범위가 겹치지 않는 tombstone만 버릴 수 있다
+    """
+    # 병합은 조회 순서(최신 먼저)로 해야 같은 key에서 최신 값이 이긴다
+    inputs = sorted(task.inputs, key=lambda table: (table.level, -table.seq))
+    # 한 번만 읽는 입력 블록으로 블록 캐시의 뜨거운 블록을 밀어내지 않는다
+    merged = merge_scans([readers[table.table_id].scan(fill_cache=False) for table in inputs])
+    live = (
+        (key, value) for key, value in merged
+        if value is not TOMBSTONE or any(table.overlaps(key, key) for table in older_tables)
+    )
+
+    seq = max(table.seq for table in inputs)
+    throttle = rate_limiter.request if rate_limiter is not None else None
+    outputs = []
+    pending = next(live, None)
+    while pending is not None:
+        def take() -> Iterator[tuple[str, object]]:
+            # target_file_size마다 출력 테이블을 나눈다 (같은 key가 두 테이블로 갈라지지 않음)
+            nonlocal pending
+            size = 0
+            while pending is not None and (task.target_file_size is None or size < task.target_file_size):
+                key, value = pending
+                yield pending
+                size += len(key) + (0 if value is TOMBSTONE else len(value))
+                pending = next(live, None)
+
+        table_id = allocate_table_id()
+        path = Path(directory) / table_file_name(table_id)
+        tmp_path = path.with_name(path.name + ".tmp")
+        info = write_sstable(tmp_path, take(), block_size, bloom_bits_per_key, throttle=throttle)
+        tmp_path.rename(path)
+        outputs.append(TableMeta(table_id, info.count, info.size, info.min_key, info.max_key, task.output_level, seq))
+
+    return outputs
@@ -4,7 +4,7 @@ subprocess로 실행되어 특정 시점에 마커 파일을 생성하고 대기
 테스트에서 SIGKILL로 종료하여 크래시를 시뮬레이션한다.
 
 사용법:
-    python crash_test_worker.py <data_dir> <crash_point> <marker_file> <operation> <key> [value]
+    python crash_test_worker.py <data_dir> <crash_point> <marker_file> <operation> <key> [value] [--durability MODE]
 
 operation:
     - put: PUT 연산 (value 필수)
@@ -14,13 +14,19 @@ crash_point:
     - post_append: append 후, sync 전
     - post_flush: flush 후, fsync 전
     - post_sync: sync 완료 후, _apply_record 전
+    - post_commit: 연산이 반환된 직후 (close 전. INTERVAL/NONE 모드에서는 아직 fsync 전)
+
+durability:
+    - always(기본값), interval, none. interval은 주기를 길게 잡아 kill 전에 백그라운드 fsync가 돌지 않게 한다
 """
 
+import argparse
 import sys
 import time
 from pathlib import Path
 
 from src.kv_store import KVStore
+from src.wal import Durability
 
 
 def create_marker_and_wait(marker_path: Path) -> None:
@@ -31,16 +37,22 @@ def create_marker_and_wait(marker_path: Path) -> None:
 
 
 def main() -> None:
-    if len(sys.argv) < 6:
-        print(f"Usage: {sys.argv[0]} <data_dir> <crash_point> <marker_file> <operation> <key> [value]")
-        sys.exit(1)
-
-    data_dir = Path(sys.argv[1])
-    crash_point = sys.argv[2]
-    marker_file = Path(sys.argv[3])
-    operation = sys.argv[4]
-    key = sys.argv[5]
-    value = sys.argv[6] if len(sys.argv) > 6 else None
+    parser = argparse.ArgumentParser()
+    parser.add_argument("data_dir", type=Path)
+    parser.add_argument("crash_point")
+    parser.add_argument("marker_file", type=Path)
+    parser.add_argument("operation")
+    parser.add_argument("key")
+    parser.add_argument("value", nargs="?")
+    parser.add_argument("--durability", type=Durability, default=Durability.ALWAYS)
+    args = parser.parse_args()
+
+    data_dir = args.data_dir
+    crash_point = args.crash_point
+    marker_file = args.marker_file
+    operation = args.operation
+    key = args.key
+    value = args.value
 
     hooks = {
         "post_append_hook": None,
@@ -54,11 +66,11 @@ def main() -> None:
         hooks["post_flush_hook"] = lambda: create_marker_and_wait(marker_file)
     elif crash_point == "post_sync":
         hooks["post_sync_hook"] = lambda: create_marker_and_wait(marker_file)
-    else:
+    elif crash_point != "post_commit":
         print(f"Unknown crash point: {crash_point}")
         sys.exit(1)
 
-    store = KVStore(data_dir=data_dir, **hooks)
+    store = KVStore(data_dir=data_dir, durability=args.durability, sync_interval_ms=60_000, **hooks)
 
     if operation == "put":
         if value is None:
@@ -71,6 +83,8 @@ def main() -> None:
         print(f"Unknown operation: {operation}")
         sys.exit(1)
 
+    if crash_point == "post_commit":
+        create_marker_and_wait(marker_file)
     store.close()
 
 
@@ -0,0 +1,96 @@
+"""그룹 커밋 (여러 writer의 레코드를 한 번의 fsync로 묶어서 커밋)"""
+
+import threading
+import time
+
+from collections.abc import Callable
+
+from src.wal_record import WALRecord
+
+
+class _CommitRequest:
+    def __init__(self, record: WALRecord):
+        self.record = record
+        self.done = False
+        self.error: BaseException | None = None
+
+
+class GroupCommitter:
+    """리더-팔로워 방식 그룹 커밋
+
+    - writer는 레코드를 대기열에 넣고 커밋 완료를 기다린다
+    - 진행 중인 리더가 없으면 대기열에 넣은 writer가 리더가 된다
+    - 리더는 최대 max_wait_seconds 동안 배치가 차기를 기다린 뒤,
+      최대 max_batch_size개의 레코드를 commit_fn 한 번으로 기록한다 (append N번 + fsync 1번)
+    - commit_fn이 끝나면(= fsync 완료) 배치의 모든 writer에게 결과를 알린다
+    - 배치 커밋이 실패하면 배치에 포함된 모든 writer가 같은 예외를 받는다
+    """
+
+    def __init__(
+        self,
+        commit_fn: Callable[[list[WALRecord]], None],
+        max_batch_size: int = 256,
+        max_wait_seconds: float = 0.0,
+    ):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        if max_wait_seconds < 0:
+            raise ValueError("max_wait_seconds cannot be negative")
+
+        self._commit_fn = commit_fn
+        self._max_batch_size = max_batch_size
+        self._max_wait_seconds = max_wait_seconds
+
+        self._cond = threading.Condition()
+        self._pending: list[_CommitRequest] = []
+        self._leader_active = False
+
+    def submit(self, record: WALRecord) -> None:
+        """레코드를 커밋 대기열에 넣고 fsync 완료까지 블록한다"""
+        request = _CommitRequest(record)
+
+        with self._cond:
+            self._pending.append(request)
+            # 배치를 채우며 기다리는 리더가 있으면 깨운다
+            self._cond.notify_all()
+
+        # 대기열이 max_batch_size보다 길면 리더가 한 번에 다 못 가져갈 수 있으므로 반복
+        while True:
+            with self._cond:
+                while not request.done and self._leader_active:
+                    self._cond.wait()
+
+                if request.done:
+                    break
+
+                self._leader_active = True
+                batch = self._take_batch()
+
+            error: BaseException | None = None
+            try:
+                self._commit_fn([r.record for r in batch])
+            except BaseException as e:
+                error = e
+
+            with self._cond:
+                for r in batch:
+                    r.done = True
+                    r.error = error
+                self._leader_active = False
+                self._cond.notify_all()
+
+        if request.error is not None:
+            raise request.error
+
+    # self._cond를 잡은 상태에서 호출
+    def _take_batch(self) -> list[_CommitRequest]:
+        deadline = time.monotonic() + self._max_wait_seconds
+        while len(self._pending) < self._max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            self._cond.wait(remaining)
+
+        batch = self._pending[:self._max_batch_size]
+        del self._pending[:self._max_batch_size]
+        return batch
@@ -3,11 +3,28 @@
 import json
 import os
 import threading
+import time
 
-from collections.abc import Callable
+from collections.abc import Callable, Iterable, Iterator
 from pathlib import Path
-from src.wal import WAL
-from src.wal_record import WALRecord, RecordType
+from src.block_cache import BlockCache
+from src.bloom_filter import DEFAULT_BITS_PER_KEY
+from src.checkpoint_file import iter_checkpoint, read_footer, write_checkpoint
+from src.compaction import CompactionStats, CompactionStrategy, RateLimiter, run_compaction
+from src.group_commit import GroupCommitter
+from src.manifest import Manifest, TableMeta, table_file_name
+from src.memtable import TOMBSTONE, DictMemTable, MemTable, merge_scans, prefix_end
+from src.metrics import StoreMetrics
+from src.parallel_replay import read_entries_parallel
+from src.segmented_wal import DEFAULT_SEGMENT_SIZE, SegmentedWAL, fsync_dir, list_segments, segment_path
+from src.snapshot import Snapshot, VersionStore
+from src.sstable import DEFAULT_BLOCK_SIZE, SSTable, TableReadStats, write_sstable
+from src.wal import Durability
+from src.wal_record import WALFormat, WALRecord, RecordType
+from src.write_batch import WriteBatch
+
+_MISSING = object()
+
 
 class KVStore:
     def __init__(
@@ -16,85 +33,831 @@ class KVStore:
         post_append_hook: Callable[[], None] | None = None,
         post_flush_hook: Callable[[], None] | None = None,
         post_sync_hook: Callable[[], None] | None = None,
+        group_commit: bool = False,
+        group_commit_max_batch_size: int = 256,
+        group_commit_max_wait_ms: float = 0.0,
+        wal_format: WALFormat = WALFormat.JSON,
+        wal_segment_size: int = DEFAULT_SEGMENT_SIZE,
+        wal_preallocate_bytes: int | None = None,
+        wal_recycle_segments: int = 2,
+        wal_direct_io: bool = False,
+        checkpoint_wal_bytes: int | None = None,
+        checkpoint_interval_seconds: float | None = None,
+        recovery_workers: int | None = None,
+        memtable_factory: Callable[[], MemTable] = DictMemTable,
+        memtable_flush_bytes: int | None = None,
+        sstable_block_size: int = DEFAULT_BLOCK_SIZE,
+        bloom_bits_per_key: int = DEFAULT_BITS_PER_KEY,
+        compaction_strategy: CompactionStrategy | None = None,
+        compaction_rate_limit_bytes: int | None = None,
+        block_cache: BlockCache | None = None,
+        latency_metrics: bool = False,
+        durability: Durability = Durability.ALWAYS,
+        sync_interval_ms: float = 10.0,
+        sync_interval_bytes: int | None = None,
     ):
-        self._store_data = {}
+        if durability == Durability.INTERVAL and sync_interval_ms <= 0:
+            raise ValueError("sync_interval_ms must be positive")
+
+        # 카운터는 항상 세고, 단계별 지연 히스토그램은 latency_metrics=True일 때만 잰다 (stats() 참고)
+        self._metrics = StoreMetrics(latency=latency_metrics)
+        # 점 조회만 필요하면 DictMemTable(기본값), 범위 조회가 잦으면 SortedMemTable
+        self._memtable_factory = memtable_factory
+        self._store_data = memtable_factory()
         self._lock = threading.Lock()
 
+        # 백그라운드 체크포인트 중에는 스냅샷(frozen)을 고정하고 새 쓰기는 _store_data(delta)에 쌓는다
+        # 읽기는 (active, frozen, SSTable 최신순) 튜플을 한 번에 읽어서 교체 도중의 불일치를 피한다
+        self._frozen_data: MemTable | None = None
+        self._tables: tuple[SSTable, ...] = ()
+        self._read_view: tuple[MemTable, MemTable | None, tuple[SSTable, ...]] = (self._store_data, None, ())
+        # memtable에 반영된 레코드의 대략적인 크기 (key + value 문자 수)
+        self._memtable_bytes = 0
+        self._frozen_bytes = 0
+        self._checkpoint_lock = threading.Lock()
+        # 살아 있는 스냅샷이 볼 수 있도록, 스냅샷 이후 덮어써지는 값의 이전 값을 보관
+        self._versions = VersionStore()
+        # 커밋된 레코드를 follower에게 보내는 복제 leader (set_replication 참고)
+        self._replication = None
+        # 복제 leader가 내부용으로 쓰는 key. 사용자 쓰기에서 거부한다
+        self._reserved_keys: frozenset[str] = frozenset()
+
+        # 그룹 커밋 모드에서는 동시에 들어온 쓰기를 모아 fsync 한 번으로 커밋
+        self._group_committer: GroupCommitter | None = None
+        if group_commit:
+            self._group_committer = GroupCommitter(
+                self._commit_records,
+                max_batch_size=group_commit_max_batch_size,
+                max_wait_seconds=group_commit_max_wait_ms / 1000,
+            )
+
         if data_dir:
-            self._wal_path = data_dir / "wal.log"
+            self._data_dir = data_dir
             self._checkpoint_tmp_path = data_dir / "checkpoint.tmp"
-            self._checkpoint_path = data_dir / "checkpoint.json"
+            self._checkpoint_path = data_dir / "checkpoint.dat"
+            # 예전 JSON 체크포인트. checkpoint.dat이 없을 때만 읽고, 새 체크포인트가 생기면 삭제
+            self._legacy_checkpoint_path = data_dir / "checkpoint.json"
 
             if self._checkpoint_tmp_path.exists:
                 self._checkpoint_tmp_path.unlink(missing_ok=True)
 
-            if self._wal_path.exists():
-                # 체크포인트 활용 복구
-                if self._checkpoint_path.exists():
-                    with open(self._checkpoint_path, "r") as f:
-                        self._store_data = json.load(f)
+            # 단일 wal.log를 쓰던 데이터 디렉터리는 그 파일을 LSN 0 세그먼트로 이어받음
+            legacy_wal_path = data_dir / "wal.log"
+            if legacy_wal_path.exists() and not list_segments(data_dir):
+                os.rename(legacy_wal_path, segment_path(data_dir, 0))
+
+            # LSM 모드: memtable을 체크포인트 파일 대신 SSTable로 flush 한다
+            # manifest가 이미 있으면 테이블이 있는 디렉터리이므로 옵션과 무관하게 LSM 모드로 연다
+            self._sstable_block_size = sstable_block_size
+            self._bloom_bits_per_key = bloom_bits_per_key
+            self._table_stats = TableReadStats()
+            # 같은 BlockCache 인스턴스를 여러 KVStore에 넘기면 바이트 예산을 함께 쓴다
+            self._block_cache = block_cache
+            self._compaction_stats = CompactionStats()
+            # manifest와 테이블 리더 목록은 flush와 컴팩션이 함께 바꾸므로 보호 (_lock보다 먼저 잡는다)
+            self._manifest_lock = threading.Lock()
+            self._table_readers: dict[int, SSTable] = {}
+            self._manifest = Manifest.load(data_dir)
+            if self._manifest is not None:
+                # 첫 flush가 체크포인트 내용까지 테이블로 옮겼으므로 남아 있는 체크포인트 파일은 이미 커버됨
+                self._checkpoint_path.unlink(missing_ok=True)
+                self._legacy_checkpoint_path.unlink(missing_ok=True)
+                self._table_readers = {
+                    table.table_id: SSTable(data_dir / table.file_name, self._table_stats, self._block_cache)
+                    for table in self._manifest.tables
+                }
+                self._tables = tuple(self._table_readers[table.table_id] for table in self._manifest.read_order())
+            elif memtable_flush_bytes is not None:
+                self._manifest = Manifest()
+            self._lsm = self._manifest is not None
+            if self._lsm:
+                self._manifest.remove_orphan_tables(data_dir)
+            self._read_view = (self._store_data, None, self._tables)
+
+            # 체크포인트 활용 복구
+            checkpoint_lsn = self._manifest.lsn if self._manifest is not None else 0
+            if self._checkpoint_path.exists():
+                self._store_data.update(iter_checkpoint(self._checkpoint_path))
+                checkpoint_lsn = read_footer(self._checkpoint_path).lsn
+            elif self._legacy_checkpoint_path.exists():
+                with open(self._legacy_checkpoint_path, "r") as f:
+                    self._store_data.update(json.load(f))
 
-                # 체크포인트에 없는 변경사항이 있는 경우 복구
-                for record in WAL.read(self._wal_path):
-                    if record.record_type == RecordType.PUT:
-                        self._store_data[record.key] = record.value
-                    if record.record_type == RecordType.DEL:
-                        self._store_data.pop(record.key)
+            # 체크포인트에 없는 변경사항이 있는 경우 복구 (체크포인트가 커버하는 LSN 이후만)
+            # recovery_workers가 2 이상이면 디코드/검증을 프로세스 풀에 맡기고 적용은 로그 순서대로
+            if recovery_workers is not None and recovery_workers > 1:
+                for _, _, record in read_entries_parallel(data_dir, start_lsn=checkpoint_lsn, workers=recovery_workers):
+                    self._apply_record(record)
+            else:
+                for _, _, view in SegmentedWAL.read_views(data_dir, start_lsn=checkpoint_lsn):
+                    self._apply_record(view.to_record())
 
-            self._wal = WAL(self._wal_path)
+            self._wal = SegmentedWAL(
+                data_dir,
+                segment_size=wal_segment_size,
+                wal_format=wal_format,
+                # 미리 할당 + 세그먼트 재활용: 커밋 fsync가 fdatasync(데이터만)로 끝나도록 (바이너리 포맷 전용)
+                preallocate_bytes=wal_preallocate_bytes,
+                recycle_segments=wal_recycle_segments if wal_preallocate_bytes is not None else 0,
+                # 정렬 버퍼 + O_DIRECT/O_DSYNC 쓰기 (wal_preallocate_bytes 필요, docs/wal-preallocation.md)
+                direct_io=wal_direct_io,
+                **self._metrics.wal_hooks(post_append_hook, post_flush_hook, post_sync_hook),
+            )
         else:
             raise Exception("data_dir is needed")
 
-    # 매번 sync 하기 때문에 비효율적이긴 함 (학습 차원 허용. 실제로는 bulk나 다른 방안 고려 필요함)
+        # 내구성 모드 (docs/durability-modes.md)
+        # ALWAYS가 아니면 커밋은 OS로 flush만 하고, fsync가 끝난 위치는 _durable_lsn으로 따로 관리한다
+        # INTERVAL은 sync_interval_ms마다, 또는 fsync 안 된 WAL이 sync_interval_bytes를 넘으면 백그라운드 스레드가 fsync
+        self._durability = durability
+        self._sync_interval_seconds = sync_interval_ms / 1000
+        self._sync_interval_bytes = sync_interval_bytes
+        self._durable = threading.Condition(self._lock)
+        # fsync는 한 번에 하나만 (store 락은 fd를 복제하는 동안만 잡는다)
+        self._sync_lock = threading.Lock()
+        self._sync_error: OSError | None = None
+        self._sync_wakeup = threading.Event()
+        self._sync_thread: threading.Thread | None = None
+        if durability != Durability.ALWAYS:
+            # 이전 프로세스가 flush만 하고 죽었으면 WAL 꼬리가 아직 OS 버퍼에만 있을 수 있다
+            self._wal.detach_sync()()
+        self._durable_lsn = self._wal.end_lsn
+
+        # 체크포인트 트리거: 마지막 체크포인트 이후 WAL이 checkpoint_wal_bytes만큼 쌓였거나
+        # checkpoint_interval_seconds가 지나면 백그라운드 스레드가 checkpoint()를 수행
+        # LSM 모드에서는 memtable이 memtable_flush_bytes를 넘어도 트리거 (이때 checkpoint()는 flush)
+        self._checkpoint_wal_bytes = checkpoint_wal_bytes
+        self._checkpoint_interval_seconds = checkpoint_interval_seconds
+        self._memtable_flush_bytes = memtable_flush_bytes
+        self._checkpoint_lsn = max(checkpoint_lsn, self._wal.segments[0][0])
+        self._last_checkpoint_time = time.monotonic()
+        self._checkpoint_error: Exception | None = None
+        self._checkpoint_wakeup = threading.Event()
+        self._checkpoint_stop = threading.Event()
+        self._checkpoint_thread: threading.Thread | None = None
+        if checkpoint_wal_bytes is not None or checkpoint_interval_seconds is not None or memtable_flush_bytes is not None:
+            self._checkpoint_thread = threading.Thread(
+                target=self._checkpoint_loop, name="kv-checkpoint", daemon=True
+            )
+            self._checkpoint_thread.start()
+
+        # 컴팩션: LSM 모드에서 전략이 주어지면 flush가 끝날 때마다 백그라운드 스레드가 깨어나 병합
+        self._compaction_strategy = compaction_strategy
+        self._compaction_rate_limiter = RateLimiter(compaction_rate_limit_bytes) if compaction_rate_limit_bytes else None
+        self._compaction_lock = threading.Lock()
+        self._compaction_error: Exception | None = None
+        self._compaction_wakeup = threading.Event()
+        self._compaction_thread: threading.Thread | None = None
+        if compaction_strategy is not None and self._lsm:
+            self._compaction_thread = threading.Thread(
+                target=self._compaction_loop, name="kv-compaction", daemon=True
+            )
+            self._compaction_thread.start()
+            self._compaction_wakeup.set()
+
+        if durability == Durability.INTERVAL:
+            self._sync_thread = threading.Thread(target=self._sync_loop, name="kv-wal-sync", daemon=True)
+            self._sync_thread.start()
+
+    # 그룹 커밋을 켜지 않으면 매번 sync 하기 때문에 비효율적이긴 함
     def put(self, key: str, value: str) -> None:
+        if not key:
+            raise ValueError("key cannot be empty")
+        if not isinstance(value, str):
+            raise TypeError("value must be a str")
+
+        self._write(WALRecord(RecordType.PUT, key, value))
+
+    # memtable → flush 중인 memtable → SSTable 최신순으로 찾고, 처음 찾은 값(또는 tombstone)이 결과
+    # 락을 잡지 않는다. 쓰기/체크포인트/flush/컴팩션은 _read_view 튜플을 통째로 교체만 하므로
+    # 읽기는 시작할 때 잡은 뷰 하나를 끝까지 보고, 교체된 테이블도 참조가 남아 있는 동안은 읽힌다
+    def get(self, key: str) -> str | None:
+        value = self._read(key)
+        return None if value is TOMBSTONE else value
+
+    def scan(self, start: str | None = None, end: str | None = None, reverse: bool = False) -> Iterator[tuple[str, str]]:
+        """start 이상 end 미만 key의 (key, value)를 key 순서대로 내보내는 제너레이터 (None이면 무한)
+
+        memtable, 체크포인트/flush 중인 스냅샷, SSTable을 최신 것이 이기도록 병합해서 보여준다.
+        """
+        return ((key, value) for key, value in self._scan(start, end, reverse) if value is not TOMBSTONE)
+
+    def prefix(self, prefix: str, reverse: bool = False) -> Iterator[tuple[str, str]]:
+        """prefix로 시작하는 key만 scan"""
+        return self.scan(prefix, prefix_end(prefix), reverse)
+
+    def get_from_memory(self, key: str) -> tuple[bool, str | None]:
+        """SSTable을 읽지 않고 memtable만 보고 (찾았는지, 값)을 반환
+
+        memtable에 없더라도 테이블이 없으면 "없음"이 확정이므로 찾은 것으로 본다.
+        찾지 못했으면 디스크를 읽어야 하므로 호출자가 get()을 다른 스레드에서 부르면 된다.
+        """
+        active, frozen, tables = self._read_view
+        value = active.get(key, _MISSING)
+        if value is _MISSING and frozen is not None:
+            value = frozen.get(key, _MISSING)
+        if value is _MISSING:
+            return not tables, None
+        return True, None if value is TOMBSTONE else value
+
+    def commit(self, records: list[WALRecord]) -> None:
+        """레코드들을 WAL에 append 하고 sync 한 번으로 커밋한다 (여러 writer를 직접 모으는 호출자용)
+
+        레코드는 각각 독립적으로 적용되지만 sync가 실패하면 모두 실패한다.
+        하나라도 check_record를 통과하지 못하면 아무것도 커밋하지 않는다.
+        """
+        for record in records:
+            self.check_record(record)
+        self._commit_records(records)
+
+    def check_record(self, record: WALRecord) -> None:
+        """put/delete/write_batch와 같은 규칙으로 레코드를 검증한다 (WAL에 닿기 전에 거부)"""
+        if record.record_type == RecordType.BATCH:
+            for sub_record in record.records:
+                if sub_record.record_type not in (RecordType.PUT, RecordType.DEL):
+                    raise ValueError(f"unsupported record type in batch: {sub_record.record_type}")
+                self._check_operation(sub_record)
+        elif record.record_type in (RecordType.PUT, RecordType.DEL):
+            self._check_operation(record)
+        else:
+            raise ValueError(f"unsupported record type: {record.record_type}")
+
+    def _check_operation(self, record: WALRecord) -> None:
+        if not isinstance(record.key, str):
+            raise TypeError("key must be a str")
+        if not record.key:
+            raise ValueError("key cannot be empty")
+        if record.key in self._reserved_keys:
+            raise ValueError("key is reserved")
+        if record.record_type == RecordType.PUT and not isinstance(record.value, str):
+            raise TypeError("value must be a str")
+
+    def set_replication(self, replication) -> None:
+        """커밋마다 복제 leader에게 알린다 (None이면 해제)
+
+        - replication.publish(entries): 커밋 직후 store 락 안에서 (LSN 순서 그대로) 호출
+          entries는 [(시작 LSN, 끝 LSN, 레코드)]
+        - replication.wait(end_lsn): store 락을 놓은 뒤 호출. ack 모드에 따라 follower 응답을 기다린다
+        - replication.reserved_keys: follower 쪽에서 쓰는 예약 key. 이 store에 쓰면 ValueError
+        """
         with self._lock:
-            if not key:
-                raise ValueError("key cannot be empty")
+            self._replication = replication
+            self._reserved_keys = frozenset() if replication is None else frozenset(replication.reserved_keys)
+
+    def wal_entries(self, start_lsn: int, end_lsn: int) -> Iterator[tuple[int, int, WALRecord]]:
+        """디스크에 남아 있는 WAL에서 [start_lsn, end_lsn) 레코드를 (시작 LSN, 끝 LSN, 레코드)로 읽는다
 
+        체크포인트가 이미 지운 구간은 나오지 않으므로, 첫 레코드가 start_lsn인지는 호출자가 확인한다.
+        """
+        if self._wal.direct_io:
+            # sync 전의 레코드는 아직 파일에 없고 WAL 버퍼에만 있다
+            self.wait_durable(end_lsn)
+        for lsn, end, record in SegmentedWAL.read_entries(self._data_dir, start_lsn=start_lsn):
+            if lsn >= end_lsn:
+                return
+            yield lsn, end, record
+
+    # 없는 key와 지워진 key는 모두 TOMBSTONE
+    def _read(self, key: str) -> object:
+        active, frozen, tables = self._read_view
+        value = active.get(key, _MISSING)
+        if value is _MISSING and frozen is not None:
+            value = frozen.get(key, _MISSING)
+        if value is _MISSING:
+            for table in tables:
+                value = table.get(key, _MISSING)
+                if value is not _MISSING:
+                    break
+        return TOMBSTONE if value is _MISSING else value
+
+    # tombstone을 걸러내지 않은 병합 결과
+    def _scan(self, start: str | None, end: str | None, reverse: bool) -> Iterator[tuple[str, object]]:
+        active, frozen, tables = self._read_view
+        sources = [active] if frozen is None else [active, frozen]
+        sources.extend(tables)
+        if len(sources) == 1:
+            return active.scan(start, end, reverse)
+        return merge_scans([source.scan(start, end, reverse) for source in sources], reverse)
+
+    @property
+    def lsn(self) -> int:
+        """다음 쓰기가 받을 LSN. 이미 커밋된 모든 쓰기의 LSN은 이보다 작다"""
+        return self._wal.end_lsn
+
+    def snapshot(self) -> Snapshot:
+        """지금 시점의 일관된 읽기 뷰를 반환한다 (쓰기는 멈추지 않음)
+
+        스냅샷의 get/scan/prefix는 이후의 쓰기와 무관하게 이 시점(LSN) 상태를 보여준다.
+        다 쓰면 release() 하거나 with 블록으로 써야 붙잡아 둔 이전 값이 정리된다.
+        """
+        with self._lock:
+            lsn = self._wal.end_lsn
+            self._versions.acquire(lsn)
+        return Snapshot(lsn, self._versions, self._read, self._scan, self._release_snapshot)
+
+    def snapshot_stats(self) -> dict[str, int]:
+        """살아 있는 스냅샷 수와 그들을 위해 보관 중인 이전 값 수"""
+        return {"snapshots": self._versions.snapshot_count, "versions": len(self._versions)}
+
+    def _release_snapshot(self, snapshot: Snapshot) -> None:
+        with self._lock:
+            dropped = self._versions.release(snapshot.lsn)
+            # 스냅샷 때문에 남겨 둔 tombstone은 더 가릴 것이 없으면 지운다 (_apply_record의 DEL 참고)
+            if self._frozen_data is None and not self._lsm:
+                for key in dropped:
+                    if self._store_data.get(key) is TOMBSTONE:
+                        del self._store_data[key]
+
+    def delete(self, key: str) -> None:
+        if not key:
+            raise ValueError("key cannot be empty")
+
+        self._write(WALRecord(RecordType.DEL, key))
+
+    def table_stats(self) -> dict[str, int]:
+        """SSTable 조회 카운터 (Bloom filter가 걸러낸 조회 수, 거짓 양성 수, 읽은 블록 수 등)"""
+        stats = self._table_stats.to_dict()
+        stats["tables"] = len(self._tables)
+        return stats
+
+    def stats(self) -> dict:
+        """계측 스냅샷: 쓰기 카운터, (켰으면) 단계별 지연, LSN, 테이블/컴팩션/스냅샷/블록 캐시 통계
+
+        - commits, records, wal_bytes, fsyncs, checkpoints: 프로세스 시작 이후 누적
+        - latency_us: latency_metrics=True일 때만. 단계별 {count, sum, min, max, mean, p50, p90, p99, p999} (µs)
+          lock_wait, append, flush, fsync, apply, commit(락 대기부터 적용까지), checkpoint
+        - batch_records: latency_metrics=True일 때만. 커밋 한 번에 묶인 레코드 수 분포
+
+        Prometheus로 내보내려면 metrics.render_prometheus(store.stats()) 또는 PrometheusExporter(store.stats)
+        """
+        with self._lock:
+            stats = self._metrics.to_dict()
+            stats["lsn"] = self._wal.end_lsn
+            stats["durable_lsn"] = self._durable_lsn
+            stats["checkpoint_lsn"] = self._checkpoint_lsn
+            stats["memtable_bytes"] = self._memtable_bytes
+        stats["tables"] = self.table_stats()
+        stats["compaction"] = self.compaction_stats()
+        stats["snapshots"] = self.snapshot_stats()
+        if self._block_cache is not None:
+            stats["block_cache"] = self._block_cache.stats()
+        return stats
+
+    def compaction_stats(self) -> dict[str, float]:
+        """컴팩션 횟수와 누적 바이트, 쓰기 증폭 (프로세스 시작 이후)"""
+        return self._compaction_stats.to_dict()
+
+    def write_batch(self, operations: Iterable[WALRecord] | None = None) -> WriteBatch:
+        """여러 PUT/DEL을 WAL 레코드 하나 + sync 한 번으로 원자적으로 커밋한다
+
+        - operations를 넘기면 바로 커밋하고 커밋된 배치를 반환한다
+        - 넘기지 않으면 컨텍스트 매니저로 쓸 배치를 반환한다 (with 블록 종료 시 커밋)
+        """
+        batch = WriteBatch(self._write)
+        if operations is not None:
+            for record in operations:
+                batch.add(record)
+            batch.commit()
+        return batch
+
+    def _write(self, record: WALRecord) -> None:
+        self.check_record(record)
+        if self._group_committer:
+            self._group_committer.submit(record)
+        else:
+            self._commit_records([record])
+
+    # 레코드 묶음을 append한 뒤 한 번만 sync 하고, 커밋된 순서(= WAL 순서)대로 메모리에 반영
+    # sync 실패 시 묶음 전체를 rollback 해서 WAL에 흔적을 남기지 않는다
+    def _commit_records(self, records: list[WALRecord]) -> None:
+        # 빈 묶음은 락도 잡지 않고 WAL에 아무것도 남기지 않는다
+        if not records:
+            return
+        metrics = self._metrics
+        started = time.perf_counter_ns() if metrics.latency else 0
+        with self._lock:
+            if metrics.latency:
+                metrics.lock_acquired(started)
+            self._check_sync_error()
+            offset = None
+            lsns = []
             try:
-                offset = self._wal.append(WALRecord(RecordType.PUT, key, value))
-                self._wal.sync()
+                for record in records:
+                    lsns.append(self._wal.append(record))
+                    if offset is None:
+                        offset = lsns[0]
+                if self._durability == Durability.ALWAYS:
+                    self._wal.sync()
+                else:
+                    self._wal.flush()
             except Exception:
-                self._wal.rollback(offset)
+                if offset is not None:
+                    self._wal.rollback(offset)
                 raise
 
-            self._store_data[key] = value
+            applied_bytes = self._memtable_bytes
+            for record, lsn in zip(records, lsns):
+                self._apply_record(record, lsn)
+            self._compaction_stats.user_bytes += self._memtable_bytes - applied_bytes
+            self._compaction_stats.wal_bytes += self._wal.end_lsn - offset
+            metrics.committed(len(records), self._wal.end_lsn - offset, started)
 
-    def get(self, key: str) -> str | None:
-        return self._store_data.get(key, None)
+            if self._durability == Durability.ALWAYS:
+                self._durable_lsn = self._wal.end_lsn
+            elif (
+                self._sync_thread is not None
+                and self._sync_interval_bytes is not None
+                and self._wal.end_lsn - self._durable_lsn >= self._sync_interval_bytes
+            ):
+                self._sync_wakeup.set()
 
-    # 매번 sync 하기 때문에 비효율적이긴 함 (학습 차원 허용. 실제로는 bulk나 다른 방안 고려 필요함)
-    def delete(self, key: str) -> None:
-        with self._lock:
-            if not key:
-                raise ValueError("key cannot be empty")
+            if self._checkpoint_threshold_reached():
+                self._checkpoint_wakeup.set()
+
+            replication = self._replication
+            if replication is not None:
+                ends = lsns[1:] + [self._wal.end_lsn]
+                replication.publish(list(zip(lsns, ends, records)))
+
+        # 복제 ack는 store 락 밖에서 기다린다 (다른 쓰기는 계속 커밋되고 스트림에 실림)
+        if replication is not None:
+            replication.wait(ends[-1])
+
+    @property
+    def durability(self) -> Durability:
+        return self._durability
+
+    @property
+    def durable_lsn(self) -> int:
+        """이 LSN 이전의 WAL은 fsync가 끝났다 (ALWAYS 모드에서는 커밋된 전부)"""
+        return self._durable_lsn
+
+    def wait_durable(self, lsn: int | None = None, timeout: float | None = None) -> bool:
+        """lsn 이전에 커밋된 쓰기가 fsync 될 때까지 기다린다 (None이면 지금까지 커밋된 전부). 시간 초과면 False
+
+        - ALWAYS: 커밋이 이미 fsync 했으므로 바로 반환
+        - INTERVAL: 다음 주기를 기다리지 않고 백그라운드 sync를 바로 깨운다 (동시에 기다리는 호출은 fsync 한 번으로 묶임)
+        - NONE: 호출한 스레드에서 fsync 한다
 
-            self._wal.append(WALRecord(RecordType.DEL, key))
-            self._wal.sync()
-            self._store_data.pop(key, None)
+        백그라운드 fsync가 실패했으면 OSError를 올린다.
+        """
+        if lsn is None:
+            lsn = self.lsn
+        if self._durability == Durability.NONE:
+            if lsn > self._durable_lsn:
+                self._sync_wal()
+            return True
+
+        with self._durable:
+            # ALWAYS: 락을 잡았다는 것은 진행 중이던 커밋(과 그 fsync)이 끝났다는 뜻
+            if self._durability == Durability.ALWAYS or self._durable_lsn >= lsn:
+                return True
+            self._check_sync_error()
+            self._sync_wakeup.set()
+            done = self._durable.wait_for(
+                lambda: self._durable_lsn >= lsn or self._sync_error is not None, timeout=timeout
+            )
+            if self._durable_lsn >= lsn:
+                return True
+            self._check_sync_error()
+            return done
+
+    # 커밋되어 flush 된 WAL을 fsync 하고 _durable_lsn을 올린다
+    # fsync 하는 동안에도 다른 쓰기는 계속 커밋된다 (복제한 fd로 store 락 밖에서 fsync)
+    def _sync_wal(self) -> None:
+        with self._sync_lock:
+            with self._lock:
+                self._check_sync_error()
+                lsn = self._wal.end_lsn
+                if lsn <= self._durable_lsn:
+                    return
+                sync = self._wal.detach_sync()
+
+            started = time.perf_counter_ns()
+            try:
+                sync()
+            except OSError as e:
+                with self._lock:
+                    self._sync_error = e
+                    self._durable.notify_all()
+                raise
+
+            with self._lock:
+                self._metrics.synced(started)
+                self._advance_durable(lsn)
+
+    def _sync_loop(self) -> None:
+        while not self._checkpoint_stop.is_set():
+            self._sync_wakeup.wait(self._sync_interval_seconds)
+            self._sync_wakeup.clear()
+            try:
+                self._sync_wal()
+            except OSError:
+                # fsync가 실패하면 커널이 더티 페이지를 버렸을 수 있어 다시 시도해도 믿을 수 없다
+                # 이후 쓰기와 wait_durable은 모두 실패한다 (_check_sync_error)
+                return
+
+    # self._lock을 잡은 상태에서 호출
+    def _advance_durable(self, lsn: int) -> None:
+        if lsn > self._durable_lsn:
+            self._durable_lsn = lsn
+            self._durable.notify_all()
+
+    # self._lock을 잡은 상태에서 호출
+    def _check_sync_error(self) -> None:
+        if self._sync_error is not None:
+            raise OSError("background WAL fsync failed; reopen the store") from self._sync_error
+
+    # lsn은 커밋 경로에서만 넘어온다 (복구 중에는 스냅샷이 없음)
+    def _apply_record(self, record: WALRecord, lsn: int | None = None) -> None:
+        if record.record_type == RecordType.BATCH:
+            for sub_record in record.records:
+                self._apply_record(sub_record, lsn)
+            return
+        # 값이 없는 PUT은 검증이 없던 시절에 WAL에 남았을 수 있다. 복구가 막히지 않도록 건너뛴다
+        if record.record_type == RecordType.PUT and not isinstance(record.value, str):
+            return
+        if lsn is not None and self._versions.active:
+            # 바꾸기 전에 이전 값을 남겨야 락 없이 읽는 스냅샷이 중간 상태를 보지 않는다
+            self._versions.record(record.key, lsn, self._read)
+        if record.record_type == RecordType.PUT:
+            self._store_data[record.key] = record.value
+            self._memtable_bytes += len(record.key) + len(record.value)
+        if record.record_type == RecordType.DEL:
+            # 더 오래된 데이터(스냅샷, SSTable)에 값이 있을 수 있으면 tombstone으로 가린다
+            # 시점 스냅샷이 살아 있을 때도 남겨 둔다. 진행 중인 스냅샷 scan이 이미 모아 둔 key를 놓치지 않도록
+            if self._frozen_data is None and not self._lsm and not self._versions.active:
+                self._store_data.pop(record.key, None)
+            else:
+                self._store_data[record.key] = TOMBSTONE
+            self._memtable_bytes += len(record.key)
 
     # 체크포인트가 없어도 복구 자체는 가능함
     # 하지만 이런 정리 작업이 없으면 로그 데이터가 무한정 늘어나기 때문에 효율을 위한 스냅샷을 남김
-    # 이 외에도 분산 처리하건 오래된 로그를 날리건 다른 방법은 얼마든지 존재함. 추가로 고민할 거리
+    # 체크포인트 시점에 새 세그먼트로 롤링하고, 체크포인트가 커버하는 이전 세그먼트는 통째로 삭제
+    #
+    # 쓰기를 막는 구간은 롤링 + 스냅샷 교체, 그리고 마지막 병합뿐이고
+    # 직렬화/fsync/rename은 store 락 없이 수행한다
+    #
+    # LSM 모드에서는 전체 상태 대신 memtable만 새 SSTable로 flush 하고 memtable을 비운다
     def checkpoint(self) -> None:
-        with self._lock:
-            with open(self._checkpoint_tmp_path, "w") as f:
-                f.write(json.dumps(self._store_data))
-                f.flush
-                os.fsync(f.fileno())
-            
+        with self._checkpoint_lock:
+            started = time.perf_counter_ns()
+            with self._lock:
+                self._metrics.start()
+                checkpoint_lsn = self._wal.roll()
+                # 롤링은 이전 세그먼트를 sync 하므로 여기까지는 내구성 있음
+                self._advance_durable(checkpoint_lsn)
+                snapshot = self._freeze()
+
             try:
-                # 굳이 왜 rename을 하드라..?
-                # 원자성 때문이었나..? 파일 쓰던 도중에 죽으면 안되니까..?
-                # 쓰던 중에는 무조건 tmp고 완전히 적힌 파일만 체크포인트로 취급하기 위해서였나..?
-                os.rename(self._checkpoint_tmp_path,  self._checkpoint_path)
+                if self._lsm:
+                    self._flush_memtable(snapshot, checkpoint_lsn)
+                else:
+                    self._write_checkpoint(snapshot, checkpoint_lsn)
             except Exception:
-                self._checkpoint_tmp_path.unlink(missing_ok=True)
+                with self._lock:
+                    self._unfreeze()
                 raise
 
-            if self._wal:
-                self._wal.rollback(0)
+            if self._lsm:
+                with self._manifest_lock, self._lock:
+                    self._drop_frozen()
+                self._compaction_wakeup.set()
 
-    def close(self) -> None:
+            with self._lock:
+                if not self._lsm:
+                    self._unfreeze()
+                # 여기서 크래시가 나도 이전 세그먼트 replay는 멱등하므로 안전
+                self._wal.truncate_before(checkpoint_lsn)
+                self._checkpoint_lsn = checkpoint_lsn
+                self._last_checkpoint_time = time.monotonic()
+                self._metrics.checkpointed(started)
+
+            # 지운 세그먼트를 다음 롤링에 쓰도록 0으로 채운다 (세그먼트 크기만큼 쓰므로 store 락 밖에서)
+            self._wal.recycle()
+
+    # self._lock을 잡은 상태에서 호출
+    # 현재 memtable을 스냅샷으로 고정하고 이후 쓰기는 새 memtable(delta)에 쌓는다 (복사 없음)
+    def _freeze(self) -> MemTable:
+        snapshot = self._store_data
+        self._frozen_data = snapshot
+        self._store_data = self._memtable_factory()
+        self._read_view = (self._store_data, snapshot, self._tables)
+        self._frozen_bytes, self._memtable_bytes = self._memtable_bytes, 0
+        return snapshot
+
+    # self._lock을 잡은 상태에서 호출
+    # 체크포인트 동안 쌓인 delta를 스냅샷에 병합 (delta 크기만큼만 락을 잡음)
+    def _unfreeze(self) -> None:
+        snapshot, delta = self._frozen_data, self._store_data
+        for key, value in delta.items():
+            # LSM 모드에서는 SSTable의 값을 가려야 하므로 tombstone을 그대로 둔다
+            if value is TOMBSTONE and not self._lsm:
+                snapshot.pop(key, None)
+            else:
+                snapshot[key] = value
+
+        self._store_data = snapshot
+        self._frozen_data = None
+        self._read_view = (snapshot, None, self._tables)
+        self._memtable_bytes += self._frozen_bytes
+        self._frozen_bytes = 0
+
+    # self._manifest_lock, self._lock을 잡은 상태에서 호출
+    # flush가 끝난 스냅샷을 버린다 (그 내용은 이미 테이블로 읽기 경로에 들어가 있음)
+    def _drop_frozen(self) -> None:
+        self._frozen_data = None
+        self._frozen_bytes = 0
+        self._refresh_tables()
+
+    # self._manifest_lock, self._lock을 잡은 상태에서 호출
+    # manifest의 조회 순서대로 테이블 리더를 읽기 경로에 넣는다
+    def _refresh_tables(self) -> None:
+        self._tables = tuple(self._table_readers[table.table_id] for table in self._manifest.read_order())
+        self._read_view = (self._store_data, self._frozen_data, self._tables)
+
+    def _allocate_table_id(self) -> int:
+        with self._manifest_lock:
+            return self._manifest.allocate_table_id()
+
+    # 스냅샷을 새 SSTable로 쓰고 manifest에 등록한다 (store 락 없이 호출)
+    # manifest에 기록된 뒤에야 테이블이 유효하므로, 도중에 크래시가 나면 WAL replay로 다시 만들어진다
+    def _flush_memtable(self, snapshot: MemTable, flush_lsn: int) -> None:
+        meta = table = None
+        if len(snapshot) > 0:
+            table_id = self._allocate_table_id()
+            path = self._data_dir / table_file_name(table_id)
+            tmp_path = path.with_name(path.name + ".tmp")
+            info = write_sstable(tmp_path, snapshot.scan(), self._sstable_block_size, self._bloom_bits_per_key)
+            os.rename(tmp_path, path)
+            meta = TableMeta(table_id, info.count, info.size, info.min_key, info.max_key)
+            table = SSTable(path, self._table_stats, self._block_cache)
+            self._compaction_stats.flush_bytes += info.size
+
+        with self._manifest_lock:
+            manifest = self._manifest
+            tables = manifest.tables + ([meta] if meta is not None else [])
+            # 새 manifest가 rename 되는 순간이 flush의 커밋 지점 (save가 디렉터리까지 fsync)
+            new_manifest = Manifest(tables, flush_lsn, manifest.next_table_id)
+            new_manifest.save(self._data_dir)
+            self._manifest = new_manifest
+            if table is not None:
+                self._table_readers[meta.table_id] = table
+            with self._lock:
+                self._refresh_tables()
+
+        # LSM 모드로 처음 열기 전의 체크포인트 내용은 이제 테이블에 들어 있음
+        self._checkpoint_path.unlink(missing_ok=True)
+        self._legacy_checkpoint_path.unlink(missing_ok=True)
+
+    def compact(self) -> int:
+        """전략이 더 할 일이 없다고 할 때까지 컴팩션을 수행하고 수행 횟수를 반환 (LSM 모드 전용)"""
+        if not self._lsm or self._compaction_strategy is None:
+            raise RuntimeError("compaction requires LSM mode and a compaction strategy")
+        count = 0
+        while self._compact_once():
+            count += 1
+        return count
+
+    # 입력 선택과 결과 등록만 manifest 락 안에서 하고, 병합/쓰기는 락 없이 수행
+    # 결과 테이블은 manifest에 기록된 뒤에야 유효하므로, 도중에 크래시가 나면 입력 테이블이 그대로 남는다
+    def _compact_once(self) -> bool:
+        with self._compaction_lock:
+            with self._manifest_lock:
+                manifest = self._manifest
+                task = self._compaction_strategy.pick(manifest.tables)
+                if task is None:
+                    return False
+                input_ids = {table.table_id for table in task.inputs}
+                readers = {table_id: self._table_readers[table_id] for table_id in input_ids}
+                # 입력 중 가장 최신 것보다 조회 순서가 뒤인 (= 더 오래된) 테이블
+                order = manifest.read_order()
+                first_input = min(i for i, table in enumerate(order) if table.table_id in input_ids)
+                older_tables = [table for table in order[first_input:] if table.table_id not in input_ids]
+
+            outputs = run_compaction(
+                self._data_dir,
+                task,
+                readers,
+                older_tables,
+                self._allocate_table_id,
+                self._sstable_block_size,
+                self._bloom_bits_per_key,
+                self._compaction_rate_limiter,
+            )
+
+            with self._manifest_lock:
+                manifest = self._manifest
+                tables = [table for table in manifest.tables if table.table_id not in input_ids] + outputs
+                new_manifest = Manifest(tables, manifest.lsn, manifest.next_table_id)
+                new_manifest.save(self._data_dir)
+                self._manifest = new_manifest
+                for meta in outputs:
+                    self._table_readers[meta.table_id] = SSTable(
+                        self._data_dir / meta.file_name, self._table_stats, self._block_cache
+                    )
+                for table_id in input_ids:
+                    del self._table_readers[table_id]
+                with self._lock:
+                    self._refresh_tables()
+
+            # 진행 중인 조회가 들고 있는 리더는 unlink 이후에도 열린 fd로 계속 읽을 수 있음
+            for table in task.inputs:
+                (self._data_dir / table.file_name).unlink(missing_ok=True)
+
+            self._compaction_stats.compactions += 1
+            self._compaction_stats.compaction_read_bytes += sum(table.size for table in task.inputs)
+            self._compaction_stats.compaction_write_bytes += sum(table.size for table in outputs)
+            return True
+
+    def _compaction_loop(self) -> None:
+        while not self._checkpoint_stop.is_set():
+            self._compaction_wakeup.wait()
+            self._compaction_wakeup.clear()
+            if self._checkpoint_stop.is_set():
+                return
+
+            try:
+                self._compaction_error = None
+                while not self._checkpoint_stop.is_set() and self._compact_once():
+                    pass
+            except Exception as e:
+                # 다음 flush 때 다시 시도. 실패 원인은 확인할 수 있게 남겨둔다
+                self._compaction_error = e
+
+    def _write_checkpoint(self, snapshot: MemTable, checkpoint_lsn: int) -> None:
+        write_checkpoint(self._checkpoint_tmp_path, snapshot, checkpoint_lsn)
+
+        try:
+            # 쓰던 중에는 무조건 tmp고 완전히 적힌 파일만 체크포인트로 취급하기 위해 rename (원자적)
+            os.rename(self._checkpoint_tmp_path,  self._checkpoint_path)
+        except Exception:
+            self._checkpoint_tmp_path.unlink(missing_ok=True)
+            raise
+        self._legacy_checkpoint_path.unlink(missing_ok=True)
+        fsync_dir(self._data_dir)
+
+    def _wal_bytes_since_checkpoint(self) -> int:
+        return self._wal.end_lsn - self._checkpoint_lsn
+
+    # self._lock을 잡은 상태에서 호출
+    def _checkpoint_threshold_reached(self) -> bool:
+        if self._checkpoint_wal_bytes is not None and self._wal_bytes_since_checkpoint() >= self._checkpoint_wal_bytes:
+            return True
+        if self._memtable_flush_bytes is not None and self._memtable_bytes >= self._memtable_flush_bytes:
+            return True
+        return False
+
+    def _checkpoint_due(self) -> bool:
         with self._lock:
-            self._wal.close()
+            if self._checkpoint_threshold_reached():
+                return True
+        if self._checkpoint_interval_seconds is not None:
+            if time.monotonic() - self._last_checkpoint_time >= self._checkpoint_interval_seconds:
+                return True
+        return False
+
+    def _checkpoint_loop(self) -> None:
+        while not self._checkpoint_stop.is_set():
+            timeout = None
+            if self._checkpoint_interval_seconds is not None:
+                elapsed = time.monotonic() - self._last_checkpoint_time
+                timeout = max(self._checkpoint_interval_seconds - elapsed, 0)
+            self._checkpoint_wakeup.wait(timeout)
+            self._checkpoint_wakeup.clear()
+
+            if self._checkpoint_stop.is_set():
+                return
+            if not self._checkpoint_due():
+                continue
+
+            try:
+                self._checkpoint_error = None
+                self.checkpoint()
+            except Exception as e:
+                # 다음 트리거에서 다시 시도. 실패 원인은 확인할 수 있게 남겨둔다
+                self._checkpoint_error = e
+                self._last_checkpoint_time = time.monotonic()
+
+    def close(self) -> None:
+        self._checkpoint_stop.set()
+        if self._checkpoint_thread is not None:
+            self._checkpoint_wakeup.set()
+            self._checkpoint_thread.join()
+        if self._compaction_thread is not None:
+            self._compaction_wakeup.set()
+            self._compaction_thread.join()
+        if self._sync_thread is not None:
+            self._sync_wakeup.set()
+            self._sync_thread.join()
+
+        try:
+            # 정상 종료에서는 어느 모드든 커밋된 쓰기가 모두 디스크에 남는다
+            if self._durability != Durability.ALWAYS and self._sync_error is None:
+                self._sync_wal()
+        finally:
+            with self._lock:
+                self._wal.close()
+                for table in self._tables:
+                    table.close()
@@ -0,0 +1,131 @@
+"""SSTable 목록을 기록하는 manifest
+
+manifest.json 하나에 현재 유효한 테이블 목록과, 테이블들이 커버하는 WAL 위치(LSN)를 둔다.
+- 테이블 파일은 manifest에 기록된 뒤에야 유효하다. 목록에 없는 sst 파일은 쓰다 만 파일이므로 지워도 된다
+- 교체는 tmp에 쓰고 fsync 후 rename (체크포인트와 같은 방식)
+"""
+import json
+import os
+
+from pathlib import Path
+
+from src.segmented_wal import fsync_dir
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+TABLE_PREFIX = "sst-"
+TABLE_SUFFIX = ".sst"
+
+
+def table_file_name(table_id: int) -> str:
+    return f"{TABLE_PREFIX}{table_id:06d}{TABLE_SUFFIX}"
+
+
+class TableMeta:
+    """manifest에 기록되는 SSTable 하나의 정보
+
+    - level: flush 결과는 0. leveled 컴팩션은 아래 레벨로 내려 보낸다
+    - seq: 데이터의 최신 정도. flush는 table_id, 컴팩션 결과는 입력 중 가장 큰 seq를 물려받는다
+    """
+
+    def __init__(
+        self,
+        table_id: int,
+        count: int,
+        size: int,
+        min_key: str | None,
+        max_key: str | None,
+        level: int = 0,
+        seq: int | None = None,
+    ):
+        self.table_id = table_id
+        self.count = count
+        self.size = size
+        self.min_key = min_key
+        self.max_key = max_key
+        self.level = level
+        self.seq = table_id if seq is None else seq
+
+    def overlaps(self, min_key: str | None, max_key: str | None) -> bool:
+        if self.min_key is None or min_key is None:
+            return False
+        return self.min_key <= max_key and min_key <= self.max_key
+
+    @property
+    def file_name(self) -> str:
+        return table_file_name(self.table_id)
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.table_id,
+            "count": self.count,
+            "size": self.size,
+            "min_key": self.min_key,
+            "max_key": self.max_key,
+            "level": self.level,
+            "seq": self.seq,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "TableMeta":
+        return cls(
+            data["id"], data["count"], data["size"], data["min_key"], data["max_key"],
+            level=data.get("level", 0), seq=data.get("seq"),
+        )
+
+
+class Manifest:
+    """tables: 유효한 테이블 목록 (조회 순서는 read_order). lsn: 이 LSN 이전 WAL 레코드는 모두 테이블에 반영됨"""
+
+    def __init__(self, tables: list[TableMeta] | None = None, lsn: int = 0, next_table_id: int = 1):
+        self.tables = tables or []
+        self.lsn = lsn
+        self.next_table_id = next_table_id
+
+    def read_order(self) -> list[TableMeta]:
+        """조회 순서: 얕은 레벨부터, 같은 레벨 안에서는 최신(seq 큰) 것부터"""
+        return sorted(self.tables, key=lambda table: (table.level, -table.seq))
+
+    def allocate_table_id(self) -> int:
+        table_id = self.next_table_id
+        self.next_table_id += 1
+        return table_id
+
+    @classmethod
+    def load(cls, directory: Path) -> "Manifest | None":
+        """manifest가 없으면 None"""
+        path = Path(directory) / MANIFEST_NAME
+        if not path.exists():
+            return None
+        with open(path, "r") as f:
+            data = json.load(f)
+        if data.get("version") != MANIFEST_VERSION:
+            raise ValueError(f"unsupported manifest version: {data.get('version')}")
+        return cls(
+            tables=[TableMeta.from_dict(table) for table in data["tables"]],
+            lsn=data["lsn"],
+            next_table_id=data["next_table_id"],
+        )
+
+    def save(self, directory: Path) -> None:
+        directory = Path(directory)
+        tmp_path = directory / (MANIFEST_NAME + ".tmp")
+        data = {
+            "version": MANIFEST_VERSION,
+            "lsn": self.lsn,
+            "next_table_id": self.next_table_id,
+            "tables": [table.to_dict() for table in self.tables],
+        }
+        with open(tmp_path, "w") as f:
+            json.dump(data, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.rename(tmp_path, directory / MANIFEST_NAME)
+        fsync_dir(directory)
+
+    def remove_orphan_tables(self, directory: Path) -> None:
+        """manifest에 없는 sst 파일(쓰다 만 flush 결과 등)을 지운다"""
+        live = {table.file_name for table in self.tables}
+        for path in Path(directory).glob(f"{TABLE_PREFIX}*{TABLE_SUFFIX}*"):
+            if path.name not in live:
+                path.unlink(missing_ok=True)
@@ -0,0 +1,179 @@
+"""교체 가능한 memtable 구현
+
+KVStore는 memtable_factory로 만든 memtable에 최신 상태를 들고 있는다.
+- DictMemTable: 기존 dict 그대로. 점 조회가 가장 빠르지만 범위 조회는 전체 key 정렬이 필요
+- SortedMemTable: 정렬된 key 배열 + 정렬 안 된 신규 key(delta). 범위 조회가 bisect로 시작 위치를 찾음
+
+공통 인터페이스 (MutableMapping + 범위 조회):
+    scan(start, end, reverse) -> (key, value) 제너레이터   start 이상, end 미만, None이면 무한
+    prefix(p, reverse)        -> p로 시작하는 key만 scan
+
+쓰기는 호출자(KVStore)가 직렬화한다. 범위 조회는 쓰기와 동시에 돌 수 있으며
+시작 시점의 key 목록을 따라가면서 값은 읽는 순간의 최신 값을 본다 (도중에 지워진 key는 건너뜀).
+"""
+import bisect
+import heapq
+import threading
+
+from collections.abc import Iterable, Iterator, MutableMapping
+
+_MISSING = object()
+
+# 삭제 표시. 값 대신 저장되어 더 오래된 데이터(체크포인트 스냅샷, SSTable)의 값을 가린다
+TOMBSTONE = object()
+
+
+def prefix_end(prefix: str) -> str | None:
+    """prefix로 시작하는 모든 문자열보다 큰 가장 작은 문자열 (없으면 None)"""
+    # 마지막 문자가 코드포인트 최댓값이면 그 문자를 떼고 앞 문자를 올림
+    stripped = prefix.rstrip(chr(0x10FFFF))
+    if not stripped:
+        return None
+    return stripped[:-1] + chr(ord(stripped[-1]) + 1)
+
+
+def merge_scans(sources: list[Iterable[tuple[str, object]]], reverse: bool = False) -> Iterator[tuple[str, object]]:
+    """key 순으로 정렬된 여러 (key, value) 스트림을 하나로 합친다
+
+    같은 key가 여러 소스에 있으면 앞쪽(더 최신) 소스의 값만 내보낸다.
+    삭제 표시(tombstone) 같은 값은 그대로 내보내므로 걸러내는 것은 호출자 몫.
+    """
+    tagged = [((key, index, value) for key, value in source) for index, source in enumerate(sources)]
+    if reverse:
+        # key 내림차순, 같은 key 안에서는 소스 번호 오름차순
+        merged = heapq.merge(*tagged, key=lambda entry: (entry[0], -entry[1]), reverse=True)
+    else:
+        merged = heapq.merge(*tagged, key=lambda entry: (entry[0], entry[1]))
+
+    last_key = _MISSING
+    for key, _, value in merged:
+        if key == last_key:
+            continue
+        last_key = key
+        yield key, value
+
+
+class MemTable(MutableMapping):
+    """memtable 공통 인터페이스"""
+
+    def scan(self, start: str | None = None, end: str | None = None, reverse: bool = False) -> Iterator[tuple[str, object]]:
+        raise NotImplementedError
+
+    def prefix(self, prefix: str, reverse: bool = False) -> Iterator[tuple[str, object]]:
+        return self.scan(prefix, prefix_end(prefix), reverse)
+
+
+class DictMemTable(dict, MemTable):
+    """dict 기반 memtable (기본값)
+
+    get/put은 dict 그대로라 가장 빠르다. scan은 호출할 때마다 범위 안의 key를 모아 정렬한다.
+    """
+
+    def scan(self, start: str | None = None, end: str | None = None, reverse: bool = False) -> Iterator[tuple[str, object]]:
+        # list(self)는 GIL 아래에서 한 번에 복사되므로 동시 쓰기로 크기가 바뀌어도 안전
+        keys = [
+            key for key in list(self)
+            if (start is None or key >= start) and (end is None or key < end)
+        ]
+        keys.sort(reverse=reverse)
+        return self._iter_keys(keys)
+
+    def _iter_keys(self, keys: list[str]) -> Iterator[tuple[str, object]]:
+        for key in keys:
+            value = self.get(key, _MISSING)
+            if value is not _MISSING:
+                yield key, value
+
+
+class SortedMemTable(MemTable):
+    """정렬 배열 + delta 기반 memtable
+
+    - 값은 dict에 두므로 get은 DictMemTable과 같은 비용
+    - 새 key는 정렬 배열에 바로 끼우지 않고 delta에 모았다가 다음 scan 때 한 번에 병합
+      (이미 정렬된 배열 + 작은 delta라서 timsort가 거의 선형으로 처리)
+    - 삭제된 key는 배열에 남겨 두고 scan에서 건너뛰다가, 절반 넘게 쌓이면 병합 때 정리
+    - 병합은 배열을 제자리에서 고치지 않고 새 배열로 교체하므로 진행 중인 scan은 영향 받지 않음
+    """
+
+    def __init__(self, items: Iterable[tuple[str, object]] = ()):
+        self._data: dict[str, object] = {}
+        self._keys: list[str] = []
+        self._delta: set[str] = set()
+        self._dead = 0
+        # delta/배열 교체는 쓰기(호출자가 직렬화)와 scan(락 없이 호출됨) 양쪽에서 일어나므로 보호
+        self._index_lock = threading.Lock()
+        self.update(items)
+
+    def __getitem__(self, key: str) -> object:
+        return self._data[key]
+
+    def get(self, key: str, default: object = None) -> object:
+        return self._data.get(key, default)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __iter__(self) -> Iterator[str]:
+        return (key for key, _ in self.scan())
+
+    def __setitem__(self, key: str, value: object) -> None:
+        if key not in self._data:
+            with self._index_lock:
+                if self._in_keys(key):
+                    # 예전에 지워졌던 key가 되살아남
+                    self._dead -= 1
+                else:
+                    self._delta.add(key)
+        self._data[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        del self._data[key]
+        with self._index_lock:
+            if key in self._delta:
+                self._delta.discard(key)
+            else:
+                self._dead += 1
+
+    def pop(self, key: str, default: object = _MISSING) -> object:
+        if key not in self._data:
+            if default is _MISSING:
+                raise KeyError(key)
+            return default
+        value = self._data[key]
+        del self[key]
+        return value
+
+    def scan(self, start: str | None = None, end: str | None = None, reverse: bool = False) -> Iterator[tuple[str, object]]:
+        keys = self._sorted_keys()
+        lo = 0 if start is None else bisect.bisect_left(keys, start)
+        hi = len(keys) if end is None else bisect.bisect_left(keys, end)
+        return self._iter_range(keys, lo, hi, reverse)
+
+    def _iter_range(self, keys: list[str], lo: int, hi: int, reverse: bool) -> Iterator[tuple[str, object]]:
+        data = self._data
+        indexes = range(hi - 1, lo - 1, -1) if reverse else range(lo, hi)
+        for i in indexes:
+            key = keys[i]
+            value = data.get(key, _MISSING)
+            if value is not _MISSING:
+                yield key, value
+
+    def _in_keys(self, key: str) -> bool:
+        keys = self._keys
+        i = bisect.bisect_left(keys, key)
+        return i < len(keys) and keys[i] == key
+
+    def _sorted_keys(self) -> list[str]:
+        with self._index_lock:
+            if self._delta or self._dead * 2 > len(self._keys):
+                keys = self._keys
+                if self._dead:
+                    data = self._data
+                    keys = [key for key in keys if key in data]
+                    self._dead = 0
+                self._keys = sorted(keys + list(self._delta))
+                self._delta = set()
+            return self._keys
@@ -0,0 +1,280 @@
+"""KVStore 쓰기 경로 계측 (카운터, 지연 히스토그램, Prometheus 텍스트 포맷)
+
+- Histogram: HDR 방식 로그-선형 버킷. 2의 거듭제곱 구간마다 32개 버킷이라 상대 오차 약 3% 이내로
+  값 범위와 상관없이 고정 메모리에 기록하고, 기록은 버킷 계산 + 덧셈 한 번이다
+- StoreMetrics: 커밋/레코드/WAL 바이트/fsync/체크포인트 카운터는 항상 센다 (커밋당 정수 덧셈 몇 번).
+  단계별 지연(락 대기, append, flush, fsync, 적용, 커밋 전체, 체크포인트)은 latency=True일 때만 잰다
+- 단계 경계는 WAL의 post_append/post_flush/post_sync 훅으로 잡는다. 사용자 훅은 계측 훅 다음에 호출
+
+기록은 모두 store 락 안에서 일어나므로(커밋, 체크포인트 롤링) 따로 락을 잡지 않는다.
+"""
+
+import threading
+import time
+
+from collections.abc import Callable
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+SUB_BUCKET_BITS = 5
+# 이 값 미만은 값 하나가 버킷 하나 (정확)
+LINEAR_LIMIT = 1 << (SUB_BUCKET_BITS + 1)
+# 2^64 미만 값을 모두 담는 버킷 수
+BUCKET_COUNT = (64 - SUB_BUCKET_BITS) << SUB_BUCKET_BITS
+
+# 단계별 지연 히스토그램 이름 (ns로 기록)
+PHASES = ("lock_wait", "append", "flush", "fsync", "apply", "commit", "checkpoint")
+# 프로세스 시작 이후 단조 증가하는 카운터
+COUNTERS = ("commits", "records", "wal_bytes", "fsyncs", "checkpoints")
+
+
+def bucket_index(value: int) -> int:
+    if value < LINEAR_LIMIT:
+        return value
+    shift = value.bit_length() - SUB_BUCKET_BITS - 1
+    return (shift << SUB_BUCKET_BITS) + (value >> shift)
+
+
+def bucket_upper_bound(index: int) -> int:
+    """버킷에 들어갈 수 있는 가장 큰 값"""
+    if index < LINEAR_LIMIT:
+        return index
+    shift = (index >> SUB_BUCKET_BITS) - 1
+    mantissa = index - (shift << SUB_BUCKET_BITS)
+    return ((mantissa + 1) << shift) - 1
+
+
+class Histogram:
+    """0 이상 정수 값의 분포. 백분위는 버킷 상한으로 답하므로 실제 값보다 작게 보고하지 않는다"""
+
+    def __init__(self):
+        self._counts = [0] * BUCKET_COUNT
+        self.count = 0
+        self.sum = 0
+        self.min = 0
+        self.max = 0
+
+    def record(self, value: int) -> None:
+        if value < 0:
+            value = 0
+        self._counts[bucket_index(value)] += 1
+        if self.count == 0 or value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self.count += 1
+        self.sum += value
+
+    def percentile(self, fraction: float) -> int:
+        if self.count == 0:
+            return 0
+        target = max(1, round(self.count * fraction))
+        seen = 0
+        for index, count in enumerate(self._counts):
+            seen += count
+            if seen >= target:
+                return min(bucket_upper_bound(index), self.max)
+        return self.max
+
+    def summary(self, scale: float = 1) -> dict[str, float]:
+        """개수와 합, 최소/최대/평균, p50/p90/p99/p999 (scale로 나눈 값)"""
+        return {
+            "count": self.count,
+            "sum": self.sum / scale,
+            "min": self.min / scale,
+            "max": self.max / scale,
+            "mean": self.sum / self.count / scale if self.count else 0.0,
+            "p50": self.percentile(0.50) / scale,
+            "p90": self.percentile(0.90) / scale,
+            "p99": self.percentile(0.99) / scale,
+            "p999": self.percentile(0.999) / scale,
+        }
+
+
+def _chain(first: Callable[[], None] | None, second: Callable[[], None] | None) -> Callable[[], None] | None:
+    if first is None:
+        return second
+    if second is None:
+        return first
+
+    def hook() -> None:
+        first()
+        second()
+
+    return hook
+
+
+class StoreMetrics:
+    def __init__(self, latency: bool = False):
+        self.latency = latency
+        self.commits = 0
+        self.records = 0
+        self.wal_bytes = 0
+        self.fsyncs = 0
+        self.checkpoints = 0
+        self.histograms = {phase: Histogram() for phase in PHASES} if latency else {}
+        # 커밋 한 번(그룹 커밋 배치 하나)에 들어간 레코드 수
+        self.batch_records = Histogram() if latency else None
+        # 마지막 단계 경계 시각. 다음 훅이 이 시각부터의 경과를 자기 단계로 기록한다
+        self._mark = 0
+
+    def wal_hooks(
+        self,
+        post_append_hook: Callable[[], None] | None = None,
+        post_flush_hook: Callable[[], None] | None = None,
+        post_sync_hook: Callable[[], None] | None = None,
+    ) -> dict[str, Callable[[], None] | None]:
+        """WAL에 넘길 훅. 지연 계측이 꺼져 있으면 append/flush에는 사용자 훅만 걸린다"""
+        if self.latency:
+            post_append_hook = _chain(self._on_append, post_append_hook)
+            post_flush_hook = _chain(self._on_flush, post_flush_hook)
+        return {
+            "post_append_hook": post_append_hook,
+            "post_flush_hook": post_flush_hook,
+            "post_sync_hook": _chain(self._on_sync, post_sync_hook),
+        }
+
+    def start(self) -> None:
+        """WAL 작업 구간 시작 (체크포인트 롤링처럼 커밋 밖에서 sync 할 때)"""
+        if self.latency:
+            self._mark = time.perf_counter_ns()
+
+    def lock_acquired(self, started: int) -> None:
+        now = time.perf_counter_ns()
+        self.histograms["lock_wait"].record(now - started)
+        self._mark = now
+
+    def committed(self, records: int, wal_bytes: int, started: int) -> None:
+        """커밋이 메모리 적용까지 끝났을 때. started는 락을 기다리기 시작한 시각 (지연 계측이 꺼져 있으면 무시)"""
+        self.commits += 1
+        self.records += records
+        self.wal_bytes += wal_bytes
+        if self.latency:
+            now = time.perf_counter_ns()
+            self.histograms["apply"].record(now - self._mark)
+            self.histograms["commit"].record(now - started)
+            self.batch_records.record(records)
+
+    def synced(self, started: int) -> None:
+        """커밋 밖에서 한 fsync (INTERVAL/NONE 내구성 모드의 백그라운드 sync, wait_durable)"""
+        self.fsyncs += 1
+        if self.latency:
+            self.histograms["fsync"].record(time.perf_counter_ns() - started)
+
+    def checkpointed(self, started: int) -> None:
+        self.checkpoints += 1
+        if self.latency:
+            self.histograms["checkpoint"].record(time.perf_counter_ns() - started)
+
+    def to_dict(self) -> dict:
+        stats = {name: getattr(self, name) for name in COUNTERS}
+        if self.latency:
+            stats["latency_us"] = {phase: histogram.summary(1000) for phase, histogram in self.histograms.items()}
+            stats["batch_records"] = self.batch_records.summary()
+        return stats
+
+    def _on_append(self) -> None:
+        now = time.perf_counter_ns()
+        self.histograms["append"].record(now - self._mark)
+        self._mark = now
+
+    def _on_flush(self) -> None:
+        now = time.perf_counter_ns()
+        self.histograms["flush"].record(now - self._mark)
+        self._mark = now
+
+    def _on_sync(self) -> None:
+        self.fsyncs += 1
+        if self.latency:
+            now = time.perf_counter_ns()
+            self.histograms["fsync"].record(now - self._mark)
+            self._mark = now
+
+
+# --- Prometheus 텍스트 포맷 ---
+
+def _is_summary(value: object) -> bool:
+    return isinstance(value, dict) and "count" in value and "p50" in value
+
+
+def _summary_lines(name: str, summary: dict[str, float], scale: float = 1) -> list[str]:
+    lines = [f"# TYPE {name} summary"]
+    for quantile, key in (("0.5", "p50"), ("0.9", "p90"), ("0.99", "p99"), ("0.999", "p999")):
+        lines.append(f'{name}{{quantile="{quantile}"}} {summary[key] / scale}')
+    lines.append(f"{name}_sum {summary['sum'] / scale}")
+    lines.append(f"{name}_count {summary['count']}")
+    return lines
+
+
+def render_prometheus(stats: dict, namespace: str = "kvstore") -> str:
+    """KVStore.stats() 결과를 Prometheus 텍스트 포맷으로 바꾼다
+
+    카운터는 <name>_total, 지연은 초 단위 summary(<phase>_seconds), 나머지 숫자는 gauge.
+    중첩된 dict는 key를 _로 이어 붙인다.
+    """
+    lines = []
+
+    def walk(prefix: str, value: object) -> None:
+        if isinstance(value, bool) or value is None:
+            return
+        if _is_summary(value):
+            lines.extend(_summary_lines(prefix, value))
+        elif isinstance(value, dict):
+            for key, child in value.items():
+                walk(f"{prefix}_{key}", child)
+        elif isinstance(value, (int, float)):
+            lines.append(f"# TYPE {prefix} gauge")
+            lines.append(f"{prefix} {value}")
+
+    for key, value in stats.items():
+        name = f"{namespace}_{key}"
+        if key in COUNTERS:
+            lines.append(f"# TYPE {name}_total counter")
+            lines.append(f"{name}_total {value}")
+        elif key == "latency_us":
+            for phase, summary in value.items():
+                lines.extend(_summary_lines(f"{namespace}_{phase}_seconds", summary, scale=1_000_000))
+        else:
+            walk(name, value)
+    return "\n".join(lines) + "\n"
+
+
+class PrometheusExporter:
+    """GET /metrics 요청에 stats_fn() 결과를 Prometheus 텍스트 포맷으로 답하는 HTTP 서버 (백그라운드 스레드)
+
+    port 0이면 빈 포트를 고른다. 실제 주소는 address로 확인.
+    """
+
+    def __init__(
+        self,
+        stats_fn: Callable[[], dict],
+        address: tuple[str, int] = ("127.0.0.1", 0),
+        namespace: str = "kvstore",
+    ):
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path.split("?", 1)[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = render_prometheus(stats_fn(), namespace).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer(address, Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name="kv-metrics", daemon=True)
+        self._thread.start()
+
+    @property
+    def address(self) -> tuple[str, int]:
+        return self._server.server_address[:2]
+
+    def close(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
@@ -0,0 +1,183 @@
+"""청크 단위 병렬 WAL replay
+
+순차 replay(SegmentedWAL.read)는 레코드마다 JSON 파싱 + 체크섬 검증을 한 코어에서 수행한다.
+여기서는
+1) 부모 프로세스가 세그먼트를 큰 블록으로 읽어 레코드 경계에서 청크로 자르고
+2) 프로세스 풀이 청크를 디코드/검증한 뒤
+3) 부모가 로그 순서대로 결과를 내보낸다.
+처음 손상된 레코드에서 멈추는 순차 replay의 의미는 그대로 유지한다.
+"""
+import json
+import multiprocessing
+
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+
+from src.segmented_wal import list_segments
+from src.wal import ZERO_BLOCK, detect_format
+from src.wal_record import BINARY_FILE_HEADER, BINARY_HEADER, ChecksumError, RecordType, WALFormat, WALRecord
+
+DEFAULT_CHUNK_SIZE = 4 * 1024 * 1024
+
+_RECORD_TYPES = {record_type.value: record_type for record_type in RecordType}
+
+# 워커 → 부모로 보내는 레코드 표현. WALRecord 객체를 그대로 pickle 하는 것보다 몇 배 빠름
+# (시작 LSN, 끝 LSN, record_type 값, key, value, BATCH 하위 레코드 [(type, key, value)] 또는 None)
+_Entry = tuple[int, int, int, str, str | None, list[tuple[int, str, str | None]] | None]
+
+
+def _to_entry(lsn: int, end: int, record: WALRecord) -> _Entry:
+    sub_records = None
+    if record.records is not None:
+        sub_records = [(r.record_type.value, r.key, r.value) for r in record.records]
+    return lsn, end, record.record_type.value, record.key, record.value, sub_records
+
+
+def _from_entry(entry: _Entry) -> tuple[int, int, WALRecord]:
+    lsn, end, record_type, key, value, sub_records = entry
+    if sub_records is not None:
+        record = WALRecord.batch([WALRecord(_RECORD_TYPES[t], k, v) for t, k, v in sub_records])
+    else:
+        record = WALRecord(_RECORD_TYPES[record_type], key, value)
+    return lsn, end, record
+
+
+def _decode_chunk(
+    wal_format: WALFormat,
+    data: bytes,
+    base_lsn: int,
+    start_lsn: int,
+) -> tuple[list[_Entry], bool]:
+    """청크를 디코드해 (엔트리 목록, 손상 여부)를 반환 (워커 프로세스에서 실행)"""
+    entries = []
+    pos = 0
+    size = len(data)
+
+    while pos < size:
+        if wal_format == WALFormat.BINARY:
+            if size - pos < BINARY_HEADER.size:
+                return entries, True
+            end = pos + int.from_bytes(data[pos:pos + 4], "little")
+            if end - pos < BINARY_HEADER.size or end > size:
+                return entries, True
+            try:
+                record = WALRecord.deserialize_binary(data[pos:end])
+            except (ChecksumError, ValueError):
+                return entries, True
+        else:
+            newline = data.find(b"\n", pos)
+            end = size if newline == -1 else newline + 1
+            line = data[pos:end]
+            if not line.strip():
+                pos = end
+                continue
+            try:
+                record = WALRecord.deserialize(line)
+            except (json.JSONDecodeError, ChecksumError, KeyError, ValueError):
+                return entries, True
+
+        if base_lsn + pos >= start_lsn:
+            entries.append(_to_entry(base_lsn + pos, base_lsn + end, record))
+        pos = end
+
+    return entries, False
+
+
+def _split_chunks(path: Path, wal_format: WALFormat, chunk_size: int) -> Iterator[tuple[int, bytes]]:
+    """세그먼트 파일을 레코드 경계에서 자른 (파일 내 시작 위치, 청크)로 나눈다"""
+    offset = len(BINARY_FILE_HEADER) if wal_format == WALFormat.BINARY else 0
+    carry = b""
+
+    with open(path, "rb") as f:
+        f.seek(offset)
+        while block := f.read(chunk_size):
+            data = carry + block
+            cut = _last_boundary(data, wal_format)
+            if cut > 0:
+                yield offset, data[:cut]
+                offset += cut
+            carry = data[cut:]
+            if wal_format == WALFormat.BINARY and carry[:4] == b"\0\0\0\0" and _rest_is_zero(carry, f):
+                # 미리 할당된 세그먼트의 0으로 채워진 꼬리. 레코드가 더 없다
+                return
+
+    # 끝부분 나머지도 워커가 판단하도록 넘긴다 (불완전 레코드면 손상으로 보고됨)
+    if carry:
+        yield offset, carry
+
+
+def _rest_is_zero(carry: bytes, f) -> bool:
+    """carry와 파일의 나머지가 모두 0인가. 아니면 파일 위치를 되돌린다"""
+    position = f.tell()
+    if carry.count(0) == len(carry):
+        while block := f.read(len(ZERO_BLOCK)):
+            if block != ZERO_BLOCK[:len(block)]:
+                break
+        else:
+            return True
+    f.seek(position)
+    return False
+
+
+def _last_boundary(data: bytes, wal_format: WALFormat) -> int:
+    if wal_format == WALFormat.JSON:
+        return data.rfind(b"\n") + 1
+
+    # 바이너리는 길이 필드만 따라가며 경계를 찾는다 (디코드/검증은 워커 몫)
+    pos = 0
+    while len(data) - pos >= 4:
+        length = int.from_bytes(data[pos:pos + 4], "little")
+        if length < BINARY_HEADER.size or pos + length > len(data):
+            break
+        pos += length
+    return pos
+
+
+def read_entries_parallel(
+    directory: Path,
+    start_lsn: int = 0,
+    workers: int | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[tuple[int, int, WALRecord]]:
+    """SegmentedWAL.read_entries와 같은 결과를 프로세스 풀로 디코드해서 내보낸다"""
+    segments = list_segments(directory)
+    # 워커 몇 개가 돌고 있는 동안만 청크를 미리 읽어 둔다 (메모리 상한)
+    max_in_flight = (workers or multiprocessing.cpu_count()) * 2
+
+    # fork는 다른 스레드가 잡고 있던 락을 복제할 수 있어 spawn 사용
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+        for i, (segment_start, path) in enumerate(segments):
+            next_start = segments[i + 1][0] if i + 1 < len(segments) else None
+            if next_start is not None and next_start <= start_lsn:
+                continue
+
+            wal_format = detect_format(path)
+            if wal_format is None:
+                continue
+
+            in_flight: deque[Future] = deque()
+            chunks = _split_chunks(path, wal_format, chunk_size)
+
+            def fill() -> None:
+                while len(in_flight) < max_in_flight:
+                    chunk = next(chunks, None)
+                    if chunk is None:
+                        return
+                    offset, data = chunk
+                    in_flight.append(
+                        executor.submit(_decode_chunk, wal_format, data, segment_start + offset, start_lsn)
+                    )
+
+            fill()
+            while in_flight:
+                entries, corrupted = in_flight.popleft().result()
+                for entry in entries:
+                    yield _from_entry(entry)
+                if corrupted:
+                    # 손상 지점 이후는 이 세그먼트든 다음 세그먼트든 replay 하지 않음
+                    for future in in_flight:
+                        future.cancel()
+                    return
+                fill()
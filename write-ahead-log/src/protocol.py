@@ -0,0 +1,155 @@
+"""KV 서버/클라이언트 바이너리 프로토콜
+
+요청과 응답은 모두 같은 모양의 프레임이다.
+    body_len(u32) | request_id(u32) | code(u8) | body
+- 요청의 code는 Op, 응답의 code는 Status
+- 응답은 요청 순서대로 오고 request_id를 그대로 돌려준다. 그래서 클라이언트는 응답을 기다리지 않고
+  여러 요청을 연달아 보낼 수 있다 (파이프라이닝)
+
+body는 필드를 순서대로 이어 붙인다.
+- 문자열: len(u32) | utf-8 바이트. len이 NULL_LEN이면 None (WAL 바이너리 프레임과 같은 규칙)
+  key와 PUT의 value는 None일 수 없다. 서버는 store에 닿기 전에 ERROR로 거절한다
+- GET/DELETE: key          PUT: key, value
+- BATCH: count(u32) | (record_type(u8), key, value)*   record_type은 RecordType 값
+- SCAN: start, end, reverse(u8), limit(u32)
+- 응답 GET: value           SCAN: count(u32) | (key, value)* | more(u8)
+- 응답 ERROR: 오류 메시지    그 외 OK 응답은 body가 비어 있다
+"""
+import struct
+
+from enum import IntEnum
+
+from src.wal_record import NULL_VALUE_LEN, RecordType, WALRecord
+
+FRAME_HEADER = struct.Struct("<IIB")
+LENGTH = struct.Struct("<I")
+NULL_LEN = NULL_VALUE_LEN
+# 잘못된 길이 필드로 거대한 버퍼를 잡지 않도록 프레임 크기를 제한
+MAX_FRAME_BODY = 64 * 1024 * 1024
+
+
+class Op(IntEnum):
+    GET = 1
+    PUT = 2
+    DELETE = 3
+    BATCH = 4
+    SCAN = 5
+    PING = 6
+
+
+class Status(IntEnum):
+    OK = 0
+    NOT_FOUND = 1
+    ERROR = 2
+
+
+class ProtocolError(Exception):
+    pass
+
+
+def encode_frame(request_id: int, code: int, body: bytes = b"") -> bytes:
+    if len(body) > MAX_FRAME_BODY:
+        raise ProtocolError(f"frame body too large: {len(body)}")
+    return FRAME_HEADER.pack(len(body), request_id, code) + body
+
+
+def decode_frames(buffer: bytearray) -> list[tuple[int, int, bytes]]:
+    """buffer 앞쪽의 완전한 프레임을 모두 꺼내 (request_id, code, body)로 반환하고 buffer에서 지운다"""
+    frames = []
+    offset = 0
+    while len(buffer) - offset >= FRAME_HEADER.size:
+        body_len, request_id, code = FRAME_HEADER.unpack_from(buffer, offset)
+        if body_len > MAX_FRAME_BODY:
+            raise ProtocolError(f"frame body too large: {body_len}")
+        end = offset + FRAME_HEADER.size + body_len
+        if len(buffer) < end:
+            break
+        frames.append((request_id, code, bytes(buffer[offset + FRAME_HEADER.size:end])))
+        offset = end
+    del buffer[:offset]
+    return frames
+
+
+def encode_str(value: str | None) -> bytes:
+    if value is None:
+        return LENGTH.pack(NULL_LEN)
+    data = value.encode("utf-8")
+    return LENGTH.pack(len(data)) + data
+
+
+class BodyReader:
+    """body에서 필드를 순서대로 꺼낸다"""
+
+    def __init__(self, body: bytes):
+        self._body = body
+        self._offset = 0
+
+    def u8(self) -> int:
+        if self._offset + 1 > len(self._body):
+            raise ProtocolError("truncated body")
+        value = self._body[self._offset]
+        self._offset += 1
+        return value
+
+    def u32(self) -> int:
+        if self._offset + LENGTH.size > len(self._body):
+            raise ProtocolError("truncated body")
+        value, = LENGTH.unpack_from(self._body, self._offset)
+        self._offset += LENGTH.size
+        return value
+
+    def str(self) -> str | None:
+        length = self.u32()
+        if length == NULL_LEN:
+            return None
+        end = self._offset + length
+        if end > len(self._body):
+            raise ProtocolError("truncated body")
+        value = self._body[self._offset:end].decode("utf-8")
+        self._offset = end
+        return value
+
+    def required_str(self, field: str) -> str:
+        """None이 올 수 없는 필드 (key, PUT의 value)"""
+        value = self.str()
+        if value is None:
+            raise ProtocolError(f"{field} cannot be null")
+        return value
+
+
+def encode_batch(records: list[WALRecord]) -> bytes:
+    parts = [LENGTH.pack(len(records))]
+    for record in records:
+        parts.append(bytes((record.record_type.value,)))
+        parts.append(encode_str(record.key))
+        parts.append(encode_str(record.value))
+    return b"".join(parts)
+
+
+def decode_batch(reader: BodyReader) -> list[WALRecord]:
+    records = []
+    for _ in range(reader.u32()):
+        record_type = RecordType(reader.u8())
+        key = reader.required_str("key")
+        value = reader.required_str("value") if record_type == RecordType.PUT else reader.str()
+        records.append(WALRecord(record_type, key, value))
+    return records
+
+
+def encode_scan_request(start: str | None, end: str | None, reverse: bool, limit: int) -> bytes:
+    return encode_str(start) + encode_str(end) + bytes((int(reverse),)) + LENGTH.pack(limit)
+
+
+def encode_scan_response(entries: list[tuple[str, str]], more: bool) -> bytes:
+    parts = [LENGTH.pack(len(entries))]
+    for key, value in entries:
+        parts.append(encode_str(key))
+        parts.append(encode_str(value))
+    parts.append(bytes((int(more),)))
+    return b"".join(parts)
+
+
+def decode_scan_response(body: bytes) -> tuple[list[tuple[str, str]], bool]:
+    reader = BodyReader(body)
+    entries = [(reader.str(), reader.str()) for _ in range(reader.u32())]
+    return entries, bool(reader.u8())
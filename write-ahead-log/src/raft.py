@@ -0,0 +1,1031 @@
+"""Raft 합의로 복제하는 KVStore
+
+노드마다 Raft 로그(src/raft_log.py)와 상태 머신 KVStore(data_dir/state)를 두고, 여러 노드가 localhost의
+Unix 소켓이나 TCP로 RPC를 주고받는다. 쓰기는 leader 로그에 붙인 엔트리가 과반 노드의 디스크에 올라가면
+커밋되고, 커밋된 엔트리는 모든 노드가 같은 순서로 상태 머신에 적용한다.
+
+    node = RaftNode(1, {1: "/tmp/r1.sock", 2: "/tmp/r2.sock", 3: "/tmp/r3.sock"}, data_dir)
+    node.put("k", "v")      # leader가 아니면 NotLeaderError (leader_id로 leader를 알려 줌)
+    node.get("k")           # leader에서만. 읽기 시점의 commit index까지 적용된 뒤 읽는다
+
+- 선출: election_timeout 동안 leader 소식이 없으면 term을 올리고 후보가 되어 RequestVote를 보낸다.
+  로그가 자기보다 뒤처지지 않은 후보에게만 term당 한 표를 준다. 당선되면 no-op 엔트리를 붙여
+  이전 term 엔트리까지 함께 커밋되게 한다
+- 로그 일치: AppendEntries는 바로 앞 엔트리의 (index, term)을 함께 보낸다. follower는 그것이 자기 로그와
+  맞을 때만 받고, 충돌하는 꼬리는 잘라낸다. 거절할 때는 충돌 term이 시작되는 index를 알려 준다
+- 커밋: leader는 과반의 match index 중 현재 term 엔트리까지만 commit index를 올린다
+- 파이프라이닝: leader는 follower마다 응답을 기다리지 않고 AppendEntries를 max_inflight개까지 연달아 보낸다
+  (next_index를 낙관적으로 올리고, 거절되면 알려 준 index로 되돌린다)
+- fsync 묶기: leader는 엔트리를 파일에 쓰기만 하고 전송과 동시에 sync 스레드가 쌓인 엔트리를 fsync 한 번으로
+  내린다. follower는 소켓에서 한 번에 받은 AppendEntries를 모두 붙인 뒤 fsync 한 번 하고 응답한다.
+  그래서 커밋 지연은 대략 왕복 한 번 + fsync 한 번이다
+- 스냅샷: 상태 머신 KVStore는 적용한 마지막 index를 예약 key(RAFT_APPLIED_KEY)에 같은 배치로 기록하므로
+  그 자체로 내구성이 있다. 그래서 적용이 snapshot_entries만큼 앞서면 로그 앞쪽을 버린다.
+  follower가 버린 구간을 필요로 하면 leader는 상태 머신 스냅샷을 체크포인트 파일(checkpoint_file.py 형식)로
+  써서 InstallSnapshot으로 나눠 보내고, follower는 그 파일로 상태 머신을 통째로 바꾼다.
+  양쪽 모두 상태 머신을 메모리에 모으지 않고 key 순서로 흘려 쓰고/적용한다
+
+term/voted_for는 raft-state.json에 fsync 후 rename으로 저장한다. 읽기는 leader lease 확인을 하지 않으므로
+네트워크가 갈라진 동안 옛 leader가 잠깐 오래된 값을 돌려줄 수 있다.
+
+RPC는 src/protocol.py의 프레임을 그대로 쓰고 code만 RaftOp로 구분한다 (request_id는 0).
+- REQUEST_VOTE: term(u64) | candidate(u32) | last_log_index(u64) | last_log_term(u64)     VOTE: term | granted(u8)
+- APPEND_ENTRIES: term | leader(u32) | prev_index | prev_term | leader_commit | count(u32) | (term, len(u32), payload)*
+  APPEND_RESULT: term | success(u8) | index (성공이면 match index, 실패면 다시 보낼 index)
+- INSTALL_SNAPSHOT: term | leader(u32) | last_index | last_term | offset | done(u8) | 파일 조각
+  SNAPSHOT_RESULT: term | last_index (마지막 조각에만 응답)
+
+실행 (노드마다 프로세스 하나, 클라이언트는 각 노드의 --unix/--port로 접속):
+  python -m src.raft --id 1 --cluster 1=/tmp/r1.sock,2=/tmp/r2.sock,3=/tmp/r3.sock --data-dir ./n1 --unix /tmp/kv1.sock
+"""
+import argparse
+import json
+import os
+import random
+import re
+import signal
+import socket
+import socketserver
+import struct
+import threading
+import time
+
+from collections.abc import Callable, Iterable, Iterator
+from enum import Enum, IntEnum
+from pathlib import Path
+
+from src.checkpoint_file import iter_checkpoint, write_checkpoint_entries
+from src.client import KVClient, ServerError
+from src.kv_store import KVStore
+from src.memtable import prefix_end
+from src.protocol import ProtocolError, decode_frames, encode_frame
+from src.raft_log import RaftLog
+from src.segmented_wal import fsync_dir
+from src.server import RECV_SIZE, KVServer, acquire_dir_lock, create_server, parse_address
+from src.wal_record import RecordType, WALRecord
+from src.write_batch import WriteBatch
+
+# 상태 머신에 적용한 마지막 엔트리 "index:term". get/scan에는 보이지 않는다
+RAFT_APPLIED_KEY = "\x00raft-applied"
+STATE_FILE_NAME = "raft-state.json"
+LOG_FILE_NAME = "raft.log"
+STATE_DIR_NAME = "state"
+SNAPSHOT_FILE_NAME = "raft-snapshot.dat"
+SNAPSHOT_RECV_NAME = "raft-snapshot.recv"
+SNAPSHOT_CHUNK_SIZE = 1024 * 1024
+# 스냅샷 전송 후 이 시간 안에 응답이 없으면 다시 보낸다
+SNAPSHOT_TIMEOUT = 30.0
+# 적용 스레드가 KVStore 배치 하나로 적용하는 최대 엔트리 수
+MAX_APPLY_ENTRIES = 1024
+
+VOTE_REQUEST = struct.Struct("<QIQQ")
+VOTE_RESPONSE = struct.Struct("<QB")
+APPEND_HEADER = struct.Struct("<QIQQQI")
+APPEND_ENTRY = struct.Struct("<QI")
+APPEND_RESPONSE = struct.Struct("<QBQ")
+SNAPSHOT_HEADER = struct.Struct("<QIQQQB")
+SNAPSHOT_RESPONSE = struct.Struct("<QQ")
+
+
+class RaftOp(IntEnum):
+    REQUEST_VOTE = 1
+    VOTE = 2
+    APPEND_ENTRIES = 3
+    APPEND_RESULT = 4
+    INSTALL_SNAPSHOT = 5
+    SNAPSHOT_RESULT = 6
+
+
+class Role(Enum):
+    FOLLOWER = "follower"
+    CANDIDATE = "candidate"
+    LEADER = "leader"
+
+
+class NotLeaderError(Exception):
+    """leader가 아닌 노드에 요청함. leader_id는 알고 있는 leader (모르면 None)
+
+    쓰기를 기다리는 도중 leader 자리를 잃어도 이 예외가 난다. 이때 쓰기는 커밋됐을 수도 있다.
+    """
+
+    def __init__(self, leader_id: int | None):
+        super().__init__(f"not the leader (leader={leader_id})")
+        self.leader_id = leader_id
+
+
+class _Peer:
+    """leader/후보 쪽에서 본 다른 노드 하나 (나가는 연결과 복제 진행 상태)"""
+
+    def __init__(self, node_id: int, address: str | Path | tuple[str, int]):
+        self.node_id = node_id
+        self.address = address
+        self.sock: socket.socket | None = None
+        self.next_index = 1
+        self.match_index = 0
+        # 응답을 받지 못한 AppendEntries 수
+        self.inflight = 0
+        self.last_sent = 0.0
+        self.vote_request: bytes | None = None
+        self.snapshot_started: float | None = None
+
+
+class _SnapshotFile:
+    def __init__(self, path: Path, index: int, term: int):
+        self.path = path
+        self.index = index
+        self.term = term
+
+
+class _RaftHandler(socketserver.BaseRequestHandler):
+    def handle(self) -> None:
+        self.server.node._serve_peer(self.request)
+
+
+def _connect(address: str | Path | tuple[str, int]) -> socket.socket:
+    if isinstance(address, tuple):
+        sock = socket.create_connection(address)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return sock
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(str(address))
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+class RaftNode:
+    def __init__(
+        self,
+        node_id: int,
+        cluster: dict[int, str | Path | tuple[str, int]],
+        data_dir: Path,
+        election_timeout: tuple[float, float] = (0.3, 0.6),
+        heartbeat_interval: float = 0.05,
+        max_batch_entries: int = 256,
+        max_inflight: int = 4,
+        snapshot_entries: int = 10_000,
+        request_timeout: float = 10.0,
+        **store_options,
+    ):
+        """cluster는 모든 노드(자신 포함)의 RPC 주소. store_options는 상태 머신 KVStore에 넘긴다"""
+        if node_id not in cluster:
+            raise ValueError(f"node {node_id} is not in the cluster")
+        self._node_id = node_id
+        self._data_dir = Path(data_dir)
+        self._data_dir.mkdir(parents=True, exist_ok=True)
+        self._election_timeout = election_timeout
+        self._heartbeat_interval = heartbeat_interval
+        self._max_batch_entries = max_batch_entries
+        self._max_inflight = max_inflight
+        self._snapshot_entries = snapshot_entries
+        self._request_timeout = request_timeout
+
+        self._state_path = self._data_dir / STATE_FILE_NAME
+        self._current_term, self._voted_for = 0, None
+        if self._state_path.exists():
+            with open(self._state_path) as f:
+                state = json.load(f)
+            self._current_term, self._voted_for = state["term"], state["voted_for"]
+        self._log = RaftLog(self._data_dir / LOG_FILE_NAME)
+        (self._data_dir / SNAPSHOT_RECV_NAME).unlink(missing_ok=True)
+        state_dir = self._data_dir / STATE_DIR_NAME
+        state_dir.mkdir(exist_ok=True)
+        self._store = KVStore(data_dir=state_dir, **store_options)
+        applied = self._store.get(RAFT_APPLIED_KEY)
+        self._last_applied = int(applied.split(":")[0]) if applied is not None else 0
+        self._commit_index = self._last_applied
+        # 이 노드 디스크에 fsync된 마지막 로그 index (leader 자신의 match index)
+        self._durable_index = self._log.last_index
+        # sync 스레드의 fsync가 실패하면 남긴다. 이 노드는 더 이상 leader가 되지 않는다
+        self._sync_error: OSError | None = None
+
+        # _lock 하나가 Raft 상태 전체를 보호한다. 조건 변수는 깨울 대상별로 나눈다
+        # - _replicate: 로그가 늘거나 역할이 바뀜 (peer 송신 스레드, sync 스레드)
+        # - _committed: commit/적용 index가 바뀌거나 역할이 바뀜 (쓰기/읽기 대기, 적용 스레드)
+        self._lock = threading.Lock()
+        self._replicate = threading.Condition(self._lock)
+        self._committed = threading.Condition(self._lock)
+        # 적용 스레드와 스냅샷 설치가 상태 머신을 동시에 고치지 않도록
+        self._apply_lock = threading.Lock()
+        self._snapshot_lock = threading.Lock()
+        self._snapshot: _SnapshotFile | None = None
+        self._role = Role.FOLLOWER
+        self._leader_id: int | None = None
+        self._votes: set[int] = set()
+        self._majority = len(cluster) // 2 + 1
+        self._election_deadline = 0.0
+        self._reset_election_deadline()
+        self._closed = False
+        self._stop = threading.Event()
+        self._peers = {peer_id: _Peer(peer_id, address) for peer_id, address in cluster.items() if peer_id != node_id}
+        self._inbound: set[socket.socket] = set()
+
+        address = cluster[node_id]
+        self._unix_path = None if isinstance(address, tuple) else Path(address)
+        self._server = create_server(address, _RaftHandler)
+        self._server.node = self
+        self._threads = [
+            threading.Thread(target=self._tick_loop, name=f"raft-{node_id}-tick", daemon=True),
+            threading.Thread(target=self._sync_loop, name=f"raft-{node_id}-sync", daemon=True),
+            threading.Thread(target=self._apply_loop, name=f"raft-{node_id}-apply", daemon=True),
+        ] + [
+            threading.Thread(target=self._peer_loop, args=(peer,), name=f"raft-{node_id}-peer-{peer.node_id}", daemon=True)
+            for peer in self._peers.values()
+        ]
+        self._server_thread = threading.Thread(target=self._server.serve_forever, name=f"raft-{node_id}-rpc", daemon=True)
+        self._server_thread.start()
+        for thread in self._threads:
+            thread.start()
+
+    @property
+    def node_id(self) -> int:
+        return self._node_id
+
+    @property
+    def role(self) -> Role:
+        return self._role
+
+    @property
+    def leader_id(self) -> int | None:
+        return self._leader_id
+
+    @property
+    def store(self) -> KVStore:
+        """상태 머신 (직접 쓰면 복제되지 않으므로 읽기 전용으로만)"""
+        return self._store
+
+    def status(self) -> dict[str, object]:
+        with self._lock:
+            return {
+                "id": self._node_id,
+                "role": self._role.value,
+                "term": self._current_term,
+                "leader": self._leader_id,
+                "commit_index": self._commit_index,
+                "last_applied": self._last_applied,
+                "last_index": self._log.last_index,
+                "base_index": self._log.base_index,
+            }
+
+    def put(self, key: str, value: str) -> None:
+        if not key:
+            raise ValueError("key cannot be empty")
+        if not isinstance(value, str):
+            raise TypeError("value must be a str")
+        self._propose(WALRecord(RecordType.PUT, key, value))
+
+    def delete(self, key: str) -> None:
+        if not key:
+            raise ValueError("key cannot be empty")
+        self._propose(WALRecord(RecordType.DEL, key))
+
+    def write_batch(self, operations: Iterable[WALRecord] | None = None) -> WriteBatch:
+        """KVStore.write_batch와 같지만 배치가 엔트리 하나로 복제된다"""
+        batch = WriteBatch(self._propose)
+        if operations is not None:
+            for record in operations:
+                batch.add(record)
+            batch.commit()
+        return batch
+
+    def get(self, key: str) -> str | None:
+        self._read_barrier()
+        if key == RAFT_APPLIED_KEY:
+            return None
+        return self._store.get(key)
+
+    def scan(self, start: str | None = None, end: str | None = None, reverse: bool = False) -> Iterator[tuple[str, str]]:
+        self._read_barrier()
+        return ((key, value) for key, value in self._store.scan(start, end, reverse) if key != RAFT_APPLIED_KEY)
+
+    def prefix(self, prefix: str, reverse: bool = False) -> Iterator[tuple[str, str]]:
+        return self.scan(prefix, prefix_end(prefix), reverse)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._replicate.notify_all()
+            self._committed.notify_all()
+            inbound = list(self._inbound)
+        self._stop.set()
+        self._server.shutdown()
+        self._server.server_close()
+        if self._unix_path is not None:
+            self._unix_path.unlink(missing_ok=True)
+        for sock in inbound + [peer.sock for peer in self._peers.values() if peer.sock is not None]:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        for thread in self._threads:
+            thread.join()
+        for peer in self._peers.values():
+            if peer.sock is not None:
+                peer.sock.close()
+        self._store.close()
+        self._log.close()
+
+    # --- 클라이언트 요청 ---
+
+    def _propose(self, record: WALRecord) -> None:
+        """leader 로그에 엔트리를 붙이고 커밋될 때까지 기다린다"""
+        payload = record.serialize_binary()
+        with self._lock:
+            self._check_leader()
+            term = self._current_term
+            self._log.append([(term, payload)])
+            index = self._log.last_index
+            self._replicate.notify_all()
+
+            deadline = time.monotonic() + self._request_timeout
+            while self._commit_index < index:
+                if self._role != Role.LEADER or self._current_term != term:
+                    raise NotLeaderError(self._leader_id)
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(f"entry {index} was not committed within {self._request_timeout}s")
+                self._committed.wait(remaining)
+
+    def _read_barrier(self) -> None:
+        """leader가 자기 term 엔트리를 커밋했고, 지금의 commit index까지 상태 머신에 적용될 때까지 기다린다"""
+        with self._lock:
+            self._check_leader()
+            term = self._current_term
+            deadline = time.monotonic() + self._request_timeout
+            while (
+                self._log.term_at(self._commit_index) != term
+                or self._last_applied < self._commit_index
+            ):
+                if self._role != Role.LEADER or self._current_term != term:
+                    raise NotLeaderError(self._leader_id)
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(f"read was not ready within {self._request_timeout}s")
+                self._committed.wait(remaining)
+
+    def _check_leader(self) -> None:
+        if self._closed:
+            raise RuntimeError("node is closed")
+        if self._role != Role.LEADER:
+            raise NotLeaderError(self._leader_id)
+
+    # --- 역할 전환 (모두 _lock을 잡고 호출) ---
+
+    def _reset_election_deadline(self) -> None:
+        self._election_deadline = time.monotonic() + random.uniform(*self._election_timeout)
+
+    def _save_state(self) -> None:
+        tmp_path = self._state_path.with_name(self._state_path.name + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({"term": self._current_term, "voted_for": self._voted_for}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.rename(tmp_path, self._state_path)
+        fsync_dir(self._data_dir)
+
+    def _step_down(self, term: int) -> None:
+        if term > self._current_term:
+            self._current_term = term
+            self._voted_for = None
+            self._save_state()
+        if self._role != Role.FOLLOWER:
+            self._role = Role.FOLLOWER
+            self._reset_election_deadline()
+            self._replicate.notify_all()
+            self._committed.notify_all()
+
+    def _start_election(self) -> None:
+        self._current_term += 1
+        self._voted_for = self._node_id
+        self._save_state()
+        self._role = Role.CANDIDATE
+        self._leader_id = None
+        self._votes = {self._node_id}
+        self._reset_election_deadline()
+        request = VOTE_REQUEST.pack(self._current_term, self._node_id, self._log.last_index, self._log.last_term)
+        for peer in self._peers.values():
+            peer.vote_request = request
+        if len(self._votes) >= self._majority:
+            self._become_leader()
+        self._replicate.notify_all()
+
+    def _become_leader(self) -> None:
+        self._role = Role.LEADER
+        self._leader_id = self._node_id
+        for peer in self._peers.values():
+            peer.next_index = self._log.last_index + 1
+            peer.match_index = 0
+            peer.inflight = 0
+            peer.last_sent = 0.0
+            peer.snapshot_started = None
+        # 현재 term 엔트리가 커밋되어야 이전 term 엔트리도 커밋된 것으로 셀 수 있다
+        self._log.append([(self._current_term, b"")])
+        self._replicate.notify_all()
+        self._committed.notify_all()
+
+    def _advance_commit(self) -> None:
+        matches = sorted([self._durable_index] + [peer.match_index for peer in self._peers.values()], reverse=True)
+        candidate = matches[self._majority - 1]
+        if candidate > self._commit_index and self._log.term_at(candidate) == self._current_term:
+            self._commit_index = candidate
+            self._committed.notify_all()
+
+    # --- 백그라운드 스레드 ---
+
+    def _tick_loop(self) -> None:
+        while not self._stop.is_set():
+            with self._lock:
+                if self._closed:
+                    return
+                now = time.monotonic()
+                if self._role != Role.LEADER and now >= self._election_deadline and self._sync_error is None:
+                    self._start_election()
+                wait = self._heartbeat_interval
+                if self._role != Role.LEADER:
+                    wait = max(0.001, self._election_deadline - now)
+            self._stop.wait(wait)
+
+    def _sync_loop(self) -> None:
+        """append만 된 로그를 fsync 한 번씩으로 묶어 내리고 leader의 commit index를 올린다"""
+        while True:
+            with self._lock:
+                while not self._closed and self._log.last_index <= self._durable_index:
+                    self._replicate.wait()
+                if self._closed:
+                    return
+                target = self._log.last_index
+                sync = self._log.detach_sync()
+            try:
+                sync()
+            except OSError as e:
+                # fsync가 실패하면 커널이 더티 페이지를 버렸을 수 있어 다시 시도해도 믿을 수 없다
+                # _durable_index를 더 올리지 않고 leader에서 내려와 다시 후보가 되지 않는다
+                with self._lock:
+                    self._sync_error = e
+                    self._step_down(self._current_term)
+                return
+            with self._lock:
+                self._durable_index = max(self._durable_index, min(target, self._log.last_index))
+                if self._role == Role.LEADER:
+                    self._advance_commit()
+
+    def _apply_loop(self) -> None:
+        while True:
+            with self._lock:
+                while not self._closed and self._commit_index <= self._last_applied:
+                    self._committed.wait()
+                if self._closed:
+                    return
+                start = self._last_applied + 1
+                end = min(self._commit_index, start + MAX_APPLY_ENTRIES - 1)
+                entries = self._log.entries(start, end)
+                end_term = self._log.term_at(end)
+
+            with self._apply_lock:
+                with self._lock:
+                    if self._last_applied >= end:
+                        # 그 사이 스냅샷이 설치됨
+                        continue
+                operations = []
+                for _, payload in entries:
+                    if not payload:
+                        continue
+                    record = WALRecord.deserialize_binary(payload)
+                    if record.record_type == RecordType.BATCH:
+                        operations.extend(record.records)
+                    else:
+                        operations.append(record)
+                operations.append(WALRecord(RecordType.PUT, RAFT_APPLIED_KEY, f"{end}:{end_term}"))
+                self._store.write_batch(operations)
+
+                with self._lock:
+                    self._last_applied = max(self._last_applied, end)
+                    self._committed.notify_all()
+                    # 상태 머신이 적용 index를 내구성 있게 기록했으므로 그 앞의 로그는 필요 없다
+                    if self._last_applied - self._log.base_index >= self._snapshot_entries:
+                        self._log.compact(self._last_applied, self._log.term_at(self._last_applied))
+
+    # --- leader -> peer 전송 ---
+
+    def _peer_loop(self, peer: _Peer) -> None:
+        while True:
+            with self._lock:
+                message = self._next_message(peer)
+            if message is None:
+                return
+            code, body = message
+            if code == RaftOp.INSTALL_SNAPSHOT:
+                self._send_snapshot(peer)
+            else:
+                self._send(peer, code, body)
+
+    def _next_message(self, peer: _Peer) -> tuple[RaftOp, bytes | None] | None:
+        """peer에게 보낼 다음 메시지를 만든다 (_lock을 잡고 호출, 보낼 것이 생길 때까지 기다림). 종료되면 None"""
+        while not self._closed:
+            if peer.vote_request is not None:
+                request, peer.vote_request = peer.vote_request, None
+                return RaftOp.REQUEST_VOTE, request
+            if self._role != Role.LEADER:
+                self._replicate.wait()
+                continue
+
+            now = time.monotonic()
+            if peer.snapshot_started is not None:
+                if now - peer.snapshot_started < SNAPSHOT_TIMEOUT:
+                    self._replicate.wait(self._heartbeat_interval)
+                    continue
+                peer.snapshot_started = None
+            if peer.next_index <= self._log.base_index:
+                peer.snapshot_started = now
+                return RaftOp.INSTALL_SNAPSHOT, None
+
+            has_entries = peer.inflight < self._max_inflight and peer.next_index <= self._log.last_index
+            idle = now - peer.last_sent
+            if has_entries or idle >= self._heartbeat_interval:
+                return RaftOp.APPEND_ENTRIES, self._append_entries(peer, has_entries, now)
+            self._replicate.wait(self._heartbeat_interval - idle)
+        return None
+
+    def _append_entries(self, peer: _Peer, with_entries: bool, now: float) -> bytes:
+        prev_index = peer.next_index - 1
+        entries = []
+        if with_entries:
+            end = min(self._log.last_index, peer.next_index + self._max_batch_entries - 1)
+            entries = self._log.entries(peer.next_index, end)
+        parts = [APPEND_HEADER.pack(
+            self._current_term, self._node_id, prev_index, self._log.term_at(prev_index),
+            self._commit_index, len(entries),
+        )]
+        for term, payload in entries:
+            parts.append(APPEND_ENTRY.pack(term, len(payload)))
+            parts.append(payload)
+        # 응답을 기다리지 않고 다음 구간을 보낼 수 있도록 next_index를 미리 올린다
+        peer.next_index += len(entries)
+        peer.inflight += 1
+        peer.last_sent = now
+        return b"".join(parts)
+
+    def _send(self, peer: _Peer, code: RaftOp, body: bytes) -> bool:
+        sock = peer.sock
+        if sock is None:
+            try:
+                sock = _connect(peer.address)
+            except OSError:
+                with self._lock:
+                    self._reset_peer(peer)
+                self._stop.wait(self._heartbeat_interval)
+                return False
+            peer.sock = sock
+            threading.Thread(
+                target=self._read_responses, args=(peer, sock),
+                name=f"raft-{self._node_id}-responses-{peer.node_id}", daemon=True,
+            ).start()
+        try:
+            sock.sendall(encode_frame(0, code, body))
+            return True
+        except OSError:
+            self._drop_connection(peer, sock)
+            return False
+
+    def _send_snapshot(self, peer: _Peer) -> None:
+        try:
+            snapshot = self._snapshot_file()
+        except OSError:
+            with self._lock:
+                peer.snapshot_started = None
+            return
+        with self._lock:
+            if self._role != Role.LEADER:
+                peer.snapshot_started = None
+                return
+            term = self._current_term
+
+        size = snapshot.path.stat().st_size
+        offset = 0
+        with open(snapshot.path, "rb") as f:
+            while True:
+                data = f.read(SNAPSHOT_CHUNK_SIZE)
+                done = offset + len(data) >= size
+                header = SNAPSHOT_HEADER.pack(term, self._node_id, snapshot.index, snapshot.term, offset, done)
+                if not self._send(peer, RaftOp.INSTALL_SNAPSHOT, header + data):
+                    with self._lock:
+                        peer.snapshot_started = None
+                    return
+                offset += len(data)
+                if done:
+                    return
+
+    def _snapshot_file(self) -> _SnapshotFile:
+        """상태 머신의 지금 상태를 체크포인트 파일로 쓴다 (로그가 더 줄지 않았으면 이전 파일을 재사용)"""
+        with self._snapshot_lock:
+            with self._lock:
+                base_index = self._log.base_index
+            if self._snapshot is not None and self._snapshot.index >= base_index:
+                return self._snapshot
+
+            path = self._data_dir / SNAPSHOT_FILE_NAME
+            tmp_path = path.with_name(path.name + ".tmp")
+            # 상태 머신을 메모리에 모으지 않고 시점 스냅샷의 scan을 그대로 파일로 흘려 쓴다
+            # 적용 index는 같은 스냅샷에서 읽으므로 파일 내용과 어긋나지 않는다
+            with self._store.snapshot() as snapshot:
+                applied = snapshot.get(RAFT_APPLIED_KEY)
+                index, term = (int(part) for part in (applied or "0:0").split(":"))
+                entries = ((key, value) for key, value in snapshot.scan() if key != RAFT_APPLIED_KEY)
+                write_checkpoint_entries(tmp_path, entries, index)
+            os.rename(tmp_path, path)
+            fsync_dir(self._data_dir)
+            self._snapshot = _SnapshotFile(path, index, term)
+            return self._snapshot
+
+    def _read_responses(self, peer: _Peer, sock: socket.socket) -> None:
+        buffer = bytearray()
+        try:
+            while True:
+                data = sock.recv(RECV_SIZE)
+                if not data:
+                    break
+                buffer += data
+                frames = decode_frames(buffer)
+                if frames:
+                    with self._lock:
+                        for _, code, body in frames:
+                            self._on_response(peer, RaftOp(code), body)
+        except (OSError, ProtocolError, ValueError, struct.error):
+            pass
+        self._drop_connection(peer, sock)
+
+    def _drop_connection(self, peer: _Peer, sock: socket.socket) -> None:
+        with self._lock:
+            if peer.sock is sock:
+                peer.sock = None
+                self._reset_peer(peer)
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        sock.close()
+
+    def _reset_peer(self, peer: _Peer) -> None:
+        # 보낸 요청의 응답은 오지 않으므로, 확인된 지점부터 다시 보낸다
+        peer.inflight = 0
+        peer.snapshot_started = None
+        if self._role == Role.LEADER:
+            peer.next_index = peer.match_index + 1
+        self._replicate.notify_all()
+
+    def _on_response(self, peer: _Peer, op: RaftOp, body: bytes) -> None:
+        if op == RaftOp.VOTE:
+            term, granted = VOTE_RESPONSE.unpack(body)
+            if term > self._current_term:
+                self._step_down(term)
+            elif self._role == Role.CANDIDATE and term == self._current_term and granted:
+                self._votes.add(peer.node_id)
+                if len(self._votes) >= self._majority:
+                    self._become_leader()
+            return
+
+        if op == RaftOp.APPEND_RESULT:
+            term, success, index = APPEND_RESPONSE.unpack(body)
+        elif op == RaftOp.SNAPSHOT_RESULT:
+            term, index = SNAPSHOT_RESPONSE.unpack(body)
+            success = True
+        else:
+            raise ProtocolError(f"unexpected response: {op}")
+        if term > self._current_term:
+            self._step_down(term)
+            return
+        if self._role != Role.LEADER or term != self._current_term:
+            return
+
+        if op == RaftOp.SNAPSHOT_RESULT:
+            peer.snapshot_started = None
+        else:
+            peer.inflight = max(0, peer.inflight - 1)
+        if success:
+            if index > peer.match_index:
+                peer.match_index = index
+                self._advance_commit()
+            peer.next_index = max(peer.next_index, index + 1)
+        else:
+            peer.next_index = max(min(peer.next_index, index), peer.match_index + 1)
+        self._replicate.notify_all()
+
+    # --- peer -> 이 노드 RPC 처리 ---
+
+    def _serve_peer(self, sock: socket.socket) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._inbound.add(sock)
+        buffer = bytearray()
+        receiving: dict[str, object] = {}
+        try:
+            while True:
+                data = sock.recv(RECV_SIZE)
+                if not data:
+                    return
+                buffer += data
+                responses = []
+                acked_index = 0
+                for _, code, body in decode_frames(buffer):
+                    op = RaftOp(code)
+                    if op == RaftOp.INSTALL_SNAPSHOT:
+                        response = self._handle_snapshot_chunk(receiving, body)
+                        if response is not None:
+                            responses.append(encode_frame(0, RaftOp.SNAPSHOT_RESULT, response))
+                        continue
+                    with self._lock:
+                        if op == RaftOp.REQUEST_VOTE:
+                            responses.append(encode_frame(0, RaftOp.VOTE, self._handle_vote(body)))
+                        elif op == RaftOp.APPEND_ENTRIES:
+                            response, match_index = self._handle_append(body)
+                            acked_index = max(acked_index, match_index)
+                            responses.append(encode_frame(0, RaftOp.APPEND_RESULT, response))
+                        else:
+                            raise ProtocolError(f"unexpected request: {op}")
+
+                # 성공을 알릴 match_index까지 fsync 한 번으로 내린 뒤에 응답한다. 이번 요청에서 새로 쓴 게 없어도
+                # 같은 엔트리를 다른 연결의 핸들러가 쓰고 아직 sync하지 않았을 수 있다
+                sync = None
+                with self._lock:
+                    if acked_index > self._durable_index:
+                        target = self._log.last_index
+                        sync = self._log.detach_sync()
+                if sync is not None:
+                    sync()
+                    with self._lock:
+                        self._durable_index = max(self._durable_index, min(target, self._log.last_index))
+                if responses:
+                    sock.sendall(b"".join(responses))
+        except (OSError, ProtocolError, ValueError, struct.error):
+            return
+        finally:
+            file = receiving.get("file")
+            if file is not None:
+                file.close()
+            with self._lock:
+                self._inbound.discard(sock)
+
+    def _handle_vote(self, body: bytes) -> bytes:
+        term, candidate, last_index, last_term = VOTE_REQUEST.unpack(body)
+        if term > self._current_term:
+            self._step_down(term)
+        up_to_date = (last_term, last_index) >= (self._log.last_term, self._log.last_index)
+        granted = term == self._current_term and self._voted_for in (None, candidate) and up_to_date
+        if granted:
+            self._voted_for = candidate
+            self._save_state()
+            self._reset_election_deadline()
+        return VOTE_RESPONSE.pack(self._current_term, granted)
+
+    def _handle_append(self, body: bytes) -> tuple[bytes, int]:
+        """응답과 성공으로 알린 match_index(실패면 0)를 반환한다. 응답 전에 match_index까지 sync해야 한다"""
+        term, leader, prev_index, prev_term, leader_commit, count = APPEND_HEADER.unpack_from(body)
+        if term < self._current_term:
+            return APPEND_RESPONSE.pack(self._current_term, False, self._log.last_index + 1), 0
+        if term > self._current_term or self._role != Role.FOLLOWER:
+            self._step_down(term)
+        self._leader_id = leader
+        self._reset_election_deadline()
+
+        entries = []
+        offset = APPEND_HEADER.size
+        for _ in range(count):
+            entry_term, length = APPEND_ENTRY.unpack_from(body, offset)
+            offset += APPEND_ENTRY.size
+            entries.append((entry_term, body[offset:offset + length]))
+            offset += length
+
+        if prev_index > self._log.last_index:
+            return APPEND_RESPONSE.pack(self._current_term, False, self._log.last_index + 1), 0
+        if prev_index < self._log.base_index:
+            # 스냅샷이 덮은 앞부분은 이미 커밋된 것과 같으므로 건너뛴다
+            skip = self._log.base_index - prev_index
+            entries = entries[skip:]
+            prev_index = self._log.base_index
+        elif self._log.term_at(prev_index) != prev_term:
+            hint = self._log.first_index_of_term(prev_index)
+            return APPEND_RESPONSE.pack(self._current_term, False, hint), 0
+
+        for i, (entry_term, _) in enumerate(entries):
+            index = prev_index + 1 + i
+            existing = self._log.term_at(index)
+            if existing == entry_term:
+                continue
+            if existing is not None:
+                self._log.truncate_after(index - 1)
+                self._durable_index = min(self._durable_index, index - 1)
+            self._log.append(entries[i:])
+            break
+
+        match_index = prev_index + len(entries)
+        commit_index = min(leader_commit, match_index)
+        if commit_index > self._commit_index:
+            self._commit_index = commit_index
+            self._committed.notify_all()
+        return APPEND_RESPONSE.pack(self._current_term, True, match_index), match_index
+
+    def _handle_snapshot_chunk(self, receiving: dict[str, object], body: bytes) -> bytes | None:
+        term, leader, index, snapshot_term, offset, done = SNAPSHOT_HEADER.unpack_from(body)
+        with self._lock:
+            if term < self._current_term:
+                return SNAPSHOT_RESPONSE.pack(self._current_term, 0)
+            if term > self._current_term or self._role != Role.FOLLOWER:
+                self._step_down(term)
+            self._leader_id = leader
+            self._reset_election_deadline()
+
+        path = self._data_dir / SNAPSHOT_RECV_NAME
+        if offset == 0:
+            if receiving.get("file") is not None:
+                receiving["file"].close()
+            receiving["file"] = open(path, "wb")
+        file = receiving.get("file")
+        if file is None or file.tell() != offset:
+            # 앞 조각을 놓침. leader가 시간 초과 후 처음부터 다시 보낸다
+            return None
+        file.write(memoryview(body)[SNAPSHOT_HEADER.size:])
+        if not done:
+            return None
+
+        file.flush()
+        os.fsync(file.fileno())
+        file.close()
+        receiving["file"] = None
+        self._install_snapshot(path, index, snapshot_term)
+        with self._lock:
+            return SNAPSHOT_RESPONSE.pack(self._current_term, index)
+
+    def _install_snapshot(self, path: Path, index: int, term: int) -> None:
+        """받은 체크포인트 파일로 상태 머신을 바꾸고 로그에서 스냅샷이 덮는 부분을 버린다"""
+        with self._apply_lock:
+            with self._lock:
+                installed = index <= self._last_applied
+            if not installed:
+                # 바뀐 key만 MAX_APPLY_ENTRIES개씩 나눠 배치로 쓰고, 적용 index는 맨 마지막에 따로 쓴다
+                # 도중에 죽어도 적용 index는 예전 값으로 남아 있어 설치가 끝난 것으로 보지 않는다
+                operations = []
+                for operation in self._snapshot_diff(path):
+                    operations.append(operation)
+                    if len(operations) >= MAX_APPLY_ENTRIES:
+                        self._store.write_batch(operations)
+                        operations = []
+                if operations:
+                    self._store.write_batch(operations)
+                self._store.put(RAFT_APPLIED_KEY, f"{index}:{term}")
+            path.unlink(missing_ok=True)
+
+            with self._lock:
+                self._last_applied = max(self._last_applied, index)
+                self._commit_index = max(self._commit_index, index)
+                self._log.compact(index, term)
+                self._durable_index = max(self._durable_index, self._log.base_index)
+                self._committed.notify_all()
+
+
+    def _snapshot_diff(self, path: Path) -> Iterator[WALRecord]:
+        """체크포인트 파일과 지금 상태 머신을 key 순서로 함께 훑어, 파일 상태로 바꾸는 PUT/DEL을 내보낸다
+
+        둘 다 key 순서라 한 번에 엔트리 하나씩만 들고 있으면 된다. 스냅샷에 없는 key는 leader에서 지워진 것.
+        """
+        current = ((key, value) for key, value in self._store.scan() if key != RAFT_APPLIED_KEY)
+        target = ((key, value) for key, value in iter_checkpoint(path) if key != RAFT_APPLIED_KEY)
+        current_entry = next(current, None)
+        for key, value in target:
+            while current_entry is not None and current_entry[0] < key:
+                yield WALRecord(RecordType.DEL, current_entry[0])
+                current_entry = next(current, None)
+            if current_entry is not None and current_entry[0] == key:
+                current_entry, existing = next(current, None), current_entry[1]
+                if existing == value:
+                    continue
+            yield WALRecord(RecordType.PUT, key, value)
+        while current_entry is not None:
+            yield WALRecord(RecordType.DEL, current_entry[0])
+            current_entry = next(current, None)
+
+
+class RaftClient:
+    """여러 노드의 클라이언트 주소를 받아 leader를 찾아 요청한다
+
+    NotLeaderError면 알려 준 leader로, 연결이 안 되면 다음 노드로 넘어가며 timeout까지 다시 시도한다.
+    다시 보낸 쓰기는 두 번 적용될 수 있지만 put/delete는 같은 결과가 된다.
+    """
+
+    def __init__(self, addresses: dict[int, str | Path | tuple[str, int]], timeout: float = 10.0, pool_size: int = 8):
+        self._clients = {node_id: KVClient(address, pool_size=pool_size, timeout=timeout) for node_id, address in addresses.items()}
+        self._node_ids = list(addresses)
+        self._leader = self._node_ids[0]
+        self._timeout = timeout
+
+    def __enter__(self) -> "RaftClient":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    @property
+    def leader(self) -> int:
+        """마지막으로 요청이 성공한(또는 알려진) leader"""
+        return self._leader
+
+    def get(self, key: str) -> str | None:
+        return self._call(lambda client: client.get(key))
+
+    def put(self, key: str, value: str) -> None:
+        self._call(lambda client: client.put(key, value))
+
+    def delete(self, key: str) -> None:
+        self._call(lambda client: client.delete(key))
+
+    def write_batch(self, operations: Iterable[WALRecord]) -> None:
+        records = list(operations)
+        self._call(lambda client: client.write_batch(records))
+
+    def scan(self, start: str | None = None, end: str | None = None, reverse: bool = False) -> list[tuple[str, str]]:
+        return self._call(lambda client: list(client.scan(start, end, reverse)))
+
+    def close(self) -> None:
+        for client in self._clients.values():
+            client.close()
+
+    def _call(self, request: Callable[[KVClient], object]):
+        deadline = time.monotonic() + self._timeout
+        while True:
+            try:
+                return request(self._clients[self._leader])
+            except ServerError as e:
+                if not str(e).startswith(NotLeaderError.__name__):
+                    raise
+                match = re.search(r"leader=(\d+)", str(e))
+                hint = int(match.group(1)) if match else None
+                self._leader = hint if hint in self._clients and hint != self._leader else self._next_node()
+            except OSError:
+                self._leader = self._next_node()
+            if time.monotonic() >= deadline:
+                raise TimeoutError("no leader answered in time")
+            time.sleep(0.01)
+
+    def _next_node(self) -> int:
+        return self._node_ids[(self._node_ids.index(self._leader) + 1) % len(self._node_ids)]
+
+
+def parse_cluster(value: str) -> dict[int, str | tuple[str, int]]:
+    """"1=/tmp/r1.sock,2=127.0.0.1:7001" 형식"""
+    cluster = {}
+    for part in value.split(","):
+        node_id, _, address = part.partition("=")
+        cluster[int(node_id)] = parse_address(address)
+    return cluster
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Raft replicated KVStore node")
+    parser.add_argument("--id", type=int, required=True)
+    parser.add_argument("--cluster", required=True, help="모든 노드의 RPC 주소: 1=/tmp/r1.sock,2=127.0.0.1:7002,...")
+    parser.add_argument("--data-dir", type=Path, required=True)
+    parser.add_argument("--unix", type=Path, help="클라이언트용 Unix 도메인 소켓 경로")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, help="클라이언트용 TCP 포트")
+    parser.add_argument("--election-timeout-ms", type=float, default=300, help="선출 시간 제한 (이 값과 두 배 사이 무작위)")
+    parser.add_argument("--heartbeat-ms", type=float, default=50)
+    parser.add_argument("--snapshot-entries", type=int, default=10_000)
+    parser.add_argument("--max-inflight", type=int, default=4, help="follower마다 응답 없이 보낼 AppendEntries 수")
+    args = parser.parse_args()
+    if (args.unix is None) == (args.port is None):
+        parser.error("exactly one of --unix or --port is required")
+
+    args.data_dir.mkdir(parents=True, exist_ok=True)
+    lock_fd = acquire_dir_lock(args.data_dir)
+    timeout = args.election_timeout_ms / 1000
+    node = RaftNode(
+        args.id, parse_cluster(args.cluster), args.data_dir,
+        election_timeout=(timeout, timeout * 2),
+        heartbeat_interval=args.heartbeat_ms / 1000,
+        snapshot_entries=args.snapshot_entries,
+        max_inflight=args.max_inflight,
+    )
+    server = KVServer(node, args.unix if args.unix is not None else (args.host, args.port))
+
+    def stop(signum, frame):
+        threading.Thread(target=server.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    address = server.address
+    print(f"listening on {address if isinstance(address, str) else f'{address[0]}:{address[1]}'}", flush=True)
+    try:
+        server.serve_forever()
+    finally:
+        server.close()
+        node.close()
+        os.close(lock_fd)
+
+
+if __name__ == "__main__":
+    main()
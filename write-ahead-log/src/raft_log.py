@@ -0,0 +1,194 @@
+"""Raft 로그 파일
+
+Raft 엔트리는 (index, term, payload)이고, 뒤쪽이 leader와 충돌하면 잘라내고(truncate_after),
+스냅샷이 덮은 앞쪽은 버린다(compact). WAL 세그먼트는 레코드에 term을 담을 자리가 없으므로 파일 하나에 따로 쓴다.
+
+파일 구조:
+    header: magic(4) | base_index(u64) | base_term(u64)
+    entry*: payload_len(u32) | crc32(u32) | term(u64) | payload
+- base_index/base_term: 스냅샷이 덮는 마지막 엔트리. 첫 엔트리의 index는 base_index + 1
+- crc32: term(8바이트) + payload의 CRC32. 손상/불완전한 엔트리부터 뒤는 열 때 잘라낸다 (fsync 전에 죽은 꼬리)
+- payload는 WALRecord 바이너리 프레임. 빈 payload는 leader가 당선 직후 넣는 no-op
+
+append는 OS에 쓰기만 하고, fsync는 sync()로 따로 한다. 여러 append를 fsync 한 번으로 묶기 위해서다.
+스레드 안전하지 않으므로 호출자(RaftNode)가 락으로 직렬화한다. 락 밖에서 fsync 하려면
+락 안에서 detach_sync()로 받은 함수를 부른다.
+"""
+import os
+import struct
+import zlib
+
+from collections.abc import Callable
+from pathlib import Path
+
+from src.segmented_wal import fsync_dir
+
+LOG_MAGIC = b"RFTL"
+LOG_HEADER = struct.Struct("<4sQQ")
+ENTRY_HEADER = struct.Struct("<IIQ")
+TERM = struct.Struct("<Q")
+
+
+class RaftLog:
+    def __init__(self, path: Path):
+        self._path = path
+        if not path.exists():
+            self._write_file(path, 0, 0, [])
+            fsync_dir(path.parent)
+
+        with open(path, "rb") as f:
+            data = f.read()
+        if len(data) < LOG_HEADER.size:
+            raise ValueError(f"raft log header is truncated: {path}")
+        magic, self._base_index, self._base_term = LOG_HEADER.unpack_from(data)
+        if magic != LOG_MAGIC:
+            raise ValueError(f"not a raft log: {path}")
+
+        # entries[i]는 index base_index + 1 + i, offsets[i]는 그 엔트리의 파일 위치
+        self._entries: list[tuple[int, bytes]] = []
+        self._offsets: list[int] = []
+        position = LOG_HEADER.size
+        while position + ENTRY_HEADER.size <= len(data):
+            length, checksum, term = ENTRY_HEADER.unpack_from(data, position)
+            end = position + ENTRY_HEADER.size + length
+            if end > len(data):
+                break
+            payload = data[position + ENTRY_HEADER.size:end]
+            if zlib.crc32(payload, zlib.crc32(TERM.pack(term))) != checksum:
+                break
+            self._entries.append((term, payload))
+            self._offsets.append(position)
+            position = end
+
+        self._file = open(path, "r+b", buffering=0)
+        if position < len(data):
+            self._file.truncate(position)
+        # 이전 프로세스가 sync 전에 죽었으면 꼬리 엔트리는 page cache에만 있다. 열 때 한 번 내려서
+        # 읽은 엔트리 전부를 fsync된 것으로 볼 수 있게 한다
+        os.fsync(self._file.fileno())
+        self._file.seek(position)
+        self._end = position
+
+    @property
+    def base_index(self) -> int:
+        return self._base_index
+
+    @property
+    def base_term(self) -> int:
+        return self._base_term
+
+    @property
+    def last_index(self) -> int:
+        return self._base_index + len(self._entries)
+
+    @property
+    def last_term(self) -> int:
+        return self._entries[-1][0] if self._entries else self._base_term
+
+    def term_at(self, index: int) -> int | None:
+        """index 엔트리의 term. base_index면 base_term, 로그 범위 밖이면 None"""
+        if index == self._base_index:
+            return self._base_term
+        if self._base_index < index <= self.last_index:
+            return self._entries[index - self._base_index - 1][0]
+        return None
+
+    def entries(self, start: int, end: int) -> list[tuple[int, bytes]]:
+        """[start, end] 구간의 (term, payload). start는 base_index보다 커야 한다"""
+        if start <= self._base_index:
+            raise IndexError(f"index {start} is compacted (base {self._base_index})")
+        return self._entries[start - self._base_index - 1:end - self._base_index]
+
+    def first_index_of_term(self, index: int) -> int:
+        """index와 같은 term이 시작되는 index (충돌 시 leader가 term 단위로 건너뛰도록 알려 준다)"""
+        term = self.term_at(index)
+        while index - 1 > self._base_index and self.term_at(index - 1) == term:
+            index -= 1
+        return index
+
+    def append(self, entries: list[tuple[int, bytes]]) -> None:
+        """엔트리를 이어 쓴다 (fsync는 하지 않음)"""
+        buffer = bytearray()
+        for term, payload in entries:
+            self._offsets.append(self._end + len(buffer))
+            buffer += ENTRY_HEADER.pack(len(payload), zlib.crc32(payload, zlib.crc32(TERM.pack(term))), term)
+            buffer += payload
+        self._file.write(buffer)
+        self._end += len(buffer)
+        self._entries.extend(entries)
+
+    def sync(self) -> None:
+        os.fsync(self._file.fileno())
+
+    def detach_sync(self) -> Callable[[], None]:
+        """지금까지 append 한 내용을 fsync 하는 함수를 반환한다 (WAL.detach_sync와 같은 방식)
+
+        fd를 복제해 두므로 반환된 함수는 락 밖에서 불러도 되고, 그 사이 compact가 파일을 닫고 교체해도
+        옛 파일을 fsync 할 뿐이다 (교체된 새 파일은 이미 fsync됨).
+        """
+        fd = os.dup(self._file.fileno())
+
+        def sync() -> None:
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+        return sync
+
+    def truncate_after(self, index: int) -> None:
+        """index 뒤의 엔트리를 모두 버린다 (leader와 충돌한 꼬리)"""
+        keep = index - self._base_index
+        if keep < 0:
+            raise IndexError(f"index {index} is compacted (base {self._base_index})")
+        if keep >= len(self._entries):
+            return
+        self._end = self._offsets[keep]
+        del self._entries[keep:]
+        del self._offsets[keep:]
+        self._file.truncate(self._end)
+        self._file.seek(self._end)
+        os.fsync(self._file.fileno())
+
+    def compact(self, index: int, term: int) -> None:
+        """index(term)까지를 스냅샷이 덮었으므로 버린다
+
+        index 엔트리가 같은 term으로 로그에 있으면 뒤쪽은 남기고, 아니면(스냅샷 설치) 로그 전체를 버린다.
+        남은 엔트리로 새 파일을 써서 rename으로 원자적으로 교체한다.
+        """
+        if index <= self._base_index:
+            return
+        if self.term_at(index) == term:
+            remaining = self._entries[index - self._base_index:]
+        else:
+            remaining = []
+
+        tmp_path = self._path.with_name(self._path.name + ".tmp")
+        self._write_file(tmp_path, index, term, remaining)
+        self._file.close()
+        os.rename(tmp_path, self._path)
+        fsync_dir(self._path.parent)
+
+        self._base_index, self._base_term = index, term
+        self._entries = remaining
+        self._offsets = []
+        position = LOG_HEADER.size
+        for _, payload in remaining:
+            self._offsets.append(position)
+            position += ENTRY_HEADER.size + len(payload)
+        self._file = open(self._path, "r+b", buffering=0)
+        self._file.seek(position)
+        self._end = position
+
+    def close(self) -> None:
+        self._file.close()
+
+    @staticmethod
+    def _write_file(path: Path, base_index: int, base_term: int, entries: list[tuple[int, bytes]]) -> None:
+        with open(path, "wb") as f:
+            f.write(LOG_HEADER.pack(LOG_MAGIC, base_index, base_term))
+            for term, payload in entries:
+                f.write(ENTRY_HEADER.pack(len(payload), zlib.crc32(payload, zlib.crc32(TERM.pack(term))), term))
+                f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
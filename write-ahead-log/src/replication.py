@@ -0,0 +1,586 @@
+"""leader-follower WAL 복제
+
+leader KVStore가 커밋한 WAL 레코드를 (시작 LSN, 끝 LSN)과 함께 follower 프로세스에 소켓으로 흘려보내고,
+follower는 받은 레코드를 자기 KVStore에 같은 순서로 적용한다. follower는 읽기 전용으로 get/scan을 처리하므로
+읽기 부하를 여러 프로세스로 나눌 수 있다.
+
+    leader = ReplicationLeader(store, "/tmp/repl.sock", ack_mode="quorum", followers=2)
+    follower = ReplicationFollower(follower_dir, "/tmp/repl.sock")   # 다른 프로세스에서
+    follower.get("k")
+
+LSN은 leader WAL의 전역 바이트 오프셋이다. follower는 "여기까지 적용했다"는 leader LSN을
+예약 key(REPLICATION_LSN_KEY)에 적용한 레코드와 같은 배치로 기록하므로, 크래시가 나도 적용 상태와 어긋나지 않는다.
+leader store는 복제 중에 이 key에 대한 쓰기를 거부한다 (복제되면 follower의 재개 위치를 덮어쓴다).
+
+접속 (follower -> leader HELLO에 적용한 LSN을 담아 보냄)
+1. leader는 follower를 라이브 스트림에 등록한 뒤 스냅샷을 떠서 시점 E(스냅샷 LSN)를 정한다
+2. 따라잡기: follower LSN == E면 할 일이 없고, leader 디스크의 WAL에 [follower LSN, E)가 그대로 남아 있으면
+   그 구간(WAL tail)을 보낸다. 체크포인트가 이미 지운 구간이면 스냅샷 전체(체크포인트에 해당)를 보낸다
+3. 이후 라이브 스트림에서 E 이상 레코드만 보낸다 (1과 2 사이에 커밋된 E 미만 레코드는 스냅샷/tail에 이미 있음)
+
+스냅샷 설치는 받은 key를 쓰고 마지막에 스냅샷에 없던 key를 지운 뒤 LSN을 기록한다. 도중에 끊기면
+LSN이 그대로이므로 다시 접속해서 처음부터 받는다 (그동안 follower 읽기에는 섞인 상태가 보일 수 있다).
+
+ack 모드 (AckMode)
+- async: 커밋은 follower를 기다리지 않는다
+- one: follower 하나가 자기 디스크에 fsync했다고 ack할 때까지 put이 기다린다
+- quorum: leader를 포함한 클러스터(followers + 1)의 과반이 될 만큼 follower ack를 기다린다
+ack_timeout 안에 ack가 모자라면 ReplicationTimeoutError. 이때 쓰기는 leader에는 이미 커밋되어 있다.
+
+follower가 max_lag_records 이상 뒤처지면 leader는 연결을 끊고, follower는 다시 접속해서 따라잡기부터 한다.
+
+프로토콜은 src/protocol.py의 프레임을 그대로 쓰고 code만 ReplicationOp로 구분한다 (request_id는 0).
+- HELLO, ACK: lsn(u64)
+- RECORDS: count(u32) | (lsn(u64), end(u64), len(u32), WAL 바이너리 프레임)*
+- SNAPSHOT_BEGIN, SNAPSHOT_END: lsn(u64)    SNAPSHOT_CHUNK: SCAN 응답과 같은 (key, value) 목록
+
+실행 (클라이언트용 KV 서버와 복제 소켓을 함께 연다):
+  python -m src.replication --data-dir ./leader --unix /tmp/kv.sock --listen /tmp/repl.sock --ack-mode one
+  python -m src.replication --data-dir ./follower --unix /tmp/kv-f1.sock --follow /tmp/repl.sock
+"""
+import argparse
+import os
+import signal
+import socket
+import socketserver
+import struct
+import threading
+
+from collections.abc import Iterable, Iterator
+from enum import Enum, IntEnum
+from pathlib import Path
+
+from src.kv_store import KVStore
+from src.memtable import prefix_end
+from src.protocol import (
+    LENGTH,
+    ProtocolError,
+    decode_frames,
+    decode_scan_response,
+    encode_frame,
+    encode_scan_response,
+)
+from src.server import RECV_SIZE, KVServer, acquire_dir_lock, create_server, parse_address
+from src.wal_record import RecordType, WALRecord
+
+# follower가 적용한 마지막 leader LSN. follower의 get/scan에는 보이지 않는다
+REPLICATION_LSN_KEY = "\x00replication-lsn"
+LSN = struct.Struct("<Q")
+RECORD_HEADER = struct.Struct("<QQI")
+# RECORDS / SNAPSHOT_CHUNK 프레임 하나에 담는 대략적인 최대 크기
+MAX_CHUNK_BYTES = 1024 * 1024
+
+
+class ReplicationOp(IntEnum):
+    HELLO = 1
+    RECORDS = 2
+    SNAPSHOT_BEGIN = 3
+    SNAPSHOT_CHUNK = 4
+    SNAPSHOT_END = 5
+    ACK = 6
+
+
+class AckMode(Enum):
+    ASYNC = "async"
+    ONE = "one"
+    QUORUM = "quorum"
+
+
+class ReplicationTimeoutError(Exception):
+    """ack_timeout 안에 필요한 follower ack를 받지 못함 (쓰기는 leader에 이미 커밋됨)"""
+
+
+class ReadOnlyReplicaError(Exception):
+    """follower에는 쓸 수 없음"""
+
+
+def encode_records(entries: list[tuple[int, int, WALRecord]]) -> bytes:
+    parts = [LENGTH.pack(len(entries))]
+    for lsn, end, record in entries:
+        data = record.serialize_binary()
+        parts.append(RECORD_HEADER.pack(lsn, end, len(data)))
+        parts.append(data)
+    return b"".join(parts)
+
+
+def decode_records(body: bytes) -> list[tuple[int, int, WALRecord]]:
+    count, = LENGTH.unpack_from(body)
+    offset = LENGTH.size
+    entries = []
+    for _ in range(count):
+        if offset + RECORD_HEADER.size > len(body):
+            raise ProtocolError("truncated body")
+        lsn, end, length = RECORD_HEADER.unpack_from(body, offset)
+        offset += RECORD_HEADER.size
+        if offset + length > len(body):
+            raise ProtocolError("truncated body")
+        entries.append((lsn, end, WALRecord.deserialize_binary(body[offset:offset + length])))
+        offset += length
+    return entries
+
+
+def _chunks(items: Iterable, size_of) -> Iterator[list]:
+    """항목들을 대략 MAX_CHUNK_BYTES 크기의 묶음으로 나눈다"""
+    chunk, size = [], 0
+    for item in items:
+        chunk.append(item)
+        size += size_of(item)
+        if size >= MAX_CHUNK_BYTES:
+            yield chunk
+            chunk, size = [], 0
+    if chunk:
+        yield chunk
+
+
+class _Channel:
+    """소켓 하나 위의 프레임 송수신"""
+
+    def __init__(self, sock: socket.socket):
+        self._sock = sock
+        self._buffer = bytearray()
+        self._frames: list[tuple[int, bytes]] = []
+
+    def send(self, code: ReplicationOp, body: bytes = b"") -> None:
+        self._sock.sendall(encode_frame(0, code, body))
+
+    def receive(self) -> tuple[ReplicationOp, bytes]:
+        """다음 프레임을 (code, body)로 반환. 상대가 연결을 닫으면 ConnectionError"""
+        while not self._frames:
+            data = self._sock.recv(RECV_SIZE)
+            if not data:
+                raise ConnectionError("peer closed the connection")
+            self._buffer += data
+            self._frames = [(code, body) for _, code, body in decode_frames(self._buffer)]
+        code, body = self._frames.pop(0)
+        return ReplicationOp(code), body
+
+    def close(self) -> None:
+        try:
+            self._sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._sock.close()
+
+
+class _FollowerSession:
+    """leader 쪽에서 본 follower 연결 하나"""
+
+    def __init__(self, acked_lsn: int):
+        self.acked_lsn = acked_lsn
+        # 커밋됐지만 아직 보내지 않은 (lsn, end, record). cond로 보호
+        self.pending: list[tuple[int, int, WALRecord]] = []
+        self.closed = False
+        self.cond = threading.Condition()
+
+    def close(self) -> None:
+        with self.cond:
+            self.closed = True
+            self.cond.notify_all()
+
+
+class _ReplicationHandler(socketserver.BaseRequestHandler):
+    def handle(self) -> None:
+        self.server.leader._serve_follower(self.request)
+
+
+class ReplicationLeader:
+    """store의 커밋을 follower에게 보낸다. 생성하면 바로 address에서 follower 접속을 받기 시작한다"""
+
+    def __init__(
+        self,
+        store: KVStore,
+        address: str | Path | tuple[str, int],
+        ack_mode: AckMode | str = AckMode.ASYNC,
+        followers: int = 1,
+        ack_timeout: float = 5.0,
+        max_lag_records: int = 100_000,
+    ):
+        """followers는 클러스터의 follower 수 (quorum 크기 계산용)"""
+        self._ack_mode = AckMode(ack_mode)
+        if self._ack_mode != AckMode.ASYNC and followers < 1:
+            raise ValueError("followers must be at least 1 when waiting for acks")
+        self._store = store
+        self._ack_timeout = ack_timeout
+        self._max_lag_records = max_lag_records
+        if self._ack_mode == AckMode.ASYNC:
+            self._required_acks = 0
+        elif self._ack_mode == AckMode.ONE:
+            self._required_acks = 1
+        else:
+            # 클러스터 N = followers + 1의 과반 N // 2 + 1에서 leader 자신을 뺀 수
+            self._required_acks = (followers + 1) // 2
+
+        self._lock = threading.Lock()
+        self._acked = threading.Condition(self._lock)
+        self._sessions: set[_FollowerSession] = set()
+        self._channels: set[_Channel] = set()
+        self._closed = False
+
+        self._server = create_server(address, _ReplicationHandler)
+        self._server.leader = self
+        self._unix_path = None if isinstance(address, tuple) else Path(address)
+        self._thread = threading.Thread(target=self._server.serve_forever, name="kv-replication-leader", daemon=True)
+        self._thread.start()
+        store.set_replication(self)
+
+    @property
+    def address(self) -> str | tuple[str, int]:
+        return self._server.server_address
+
+    @property
+    def ack_mode(self) -> AckMode:
+        return self._ack_mode
+
+    @property
+    def reserved_keys(self) -> frozenset[str]:
+        """follower가 적용 위치를 기록하는 key. leader store에 쓰면 follower의 재개 위치를 덮으므로 거부된다"""
+        return frozenset({REPLICATION_LSN_KEY})
+
+    def follower_lsns(self) -> list[int]:
+        """접속 중인 follower가 ack한 LSN 목록"""
+        with self._lock:
+            return sorted(session.acked_lsn for session in self._sessions)
+
+    def publish(self, entries: list[tuple[int, int, WALRecord]]) -> None:
+        """커밋된 레코드를 접속 중인 follower의 대기열에 넣는다 (KVStore가 store 락 안에서 호출)"""
+        with self._lock:
+            sessions = list(self._sessions)
+        for session in sessions:
+            with session.cond:
+                if session.closed:
+                    continue
+                session.pending.extend(entries)
+                if len(session.pending) > self._max_lag_records:
+                    # 너무 뒤처진 follower는 끊고, 다시 접속하면 WAL tail이나 스냅샷으로 따라잡게 한다
+                    session.closed = True
+                session.cond.notify_all()
+
+    def wait(self, end_lsn: int) -> None:
+        """ack 모드가 요구하는 수의 follower가 end_lsn까지 ack할 때까지 기다린다"""
+        if self._required_acks == 0:
+            return
+        with self._acked:
+            satisfied = self._acked.wait_for(
+                lambda: self._closed or sum(s.acked_lsn >= end_lsn for s in self._sessions) >= self._required_acks,
+                timeout=self._ack_timeout,
+            )
+            if not satisfied or self._closed:
+                raise ReplicationTimeoutError(
+                    f"{self._ack_mode.value} ack for lsn {end_lsn} not received within {self._ack_timeout}s"
+                )
+
+    def close(self) -> None:
+        """store 연결을 끊고 follower 연결을 모두 닫는다 (store는 닫지 않음)"""
+        self._store.set_replication(None)
+        self._server.shutdown()
+        self._server.server_close()
+        if self._unix_path is not None:
+            self._unix_path.unlink(missing_ok=True)
+        with self._acked:
+            self._closed = True
+            sessions, channels = list(self._sessions), list(self._channels)
+            self._acked.notify_all()
+        for session in sessions:
+            session.close()
+        for channel in channels:
+            channel.close()
+
+    def _serve_follower(self, sock: socket.socket) -> None:
+        channel = _Channel(sock)
+        session = None
+        try:
+            code, body = channel.receive()
+            if code != ReplicationOp.HELLO:
+                return
+            from_lsn, = LSN.unpack(body)
+            session = _FollowerSession(from_lsn)
+            with self._lock:
+                if self._closed:
+                    return
+                # 스냅샷보다 먼저 등록해야 스냅샷 이후의 커밋을 놓치지 않는다
+                self._sessions.add(session)
+                self._channels.add(channel)
+
+            # 따라잡는 동안에도 ack를 읽어야 follower가 ack 송신에서 막히지 않는다
+            threading.Thread(
+                target=self._read_acks, args=(channel, session), name="kv-replication-acks", daemon=True,
+            ).start()
+            stream_from = self._catch_up(channel, from_lsn)
+            self._stream(channel, session, stream_from)
+        except (OSError, ProtocolError, ValueError):
+            # 연결이 끊겼거나 잘못된 프레임. follower가 다시 접속한다
+            pass
+        finally:
+            with self._acked:
+                if session is not None:
+                    self._sessions.discard(session)
+                self._channels.discard(channel)
+                self._acked.notify_all()
+            if session is not None:
+                session.close()
+            channel.close()
+
+    def _catch_up(self, channel: _Channel, from_lsn: int) -> int:
+        """from_lsn부터 스냅샷 시점까지 보내고 그 시점 LSN(라이브 스트림 시작점)을 반환"""
+        with self._store.snapshot() as snapshot:
+            target = snapshot.lsn
+            if from_lsn == target:
+                return target
+            if from_lsn < target and self._send_wal_tail(channel, from_lsn, target):
+                return target
+
+            channel.send(ReplicationOp.SNAPSHOT_BEGIN, LSN.pack(target))
+            for chunk in _chunks(snapshot.scan(), lambda item: len(item[0]) + len(item[1])):
+                channel.send(ReplicationOp.SNAPSHOT_CHUNK, encode_scan_response(chunk, False))
+            channel.send(ReplicationOp.SNAPSHOT_END, LSN.pack(target))
+            return target
+
+    def _send_wal_tail(self, channel: _Channel, from_lsn: int, target: int) -> bool:
+        """leader WAL에 [from_lsn, target)이 모두 남아 있으면 보내고 True. 첫 레코드부터 없으면 False"""
+        entries = self._store.wal_entries(from_lsn, target)
+        try:
+            first = next(entries, None)
+        except FileNotFoundError:
+            # 읽는 도중 체크포인트가 세그먼트를 지움
+            return False
+        if first is None or first[0] != from_lsn:
+            return False
+
+        def with_first() -> Iterator[tuple[int, int, WALRecord]]:
+            yield first
+            yield from entries
+
+        expected = from_lsn
+        for chunk in _chunks(with_first(), lambda entry: entry[1] - entry[0]):
+            if chunk[0][0] != expected:
+                raise ProtocolError(f"gap in leader WAL at lsn {expected}")
+            expected = chunk[-1][1]
+            channel.send(ReplicationOp.RECORDS, encode_records(chunk))
+        if expected != target:
+            # 손상으로 WAL 읽기가 중간에 멈춤. 연결을 끊는다
+            raise ProtocolError(f"leader WAL ends at lsn {expected}, expected {target}")
+        return True
+
+    def _stream(self, channel: _Channel, session: _FollowerSession, stream_from: int) -> None:
+        while True:
+            with session.cond:
+                while not session.pending and not session.closed:
+                    session.cond.wait()
+                if session.closed:
+                    return
+                entries, session.pending = session.pending, []
+            entries = [entry for entry in entries if entry[0] >= stream_from]
+            for chunk in _chunks(entries, lambda entry: entry[1] - entry[0]):
+                channel.send(ReplicationOp.RECORDS, encode_records(chunk))
+
+    def _read_acks(self, channel: _Channel, session: _FollowerSession) -> None:
+        try:
+            while True:
+                code, body = channel.receive()
+                if code == ReplicationOp.ACK:
+                    lsn, = LSN.unpack(body)
+                    with self._acked:
+                        session.acked_lsn = max(session.acked_lsn, lsn)
+                        self._acked.notify_all()
+        except (OSError, ProtocolError, ValueError, struct.error):
+            session.close()
+
+
+class ReplicationFollower:
+    """leader의 레코드를 받아 자기 KVStore(data_dir)에 적용하는 읽기 전용 복제본
+
+    백그라운드 스레드가 leader에 접속하고, 연결이 끊기면 retry_interval마다 다시 접속한다.
+    store_options는 KVStore에 그대로 넘긴다.
+    """
+
+    def __init__(
+        self, data_dir: Path, leader_address: str | Path | tuple[str, int], retry_interval: float = 0.2,
+        **store_options,
+    ):
+        self._store = KVStore(data_dir=data_dir, **store_options)
+        self._leader_address = leader_address
+        self._retry_interval = retry_interval
+        marker = self._store.get(REPLICATION_LSN_KEY)
+        self._applied_lsn = int(marker) if marker is not None else 0
+        self._applied = threading.Condition()
+        self._stopping = threading.Event()
+        self._channel: _Channel | None = None
+        self._thread = threading.Thread(target=self._run, name="kv-replication-follower", daemon=True)
+        self._thread.start()
+
+    @property
+    def store(self) -> KVStore:
+        return self._store
+
+    @property
+    def applied_lsn(self) -> int:
+        """적용을 마친 leader LSN (이 LSN 미만의 leader 레코드가 모두 반영됨)"""
+        return self._applied_lsn
+
+    def wait_for_lsn(self, lsn: int, timeout: float | None = None) -> bool:
+        """applied_lsn이 lsn 이상이 될 때까지 기다린다 (read-your-writes용). 시간 초과면 False"""
+        with self._applied:
+            return self._applied.wait_for(lambda: self._applied_lsn >= lsn, timeout=timeout)
+
+    def get(self, key: str) -> str | None:
+        if key == REPLICATION_LSN_KEY:
+            return None
+        return self._store.get(key)
+
+    def scan(self, start: str | None = None, end: str | None = None, reverse: bool = False) -> Iterator[tuple[str, str]]:
+        return ((key, value) for key, value in self._store.scan(start, end, reverse) if key != REPLICATION_LSN_KEY)
+
+    def prefix(self, prefix: str, reverse: bool = False) -> Iterator[tuple[str, str]]:
+        return self.scan(prefix, prefix_end(prefix), reverse)
+
+    def put(self, key: str, value: str) -> None:
+        raise ReadOnlyReplicaError("follower is read-only")
+
+    def delete(self, key: str) -> None:
+        raise ReadOnlyReplicaError("follower is read-only")
+
+    def write_batch(self, operations: Iterable[WALRecord] | None = None) -> None:
+        raise ReadOnlyReplicaError("follower is read-only")
+
+    def close(self) -> None:
+        self._stopping.set()
+        channel = self._channel
+        if channel is not None:
+            channel.close()
+        self._thread.join()
+        self._store.close()
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                sock = self._connect()
+            except OSError:
+                self._stopping.wait(self._retry_interval)
+                continue
+            self._channel = _Channel(sock)
+            try:
+                if self._stopping.is_set():
+                    return
+                self._follow(self._channel)
+            except (OSError, ProtocolError, ValueError, struct.error):
+                pass
+            finally:
+                self._channel.close()
+                self._channel = None
+            self._stopping.wait(self._retry_interval)
+
+    def _connect(self) -> socket.socket:
+        if isinstance(self._leader_address, tuple):
+            sock = socket.create_connection(self._leader_address)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            return sock
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(str(self._leader_address))
+        except OSError:
+            sock.close()
+            raise
+        return sock
+
+    def _follow(self, channel: _Channel) -> None:
+        channel.send(ReplicationOp.HELLO, LSN.pack(self._applied_lsn))
+        snapshot_keys: set[str] | None = None
+        while True:
+            code, body = channel.receive()
+            if code == ReplicationOp.RECORDS:
+                self._apply_records(decode_records(body))
+            elif code == ReplicationOp.SNAPSHOT_BEGIN:
+                snapshot_keys = set()
+            elif code == ReplicationOp.SNAPSHOT_CHUNK:
+                if snapshot_keys is None:
+                    raise ProtocolError("snapshot chunk without begin")
+                entries, _ = decode_scan_response(body)
+                self._store.write_batch([WALRecord(RecordType.PUT, key, value) for key, value in entries])
+                snapshot_keys.update(key for key, _ in entries)
+            elif code == ReplicationOp.SNAPSHOT_END:
+                if snapshot_keys is None:
+                    raise ProtocolError("snapshot end without begin")
+                lsn, = LSN.unpack(body)
+                # 스냅샷에 없던 key는 leader에서 지워진 것
+                stale = [
+                    WALRecord(RecordType.DEL, key) for key, _ in self.scan() if key not in snapshot_keys
+                ]
+                self._commit_applied(stale, lsn)
+                snapshot_keys = None
+            else:
+                raise ProtocolError(f"unexpected replication op: {code}")
+            if code in (ReplicationOp.RECORDS, ReplicationOp.SNAPSHOT_END):
+                channel.send(ReplicationOp.ACK, LSN.pack(self._applied_lsn))
+
+    def _apply_records(self, entries: list[tuple[int, int, WALRecord]]) -> None:
+        operations = []
+        end = self._applied_lsn
+        for lsn, record_end, record in entries:
+            if record_end <= end:
+                # 재접속 직후 이미 적용한 레코드
+                continue
+            if lsn != end:
+                raise ProtocolError(f"expected record at lsn {end}, got {lsn}")
+            if record.record_type == RecordType.BATCH:
+                operations.extend(record.records)
+            else:
+                operations.append(record)
+            end = record_end
+        if end != self._applied_lsn:
+            self._commit_applied(operations, end)
+
+    def _commit_applied(self, operations: list[WALRecord], lsn: int) -> None:
+        """operations와 적용 LSN을 배치 하나로 커밋 (둘이 함께 반영되거나 함께 빠진다)"""
+        self._store.write_batch(operations + [WALRecord(RecordType.PUT, REPLICATION_LSN_KEY, str(lsn))])
+        with self._applied:
+            self._applied_lsn = lsn
+            self._applied.notify_all()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="replicated KVStore server")
+    parser.add_argument("--data-dir", type=Path, required=True)
+    parser.add_argument("--unix", type=Path, required=True, help="클라이언트용 Unix 도메인 소켓 경로")
+    role = parser.add_mutually_exclusive_group(required=True)
+    role.add_argument("--listen", help="leader: follower 접속을 받을 주소 (소켓 경로 또는 host:port)")
+    role.add_argument("--follow", help="follower: leader 복제 주소")
+    parser.add_argument("--ack-mode", choices=[mode.value for mode in AckMode], default=AckMode.ASYNC.value)
+    parser.add_argument("--followers", type=int, default=1)
+    parser.add_argument("--ack-timeout", type=float, default=5.0)
+    args = parser.parse_args()
+
+    args.data_dir.mkdir(parents=True, exist_ok=True)
+    lock_fd = acquire_dir_lock(args.data_dir)
+
+    leader = follower = None
+    if args.listen is not None:
+        store = KVStore(data_dir=args.data_dir, group_commit=True)
+        leader = ReplicationLeader(
+            store, parse_address(args.listen), args.ack_mode, args.followers, args.ack_timeout,
+        )
+        server = KVServer(store, args.unix)
+    else:
+        follower = ReplicationFollower(args.data_dir, parse_address(args.follow))
+        server = KVServer(follower, args.unix)
+
+    def stop(signum, frame):
+        threading.Thread(target=server.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    print(f"listening on {server.address}", flush=True)
+    try:
+        server.serve_forever()
+    finally:
+        server.close()
+        if leader is not None:
+            leader.close()
+            store.close()
+        else:
+            follower.close()
+        os.close(lock_fd)
+
+
+if __name__ == "__main__":
+    main()
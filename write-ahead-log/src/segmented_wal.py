@@ -0,0 +1,280 @@
+"""세그먼트 단위로 나뉜 WAL
+
+하나의 wal.log 대신 번호가 붙은 세그먼트 파일(wal-<시작 LSN>.log)에 순서대로 기록한다.
+- LSN: 로그 전체에서의 논리적 바이트 위치. 세그먼트 파일 이름이 그 세그먼트의 시작 LSN
+- 활성 세그먼트가 segment_size를 넘으면 다음 append 전에 새 세그먼트로 롤링
+- 체크포인트가 커버한 오래된 세그먼트는 truncate 대신 파일 단위로 unlink
+- 미리 할당 모드(preallocate_bytes)에서는 세그먼트를 지우는 대신 0으로 채워 다음 롤링에 재활용할 수 있다
+  (wal-free-<번호>.tmp → 0으로 채운 뒤 wal-free-<번호>.log). 재활용 파일은 블록이 이미 할당되고 쓰인 상태라
+  덮어쓰기만 하므로 fdatasync가 크기/extent 메타데이터를 기록하지 않는다
+"""
+import os
+import threading
+
+from collections.abc import Callable, Iterator
+from pathlib import Path
+
+from src.wal import WAL, ZERO_BLOCK
+from src.wal_mmap_reader import MmapWALReader, RecordView, scan_valid_end
+from src.wal_record import WALFormat, WALRecord
+
+SEGMENT_PREFIX = "wal-"
+SEGMENT_SUFFIX = ".log"
+FREE_PREFIX = "wal-free-"
+DEFAULT_SEGMENT_SIZE = 64 * 1024 * 1024
+
+
+def segment_path(directory: Path, start_lsn: int) -> Path:
+    return Path(directory) / f"{SEGMENT_PREFIX}{start_lsn:020d}{SEGMENT_SUFFIX}"
+
+
+def list_segments(directory: Path) -> list[tuple[int, Path]]:
+    """(시작 LSN, 경로) 목록을 LSN 순으로 반환"""
+    segments = []
+    for path in Path(directory).glob(f"{SEGMENT_PREFIX}*{SEGMENT_SUFFIX}"):
+        number = path.name[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)]
+        if number.isdigit():
+            segments.append((int(number), path))
+    return sorted(segments)
+
+
+# 파일 생성/삭제/rename은 디렉터리 엔트리가 fsync 되어야 영구 반영됨
+def fsync_dir(directory: Path) -> None:
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class SegmentedWAL:
+    def __init__(
+        self,
+        directory: Path,
+        segment_size: int = DEFAULT_SEGMENT_SIZE,
+        post_append_hook: Callable[[], None] | None = None,
+        post_flush_hook: Callable[[], None] | None = None,
+        post_sync_hook: Callable[[], None] | None = None,
+        wal_format: WALFormat = WALFormat.JSON,
+        preallocate_bytes: int | None = None,
+        recycle_segments: int = 0,
+        direct_io: bool = False,
+    ):
+        if segment_size <= 0:
+            raise ValueError("segment_size must be positive")
+        if preallocate_bytes is not None and (preallocate_bytes <= 0 or wal_format != WALFormat.BINARY):
+            raise ValueError("preallocate_bytes must be positive and requires the binary WAL format")
+        if recycle_segments and preallocate_bytes is None:
+            raise ValueError("recycle_segments requires preallocate_bytes")
+        if direct_io and preallocate_bytes is None:
+            raise ValueError("direct_io requires preallocate_bytes")
+
+        self._directory = Path(directory)
+        self._segment_size = segment_size
+        self._wal_format = wal_format
+        self._hooks = {
+            "post_append_hook": post_append_hook,
+            "post_flush_hook": post_flush_hook,
+            "post_sync_hook": post_sync_hook,
+        }
+        self._preallocate_bytes = preallocate_bytes
+        self._recycle_segments = recycle_segments
+        self._direct_io = direct_io
+        # 재활용 대기 파일: 0으로 채워 바로 쓸 수 있는 것(_free)과 아직 채우기 전인 것(_retired, (경로, 기록된 바이트))
+        # truncate_before/롤링(store 락 안)과 recycle(락 밖)이 함께 건드리므로 따로 보호
+        self._free_lock = threading.Lock()
+        self._free: list[Path] = []
+        self._retired: list[tuple[Path, int]] = []
+        self._next_free_id = 0
+        for path in sorted(self._directory.glob(f"{FREE_PREFIX}*")):
+            number = path.stem[len(FREE_PREFIX):]
+            if number.isdigit():
+                self._next_free_id = max(self._next_free_id, int(number) + 1)
+            # 0으로 채우다 만 파일은 내용을 알 수 없으므로 버린다
+            if path.suffix == SEGMENT_SUFFIX and recycle_segments:
+                self._free.append(path)
+            else:
+                path.unlink()
+
+        self._segment_starts = [start for start, _ in list_segments(self._directory)]
+        if not self._segment_starts:
+            self._segment_starts.append(0)
+            self._active = self._open_segment(0)
+            fsync_dir(self._directory)
+        else:
+            # 끝부분 불완전 레코드를 잘라내야 그 뒤에 붙는 새 레코드가 replay 됨
+            # 활성(마지막) 세그먼트만 스캔하면 되므로 세그먼트 크기만큼만 읽음
+            # (미리 할당된 세그먼트는 WAL이 열면서 프레임으로 끝을 찾고 그 뒤를 정리한다)
+            self._active = self._open_segment(self._segment_starts[-1])
+            if not self._active.preallocated:
+                valid_end = scan_valid_end(self._active.path)
+                if valid_end < self._active.position:
+                    self._active.rollback(valid_end)
+
+    @property
+    def segments(self) -> list[tuple[int, Path]]:
+        return [(start, segment_path(self._directory, start)) for start in self._segment_starts]
+
+    # 커밋된 레코드가 sync 전까지 프로세스 메모리(정렬 버퍼)에만 있을 수 있는가 (WAL.direct_io)
+    @property
+    def direct_io(self) -> bool:
+        return self._active.direct_io
+
+    @property
+    def active_start_lsn(self) -> int:
+        return self._segment_starts[-1]
+
+    # 다음 레코드가 기록될 LSN
+    @property
+    def end_lsn(self) -> int:
+        return self.active_start_lsn + self._active.position
+
+    def append(self, record: WALRecord) -> int:
+        """레코드를 기록하고 레코드의 시작 LSN을 반환"""
+        if self._active.position >= self._segment_size and self._active_has_records():
+            self.roll()
+
+        return self.active_start_lsn + self._active.append(record)
+
+    def sync(self) -> None:
+        self._active.sync()
+
+    def flush(self) -> None:
+        self._active.flush()
+
+    def detach_sync(self) -> Callable[[], None]:
+        """활성 세그먼트에 flush 된 내용을 락 밖에서 fsync 하는 함수 (WAL.detach_sync)
+
+        이전 세그먼트는 롤링할 때 이미 sync 했으므로 활성 세그먼트만 보면 된다.
+        """
+        return self._active.detach_sync()
+
+    def roll(self) -> int:
+        """새 세그먼트로 롤링하고 새 세그먼트의 시작 LSN을 반환 (활성 세그먼트가 비어 있으면 롤링하지 않음)"""
+        if not self._active_has_records():
+            return self.active_start_lsn
+
+        # 이전 세그먼트에 sync 안 된 레코드가 남으면 안 됨
+        self._active.sync()
+        start_lsn = self.end_lsn
+        self._active.close()
+
+        self._segment_starts.append(start_lsn)
+        self._active = self._open_segment(start_lsn)
+        fsync_dir(self._directory)
+        return start_lsn
+
+    def rollback(self, lsn: int) -> None:
+        """lsn 이후 기록을 모두 버린다. 롤링 이후 세그먼트도 삭제"""
+        if lsn < self.active_start_lsn:
+            self._active.close()
+            while len(self._segment_starts) > 1 and self._segment_starts[-1] > lsn:
+                segment_path(self._directory, self._segment_starts.pop()).unlink(missing_ok=True)
+            self._active = self._open_segment(self._segment_starts[-1])
+            fsync_dir(self._directory)
+
+        self._active.rollback(lsn - self.active_start_lsn)
+
+    def truncate_before(self, lsn: int) -> None:
+        """lsn 이전 기록만 담긴 세그먼트를 삭제한다 (활성 세그먼트는 삭제하지 않음)
+
+        재활용 모드에서는 recycle_segments개까지 삭제 대신 재활용 대기로 돌린다 (recycle()이 0으로 채움).
+        """
+        removed = False
+        while len(self._segment_starts) > 1 and self._segment_starts[1] <= lsn:
+            start = self._segment_starts.pop(0)
+            path = segment_path(self._directory, start)
+            with self._free_lock:
+                if len(self._free) + len(self._retired) < self._recycle_segments:
+                    free_path = self._directory / f"{FREE_PREFIX}{self._next_free_id:06d}.tmp"
+                    self._next_free_id += 1
+                    os.rename(path, free_path)
+                    # 다음 세그먼트 시작 LSN까지가 이 세그먼트에 기록된 바이트
+                    self._retired.append((free_path, self._segment_starts[0] - start))
+                else:
+                    path.unlink(missing_ok=True)
+            removed = True
+
+        if removed:
+            fsync_dir(self._directory)
+
+    def recycle(self) -> None:
+        """재활용 대기 세그먼트를 0으로 채워 다음 롤링이 쓸 수 있게 한다
+
+        세그먼트 하나만큼 순차 쓰기가 들므로 store 락 밖(체크포인트 스레드)에서 호출한다.
+        옛 레코드가 남아 있으면 새 레코드 뒤에 이어져 replay 될 수 있어서 기록된 구간을 전부 지운다.
+        """
+        with self._free_lock:
+            retired, self._retired = self._retired, []
+        if not retired:
+            return
+
+        for path, used in retired:
+            with open(path, "r+b") as f:
+                for pos in range(0, used, len(ZERO_BLOCK)):
+                    f.write(ZERO_BLOCK[:min(len(ZERO_BLOCK), used - pos)])
+                f.flush()
+                os.fsync(f.fileno())
+            ready = path.with_suffix(SEGMENT_SUFFIX)
+            os.rename(path, ready)
+            with self._free_lock:
+                self._free.append(ready)
+        fsync_dir(self._directory)
+
+    def close(self) -> None:
+        self._active.close()
+
+    def _active_has_records(self) -> bool:
+        return self._active.position > self._active.data_start
+
+    def _open_segment(self, start_lsn: int) -> WAL:
+        path = segment_path(self._directory, start_lsn)
+        if self._preallocate_bytes is not None and not path.exists():
+            with self._free_lock:
+                free = self._free.pop(0) if self._free else None
+            if free is not None:
+                # 호출자가 디렉터리를 fsync 한다
+                os.rename(free, path)
+        return WAL(
+            path,
+            wal_format=self._wal_format,
+            preallocate_bytes=self._preallocate_bytes,
+            direct_io=self._direct_io,
+            **self._hooks,
+        )
+
+    @classmethod
+    def read(cls, directory: Path, start_lsn: int = 0) -> Iterator[WALRecord]:
+        for _, _, record in cls.read_entries(directory, start_lsn):
+            yield record
+
+    @classmethod
+    def read_entries(cls, directory: Path, start_lsn: int = 0) -> Iterator[tuple[int, int, WALRecord]]:
+        """start_lsn 이후 레코드를 (시작 LSN, 끝 LSN, 레코드)로 순서대로 읽는다
+
+        어느 세그먼트에서든 손상된 레코드를 만나면 이후 세그먼트까지 포함해 중단한다.
+        """
+        for lsn, end, view in cls.read_views(directory, start_lsn):
+            yield lsn, end, view.to_record()
+
+    @classmethod
+    def read_views(cls, directory: Path, start_lsn: int = 0) -> Iterator[tuple[int, int, RecordView]]:
+        """read_entries와 같지만 mmap 위의 RecordView를 그대로 내보낸다 (payload 복사 없음)
+
+        RecordView는 다음 세그먼트로 넘어가면 무효가 되므로 받은 즉시 소비해야 한다.
+        """
+        segments = list_segments(directory)
+        for i, (segment_start, path) in enumerate(segments):
+            next_start = segments[i + 1][0] if i + 1 < len(segments) else None
+            if next_start is not None and next_start <= start_lsn:
+                continue
+
+            with MmapWALReader(path) as reader:
+                for view in reader:
+                    if segment_start + view.offset >= start_lsn:
+                        yield segment_start + view.offset, segment_start + view.end, view
+                    view = None
+
+                # 손상/불완전 레코드로 세그먼트가 중간에 끝났다면 이후 세그먼트로 넘어가지 않음
+                if not reader.complete:
+                    return
@@ -0,0 +1,220 @@
+"""KVStore 서버
+
+프로세스 하나가 data_dir의 KVStore를 열어 두고(복구는 한 번만), 여러 워커 프로세스가
+Unix 도메인 소켓이나 localhost TCP로 get/put/delete/batch/scan을 요청한다. 프로토콜은 src/protocol.py.
+
+- data_dir에 LOCK 파일을 flock으로 잡아서 같은 디렉터리를 두 프로세스가 동시에 열지 못하게 한다
+- 연결마다 스레드 하나. 한 연결에 쌓인 요청(파이프라이닝)은 순서대로 처리하고 응답을 모아 한 번에 보낸다
+- 여러 연결의 쓰기가 fsync 한 번으로 묶이도록 기본으로 그룹 커밋을 켠다
+
+실행:
+  python -m src.server --data-dir ./data --unix /tmp/kv.sock
+  python -m src.server --data-dir ./data --port 7070 [--shards 4] [--wal-format binary]
+"""
+import argparse
+import fcntl
+import itertools
+import os
+import signal
+import socket
+import socketserver
+import threading
+
+from pathlib import Path
+
+from src.kv_store import KVStore
+from src.protocol import (
+    BodyReader,
+    Op,
+    ProtocolError,
+    Status,
+    decode_batch,
+    decode_frames,
+    encode_frame,
+    encode_scan_response,
+    encode_str,
+)
+from src.sharded_kv_store import ShardedKVStore
+from src.wal_record import WALFormat
+
+LOCK_FILE_NAME = "LOCK"
+RECV_SIZE = 256 * 1024
+
+
+class DataDirLockedError(Exception):
+    pass
+
+
+def acquire_dir_lock(data_dir: Path) -> int:
+    """data_dir/LOCK에 배타 flock을 잡고 fd를 반환 (이미 다른 프로세스가 잡고 있으면 DataDirLockedError)
+
+    fd를 닫거나 프로세스가 끝나면(크래시 포함) 커널이 락을 풀어 준다.
+    """
+    fd = os.open(Path(data_dir) / LOCK_FILE_NAME, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        os.close(fd)
+        raise DataDirLockedError(f"{data_dir} is already opened by another process")
+    return fd
+
+
+def parse_address(value: str) -> str | tuple[str, int]:
+    """명령행 주소: host:port(또는 :port)면 TCP, 아니면 Unix 소켓 경로"""
+    host, sep, port = value.rpartition(":")
+    if sep and port.isdigit():
+        return host or "127.0.0.1", int(port)
+    return value
+
+
+class _RequestHandler(socketserver.BaseRequestHandler):
+    def setup(self) -> None:
+        if self.request.family in (socket.AF_INET, socket.AF_INET6):
+            self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def handle(self) -> None:
+        sock = self.request
+        buffer = bytearray()
+        while True:
+            try:
+                data = sock.recv(RECV_SIZE)
+            except OSError:
+                return
+            if not data:
+                return
+            buffer += data
+            try:
+                frames = decode_frames(buffer)
+            except ProtocolError:
+                # 프레임 경계를 잃었으므로 연결을 끊는 것 말고는 할 수 있는 게 없음
+                return
+            if frames:
+                sock.sendall(b"".join(self.server.kv.dispatch(*frame) for frame in frames))
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class _TCPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+def create_server(
+    address: str | Path | tuple[str, int], handler_class: type[socketserver.BaseRequestHandler],
+) -> socketserver.BaseServer:
+    """연결마다 스레드 하나를 쓰는 소켓 서버. address가 str/Path면 Unix 소켓, (host, port)면 TCP
+
+    Unix 소켓 파일이 남아 있으면 지운다. 이전 서버가 크래시로 남긴 것이고,
+    data_dir 락을 잡은 뒤에 호출되므로 살아 있는 서버 것은 아니다.
+    """
+    if isinstance(address, tuple):
+        return _TCPServer(address, handler_class)
+    Path(address).unlink(missing_ok=True)
+    return _UnixServer(str(address), handler_class)
+
+
+class KVServer:
+    """store를 소켓으로 내보낸다. address가 str/Path면 Unix 소켓, (host, port)면 TCP"""
+
+    def __init__(self, store: KVStore | ShardedKVStore, address: str | Path | tuple[str, int], scan_page_size: int = 1000):
+        self._store = store
+        self._scan_page_size = scan_page_size
+        self._unix_path = None if isinstance(address, tuple) else Path(address)
+        self._server = create_server(address, _RequestHandler)
+        self._server.kv = self
+
+    @property
+    def address(self) -> str | tuple[str, int]:
+        return self._server.server_address
+
+    def serve_forever(self) -> None:
+        self._server.serve_forever()
+
+    def shutdown(self) -> None:
+        """serve_forever를 멈춘다 (serve_forever를 돌리는 스레드가 아닌 곳에서 호출)"""
+        self._server.shutdown()
+
+    def close(self) -> None:
+        self._server.server_close()
+        if self._unix_path is not None:
+            self._unix_path.unlink(missing_ok=True)
+
+    def dispatch(self, request_id: int, code: int, body: bytes) -> bytes:
+        """요청 프레임 하나를 처리하고 응답 프레임을 반환"""
+        try:
+            status, response = self._execute(code, BodyReader(body))
+        except Exception as e:
+            status, response = Status.ERROR, encode_str(f"{type(e).__name__}: {e}")
+        return encode_frame(request_id, status, response)
+
+    def _execute(self, code: int, reader: BodyReader) -> tuple[Status, bytes]:
+        op = Op(code)
+        if op == Op.GET:
+            value = self._store.get(reader.required_str("key"))
+            if value is None:
+                return Status.NOT_FOUND, b""
+            return Status.OK, encode_str(value)
+        if op == Op.PUT:
+            key = reader.required_str("key")
+            self._store.put(key, reader.required_str("value"))
+        elif op == Op.DELETE:
+            self._store.delete(reader.required_str("key"))
+        elif op == Op.BATCH:
+            self._store.write_batch(decode_batch(reader))
+        elif op == Op.SCAN:
+            start, end, reverse, limit = reader.str(), reader.str(), bool(reader.u8()), reader.u32()
+            limit = min(limit, self._scan_page_size) if limit else self._scan_page_size
+            # 한 개 더 읽어서 다음 페이지가 있는지 알린다
+            entries = list(itertools.islice(self._store.scan(start, end, reverse), limit + 1))
+            return Status.OK, encode_scan_response(entries[:limit], len(entries) > limit)
+        return Status.OK, b""
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="KVStore server")
+    parser.add_argument("--data-dir", type=Path, required=True)
+    parser.add_argument("--unix", type=Path, help="Unix 도메인 소켓 경로")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, help="TCP 포트 (0이면 빈 포트)")
+    parser.add_argument("--shards", type=int, default=1, help="2 이상이면 ShardedKVStore")
+    parser.add_argument("--wal-format", choices=["json", "binary"], default="json")
+    parser.add_argument("--no-group-commit", action="store_true")
+    args = parser.parse_args()
+    if (args.unix is None) == (args.port is None):
+        parser.error("exactly one of --unix or --port is required")
+
+    args.data_dir.mkdir(parents=True, exist_ok=True)
+    lock_fd = acquire_dir_lock(args.data_dir)
+
+    options = {
+        "wal_format": WALFormat[args.wal_format.upper()],
+        "group_commit": not args.no_group_commit,
+    }
+    if args.shards > 1:
+        store = ShardedKVStore(args.data_dir, num_shards=args.shards, **options)
+    else:
+        store = KVStore(data_dir=args.data_dir, **options)
+
+    server = KVServer(store, args.unix if args.unix is not None else (args.host, args.port))
+
+    def stop(signum, frame):
+        # shutdown은 serve_forever가 끝나기를 기다리므로 다른 스레드에서 호출
+        threading.Thread(target=server.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    address = server.address
+    print(f"listening on {address if isinstance(address, str) else f'{address[0]}:{address[1]}'}", flush=True)
+    try:
+        server.serve_forever()
+    finally:
+        server.close()
+        store.close()
+        os.close(lock_fd)
+
+
+if __name__ == "__main__":
+    main()
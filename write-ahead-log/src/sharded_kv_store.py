@@ -0,0 +1,209 @@
+"""key를 해시로 나눠 여러 KVStore에 분산하는 샤딩 store
+
+KVStore 하나는 락 하나와 WAL fsync 스트림 하나로 모든 쓰기를 직렬화한다.
+ShardedKVStore는 key를 crc32(key) % num_shards로 나눠 shard마다 독립된 KVStore(락, WAL, 체크포인트)를 둔다.
+- shard는 data_dir/shard-000, shard-001, ... 에 있고, shard 수는 shards.json에 기록해 다른 값으로 열지 못하게 한다
+- 다른 shard의 쓰기는 서로 기다리지 않는다. fsync는 GIL을 놓으므로 shard 수만큼 fsync가 겹친다
+  (shard 디렉터리를 서로 다른 디스크에 두면 디스크 수만큼 늘어난다)
+- 복구는 shard마다 스레드 하나씩 병렬로 연다
+
+여러 shard에 걸친 write_batch는 intent log(data_dir/intents)로 원자성을 지킨다.
+1. 배치 전체를 intent log에 기록하고 fsync (커밋 지점, intent의 LSN이 배치 id)
+2. shard별 하위 배치에 "이 shard가 적용한 마지막 intent LSN"(INTENT_KEY)을 함께 넣어 각 shard에 커밋
+3. 다시 열 때 intent log의 각 intent를 INTENT_KEY가 그보다 작은 shard에만 다시 적용
+크래시가 나도 배치는 모든 shard에 적용되거나 어디에도 적용되지 않는다.
+2에서 shard 적용이 실패하면 다시 열어 3을 마칠 때까지 cross-shard 배치는 거부된다.
+단, 커밋 도중 다른 스레드의 읽기에는 shard별로 차례대로 보인다 (격리는 보장하지 않음).
+"""
+import json
+import os
+import threading
+import zlib
+
+from collections import defaultdict
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from src.kv_store import KVStore
+from src.memtable import merge_scans, prefix_end
+from src.segmented_wal import SegmentedWAL, fsync_dir
+from src.wal_record import RecordType, WALFormat, WALRecord
+from src.write_batch import WriteBatch
+
+SHARDS_META_NAME = "shards.json"
+INTENT_DIR_NAME = "intents"
+# shard마다 마지막으로 적용한 cross-shard intent의 LSN. 사용자 key로는 쓸 수 없다
+INTENT_KEY = "\x00intent"
+
+
+def shard_index(key: str, num_shards: int) -> int:
+    return zlib.crc32(key.encode("utf-8")) % num_shards
+
+
+def shard_dir_name(index: int) -> str:
+    return f"shard-{index:03d}"
+
+
+class ShardedKVStore:
+    def __init__(
+        self,
+        data_dir: Path,
+        num_shards: int = 4,
+        recovery_threads: int | None = None,
+        intent_segment_size: int = 4 * 1024 * 1024,
+        **store_options,
+    ):
+        """store_options는 shard마다 만드는 KVStore에 그대로 넘긴다"""
+        if num_shards <= 0:
+            raise ValueError("num_shards must be positive")
+        self._data_dir = Path(data_dir)
+        self._data_dir.mkdir(parents=True, exist_ok=True)
+        self._num_shards = self._load_num_shards(num_shards)
+
+        # shard마다 체크포인트/LSM 파일 로드와 WAL replay를 병렬로
+        def open_shard(index: int) -> KVStore:
+            shard_dir = self._data_dir / shard_dir_name(index)
+            shard_dir.mkdir(exist_ok=True)
+            return KVStore(data_dir=shard_dir, **store_options)
+
+        with ThreadPoolExecutor(max_workers=recovery_threads or self._num_shards) as pool:
+            self._shards: list[KVStore] = list(pool.map(open_shard, range(self._num_shards)))
+
+        # cross-shard 배치는 드물다고 보고 하나씩 커밋한다 (intent log 정리가 단순해짐)
+        self._batch_lock = threading.Lock()
+        # shard 적용이 실패한 intent가 있으면 다시 열 때까지 intent log를 지우지 않고 cross-shard 배치도 받지 않는다
+        # (뒤 배치가 그 shard의 INTENT_KEY를 넘겨 버리면 복구가 빠진 intent를 건너뛴다)
+        self._unapplied_intent = False
+        intent_dir = self._data_dir / INTENT_DIR_NAME
+        intent_dir.mkdir(exist_ok=True)
+        self._recover_intents(intent_dir)
+        self._intents = SegmentedWAL(intent_dir, segment_size=intent_segment_size, wal_format=WALFormat.BINARY)
+
+    @property
+    def num_shards(self) -> int:
+        return self._num_shards
+
+    @property
+    def shards(self) -> list[KVStore]:
+        return list(self._shards)
+
+    def shard_for(self, key: str) -> KVStore:
+        return self._shards[shard_index(key, self._num_shards)]
+
+    def put(self, key: str, value: str) -> None:
+        self._check_key(key)
+        self.shard_for(key).put(key, value)
+
+    def get(self, key: str) -> str | None:
+        if key == INTENT_KEY:
+            return None
+        return self.shard_for(key).get(key)
+
+    def delete(self, key: str) -> None:
+        self._check_key(key)
+        self.shard_for(key).delete(key)
+
+    def scan(self, start: str | None = None, end: str | None = None, reverse: bool = False) -> Iterator[tuple[str, str]]:
+        """모든 shard의 scan을 key 순서로 합친다 (shard끼리 key가 겹치지 않음)"""
+        merged = merge_scans([shard.scan(start, end, reverse) for shard in self._shards], reverse)
+        return ((key, value) for key, value in merged if key != INTENT_KEY)
+
+    def prefix(self, prefix: str, reverse: bool = False) -> Iterator[tuple[str, str]]:
+        """prefix로 시작하는 key만 scan"""
+        return self.scan(prefix, prefix_end(prefix), reverse)
+
+    def write_batch(self, operations: Iterable[WALRecord] | None = None) -> WriteBatch:
+        """여러 shard에 걸친 PUT/DEL을 원자적으로 커밋한다 (사용법은 KVStore.write_batch와 같음)"""
+        batch = WriteBatch(self._commit_batch)
+        if operations is not None:
+            for record in operations:
+                batch.add(record)
+            batch.commit()
+        return batch
+
+    def checkpoint(self) -> None:
+        for shard in self._shards:
+            shard.checkpoint()
+
+    def close(self) -> None:
+        with self._batch_lock:
+            self._intents.close()
+        for shard in self._shards:
+            shard.close()
+
+    def _commit_batch(self, record: WALRecord) -> None:
+        for sub_record in record.records:
+            self._check_key(sub_record.key)
+        groups = self._group_by_shard(record.records)
+
+        # 한 shard에만 걸리면 그 shard의 BATCH 레코드 하나로 이미 원자적
+        if len(groups) == 1:
+            (index, records), = groups.items()
+            self._shards[index].write_batch(records)
+            return
+
+        with self._batch_lock:
+            if self._unapplied_intent:
+                raise RuntimeError("a cross-shard batch is not fully applied; reopen the store")
+            intent_lsn = self._intents.append(record)
+            try:
+                self._intents.sync()
+            except Exception:
+                self._intents.rollback(intent_lsn)
+                raise
+            # 여기서부터는 커밋된 배치. shard 적용이 실패해도 다음에 열 때 intent log에서 다시 적용된다
+            try:
+                self._apply_intent(intent_lsn, groups)
+            except Exception:
+                self._unapplied_intent = True
+                raise
+            # 모든 intent가 shard에 반영되었으므로 이전 세그먼트는 필요 없음
+            self._intents.truncate_before(self._intents.active_start_lsn)
+
+    def _apply_intent(self, intent_lsn: int, groups: dict[int, list[WALRecord]], only_missing: bool = False) -> None:
+        marker = WALRecord(RecordType.PUT, INTENT_KEY, str(intent_lsn))
+        for index, records in sorted(groups.items()):
+            shard = self._shards[index]
+            if only_missing:
+                applied = shard.get(INTENT_KEY)
+                if applied is not None and int(applied) >= intent_lsn:
+                    continue
+            shard.write_batch(records + [marker])
+
+    def _recover_intents(self, intent_dir: Path) -> None:
+        # intent log에 남은 배치 중 일부 shard에만 적용된 것을 마저 적용
+        for intent_lsn, _, record in SegmentedWAL.read_entries(intent_dir):
+            self._apply_intent(intent_lsn, self._group_by_shard(record.records), only_missing=True)
+
+    def _group_by_shard(self, records: list[WALRecord]) -> dict[int, list[WALRecord]]:
+        groups: dict[int, list[WALRecord]] = defaultdict(list)
+        for record in records:
+            groups[shard_index(record.key, self._num_shards)].append(record)
+        return dict(groups)
+
+    def _load_num_shards(self, num_shards: int) -> int:
+        # key 분배가 shard 수에 따라 달라지므로 처음 정한 값으로만 열 수 있다
+        path = self._data_dir / SHARDS_META_NAME
+        if path.exists():
+            with open(path, "r") as f:
+                stored = json.load(f)["num_shards"]
+            if stored != num_shards:
+                raise ValueError(f"data_dir has {stored} shards, got num_shards={num_shards}")
+            return stored
+
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({"num_shards": num_shards}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.rename(tmp_path, path)
+        fsync_dir(self._data_dir)
+        return num_shards
+
+    @staticmethod
+    def _check_key(key: str) -> None:
+        if not key:
+            raise ValueError("key cannot be empty")
+        if key == INTENT_KEY:
+            raise ValueError("key is reserved")
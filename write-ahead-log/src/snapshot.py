@@ -0,0 +1,175 @@
+"""시점 스냅샷 (LSN 기준 MVCC 읽기)
+
+KVStore는 key마다 최신 값 하나만 들고 있으므로, 스냅샷은 데이터를 복사하지 않고
+스냅샷 이후에 덮어써진 값만 따로 남겨 둔다 (copy-on-write).
+
+- LSN: WAL에서 레코드가 시작하는 위치. 레코드마다 다르고 커밋 순서대로 커진다
+- 스냅샷 LSN S: S 미만 LSN의 레코드만 보인다 (= 스냅샷을 뜬 순간 WAL의 끝)
+- VersionStore: 살아 있는 스냅샷이 있을 때, 쓰기 직전의 값을 (쓰기 LSN, 이전 값)으로 key별로 쌓는다
+  스냅샷 S에서 key의 값 = LSN >= S인 첫 기록의 이전 값, 그런 기록이 없으면 현재 값
+- 가장 오래된 스냅샷보다 앞선 기록은 어느 스냅샷에도 필요 없으므로 스냅샷을 놓을 때 버린다
+
+버전 기록은 스냅샷이 하나라도 살아 있을 때만 하므로, 스냅샷을 쓰지 않으면 쓰기 비용은 그대로다.
+스냅샷이 살아 있는 동안에는 그 뒤로 처음 바뀌는 key마다 이전 값을 한 번 읽고 메모리에 들고 있는다.
+"""
+import bisect
+
+from collections.abc import Callable, Iterator
+
+from src.memtable import _MISSING, TOMBSTONE, merge_scans, prefix_end
+
+
+class VersionStore:
+    """스냅샷 이후 덮어써진 이전 값 보관소
+
+    record/acquire/release는 호출자(KVStore)가 쓰기와 함께 직렬화한다.
+    lookup/changed_keys는 락 없이 호출된다. GC는 key별 리스트를 제자리에서 고치지 않고 새 리스트로 교체한다.
+    """
+
+    def __init__(self):
+        # key -> [(쓰기 LSN, 쓰기 직전 값 또는 TOMBSTONE)], LSN 오름차순
+        self._versions: dict[str, list[tuple[int, object]]] = {}
+        # 살아 있는 스냅샷 LSN 목록 (정렬, 같은 LSN 중복 허용)
+        self._snapshot_lsns: list[int] = []
+
+    @property
+    def active(self) -> bool:
+        return bool(self._snapshot_lsns)
+
+    def __len__(self) -> int:
+        """보관 중인 이전 값 개수"""
+        return sum(len(entries) for entries in list(self._versions.values()))
+
+    @property
+    def snapshot_count(self) -> int:
+        return len(self._snapshot_lsns)
+
+    def acquire(self, lsn: int) -> None:
+        bisect.insort(self._snapshot_lsns, lsn)
+
+    def release(self, lsn: int) -> list[str]:
+        """스냅샷 하나를 놓고 더 이상 필요 없는 이전 값을 버린다. 기록이 모두 사라진 key 목록을 반환"""
+        self._snapshot_lsns.remove(lsn)
+        if not self._snapshot_lsns:
+            dropped = list(self._versions)
+            self._versions = {}
+            return dropped
+
+        # LSN < 가장 오래된 스냅샷인 기록은 어떤 스냅샷의 "LSN >= S인 첫 기록"도 될 수 없다
+        oldest = self._snapshot_lsns[0]
+        dropped = []
+        for key, entries in list(self._versions.items()):
+            if entries[-1][0] < oldest:
+                del self._versions[key]
+                dropped.append(key)
+            elif entries[0][0] < oldest:
+                self._versions[key] = [entry for entry in entries if entry[0] >= oldest]
+        return dropped
+
+    def record(self, key: str, lsn: int, read_current: Callable[[str], object]) -> None:
+        """lsn의 쓰기가 key를 바꾸기 직전에 호출. 필요할 때만 read_current(key)로 이전 값을 읽어 남긴다"""
+        entries = self._versions.get(key)
+        # 가장 최신 스냅샷 이후 이미 기록이 있으면, 어떤 스냅샷이든 그 기록(또는 더 앞선 기록)을 본다
+        if entries and entries[-1][0] >= self._snapshot_lsns[-1]:
+            return
+        entry = (lsn, read_current(key))
+        if entries is None:
+            self._versions[key] = [entry]
+        else:
+            entries.append(entry)
+
+    def lookup(self, key: str, lsn: int) -> object:
+        """스냅샷 lsn에서 본 key의 값 (없었으면 TOMBSTONE). 그 뒤로 바뀐 적이 없으면 _MISSING"""
+        entries = self._versions.get(key)
+        if entries:
+            for entry_lsn, value in entries:
+                if entry_lsn >= lsn:
+                    return value
+        return _MISSING
+
+    def changed_keys(self, lsn: int, start: str | None, end: str | None) -> list[str]:
+        """스냅샷 lsn 이후 바뀐 key 중 [start, end) 범위의 key (정렬)"""
+        return sorted(
+            key for key, entries in list(self._versions.items())
+            if entries[-1][0] >= lsn and (start is None or key >= start) and (end is None or key < end)
+        )
+
+
+class Snapshot:
+    """KVStore.snapshot()이 돌려주는 시점 스냅샷
+
+    사용법:
+        with store.snapshot() as snapshot:
+            for key, value in snapshot.scan():
+                ...
+        # with 블록이 끝나면 release. 쓰기는 그동안에도 멈추지 않는다
+
+    release 하지 않은 스냅샷은 이후 바뀐 값을 계속 붙잡아 두므로 다 쓰면 반드시 놓아야 한다.
+    """
+
+    def __init__(
+        self,
+        lsn: int,
+        versions: VersionStore,
+        read_fn: Callable[[str], object],
+        scan_fn: Callable[[str | None, str | None, bool], Iterator[tuple[str, object]]],
+        release_fn: Callable[["Snapshot"], None],
+    ):
+        self._lsn = lsn
+        self._versions = versions
+        self._read_fn = read_fn
+        self._scan_fn = scan_fn
+        self._release_fn = release_fn
+        self._released = False
+
+    @property
+    def lsn(self) -> int:
+        return self._lsn
+
+    def __enter__(self) -> "Snapshot":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.release()
+
+    def get(self, key: str) -> str | None:
+        self._check_alive()
+        # 현재 값을 먼저 읽는다. 쓰기는 이전 값을 기록한 뒤 반영하므로,
+        # 그 사이에 반영된 쓰기가 있으면 아래 lookup이 반드시 그 기록을 본다
+        value = self._read_fn(key)
+        old = self._versions.lookup(key, self._lsn)
+        if old is not _MISSING:
+            value = old
+        return None if value is TOMBSTONE else value
+
+    def scan(self, start: str | None = None, end: str | None = None, reverse: bool = False) -> Iterator[tuple[str, str]]:
+        """스냅샷 시점의 start 이상 end 미만 (key, value)를 key 순서대로 내보내는 제너레이터"""
+        self._check_alive()
+        # 스냅샷 이후 지워진 key는 현재 데이터에 없을 수 있으므로 바뀐 key 목록을 함께 병합한다
+        changed = self._versions.changed_keys(self._lsn, start, end)
+        if reverse:
+            changed.reverse()
+        sources = [((key, TOMBSTONE) for key in changed), self._scan_fn(start, end, reverse)]
+        return self._resolve(merge_scans(sources, reverse))
+
+    def prefix(self, prefix: str, reverse: bool = False) -> Iterator[tuple[str, str]]:
+        """prefix로 시작하는 key만 scan"""
+        return self.scan(prefix, prefix_end(prefix), reverse)
+
+    def release(self) -> None:
+        """스냅샷을 놓는다. 여러 번 호출해도 된다"""
+        if not self._released:
+            self._released = True
+            self._release_fn(self)
+
+    def _resolve(self, entries: Iterator[tuple[str, object]]) -> Iterator[tuple[str, str]]:
+        for key, value in entries:
+            old = self._versions.lookup(key, self._lsn)
+            if old is not _MISSING:
+                value = old
+            if value is not TOMBSTONE:
+                yield key, value
+
+    def _check_alive(self) -> None:
+        if self._released:
+            raise RuntimeError("snapshot is already released")
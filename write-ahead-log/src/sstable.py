@@ -0,0 +1,310 @@
+"""정렬된 불변 테이블 파일 (SSTable)
+
+memtable이 임계치를 넘으면 key 순으로 정렬된 엔트리를 이 파일로 내려 쓴다(flush).
+한 번 쓴 파일은 바뀌지 않으며, 삭제도 tombstone 엔트리로 기록해서 더 오래된 테이블의 값을 가린다.
+
+파일 구조:
+    header: magic(4) | version(1) | padding(3)
+    block*: entry*
+        entry: key_len(u32) | value_len(u32) | key | value   (value_len=0xFFFFFFFF면 tombstone)
+    filter: Bloom filter (bloom_bits_per_key=0이면 길이 0)
+    index:  block_entry*
+        block_entry: offset(u64) | size(u32) | crc32(u32) | key_len(u32) | 블록 첫 key
+    footer: filter_offset(u64) | filter_size(u32) | filter_crc32(u32)
+            | index_offset(u64) | index_size(u32) | index_crc32(u32) | count(u64) | magic(4)
+버전 1 파일은 filter 없이 footer가 index_offset | index_size | index_crc32 | count | magic.
+
+블록별 첫 key만 담은 희소 인덱스와 Bloom filter는 열 때 한 번 읽어 메모리에 둔다.
+- 없는 key: 대부분 filter에서 걸러져 디스크를 읽지 않는다
+- 있는 key: bisect로 블록을 골라 블록 하나만 읽는다
+block_cache를 주면 디코드된 블록을 캐시해서 같은 블록을 다시 읽지 않는다.
+"""
+import bisect
+import itertools
+import os
+import struct
+import zlib
+
+from collections.abc import Callable, Iterable, Iterator
+from pathlib import Path
+
+from src.block_cache import BlockCache
+from src.bloom_filter import DEFAULT_BITS_PER_KEY, BloomFilter, key_hash
+from src.memtable import TOMBSTONE
+
+SSTABLE_MAGIC = b"KVST"
+SSTABLE_VERSION = 2
+SSTABLE_HEADER = SSTABLE_MAGIC + struct.pack("<B3x", SSTABLE_VERSION)
+SSTABLE_HEADER_V1 = SSTABLE_MAGIC + struct.pack("<B3x", 1)
+ENTRY_HEADER = struct.Struct("<II")
+INDEX_ENTRY = struct.Struct("<QIII")
+FOOTER = struct.Struct("<QIIQIIQ4s")
+FOOTER_V1 = struct.Struct("<QIIQ4s")
+TOMBSTONE_LEN = 0xFFFFFFFF
+
+# 블록 캐시 key의 앞부분. 여러 KVStore가 캐시를 공유해도 테이블끼리 겹치지 않도록 프로세스 안에서 유일
+_cache_ids = itertools.count()
+
+DEFAULT_BLOCK_SIZE = 4096
+
+
+class SSTableCorruptedError(Exception):
+    pass
+
+
+class TableReadStats:
+    """테이블 조회 카운터 (여러 테이블이 공유). 여러 스레드에서 락 없이 올리므로 근삿값이다"""
+
+    def __init__(self):
+        # filter를 확인한 조회 수, filter가 없다고 판단해 블록 읽기를 건너뛴 수,
+        # filter는 있을 수도 있다고 했지만 실제로 없던 수(거짓 양성), 실제로 읽은 블록 수
+        self.filter_checks = 0
+        self.filter_negatives = 0
+        self.filter_false_positives = 0
+        self.block_reads = 0
+
+    def to_dict(self) -> dict[str, int]:
+        return {
+            "filter_checks": self.filter_checks,
+            "filter_negatives": self.filter_negatives,
+            "filter_false_positives": self.filter_false_positives,
+            "block_reads": self.block_reads,
+        }
+
+
+class SSTableInfo:
+    def __init__(self, count: int, size: int, min_key: str | None, max_key: str | None):
+        self.count = count
+        self.size = size
+        self.min_key = min_key
+        self.max_key = max_key
+
+
+def write_sstable(
+    path: Path,
+    entries: Iterable[tuple[str, object]],
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    bloom_bits_per_key: int = DEFAULT_BITS_PER_KEY,
+    throttle: Callable[[int], None] | None = None,
+) -> SSTableInfo:
+    """key 오름차순 (key, value|TOMBSTONE)을 path에 쓰고 fsync 한다 (원자적 교체는 호출자가 rename으로 처리)
+
+    throttle이 있으면 블록을 쓰기 전마다 그 크기로 호출한다 (컴팩션 속도 제한용)
+    """
+    index = bytearray()
+    hashes: list[int] = []
+    block = bytearray()
+    block_first_key: bytes | None = None
+    count = 0
+    min_key = max_key = None
+
+    with open(path, "wb") as f:
+        f.write(SSTABLE_HEADER)
+        offset = len(SSTABLE_HEADER)
+
+        def finish_block() -> None:
+            nonlocal offset
+            index.extend(INDEX_ENTRY.pack(offset, len(block), zlib.crc32(block), len(block_first_key)))
+            index.extend(block_first_key)
+            if throttle is not None:
+                throttle(len(block))
+            f.write(block)
+            offset += len(block)
+            block.clear()
+
+        previous = None
+        for key, value in entries:
+            if previous is not None and key <= previous:
+                raise ValueError("entries must be sorted by key without duplicates")
+            previous = key
+
+            key_bytes = key.encode("utf-8")
+            if value is TOMBSTONE:
+                block.extend(ENTRY_HEADER.pack(len(key_bytes), TOMBSTONE_LEN))
+                block.extend(key_bytes)
+            else:
+                value_bytes = value.encode("utf-8")
+                block.extend(ENTRY_HEADER.pack(len(key_bytes), len(value_bytes)))
+                block.extend(key_bytes)
+                block.extend(value_bytes)
+
+            if bloom_bits_per_key > 0:
+                hashes.append(key_hash(key))
+            if block_first_key is None:
+                block_first_key = key_bytes
+            if min_key is None:
+                min_key = key
+            max_key = key
+            count += 1
+
+            if len(block) >= block_size:
+                finish_block()
+                block_first_key = None
+
+        if block:
+            finish_block()
+
+        bloom = b""
+        if bloom_bits_per_key > 0:
+            bloom = BloomFilter.for_hashes(hashes, bloom_bits_per_key).to_bytes()
+        f.write(bloom)
+        f.write(index)
+        f.write(FOOTER.pack(
+            offset, len(bloom), zlib.crc32(bloom),
+            offset + len(bloom), len(index), zlib.crc32(index),
+            count, SSTABLE_MAGIC,
+        ))
+        f.flush()
+        os.fsync(f.fileno())
+        size = f.tell()
+
+    return SSTableInfo(count, size, min_key, max_key)
+
+
+class SSTable:
+    """SSTable 리더. 블록 인덱스를 메모리에 두고 블록은 pread로 필요할 때만 읽는다 (여러 스레드에서 동시 사용 가능)"""
+
+    def __init__(self, path: Path, stats: TableReadStats | None = None, block_cache: BlockCache | None = None):
+        self._path = Path(path)
+        self._stats = stats if stats is not None else TableReadStats()
+        self._block_cache = block_cache
+        self._cache_id = next(_cache_ids)
+        self._filter: BloomFilter | None = None
+        self._fd = os.open(self._path, os.O_RDONLY)
+        try:
+            self._load_index()
+        except Exception:
+            self.close()
+            raise
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    @property
+    def stats(self) -> TableReadStats:
+        return self._stats
+
+    def _load_index(self) -> None:
+        size = os.fstat(self._fd).st_size
+        header = os.pread(self._fd, len(SSTABLE_HEADER), 0)
+        footer_struct = {SSTABLE_HEADER: FOOTER, SSTABLE_HEADER_V1: FOOTER_V1}.get(header)
+        if footer_struct is None or size < len(SSTABLE_HEADER) + footer_struct.size:
+            raise SSTableCorruptedError(f"invalid sstable header: {self._path}")
+
+        footer = footer_struct.unpack(os.pread(self._fd, footer_struct.size, size - footer_struct.size))
+        if footer_struct is FOOTER:
+            filter_offset, filter_size, filter_crc, index_offset, index_size, index_crc, count, magic = footer
+        else:
+            index_offset, index_size, index_crc, count, magic = footer
+            filter_offset = filter_size = 0
+        if magic != SSTABLE_MAGIC or index_offset + index_size != size - footer_struct.size:
+            raise SSTableCorruptedError(f"invalid sstable footer: {self._path}")
+
+        if filter_size > 0:
+            bloom = os.pread(self._fd, filter_size, filter_offset)
+            if zlib.crc32(bloom) != filter_crc:
+                raise SSTableCorruptedError(f"sstable filter checksum mismatch: {self._path}")
+            self._filter = BloomFilter.from_bytes(bloom)
+
+        index = os.pread(self._fd, index_size, index_offset)
+        if zlib.crc32(index) != index_crc:
+            raise SSTableCorruptedError(f"sstable index checksum mismatch: {self._path}")
+
+        # 블록별 (첫 key, offset, size, crc). 첫 key 목록은 bisect용으로 따로 둔다
+        self._first_keys: list[str] = []
+        self._blocks: list[tuple[int, int, int]] = []
+        pos = 0
+        while pos < len(index):
+            offset, block_size, crc, key_len = INDEX_ENTRY.unpack_from(index, pos)
+            pos += INDEX_ENTRY.size
+            self._first_keys.append(index[pos:pos + key_len].decode("utf-8"))
+            self._blocks.append((offset, block_size, crc))
+            pos += key_len
+        self._count = count
+
+    def get(self, key: str, default: object = None) -> object:
+        """key의 값 (삭제된 key면 TOMBSTONE, 없으면 default)"""
+        if self._filter is not None:
+            self._stats.filter_checks += 1
+            if not self._filter.might_contain(key):
+                self._stats.filter_negatives += 1
+                return default
+
+        i = bisect.bisect_right(self._first_keys, key) - 1
+        if i >= 0:
+            entries = self._read_block(i)
+            # (key,)는 같은 key의 (key, value)보다 작으므로 key의 위치를 가리킨다
+            j = bisect.bisect_left(entries, (key,))
+            if j < len(entries) and entries[j][0] == key:
+                return entries[j][1]
+
+        if self._filter is not None:
+            self._stats.filter_false_positives += 1
+        return default
+
+    def scan(
+        self,
+        start: str | None = None,
+        end: str | None = None,
+        reverse: bool = False,
+        fill_cache: bool = True,
+    ) -> Iterator[tuple[str, object]]:
+        """start 이상 end 미만 (key, value|TOMBSTONE)을 key 순서대로 내보낸다 (블록 단위로 읽음)
+
+        fill_cache=False면 캐시에 없는 블록을 읽어도 캐시에 넣지 않는다 (컴팩션처럼 한 번만 읽는 경우)
+        """
+        first = 0 if start is None else max(bisect.bisect_right(self._first_keys, start) - 1, 0)
+        last = len(self._blocks) if end is None else bisect.bisect_left(self._first_keys, end)
+        blocks = range(last - 1, first - 1, -1) if reverse else range(first, last)
+
+        for i in blocks:
+            entries = self._read_block(i, fill_cache)
+            for key, value in reversed(entries) if reverse else entries:
+                if (start is None or key >= start) and (end is None or key < end):
+                    yield key, value
+
+    # 캐시에 들어간 목록은 여러 조회가 함께 보므로 호출자가 고치면 안 된다
+    def _read_block(self, i: int, fill_cache: bool = True) -> list[tuple[str, object]]:
+        if self._block_cache is not None:
+            entries = self._block_cache.get((self._cache_id, i))
+            if entries is not None:
+                return entries
+
+        offset, size, crc = self._blocks[i]
+        self._stats.block_reads += 1
+        data = os.pread(self._fd, size, offset)
+        if len(data) != size or zlib.crc32(data) != crc:
+            raise SSTableCorruptedError(f"sstable block checksum mismatch: {self._path} block {i}")
+
+        entries = []
+        pos = 0
+        while pos < size:
+            key_len, value_len = ENTRY_HEADER.unpack_from(data, pos)
+            pos += ENTRY_HEADER.size
+            key = data[pos:pos + key_len].decode("utf-8")
+            pos += key_len
+            if value_len == TOMBSTONE_LEN:
+                entries.append((key, TOMBSTONE))
+            else:
+                entries.append((key, data[pos:pos + value_len].decode("utf-8")))
+                pos += value_len
+
+        if self._block_cache is not None and fill_cache:
+            self._block_cache.insert((self._cache_id, i), entries, size)
+        return entries
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    # 컴팩션으로 교체된 테이블은 진행 중인 조회가 끝날 때까지 쓰일 수 있어 명시적으로 닫지 않는다
+    # 마지막 참조가 사라질 때 fd를 닫는다 (파일은 이미 unlink 되어 있어도 읽을 수 있음)
+    def __del__(self) -> None:
+        if getattr(self, "_fd", -1) >= 0:
+            self.close()
@@ -3,9 +3,71 @@ import os
 import json
 
 from collections.abc import Callable, Iterator
+from enum import Enum
 from pathlib import Path
 
-from src.wal_record import WALRecord, ChecksumError
+from src.aligned_log_file import ALIGNMENT, AlignedLogFile
+from src.wal_record import (
+    BINARY_FILE_HEADER,
+    BINARY_FILE_MAGIC,
+    BINARY_HEADER,
+    ChecksumError,
+    WALFormat,
+    WALRecord,
+)
+
+
+ZERO_BLOCK = bytes(1024 * 1024)
+
+
+def detect_format(path: Path) -> WALFormat | None:
+    """파일 헤더로 WAL 포맷을 판별한다. 비어 있거나 없는 파일, 미리 할당만 된(0으로 시작하는) 파일이면 None"""
+    try:
+        with open(path, "rb") as f:
+            head = f.read(len(BINARY_FILE_MAGIC))
+    except FileNotFoundError:
+        return None
+
+    if not head or head == ZERO_BLOCK[:len(head)]:
+        return None
+    if head == BINARY_FILE_MAGIC:
+        return WALFormat.BINARY
+    return WALFormat.JSON
+
+
+def allocate(fd: int, offset: int, length: int) -> None:
+    """[offset, offset + length)를 0으로 읽히는 블록으로 확보한다 (posix_fallocate가 없거나 안 되는 파일시스템이면 ftruncate)"""
+    if hasattr(os, "posix_fallocate"):
+        try:
+            os.posix_fallocate(fd, offset, length)
+            return
+        except OSError:
+            pass
+    os.ftruncate(fd, max(os.fstat(fd).st_size, offset + length))
+
+
+def _zero_range(f, start: int, end: int) -> bool:
+    """파일의 [start, end)에서 0이 아닌 블록을 0으로 덮어쓴다. 덮어쓴 것이 있으면 True"""
+    changed = False
+    pos = start
+    while pos < end:
+        f.seek(pos)
+        block = f.read(min(len(ZERO_BLOCK), end - pos))
+        if not block:
+            break
+        if block != ZERO_BLOCK[:len(block)]:
+            f.seek(pos)
+            f.write(ZERO_BLOCK[:len(block)])
+            changed = True
+        pos += len(block)
+    return changed
+
+
+class Durability(Enum):
+    """커밋이 반환될 때 WAL이 어디까지 내려가 있는가 (docs/durability-modes.md 참고)"""
+    ALWAYS = "always"      # 커밋마다 fsync. 반환되면 전원 장애에도 남는다
+    INTERVAL = "interval"  # 커밋은 OS로 flush만 하고, 백그라운드 스레드가 주기적으로 fsync
+    NONE = "none"          # flush만 한다. fsync는 체크포인트 롤링, close, wait_durable 때만
 
 
 class WAL:
@@ -15,9 +77,39 @@ class WAL:
         post_append_hook: Callable[[], None] | None = None,
         post_flush_hook: Callable[[], None] | None = None,
         post_sync_hook: Callable[[], None] | None = None,
+        wal_format: WALFormat = WALFormat.JSON,
+        preallocate_bytes: int | None = None,
+        direct_io: bool = False,
     ):
+        if direct_io and (preallocate_bytes is None or preallocate_bytes % ALIGNMENT):
+            raise ValueError(f"direct_io requires preallocate_bytes that is a multiple of {ALIGNMENT}")
         self._path = path
-        self._file = open(self._path, "ab")
+        # 크래시 테스트와 계측용 훅. append는 버퍼에 쓴 직후, flush는 OS로 넘긴 직후(fsync 전),
+        # sync는 fsync가 끝난 직후 호출된다
+        self._post_append_hook = post_append_hook
+        self._post_flush_hook = post_flush_hook
+        self._post_sync_hook = post_sync_hook
+        # 기존 로그가 있으면 파일 헤더의 포맷을 따른다 (한 파일에 포맷을 섞지 않음)
+        self._format = detect_format(path) or wal_format
+
+        # 미리 할당 모드: 파일을 preallocate_bytes 단위로 미리 늘려 두고 그 안을 덮어쓴다
+        # 파일 크기가 커밋마다 바뀌지 않으므로 fdatasync가 크기 메타데이터를 기록할 필요가 없다
+        # 로그의 끝은 파일 크기가 아니라 레코드 프레임(0으로 채워진 길이 필드)으로 찾으므로 바이너리 포맷만 가능
+        self._preallocate = preallocate_bytes if self._format == WALFormat.BINARY else None
+        # 정렬된 이중 버퍼 + O_DIRECT/O_DSYNC 쓰기 (src/aligned_log_file.py). 미리 할당된 파일에서만
+        self._direct_io = direct_io and self._preallocate is not None
+        self._data_start = len(BINARY_FILE_HEADER) if self._format == WALFormat.BINARY else 0
+        if self._preallocate:
+            self._open_preallocated()
+        else:
+            self._file = open(self._path, "ab")
+            if self._format == WALFormat.BINARY and self._file.tell() == 0:
+                self._file.write(BINARY_FILE_HEADER)
+
+        if self._format == WALFormat.BINARY:
+            self._serialize = WALRecord.serialize_binary
+        else:
+            self._serialize = WALRecord.serialize
 
     def __enter__(self) -> "WAL":
         pass
@@ -25,40 +117,194 @@ class WAL:
     def __exit__(self, exc_type, exc_val, exc_tb) -> None:
         pass
 
+    @property
+    def format(self) -> WALFormat:
+        return self._format
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    # 다음 레코드가 기록될 파일 위치
+    @property
+    def position(self) -> int:
+        return self._file.tell()
+
+    # 레코드가 시작되는 위치 (바이너리 포맷은 파일 헤더 다음)
+    @property
+    def data_start(self) -> int:
+        return self._data_start
+
+    @property
+    def preallocated(self) -> bool:
+        return self._preallocate is not None
+
+    @property
+    def direct_io(self) -> bool:
+        return self._direct_io
+
     def append(self, record: WALRecord) -> int:
         offset = self._file.tell()
-        self._file.write(record.serialize())
+        data = self._serialize(record)
+        if self._preallocate and offset + len(data) > self._allocated:
+            self._reserve(offset + len(data))
+        self._file.write(data)
+        if self._post_append_hook is not None:
+            self._post_append_hook()
         return offset
 
-    def sync(self) -> None:
+    def flush(self) -> None:
+        """Python 버퍼를 OS로 넘긴다. 프로세스가 죽어도 남지만 전원 장애에는 보장되지 않는다
+
+        direct_io에서는 버퍼를 봉인만 하고 디스크에는 sync(또는 detach_sync 함수)가 쓴다.
+        """
         self._file.flush()
-        os.fsync(self._file.fileno())
+        if self._post_flush_hook is not None:
+            self._post_flush_hook()
+
+    def sync(self) -> None:
+        self.flush()
+        if self._direct_io:
+            # O_DSYNC 쓰기라 쓰고 나면 fdatasync가 필요 없다
+            self._file.wait()
+        else:
+            self._sync_fd(self._file.fileno())
+        if self._post_sync_hook is not None:
+            self._post_sync_hook()
+
+    def detach_sync(self) -> Callable[[], None]:
+        """지금까지 flush 된 내용을 fsync 하는 함수를 반환한다 (훅은 호출하지 않음)
+
+        fd를 복제해 두므로 반환된 함수는 락 밖에서 불러도 되고, 그 사이 파일이 닫혀도 안전하다.
+        direct_io에서는 봉인된 버퍼를 직접 쓰는 함수이다 (닫힌 뒤라면 이미 다 쓴 상태).
+        """
+        if self._direct_io:
+            return self._file.wait
 
+        fd = os.dup(self._file.fileno())
+
+        def sync() -> None:
+            try:
+                self._sync_fd(fd)
+            finally:
+                os.close(fd)
+
+        return sync
+
+    # 파일 헤더는 지우지 않는다
     def rollback(self, offset: int) -> None:
+        offset = max(offset, self._data_start)
         self._file.flush()
         self._file.truncate(offset)
         self._file.seek(offset)
+        if self._preallocate:
+            # 잘라낸 구간을 다시 (0으로) 할당해서 파일 크기를 유지한다
+            allocated, self._allocated = self._allocated, offset
+            self._reserve(allocated)
 
     def close(self) -> None:
         self._file.flush()
         self._file.close()
 
-    # WAL 읽기는 초기 단계에서만 실행되고, 읽기와 쓰기는 동시에 수행 불가능하기 때문에 
+    # 미리 할당된 파일은 크기가 바뀌지 않으므로 데이터만 내리는 fdatasync로 충분하다
+    def _sync_fd(self, fd: int) -> None:
+        if self._preallocate and hasattr(os, "fdatasync"):
+            os.fdatasync(fd)
+        else:
+            os.fsync(fd)
+
+    def _open_preallocated(self):
+        fd = os.open(self._path, os.O_RDWR | os.O_CREAT, 0o644)
+        f = self._file = open(fd, "r+b")
+        self._allocated = os.fstat(fd).st_size
+        if detect_format(self._path) is None:
+            # 새 파일이거나 0으로 채워 재활용하는 파일
+            f.write(BINARY_FILE_HEADER)
+            end = len(BINARY_FILE_HEADER)
+        else:
+            end = self.valid_end(self._path)
+            if _zero_range(f, end, self._allocated):
+                # 크래시 때 일부만 쓰인 레코드가 남아 있었다. 새 레코드 뒤에 옛 프레임이 이어 붙지 않도록 지운 상태를 먼저 영구화
+                f.flush()
+                os.fsync(fd)
+        if self._direct_io:
+            f.close()
+            self._file = AlignedLogFile(self._path, end)
+        else:
+            f.seek(end)
+        self._reserve(end + 1)
+
+    # 미리 할당 모드에서 end까지 쓸 수 있도록 파일을 preallocate_bytes 단위로 늘린다
+    def _reserve(self, end: int) -> None:
+        if end <= self._allocated:
+            return
+        size = -(-end // self._preallocate) * self._preallocate
+        allocate(self._file.fileno(), self._allocated, size - self._allocated)
+        self._allocated = size
+
+    # WAL 읽기는 초기 단계에서만 실행되고, 읽기와 쓰기는 동시에 수행 불가능하기 때문에
     @classmethod
     def read(cls, path: Path) -> Iterator[WALRecord]:
+        for _, _, record in cls.read_entries(path):
+            yield record
+
+    @classmethod
+    def read_entries(cls, path: Path) -> Iterator[tuple[int, int, WALRecord]]:
+        """(레코드 시작 위치, 레코드 끝 위치, 레코드)를 순서대로 읽는다. 손상된 레코드에서 중단"""
         path = Path(path)
 
-        if not path.exists:
+        if not path.exists():
+            return
+
+        if detect_format(path) == WALFormat.BINARY:
+            yield from cls._read_binary(path)
             return
-        
+
         with open(path, "rb") as f:
+            offset = 0
             for line in f:
+                start, offset = offset, offset + len(line)
                 striped = line.strip()
-                
+
                 if not striped:
                     continue
                 try:
-                    yield WALRecord.deserialize(line)
+                    yield start, offset, WALRecord.deserialize(line)
                 except (json.JSONDecodeError, ChecksumError, KeyError, ValueError):
                     # 손상된 레코드 발견 시 중단
                     return
+
+    @classmethod
+    def valid_end(cls, path: Path) -> int:
+        """마지막 정상 레코드의 끝 위치 (정상 레코드가 없으면 데이터 시작 위치)"""
+        end = len(BINARY_FILE_HEADER) if detect_format(path) == WALFormat.BINARY else 0
+        for _, end, _ in cls.read_entries(path):
+            pass
+        return end
+
+    @classmethod
+    def _read_binary(cls, path: Path) -> Iterator[tuple[int, int, WALRecord]]:
+        with open(path, "rb") as f:
+            offset = len(BINARY_FILE_HEADER)
+            f.seek(offset)
+            while True:
+                length_bytes = f.read(4)
+                if len(length_bytes) < 4:
+                    return
+
+                length = int.from_bytes(length_bytes, "little")
+                if length < BINARY_HEADER.size:
+                    return
+
+                rest = f.read(length - 4)
+                if len(rest) < length - 4:
+                    # 끝부분 불완전 레코드
+                    return
+                try:
+                    record = WALRecord.deserialize_binary(length_bytes + rest)
+                except (ChecksumError, ValueError):
+                    # 손상된 레코드 발견 시 중단
+                    return
+
+                yield offset, offset + length, record
+                offset += length
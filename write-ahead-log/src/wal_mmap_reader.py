@@ -0,0 +1,231 @@
+"""mmap 기반 zero-copy WAL 리더
+
+WAL.read는 줄 단위로 읽으면서 레코드마다 strip(), bytes 복사, decode를 거친다.
+이 리더는 세그먼트 파일을 mmap 하고 memoryview 위에서 프레임을 제자리에서 따라간다.
+- 바이너리 포맷: CRC32를 memoryview에 대해 바로 계산하고, key/value는 접근할 때만 str로 만든다
+- JSON 포맷: 체크섬이 디코드된 필드 기준이라 줄을 디코드해야 하므로 zero-copy 이점은 없음
+
+복구(KVStore)와 오프라인 도구 양쪽에서 쓸 수 있다:
+    python -m src.wal_mmap_reader <세그먼트 파일 또는 데이터 디렉터리>
+"""
+import json
+import mmap
+import sys
+import zlib
+
+from collections.abc import Iterator
+from pathlib import Path
+
+from src.wal import ZERO_BLOCK, detect_format
+from src.wal_record import (
+    BINARY_FILE_HEADER,
+    BINARY_HEADER,
+    NULL_VALUE_LEN,
+    ChecksumError,
+    RecordType,
+    WALFormat,
+    WALRecord,
+)
+
+_RECORD_TYPES = {record_type.value: record_type for record_type in RecordType}
+
+
+class RecordView:
+    """mmap 위의 레코드 프레임 하나. 리더가 닫히기 전까지만 유효하다"""
+
+    __slots__ = ("_buffer", "offset", "end", "record_type", "_key_start", "_key_end", "_value_end", "_record")
+
+    def __init__(
+        self,
+        buffer: memoryview | None,
+        offset: int,
+        end: int,
+        record_type: RecordType,
+        key_start: int = 0,
+        key_end: int = 0,
+        value_end: int | None = None,
+        record: WALRecord | None = None,
+    ):
+        self._buffer = buffer
+        self.offset = offset
+        self.end = end
+        self.record_type = record_type
+        self._key_start = key_start
+        self._key_end = key_end
+        self._value_end = value_end
+        # JSON 포맷은 검증 과정에서 이미 디코드된 레코드를 들고 있음
+        self._record = record
+
+    def key_bytes(self) -> memoryview:
+        """복사 없이 key 바이트를 본다 (리더를 닫기 전에 해제해야 함)"""
+        if self._record is not None:
+            return memoryview(self._record.key.encode("utf-8"))
+        return self._buffer[self._key_start:self._key_end]
+
+    def value_bytes(self) -> memoryview | None:
+        if self._record is not None:
+            return None if self._record.value is None else memoryview(self._record.value.encode("utf-8"))
+        if self._value_end is None:
+            return None
+        return self._buffer[self._key_end:self._value_end]
+
+    @property
+    def key(self) -> str:
+        if self._record is not None:
+            return self._record.key
+        return str(self._buffer[self._key_start:self._key_end], "utf-8")
+
+    @property
+    def value(self) -> str | None:
+        if self._record is not None:
+            return self._record.value
+        if self._value_end is None:
+            return None
+        return str(self._buffer[self._key_end:self._value_end], "utf-8")
+
+    def to_record(self) -> WALRecord:
+        if self._record is not None:
+            return self._record
+        if self.record_type == RecordType.BATCH:
+            return WALRecord.batch(WALRecord._split_binary_frames(self._buffer[self._key_end:self._value_end].tobytes()))
+        return WALRecord(self.record_type, self.key, self.value)
+
+
+class MmapWALReader:
+    """WAL 파일 하나를 mmap 해서 RecordView를 순서대로 내보낸다 (손상된 레코드에서 중단)"""
+
+    def __init__(self, path: Path):
+        self._path = Path(path)
+        self._format = detect_format(self._path)
+        self._file = open(self._path, "rb")
+        self._mmap: mmap.mmap | None = None
+        self._buffer: memoryview | None = None
+
+        size = self._path.stat().st_size
+        # 길이 0인 파일은 mmap 할 수 없음
+        if size > 0:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._buffer = memoryview(self._mmap)
+
+        # 손상/불완전 레코드 없이 끝까지 읽었는지, 마지막 정상 레코드의 끝 위치
+        self.complete = True
+        self.valid_end = len(BINARY_FILE_HEADER) if self._format == WALFormat.BINARY else 0
+
+    def __enter__(self) -> "MmapWALReader":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._buffer is not None:
+            self._buffer.release()
+            self._buffer = None
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._file.close()
+
+    def __iter__(self) -> Iterator[RecordView]:
+        # 포맷을 알 수 없는 파일은 아직 헤더도 쓰지 않은 (미리 할당된) 세그먼트
+        if self._buffer is None or self._format is None:
+            return
+        if self._format == WALFormat.BINARY:
+            yield from self._iter_binary()
+        else:
+            yield from self._iter_json()
+
+    def _iter_binary(self) -> Iterator[RecordView]:
+        buffer = self._buffer
+        size = len(buffer)
+        pos = len(BINARY_FILE_HEADER)
+
+        while pos < size:
+            if size - pos < BINARY_HEADER.size:
+                self.complete = is_zero(buffer[pos:])
+                return
+
+            length, checksum, record_type, key_len, value_len = BINARY_HEADER.unpack_from(buffer, pos)
+            if length == 0:
+                # 미리 할당된 세그먼트는 기록된 레코드 뒤가 0으로 채워져 있다. 끝까지 0이면 정상적인 끝
+                self.complete = is_zero(buffer[pos:])
+                return
+            value_size = 0 if value_len == NULL_VALUE_LEN else value_len
+            end = pos + length
+            if (
+                length != BINARY_HEADER.size + key_len + value_size
+                or end > size
+                or record_type not in _RECORD_TYPES
+                or zlib.crc32(buffer[pos + 8:end]) != checksum
+            ):
+                self.complete = False
+                return
+
+            key_start = pos + BINARY_HEADER.size
+            key_end = key_start + key_len
+            value_end = None if value_len == NULL_VALUE_LEN else end
+            yield RecordView(buffer, pos, end, _RECORD_TYPES[record_type], key_start, key_end, value_end)
+
+            pos = end
+            self.valid_end = end
+
+    def _iter_json(self) -> Iterator[RecordView]:
+        data = self._mmap
+        size = len(data)
+        pos = 0
+
+        while pos < size:
+            newline = data.find(b"\n", pos)
+            end = size if newline == -1 else newline + 1
+            line = data[pos:end]
+
+            if line.strip():
+                try:
+                    record = WALRecord.deserialize(line)
+                except (json.JSONDecodeError, ChecksumError, KeyError, ValueError):
+                    self.complete = False
+                    return
+                yield RecordView(None, pos, end, record.record_type, record=record)
+                self.valid_end = end
+            pos = end
+
+
+def is_zero(buffer: memoryview | bytes) -> bool:
+    """buffer가 모두 0 바이트인가 (1MB씩 비교)"""
+    for pos in range(0, len(buffer), len(ZERO_BLOCK)):
+        block = buffer[pos:pos + len(ZERO_BLOCK)]
+        if block != ZERO_BLOCK[:len(block)]:
+            return False
+    return True
+
+
+def scan_valid_end(path: Path) -> int:
+    """마지막 정상 레코드의 끝 위치 (정상 레코드가 없으면 데이터 시작 위치)"""
+    with MmapWALReader(path) as reader:
+        for _ in reader:
+            pass
+        return reader.valid_end
+
+
+def main() -> None:
+    if len(sys.argv) < 2:
+        print(f"Usage: {sys.argv[0]} <segment file | data dir>")
+        sys.exit(1)
+
+    # segmented_wal이 이 모듈을 쓰므로 순환 import를 피해 여기서 import
+    from src.segmented_wal import SegmentedWAL
+
+    target = Path(sys.argv[1])
+    if target.is_dir():
+        entries = SegmentedWAL.read_views(target)
+    else:
+        entries = ((view.offset, view.end, view) for view in MmapWALReader(target))
+
+    for lsn, end, view in entries:
+        value = view.value_bytes()
+        value_len = "-" if value is None else len(value)
+        print(f"{lsn}\t{end - lsn}\t{view.record_type.name}\t{view.key}\t{value_len}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,8 @@
 
 import hashlib
 import json
+import struct
+import zlib
 
 from enum import Enum
 
@@ -9,25 +11,64 @@ from enum import Enum
 class RecordType(Enum):
     PUT = 1
     DEL = 2
+    BATCH = 3  # 여러 PUT/DEL을 묶은 원자적 레코드 (하위 레코드는 records에 담김)
+
+
+class WALFormat(Enum):
+    JSON = 1    # 줄 단위 JSON + SHA-256 hex 체크섬 (기존 포맷)
+    BINARY = 2  # 길이 prefix 바이너리 프레임 + CRC32
+
+
+# 바이너리 WAL 파일은 이 헤더로 시작한다. JSON WAL은 '{'로 시작하므로 구분 가능
+BINARY_FILE_MAGIC = b"WALB"
+BINARY_FILE_HEADER = BINARY_FILE_MAGIC + struct.pack("<B3x", WALFormat.BINARY.value)
+
+# 바이너리 프레임: length | crc32 | record_type | key_len | value_len | key | value
+# - length: 프레임 전체 바이트 수 (헤더 포함)
+# - crc32: record_type부터 프레임 끝까지의 CRC32
+# - value_len이 NULL_VALUE_LEN이면 value는 None (DEL)
+BINARY_HEADER = struct.Struct("<IIBII")
+NULL_VALUE_LEN = 0xFFFFFFFF
 
 
 class ChecksumError(Exception):
     pass
 
 
-def _compute_checksum(record_type: int, key: str, value: str | None) -> str:
+def _compute_checksum(record_type: int, key: str, value: str | None, records: list | None = None) -> str:
         content = f"{record_type}:{key}:{value}"
+        # BATCH 레코드는 하위 레코드까지 체크섬에 포함해야 전체가 all-or-nothing
+        if records is not None:
+            content += ":" + json.dumps(records)
         return hashlib.sha256(content.encode("utf-8")).hexdigest()
 
 
 class WALRecord:
-    def __init__(self, record_type: RecordType, key: str, value: str | None = None):
+    def __init__(
+        self,
+        record_type: RecordType,
+        key: str,
+        value: str | None = None,
+        records: list["WALRecord"] | None = None,
+    ):
         self.record_type = record_type
         self.key = key
         self.value = value
+        self.records = records
+
+    @classmethod
+    def batch(cls, records: list["WALRecord"]) -> "WALRecord":
+        for record in records:
+            if record.record_type == RecordType.BATCH:
+                raise ValueError("nested batch is not allowed")
+        return cls(RecordType.BATCH, "", None, list(records))
 
     def serialize(self) -> bytes:
-        checksum = _compute_checksum(self.record_type.value, self.key, self.value)
+        records = None
+        if self.records is not None:
+            records = [[r.record_type.value, r.key, r.value] for r in self.records]
+
+        checksum = _compute_checksum(self.record_type.value, self.key, self.value, records)
 
         data = {
             "checksum": checksum,
@@ -35,6 +76,8 @@ class WALRecord:
             "key": self.key,
             "value": self.value
         }
+        if records is not None:
+            data["records"] = records
 
         return json.dumps(data).encode("utf-8") + b"\n"
 
@@ -42,13 +85,70 @@ class WALRecord:
     def deserialize(cls, data: bytes) -> "WALRecord":
         json_data = json.loads(data.decode("utf-8"))
 
-        computed_checksum = _compute_checksum(json_data["record_type"], json_data["key"], json_data["value"])
+        records = json_data.get("records")
+        computed_checksum = _compute_checksum(json_data["record_type"], json_data["key"], json_data["value"], records)
         if computed_checksum != json_data["checksum"]:
              raise ChecksumError()
 
+        record_type = RecordType(json_data["record_type"])
+        if record_type == RecordType.BATCH:
+            if records is None:
+                raise ValueError("batch record without records")
+            return WALRecord.batch([WALRecord(RecordType(t), k, v) for t, k, v in records])
+
         return WALRecord(
-            RecordType(json_data["record_type"]),
+            record_type,
             json_data["key"],
             json_data["value"]
         )
+
+    # BATCH 레코드는 하위 레코드의 바이너리 프레임들을 이어 붙여 value 자리에 담는다
+    def serialize_binary(self) -> bytes:
+        key_bytes = self.key.encode("utf-8")
+        if self.record_type == RecordType.BATCH:
+            value_bytes = b"".join(r.serialize_binary() for r in self.records)
+            value_len = len(value_bytes)
+        else:
+            value_bytes = b"" if self.value is None else self.value.encode("utf-8")
+            value_len = NULL_VALUE_LEN if self.value is None else len(value_bytes)
+        length = BINARY_HEADER.size + len(key_bytes) + len(value_bytes)
+
+        body = struct.pack("<BII", self.record_type.value, len(key_bytes), value_len) + key_bytes + value_bytes
+        return struct.pack("<II", length, zlib.crc32(body)) + body
+
+    @classmethod
+    def deserialize_binary(cls, data: bytes) -> "WALRecord":
+        """프레임 하나(length 필드 포함)를 역직렬화한다"""
+        if len(data) < BINARY_HEADER.size:
+            raise ValueError("incomplete record header")
+
+        length, checksum, record_type, key_len, value_len = BINARY_HEADER.unpack_from(data)
+        value_size = 0 if value_len == NULL_VALUE_LEN else value_len
+        if length != len(data) or length != BINARY_HEADER.size + key_len + value_size:
+            raise ValueError("record length mismatch")
+
+        if zlib.crc32(memoryview(data)[8:]) != checksum:
+            raise ChecksumError()
+
+        key_end = BINARY_HEADER.size + key_len
+        key = data[BINARY_HEADER.size:key_end].decode("utf-8")
+
+        if record_type == RecordType.BATCH.value:
+            return WALRecord.batch(cls._split_binary_frames(data[key_end:length]))
+
+        value = None if value_len == NULL_VALUE_LEN else data[key_end:length].decode("utf-8")
+
+        return WALRecord(RecordType(record_type), key, value)
+
+    @classmethod
+    def _split_binary_frames(cls, data: bytes) -> list["WALRecord"]:
+        records = []
+        pos = 0
+        while pos < len(data):
+            if len(data) - pos < BINARY_HEADER.size:
+                raise ValueError("incomplete record header")
+            length = int.from_bytes(data[pos:pos + 4], "little")
+            records.append(cls.deserialize_binary(data[pos:pos + length]))
+            pos += length
+        return records
     
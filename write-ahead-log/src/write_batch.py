@@ -0,0 +1,61 @@
+"""여러 PUT/DEL을 하나의 WAL 레코드로 묶는 쓰기 배치"""
+
+from collections.abc import Callable
+
+from src.wal_record import RecordType, WALRecord
+
+
+class WriteBatch:
+    """쓰기 배치
+
+    모인 연산은 BATCH 레코드 하나로 기록되어 한 번의 sync로 커밋되고,
+    replay 시에도 체크섬 단위가 레코드 하나이므로 전부 적용되거나 전혀 적용되지 않는다.
+
+    사용법:
+        with store.write_batch() as batch:
+            batch.put("k1", "v1")
+            batch.delete("k2")
+        # with 블록이 예외 없이 끝나면 커밋, 예외가 나면 버려진다
+    """
+
+    def __init__(self, commit_fn: Callable[[WALRecord], None]):
+        self._commit_fn = commit_fn
+        self._records: list[WALRecord] = []
+        self._committed = False
+
+    def __enter__(self) -> "WriteBatch":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        if exc_type is None:
+            self.commit()
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def put(self, key: str, value: str) -> None:
+        self.add(WALRecord(RecordType.PUT, key, value))
+
+    def delete(self, key: str) -> None:
+        self.add(WALRecord(RecordType.DEL, key))
+
+    def add(self, record: WALRecord) -> None:
+        if self._committed:
+            raise RuntimeError("batch is already committed")
+        if record.record_type not in (RecordType.PUT, RecordType.DEL):
+            raise ValueError(f"unsupported record type in batch: {record.record_type}")
+        if not record.key:
+            raise ValueError("key cannot be empty")
+        if record.record_type == RecordType.PUT and not isinstance(record.value, str):
+            raise TypeError("value must be a str")
+
+        self._records.append(record)
+
+    def commit(self) -> None:
+        if self._committed:
+            raise RuntimeError("batch is already committed")
+        self._committed = True
+
+        # 빈 배치는 WAL에 아무것도 남기지 않는다
+        if self._records:
+            self._commit_fn(WALRecord.batch(self._records))
@@ -0,0 +1,147 @@
+"""정렬 버퍼 + O_DIRECT/O_DSYNC WAL 파일 테스트"""
+
+import os
+import threading
+
+from unittest.mock import patch
+
+import pytest
+
+from src.aligned_log_file import ALIGNMENT, AlignedLogFile
+
+
+def zero_file(path, size=4 * ALIGNMENT, head=b""):
+    path.write_bytes(head + bytes(size - len(head)))
+    return path
+
+
+class TestAlignedLogFile:
+    def test_writes_after_existing_data(self, tmp_path):
+        """position 앞의 내용은 그대로 두고 이어 쓴다 (정렬되지 않은 위치에서 시작)"""
+        path = zero_file(tmp_path / "wal.log", head=b"HEADER")
+        f = AlignedLogFile(path, 6, buffer_bytes=2 * ALIGNMENT)
+        f.write(b"a" * 100)
+        f.wait()
+        assert f.tell() == 106
+        f.close()
+
+        data = path.read_bytes()
+        assert data[:106] == b"HEADER" + b"a" * 100
+        assert data[106:] == bytes(len(data) - 106)
+
+    def test_flush_only_seals_until_wait(self, tmp_path):
+        """flush는 버퍼를 봉인만 하고, 디스크에는 wait가 쓴다"""
+        path = zero_file(tmp_path / "wal.log")
+        f = AlignedLogFile(path, 0, buffer_bytes=2 * ALIGNMENT)
+        f.write(b"x" * 10)
+        f.flush()
+        assert path.read_bytes()[:10] == bytes(10)
+
+        f.wait()
+        assert path.read_bytes()[:10] == b"x" * 10
+        f.close()
+
+    def test_partial_block_is_rewritten_by_next_write(self, tmp_path):
+        """마지막 불완전 블록은 다음 쓰기에서 앞부분을 유지한 채 다시 쓴다"""
+        path = zero_file(tmp_path / "wal.log")
+        f = AlignedLogFile(path, 0, buffer_bytes=2 * ALIGNMENT)
+        expected = b""
+        for i in range(50):
+            chunk = bytes([65 + i % 26]) * (37 + i * 13)
+            f.write(chunk)
+            expected += chunk
+            if i % 3 == 0:
+                f.flush()
+            if i % 5 == 0:
+                f.wait()
+        f.close()
+
+        assert path.read_bytes()[:len(expected)] == expected
+        assert f.tell() == len(expected)
+
+    def test_record_larger_than_both_buffers(self, tmp_path):
+        """버퍼 두 개보다 큰 쓰기도 나눠서 모두 쓴다"""
+        path = zero_file(tmp_path / "wal.log", size=16 * ALIGNMENT)
+        f = AlignedLogFile(path, 5, buffer_bytes=ALIGNMENT)
+        data = bytes(range(256)) * 40
+        f.write(data)
+        f.close()
+
+        assert path.read_bytes()[5:5 + len(data)] == data
+
+    def test_truncate_and_seek_drop_tail(self, tmp_path):
+        """truncate + seek 뒤에는 잘린 위치부터 이어 쓴다"""
+        path = zero_file(tmp_path / "wal.log")
+        f = AlignedLogFile(path, 0, buffer_bytes=2 * ALIGNMENT)
+        f.write(b"keep" + b"drop" * 10)
+        f.flush()
+        f.truncate(4)
+        f.seek(4)
+        f.write(b"new")
+        f.close()
+
+        assert path.read_bytes() == b"keepnew" + bytes(ALIGNMENT - 7)
+
+    def test_concurrent_wait_while_writing(self, tmp_path):
+        """한 스레드가 wait로 쓰는 동안 다른 스레드가 계속 채워도 순서대로 모두 남는다"""
+        path = zero_file(tmp_path / "wal.log", size=64 * ALIGNMENT)
+        f = AlignedLogFile(path, 0, buffer_bytes=2 * ALIGNMENT)
+        stop = threading.Event()
+
+        def syncer():
+            while not stop.is_set():
+                f.wait()
+
+        thread = threading.Thread(target=syncer)
+        thread.start()
+        expected = b""
+        for i in range(2000):
+            chunk = f"record-{i};".encode()
+            f.write(chunk)
+            f.flush()
+            expected += chunk
+        stop.set()
+        thread.join()
+        f.close()
+
+        assert path.read_bytes()[:len(expected)] == expected
+
+    def test_write_error_is_sticky(self, tmp_path):
+        """쓰기가 한 번 실패하면 이후 호출도 같은 오류로 실패한다"""
+        path = zero_file(tmp_path / "wal.log")
+        f = AlignedLogFile(path, 0, buffer_bytes=2 * ALIGNMENT)
+        f.write(b"data")
+
+        def fail(fd, data, offset):
+            raise OSError("EIO")
+
+        with patch("os.pwrite", new=fail):
+            with pytest.raises(OSError, match="EIO"):
+                f.wait()
+
+        with pytest.raises(OSError, match="EIO"):
+            f.write(b"more")
+        with pytest.raises(OSError, match="EIO"):
+            f.close()
+
+    def test_falls_back_without_o_direct(self, tmp_path):
+        """O_DIRECT로 열 수 없으면 O_DSYNC만으로 연다"""
+        path = zero_file(tmp_path / "wal.log")
+        real_open = os.open
+
+        def no_direct(file, flags, *args):
+            if flags & getattr(os, "O_DIRECT", 0):
+                raise OSError(22, "Invalid argument")
+            return real_open(file, flags, *args)
+
+        with patch("os.open", side_effect=no_direct):
+            f = AlignedLogFile(path, 0)
+        assert not f.direct
+        f.write(b"abc")
+        f.close()
+
+        assert path.read_bytes()[:3] == b"abc"
+
+    def test_rejects_unaligned_buffer(self, tmp_path):
+        with pytest.raises(ValueError):
+            AlignedLogFile(zero_file(tmp_path / "wal.log"), 0, buffer_bytes=1000)
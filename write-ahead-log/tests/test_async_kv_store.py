@@ -0,0 +1,132 @@
+"""asyncio KVStore 래퍼 테스트"""
+
+import asyncio
+import threading
+
+from unittest.mock import patch
+
+import pytest
+
+from src.async_kv_store import AsyncKVStore
+from src.kv_store import KVStore
+from src.wal_record import RecordType, WALRecord
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+class TestAsyncOperations:
+    """await put/get/delete/write_batch"""
+
+    def test_put_get_delete_persist(self, tmp_path):
+        async def scenario():
+            store = AsyncKVStore(KVStore(data_dir=tmp_path))
+            await store.put("key1", "value1")
+            await store.put("key2", "value2")
+            await store.delete("key2")
+            await store.write_batch([WALRecord(RecordType.PUT, "key3", "v3"), WALRecord(RecordType.DEL, "key1")])
+            result = (await store.get("key1"), await store.get("key2"), await store.get("key3"))
+            await store.close()
+            return result
+
+        assert run(scenario()) == (None, None, "v3")
+        assert KVStore(data_dir=tmp_path).get("key3") == "v3"
+
+    def test_empty_key_is_rejected(self, tmp_path):
+        async def scenario():
+            store = AsyncKVStore(KVStore(data_dir=tmp_path))
+            try:
+                with pytest.raises(ValueError):
+                    await store.put("", "value")
+                with pytest.raises(ValueError):
+                    await store.write_batch([WALRecord(RecordType.PUT, "", "v")])
+            finally:
+                await store.close()
+
+        run(scenario())
+
+    def test_sync_failure_is_raised_to_every_waiter(self, tmp_path):
+        """fsync가 실패하면 그 sync에 묶인 모든 쓰기가 예외를 받고 아무것도 반영되지 않는다"""
+        async def scenario():
+            store = AsyncKVStore(KVStore(data_dir=tmp_path))
+            with patch.object(store.store._wal, "sync", side_effect=OSError("disk full")):
+                results = await asyncio.gather(
+                    *(store.put(f"key{i}", "v") for i in range(5)), return_exceptions=True
+                )
+            found = [await store.get(f"key{i}") for i in range(5)]
+            await store.close()
+            return results, found
+
+        results, found = run(scenario())
+        assert all(isinstance(result, OSError) for result in results)
+        assert found == [None] * 5
+
+
+class TestSyncCoalescing:
+    """동시에 기다리는 writer들은 fsync 하나로 묶인다"""
+
+    def test_concurrent_puts_share_fsyncs(self, tmp_path):
+        async def scenario():
+            store = AsyncKVStore(KVStore(data_dir=tmp_path))
+            original_sync = store.store._wal.sync
+            syncs = []
+
+            def counting_sync():
+                syncs.append(1)
+                original_sync()
+
+            with patch.object(store.store._wal, "sync", counting_sync):
+                await asyncio.gather(*(store.put(f"key{i}", str(i)) for i in range(100)))
+            values = [await store.get(f"key{i}") for i in range(100)]
+            await store.close()
+            return len(syncs), values
+
+        syncs, values = run(scenario())
+        assert values == [str(i) for i in range(100)]
+        assert syncs < 10
+
+    def test_event_loop_runs_while_fsync_is_blocked(self, tmp_path):
+        """fsync가 멈춰 있어도 루프의 다른 태스크와 메모리 읽기는 계속 진행된다"""
+        async def scenario():
+            store = AsyncKVStore(KVStore(data_dir=tmp_path))
+            await store.put("existing", "value")
+            release = threading.Event()
+            original_sync = store.store._wal.sync
+
+            def slow_sync():
+                release.wait(timeout=5)
+                original_sync()
+
+            with patch.object(store.store._wal, "sync", slow_sync):
+                write = asyncio.ensure_future(store.put("key", "value"))
+                await asyncio.sleep(0.05)
+                assert not write.done()
+                assert await store.get("existing") == "value"
+                release.set()
+                await write
+            result = await store.get("key")
+            await store.close()
+            return result
+
+        assert run(scenario()) == "value"
+
+
+class TestReadPath:
+    """memtable 조회는 스레드를 거치지 않는다"""
+
+    def test_memory_hit_does_not_use_read_threads(self, tmp_path):
+        async def scenario():
+            store = AsyncKVStore(KVStore(data_dir=tmp_path, memtable_flush_bytes=1 << 20))
+            await store.put("flushed", "on-disk")
+            store.store.checkpoint()
+            await store.put("fresh", "in-memory")
+
+            in_memory = await store.get("fresh")
+            threads_after_memory_read = len(store._read_executor._threads)
+            on_disk = await store.get("flushed")
+            threads_after_disk_read = len(store._read_executor._threads)
+            await store.close()
+            return in_memory, on_disk, threads_after_memory_read, threads_after_disk_read
+
+        assert run(scenario()) == ("in-memory", "on-disk", 0, 1)
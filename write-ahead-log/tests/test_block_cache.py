@@ -0,0 +1,128 @@
+"""블록 캐시 테스트"""
+
+import pytest
+
+from src.block_cache import ClockBlockCache, LRUBlockCache
+from src.sstable import SSTable, write_sstable
+
+
+@pytest.fixture(params=[LRUBlockCache, ClockBlockCache])
+def cache_class(request):
+    return request.param
+
+
+class TestBlockCache:
+    """공통 동작"""
+
+    def test_hit_miss_stats(self, cache_class):
+        """조회 결과에 따라 hit/miss가 집계된다"""
+        cache = cache_class(100)
+        assert cache.get("a") is None
+        cache.insert("a", "block-a", 10)
+        assert cache.get("a") == "block-a"
+
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["inserts"]) == (1, 1, 1)
+        assert stats["hit_rate"] == 0.5
+        assert stats["usage_bytes"] == 10
+
+    def test_usage_stays_within_budget(self, cache_class):
+        """바이트 예산을 넘으면 블록을 내보내고 eviction이 집계된다"""
+        cache = cache_class(100)
+        for i in range(20):
+            cache.insert(i, f"block{i}", 30)
+
+        stats = cache.stats()
+        assert stats["usage_bytes"] <= 100
+        assert stats["evictions"] == 17
+
+    def test_oversized_block_is_not_cached(self, cache_class):
+        """예산보다 큰 블록은 넣지 않는다"""
+        cache = cache_class(100)
+        cache.insert("small", "s", 10)
+        cache.insert("big", "b", 101)
+
+        assert cache.get("big") is None
+        assert cache.get("small") == "s"
+
+    def test_capacity_must_be_positive(self, cache_class):
+        with pytest.raises(ValueError):
+            cache_class(0)
+
+
+class TestEvictionPolicy:
+    """정책별 내보낼 블록 선택"""
+
+    def test_lru_evicts_least_recently_used(self):
+        """LRU는 최근에 조회한 블록을 남긴다"""
+        cache = LRUBlockCache(30)
+        for key in "abc":
+            cache.insert(key, key, 10)
+        cache.get("a")
+        cache.insert("d", "d", 10)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == "a"
+
+    def test_clock_gives_referenced_blocks_second_chance(self):
+        """CLOCK은 참조 비트가 선 블록을 한 번 건너뛴다"""
+        cache = ClockBlockCache(30)
+        for key in "abc":
+            cache.insert(key, key, 10)
+        cache.get("a")
+        cache.insert("d", "d", 10)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == "a"
+        assert cache.get("d") == "d"
+
+    def test_clock_hits_do_not_wait_for_insert_lock(self):
+        """CLOCK 조회는 삽입/eviction이 락을 쥐고 있어도 기다리지 않는다"""
+        cache = ClockBlockCache(100)
+        cache.insert("a", "block-a", 10)
+
+        with cache._lock:
+            assert cache.get("a") == "block-a"
+            assert cache.get("missing") is None
+
+
+class TestSSTableWithCache:
+    """SSTable 블록 캐시 연동"""
+
+    def test_repeated_reads_hit_cache(self, tmp_path, cache_class):
+        """같은 블록을 다시 읽으면 디스크를 읽지 않는다"""
+        path = tmp_path / "t.sst"
+        write_sstable(path, [(f"key{i:03d}", "v") for i in range(100)], block_size=64)
+        cache = cache_class(1 << 20)
+        table = SSTable(path, block_cache=cache)
+
+        for _ in range(5):
+            assert table.get("key050") == "v"
+        assert table.stats.block_reads == 1
+        assert cache.stats()["hits"] == 4
+        table.close()
+
+    def test_scan_without_fill_cache_leaves_cache_empty(self, tmp_path):
+        """fill_cache=False인 scan은 캐시에 블록을 넣지 않는다"""
+        path = tmp_path / "t.sst"
+        write_sstable(path, [(f"key{i:03d}", "v") for i in range(100)], block_size=64)
+        cache = LRUBlockCache(1 << 20)
+        table = SSTable(path, block_cache=cache)
+
+        assert len(list(table.scan(fill_cache=False))) == 100
+        assert cache.stats()["usage_bytes"] == 0
+        assert list(table.scan(reverse=True))[0] == ("key099", "v")
+        assert list(table.scan(reverse=True))[0] == ("key099", "v")
+        table.close()
+
+    def test_tables_with_same_block_index_do_not_collide(self, tmp_path):
+        """캐시를 공유하는 서로 다른 테이블의 같은 블록 번호는 섞이지 않는다"""
+        cache = LRUBlockCache(1 << 20)
+        write_sstable(tmp_path / "a.sst", [("k", "from-a")])
+        write_sstable(tmp_path / "b.sst", [("k", "from-b")])
+        a = SSTable(tmp_path / "a.sst", block_cache=cache)
+        b = SSTable(tmp_path / "b.sst", block_cache=cache)
+
+        assert (a.get("k"), b.get("k"), a.get("k"), b.get("k")) == ("from-a", "from-b", "from-a", "from-b")
+        a.close()
+        b.close()
@@ -0,0 +1,39 @@
+"""Bloom filter 테스트"""
+
+from src.bloom_filter import BloomFilter, key_hash
+
+
+def build(keys, bits_per_key=10) -> BloomFilter:
+    return BloomFilter.for_hashes([key_hash(key) for key in keys], bits_per_key)
+
+
+class TestBloomFilter:
+    """Bloom filter 동작"""
+
+    def test_no_false_negatives(self):
+        """넣은 key는 항상 있을 수도 있다고 판단한다"""
+        keys = [f"key{i}" for i in range(1000)]
+        bloom = build(keys)
+
+        assert all(bloom.might_contain(key) for key in keys)
+
+    def test_false_positive_rate_follows_bits_per_key(self):
+        """bits_per_key가 클수록 거짓 양성률이 낮다 (10비트/key면 대략 1%)"""
+        keys = [f"key{i}" for i in range(2000)]
+        probes = [f"missing{i}" for i in range(10000)]
+
+        rates = {}
+        for bits_per_key in (4, 10):
+            bloom = build(keys, bits_per_key)
+            rates[bits_per_key] = sum(bloom.might_contain(p) for p in probes) / len(probes)
+
+        assert rates[10] < 0.03
+        assert rates[4] > rates[10]
+
+    def test_bytes_roundtrip(self):
+        """직렬화 후에도 같은 판단을 한다"""
+        bloom = build(["a", "b", "c"])
+        restored = BloomFilter.from_bytes(bloom.to_bytes())
+
+        probes = ["a", "b", "c"] + [f"x{i}" for i in range(100)]
+        assert [restored.might_contain(p) for p in probes] == [bloom.might_contain(p) for p in probes]
@@ -0,0 +1,85 @@
+"""스트리밍 체크포인트 파일 테스트"""
+
+import pytest
+
+from src.checkpoint_file import (
+    CheckpointCorruptedError,
+    iter_checkpoint,
+    load_checkpoint,
+    read_footer,
+    write_checkpoint,
+    write_checkpoint_entries,
+)
+
+
+class TestCheckpointFile:
+    """체크포인트 파일 쓰기/읽기"""
+
+    def test_roundtrip(self, tmp_path):
+        """쓴 데이터와 LSN을 그대로 읽는다"""
+        path = tmp_path / "checkpoint.dat"
+        data = {"key2": "value2", "key1": "value1", "빈값": ""}
+
+        write_checkpoint(path, data, lsn=1234)
+
+        assert load_checkpoint(path) == (data, 1234)
+
+    def test_entries_are_sorted_by_key(self, tmp_path):
+        """엔트리는 key 오름차순으로 기록된다"""
+        path = tmp_path / "checkpoint.dat"
+        write_checkpoint(path, {"c": "3", "a": "1", "b": "2"}, lsn=0)
+
+        assert [key for key, _ in iter_checkpoint(path)] == ["a", "b", "c"]
+
+    def test_footer_has_count_and_lsn(self, tmp_path):
+        """footer에 엔트리 개수와 LSN이 기록된다"""
+        path = tmp_path / "checkpoint.dat"
+        write_checkpoint(path, {f"key{i}": "v" for i in range(10)}, lsn=42)
+
+        footer = read_footer(path)
+        assert footer.count == 10
+        assert footer.lsn == 42
+
+    def test_small_chunks_produce_same_file(self, tmp_path):
+        """청크 크기와 무관하게 같은 파일이 만들어진다"""
+        data = {f"key{i}": f"value{i}" for i in range(100)}
+        write_checkpoint(tmp_path / "a.dat", data, lsn=7)
+        write_checkpoint(tmp_path / "b.dat", data, lsn=7, chunk_size=16)
+
+        assert (tmp_path / "a.dat").read_bytes() == (tmp_path / "b.dat").read_bytes()
+
+    def test_streamed_entries_produce_same_file(self, tmp_path):
+        """정렬된 (key, value) 스트림으로 써도 dict로 쓴 것과 같은 파일이 만들어진다"""
+        data = {f"key{i:02d}": f"value{i}" for i in range(100)}
+        write_checkpoint(tmp_path / "a.dat", data, lsn=7)
+        write_checkpoint_entries(tmp_path / "b.dat", iter(sorted(data.items())), lsn=7)
+
+        assert (tmp_path / "a.dat").read_bytes() == (tmp_path / "b.dat").read_bytes()
+
+    def test_empty_checkpoint(self, tmp_path):
+        """빈 상태도 체크포인트할 수 있다"""
+        path = tmp_path / "checkpoint.dat"
+        write_checkpoint(path, {}, lsn=0)
+
+        assert load_checkpoint(path) == ({}, 0)
+
+    def test_corrupted_entry_raises(self, tmp_path):
+        """엔트리 바이트가 손상되면 CheckpointCorruptedError"""
+        path = tmp_path / "checkpoint.dat"
+        write_checkpoint(path, {"key1": "value1"}, lsn=0)
+
+        data = bytearray(path.read_bytes())
+        data[12] ^= 0xFF
+        path.write_bytes(bytes(data))
+
+        with pytest.raises(CheckpointCorruptedError):
+            load_checkpoint(path)
+
+    def test_truncated_file_raises(self, tmp_path):
+        """잘린 파일은 CheckpointCorruptedError"""
+        path = tmp_path / "checkpoint.dat"
+        write_checkpoint(path, {"key1": "value1"}, lsn=0)
+        path.write_bytes(path.read_bytes()[:-4])
+
+        with pytest.raises(CheckpointCorruptedError):
+            load_checkpoint(path)
@@ -0,0 +1,142 @@
+"""SSTable 컴팩션 테스트"""
+
+import time
+
+import pytest
+
+from src.compaction import (
+    CompactionTask,
+    LeveledCompaction,
+    RateLimiter,
+    SizeTieredCompaction,
+    run_compaction,
+)
+from src.manifest import TableMeta, table_file_name
+from src.memtable import TOMBSTONE
+from src.sstable import SSTable, write_sstable
+
+
+def meta(table_id, size=100, min_key="a", max_key="z", level=0, seq=None) -> TableMeta:
+    return TableMeta(table_id, 1, size, min_key, max_key, level, seq)
+
+
+def make_table(directory, table_id, entries, level=0) -> tuple[TableMeta, SSTable]:
+    path = directory / table_file_name(table_id)
+    info = write_sstable(path, entries)
+    return TableMeta(table_id, info.count, info.size, info.min_key, info.max_key, level), SSTable(path)
+
+
+class TestLeveledCompaction:
+    """leveled 전략의 입력 선택"""
+
+    def test_waits_for_l0_trigger(self):
+        """L0 테이블이 l0_trigger개 미만이면 할 일이 없다"""
+        strategy = LeveledCompaction(l0_trigger=4)
+        assert strategy.pick([meta(i) for i in range(1, 4)]) is None
+
+    def test_l0_merges_with_overlapping_l1(self):
+        """L0 전체와 key 범위가 겹치는 L1 테이블만 L1으로 병합한다"""
+        strategy = LeveledCompaction(l0_trigger=2)
+        l0 = [meta(1, min_key="c", max_key="f"), meta(2, min_key="d", max_key="h")]
+        l1 = [meta(3, min_key="a", max_key="b", level=1), meta(4, min_key="g", max_key="k", level=1)]
+
+        task = strategy.pick(l0 + l1)
+        assert sorted(t.table_id for t in task.inputs) == [1, 2, 4]
+        assert task.output_level == 1
+
+    def test_oversized_level_pushes_oldest_table_down(self):
+        """레벨이 크기 상한을 넘으면 가장 오래된 테이블을 다음 레벨의 겹치는 테이블과 병합한다"""
+        strategy = LeveledCompaction(l0_trigger=4, base_level_bytes=150)
+        tables = [
+            meta(5, size=100, min_key="a", max_key="c", level=1, seq=5),
+            meta(3, size=100, min_key="d", max_key="f", level=1, seq=3),
+            meta(1, size=100, min_key="e", max_key="z", level=2, seq=1),
+        ]
+
+        task = strategy.pick(tables)
+        assert sorted(t.table_id for t in task.inputs) == [1, 3]
+        assert task.output_level == 2
+
+
+class TestSizeTieredCompaction:
+    """size-tiered 전략의 입력 선택"""
+
+    def test_merges_similar_sized_run(self):
+        """크기가 비슷한 연속 테이블이 min_threshold개 모이면 병합한다"""
+        strategy = SizeTieredCompaction(min_threshold=3, min_table_size=0)
+        tables = [meta(1, size=10_000), meta(2, size=100), meta(3, size=110), meta(4, size=90)]
+
+        task = strategy.pick(tables)
+        assert [t.table_id for t in task.inputs] == [2, 3, 4]
+        assert task.output_level == 0
+
+    def test_different_sizes_are_not_merged(self):
+        """크기 차이가 크면 버킷이 끊겨서 할 일이 없다"""
+        strategy = SizeTieredCompaction(min_threshold=3, min_table_size=0)
+        assert strategy.pick([meta(1, size=100), meta(2, size=1000), meta(3, size=100)]) is None
+
+    def test_max_threshold_limits_inputs(self):
+        """한 번에 max_threshold개까지만 병합한다"""
+        strategy = SizeTieredCompaction(min_threshold=2, max_threshold=3)
+        task = strategy.pick([meta(i) for i in range(1, 7)])
+        assert [t.table_id for t in task.inputs] == [1, 2, 3]
+
+
+class TestRateLimiter:
+    """컴팩션 쓰기 속도 제한"""
+
+    def test_requests_beyond_burst_wait(self):
+        """burst를 넘는 요청은 초당 바이트에 맞춰 기다린다"""
+        limiter = RateLimiter(bytes_per_second=100_000, burst_bytes=10_000)
+
+        start = time.monotonic()
+        limiter.request(10_000)
+        limiter.request(20_000)
+        assert time.monotonic() - start >= 0.15
+
+    def test_rate_must_be_positive(self):
+        with pytest.raises(ValueError):
+            RateLimiter(0)
+
+
+class TestRunCompaction:
+    """테이블 병합"""
+
+    def test_drops_shadowed_values_and_tombstones(self, tmp_path):
+        """최신 테이블의 값이 이기고, 더 오래된 테이블이 없으면 tombstone은 버린다"""
+        newer, newer_reader = make_table(tmp_path, 2, [("a", "new"), ("b", TOMBSTONE)])
+        older, older_reader = make_table(tmp_path, 1, [("a", "old"), ("b", "old"), ("c", "old")])
+        ids = iter(range(10, 20))
+
+        outputs = run_compaction(
+            tmp_path, CompactionTask([older, newer], 1), {1: older_reader, 2: newer_reader}, [], lambda: next(ids)
+        )
+
+        assert len(outputs) == 1
+        assert outputs[0].level == 1
+        assert outputs[0].seq == 2
+        result = SSTable(tmp_path / outputs[0].file_name)
+        assert list(result.scan()) == [("a", "new"), ("c", "old")]
+
+    def test_keeps_tombstone_covering_older_table(self, tmp_path):
+        """입력보다 오래된 테이블에 같은 key 범위가 있으면 tombstone을 남긴다"""
+        table, reader = make_table(tmp_path, 2, [("b", TOMBSTONE)])
+        ids = iter(range(10, 20))
+
+        outputs = run_compaction(
+            tmp_path, CompactionTask([table], 1), {2: reader}, [meta(1, min_key="a", max_key="c")], lambda: next(ids)
+        )
+
+        assert list(SSTable(tmp_path / outputs[0].file_name).scan()) == [("b", TOMBSTONE)]
+
+    def test_splits_output_by_target_file_size(self, tmp_path):
+        """target_file_size마다 key 범위가 겹치지 않는 출력 테이블로 나눈다"""
+        table, reader = make_table(tmp_path, 1, [(f"key{i:03d}", "v" * 10) for i in range(100)])
+        ids = iter(range(10, 20))
+
+        outputs = run_compaction(tmp_path, CompactionTask([table], 1, target_file_size=500), {1: reader}, [], lambda: next(ids))
+
+        assert len(outputs) > 1
+        assert sum(t.count for t in outputs) == 100
+        for left, right in zip(outputs, outputs[1:]):
+            assert left.max_key < right.min_key
@@ -0,0 +1,183 @@
+"""그룹 커밋 테스트"""
+
+import threading
+import time
+
+import pytest
+
+from src.group_commit import GroupCommitter
+from src.kv_store import KVStore
+from src.wal_record import RecordType, WALRecord
+
+
+class TestGroupCommitter:
+    """GroupCommitter 단위 테스트"""
+
+    def test_single_writer_commits_alone(self):
+        """writer가 하나면 자기 레코드만 커밋하고 반환한다"""
+        batches = []
+        committer = GroupCommitter(batches.append)
+
+        committer.submit(WALRecord(RecordType.PUT, "key1", "value1"))
+
+        assert len(batches) == 1
+        assert [r.key for r in batches[0]] == ["key1"]
+
+    def test_concurrent_writers_share_one_commit(self):
+        """리더가 커밋하는 동안 쌓인 레코드는 다음 커밋 한 번으로 묶인다"""
+        batches = []
+        first_commit_started = threading.Event()
+        release_first_commit = threading.Event()
+
+        def commit_fn(records):
+            if not batches:
+                first_commit_started.set()
+                release_first_commit.wait(timeout=5)
+            batches.append(records)
+
+        committer = GroupCommitter(commit_fn)
+
+        leader = threading.Thread(
+            target=committer.submit, args=(WALRecord(RecordType.PUT, "leader", "v"),)
+        )
+        leader.start()
+        assert first_commit_started.wait(timeout=5)
+
+        followers = [
+            threading.Thread(
+                target=committer.submit, args=(WALRecord(RecordType.PUT, f"key{i}", "v"),)
+            )
+            for i in range(5)
+        ]
+        for t in followers:
+            t.start()
+
+        # 팔로워들이 대기열에 들어갈 시간을 준다
+        time.sleep(0.1)
+        release_first_commit.set()
+
+        leader.join()
+        for t in followers:
+            t.join()
+
+        assert len(batches) == 2
+        assert sorted(r.key for r in batches[1]) == [f"key{i}" for i in range(5)]
+
+    def test_max_batch_size_limits_batch(self):
+        """한 번의 커밋에 max_batch_size보다 많은 레코드를 담지 않는다"""
+        batches = []
+        committer = GroupCommitter(batches.append, max_batch_size=2, max_wait_seconds=0.05)
+
+        threads = [
+            threading.Thread(
+                target=committer.submit, args=(WALRecord(RecordType.PUT, f"key{i}", "v"),)
+            )
+            for i in range(6)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert all(len(batch) <= 2 for batch in batches)
+        assert sum(len(batch) for batch in batches) == 6
+
+    def test_commit_failure_is_raised_to_every_waiter(self):
+        """배치 커밋이 실패하면 배치의 모든 writer가 예외를 받는다"""
+        def commit_fn(records):
+            raise IOError("Disk full")
+
+        committer = GroupCommitter(commit_fn, max_wait_seconds=0.05)
+        errors = []
+
+        def writer(i):
+            try:
+                committer.submit(WALRecord(RecordType.PUT, f"key{i}", "v"))
+            except IOError as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=writer, args=(i,)) for i in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(errors) == 4
+
+    def test_invalid_options_are_rejected(self):
+        """잘못된 옵션은 거부된다"""
+        with pytest.raises(ValueError):
+            GroupCommitter(lambda records: None, max_batch_size=0)
+        with pytest.raises(ValueError):
+            GroupCommitter(lambda records: None, max_wait_seconds=-1)
+
+
+class TestKVStoreGroupCommit:
+    """KVStore 그룹 커밋 모드"""
+
+    def test_concurrent_writes_use_fewer_fsyncs(self, tmp_path):
+        """동시 쓰기는 연산 수보다 적은 fsync로 커밋되고 재시작 후 모두 복구된다"""
+        store = KVStore(data_dir=tmp_path, group_commit=True, group_commit_max_wait_ms=2)
+
+        sync_count = 0
+        original_sync = store._wal.sync
+
+        def counting_sync():
+            nonlocal sync_count
+            sync_count += 1
+            original_sync()
+
+        store._wal.sync = counting_sync
+
+        num_threads = 8
+        writes_per_thread = 50
+
+        def writer(thread_id):
+            for i in range(writes_per_thread):
+                store.put(f"key_{thread_id}_{i}", f"value_{thread_id}_{i}")
+
+        threads = [threading.Thread(target=writer, args=(t,)) for t in range(num_threads)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        store.close()
+
+        assert sync_count < num_threads * writes_per_thread
+
+        store2 = KVStore(data_dir=tmp_path)
+        for t in range(num_threads):
+            for i in range(writes_per_thread):
+                assert store2.get(f"key_{t}_{i}") == f"value_{t}_{i}"
+
+    def test_put_and_delete_apply_after_commit(self, tmp_path):
+        """그룹 커밋 모드에서도 PUT/DEL 결과가 메모리에 반영된다"""
+        store = KVStore(data_dir=tmp_path, group_commit=True)
+        store.put("key1", "value1")
+        store.put("key2", "value2")
+        store.delete("key1")
+
+        assert store.get("key1") is None
+        assert store.get("key2") == "value2"
+
+    def test_sync_failure_skips_memtable_and_wal(self, tmp_path):
+        """배치 sync 실패 시 메모리 미반영, 재시작 후에도 복구되지 않는다"""
+        store = KVStore(data_dir=tmp_path, group_commit=True)
+        store.put("key1", "value1")
+
+        def failing_sync():
+            raise IOError("Disk full")
+
+        original_sync = store._wal.sync
+        store._wal.sync = failing_sync
+        with pytest.raises(IOError):
+            store.put("key2", "value2")
+        store._wal.sync = original_sync
+
+        assert store.get("key2") is None
+        store.close()
+
+        store2 = KVStore(data_dir=tmp_path)
+        assert store2.get("key1") == "value1"
+        assert store2.get("key2") is None
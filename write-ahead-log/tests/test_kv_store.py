@@ -1,11 +1,32 @@
 """KV Store 기본 동작 테스트 (A 시나리오)"""
 
+import os
+import threading
+import time
+
 from unittest.mock import patch
 
 import pytest
 
+from src.checkpoint_file import load_checkpoint
+from src.block_cache import LRUBlockCache
+from src.compaction import LeveledCompaction, SizeTieredCompaction
 from src.kv_store import KVStore
-from src.wal import WAL
+from src.memtable import DictMemTable, SortedMemTable
+from src.segmented_wal import SegmentedWAL, list_segments
+from src.wal import Durability
+from src.wal_record import RecordType, WALFormat, WALRecord
+
+
+def wal_size(data_dir) -> int:
+    """모든 WAL 세그먼트 크기의 합 (백그라운드 체크포인트가 도중에 지운 세그먼트는 0으로 침)"""
+    total = 0
+    for _, path in list_segments(data_dir):
+        try:
+            total += path.stat().st_size
+        except FileNotFoundError:
+            pass
+    return total
 
 
 class TestBasicOperations:
@@ -64,27 +85,54 @@ class TestWALWrite:
     """WAL 쓰기 테스트"""
 
     def test_put_creates_wal_file(self, tmp_path):
-        """PUT 수행 시 WAL 파일에 레코드가 기록된다"""
-        wal_path = tmp_path / "wal.log"
-        assert not wal_path.exists()
+        """PUT 수행 시 WAL 세그먼트 파일에 레코드가 기록된다"""
+        assert not list_segments(tmp_path)
 
         store = KVStore(data_dir=tmp_path)
         store.put("key1", "value1")
 
-        assert wal_path.exists()
-        assert wal_path.stat().st_size > 0
+        assert list_segments(tmp_path)
+        assert wal_size(tmp_path) > 0
 
     def test_delete_writes_to_wal(self, tmp_path):
         """DEL 수행 시 WAL 파일에 레코드가 기록된다"""
         store = KVStore(data_dir=tmp_path)
         store.put("key1", "value1")
 
-        wal_path = tmp_path / "wal.log"
-        size_after_put = wal_path.stat().st_size
+        size_after_put = wal_size(tmp_path)
 
         store.delete("key1")
 
-        assert wal_path.stat().st_size > size_after_put
+        assert wal_size(tmp_path) > size_after_put
+
+    def test_empty_commit_is_a_no_op(self, tmp_path):
+        """빈 레코드 목록 commit은 WAL에 아무것도 쓰지 않는다"""
+        store = KVStore(data_dir=tmp_path)
+        store.put("key1", "value1")
+        lsn = store.lsn
+
+        store.commit([])
+
+        assert store.lsn == lsn
+        assert store.get("key1") == "value1"
+
+    @pytest.mark.parametrize("record, error", [
+        (WALRecord(RecordType.PUT, "key2", None), TypeError),
+        (WALRecord(RecordType.PUT, 2, "value2"), TypeError),
+        (WALRecord(RecordType.DEL, ""), ValueError),
+        (WALRecord.batch([WALRecord(RecordType.PUT, "key2", "v"), WALRecord(RecordType.PUT, "key3", None)]), TypeError),
+    ])
+    def test_commit_validates_records_before_the_wal(self, tmp_path, record, error):
+        """commit도 put/delete/write_batch와 같은 검증을 거치고, 하나라도 틀리면 아무것도 쓰지 않는다"""
+        store = KVStore(data_dir=tmp_path)
+        store.put("key1", "value1")
+        lsn = store.lsn
+
+        with pytest.raises(error):
+            store.commit([WALRecord(RecordType.PUT, "key4", "v"), record])
+
+        assert store.lsn == lsn
+        assert store.get("key4") is None
 
     def test_close_flushes_and_closes_file(self, tmp_path):
         """정상 종료 시 버퍼가 flush되고 파일이 닫힌다"""
@@ -95,9 +143,7 @@ class TestWALWrite:
         store.close()
 
         # close 후 파일에 데이터가 있어야 함
-        wal_path = tmp_path / "wal.log"
-        content = wal_path.read_bytes()
-        assert len(content) > 0
+        assert wal_size(tmp_path) > 0
 
 
 class TestWALRead:
@@ -178,8 +224,7 @@ class TestSyncFailureRollback:
         store.close()
 
         # WAL에는 key1, key2만 있어야 함
-        wal_path = tmp_path / "wal.log"
-        records = list(WAL.read(wal_path))
+        records = list(SegmentedWAL.read(tmp_path))
         assert len(records) == 2
         assert records[0].key == "key1"
         assert records[1].key == "key2"
@@ -204,6 +249,136 @@ class TestSyncFailureRollback:
         assert store2.get("key3") is None
 
 
+class TestDurabilityModes:
+    """커밋마다 fsync(ALWAYS) / 주기적 fsync(INTERVAL) / flush만(NONE)"""
+
+    def wait_until(self, condition, timeout: float = 5.0) -> None:
+        deadline = time.monotonic() + timeout
+        while not condition():
+            assert time.monotonic() < deadline
+            time.sleep(0.005)
+
+    def test_always_mode_is_durable_when_put_returns(self, tmp_path):
+        store = KVStore(data_dir=tmp_path)
+        store.put("key1", "value1")
+
+        assert store.durability == Durability.ALWAYS
+        assert store.durable_lsn == store.lsn
+        assert store.wait_durable() is True
+        assert store.stats()["fsyncs"] == 1
+        store.close()
+
+    def test_interval_mode_commits_without_fsync(self, tmp_path):
+        """Given: 주기가 긴 INTERVAL 모드
+        When: PUT 세 번
+        Then: 바로 읽히지만 fsync는 없고, wait_durable이 fsync 한 번으로 전부 내구성 있게 만든다
+        """
+        store = KVStore(data_dir=tmp_path, durability=Durability.INTERVAL, sync_interval_ms=60_000)
+        for i in range(3):
+            store.put(f"key{i}", "value")
+
+        assert store.get("key2") == "value"
+        assert store.stats()["fsyncs"] == 0
+        assert store.durable_lsn < store.lsn
+
+        assert store.wait_durable() is True
+        assert store.durable_lsn == store.lsn
+        assert store.stats()["fsyncs"] == 1
+        store.close()
+
+    def test_interval_mode_syncs_in_background(self, tmp_path):
+        store = KVStore(data_dir=tmp_path, durability=Durability.INTERVAL, sync_interval_ms=20)
+        store.put("key1", "value1")
+
+        self.wait_until(lambda: store.durable_lsn == store.lsn)
+        store.close()
+
+    def test_interval_mode_syncs_early_after_byte_threshold(self, tmp_path):
+        store = KVStore(
+            data_dir=tmp_path, durability=Durability.INTERVAL, sync_interval_ms=60_000, sync_interval_bytes=1000,
+        )
+        store.put("small", "v")
+        time.sleep(0.05)
+        assert store.durable_lsn < store.lsn
+
+        store.put("large", "v" * 2000)
+        self.wait_until(lambda: store.durable_lsn == store.lsn)
+        store.close()
+
+    def test_none_mode_syncs_only_when_asked(self, tmp_path):
+        store = KVStore(data_dir=tmp_path, durability=Durability.NONE)
+        store.put("key1", "value1")
+        lsn = store.lsn
+        store.put("key2", "value2")
+        assert store.stats()["fsyncs"] == 0
+
+        assert store.wait_durable(lsn) is True
+        assert store.durable_lsn == store.lsn
+        # 이미 내구성 있는 위치면 다시 fsync 하지 않는다
+        assert store.wait_durable(lsn) is True
+        assert store.stats()["fsyncs"] == 1
+        store.close()
+
+    def test_checkpoint_roll_makes_earlier_writes_durable(self, tmp_path):
+        store = KVStore(data_dir=tmp_path, durability=Durability.NONE)
+        store.put("key1", "value1")
+        store.checkpoint()
+
+        assert store.durable_lsn == store.stats()["checkpoint_lsn"]
+        store.close()
+
+    @pytest.mark.parametrize("durability", [Durability.INTERVAL, Durability.NONE])
+    def test_close_syncs_in_relaxed_modes(self, tmp_path, durability):
+        """정상 종료는 어느 모드든 커밋된 쓰기를 fsync 하고 닫는다"""
+        store = KVStore(data_dir=tmp_path, durability=durability, sync_interval_ms=60_000)
+        store.put("key1", "value1")
+
+        with patch("os.fsync", wraps=os.fsync) as fsync:
+            store.close()
+        assert fsync.called
+
+        reopened = KVStore(data_dir=tmp_path)
+        assert reopened.get("key1") == "value1"
+        reopened.close()
+
+    def test_background_fsync_failure_fails_waiters_and_later_writes(self, tmp_path):
+        """fsync가 한 번 실패하면 페이지 캐시를 믿을 수 없으므로 이후 wait_durable과 쓰기가 모두 실패한다"""
+        store = KVStore(data_dir=tmp_path, durability=Durability.INTERVAL, sync_interval_ms=60_000)
+        store.put("key1", "value1")
+
+        def failing_sync():
+            raise OSError("EIO")
+
+        with patch.object(store._wal, "detach_sync", return_value=failing_sync):
+            with pytest.raises(OSError):
+                store.wait_durable()
+        with pytest.raises(OSError):
+            store.put("key2", "value2")
+        with pytest.raises(OSError):
+            store.wait_durable()
+        store.close()
+
+    def test_interval_mode_with_group_commit(self, tmp_path):
+        store = KVStore(
+            data_dir=tmp_path, durability=Durability.INTERVAL, sync_interval_ms=5, group_commit=True,
+        )
+        def writer(worker: int):
+            for i in range(50):
+                store.put(f"w{worker}-{i}", str(i))
+            store.wait_durable()
+
+        threads = [threading.Thread(target=writer, args=(worker,)) for worker in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        store.close()
+
+        reopened = KVStore(data_dir=tmp_path)
+        assert len(list(reopened.prefix("w"))) == 200
+        reopened.close()
+
+
 class TestCheckpoint:
     """E. 체크포인트/로그 롤링"""
 
@@ -218,12 +393,12 @@ class TestCheckpoint:
         store.put("key2", "value2")
         store.checkpoint()
 
-        # checkpoint 후 WAL이 비워졌는지 확인 (핵심!)
-        wal_path = tmp_path / "wal.log"
-        assert wal_path.stat().st_size == 0, "checkpoint 후 WAL은 비어야 함"
+        # checkpoint 후 이전 세그먼트는 삭제되고 빈 활성 세그먼트만 남는다 (핵심!)
+        assert len(list_segments(tmp_path)) == 1
+        assert wal_size(tmp_path) == 0, "checkpoint 후 WAL은 비어야 함"
 
         # checkpoint 파일이 생성되었는지 확인
-        checkpoint_path = tmp_path / "checkpoint.json"
+        checkpoint_path = tmp_path / "checkpoint.dat"
         assert checkpoint_path.exists(), "checkpoint 파일이 없음"
 
         store.close()
@@ -259,7 +434,7 @@ class TestCheckpoint:
         """E3. checkpoint rename 실패 시 이전 checkpoint 유지 및 tmp 정리
         Given: 첫 번째 checkpoint 완료
         When: 두 번째 checkpoint 중 rename 실패
-        Then: 이전 checkpoint.json 유지, tmp 파일 자체 정리됨
+        Then: 이전 checkpoint.dat 유지, tmp 파일 자체 정리됨
         """
         import os
 
@@ -267,8 +442,8 @@ class TestCheckpoint:
         store.put("key1", "value1")
         store.checkpoint()
 
-        checkpoint_path = tmp_path / "checkpoint.json"
-        old_content = checkpoint_path.read_text()
+        checkpoint_path = tmp_path / "checkpoint.dat"
+        old_content = checkpoint_path.read_bytes()
 
         store.put("key2", "value2")
 
@@ -278,7 +453,7 @@ class TestCheckpoint:
                 store.checkpoint()
 
         # 이전 checkpoint가 손상되지 않았어야 함
-        assert checkpoint_path.read_text() == old_content
+        assert checkpoint_path.read_bytes() == old_content
 
         # tmp 파일은 자체 정리되어 없어야 함
         checkpoint_tmp = tmp_path / "checkpoint.tmp"
@@ -288,7 +463,7 @@ class TestCheckpoint:
         """E3b. 시작 시 고아 checkpoint.tmp 청소 (SIGKILL 시나리오)
         Given: SIGKILL로 인해 checkpoint.tmp가 남아있는 상태
         When: 재시작
-        Then: checkpoint.tmp 삭제, checkpoint.json + WAL로 복구
+        Then: checkpoint.tmp 삭제, checkpoint.dat + WAL로 복구
         """
         store = KVStore(data_dir=tmp_path)
         store.put("key1", "value1")
@@ -309,26 +484,25 @@ class TestCheckpoint:
         assert not checkpoint_tmp.exists()
 
     def test_crash_after_checkpoint_rename_before_wal_truncate(self, tmp_path):
-        """E4. checkpoint rename 직후 크래시 - WAL truncate 전
-        Given: checkpoint.json rename 완료
-        When: WAL rollback(truncate) 전 크래시
+        """E4. checkpoint rename 직후 크래시 - WAL 세그먼트 삭제 전
+        Given: checkpoint.dat rename 완료
+        When: 이전 WAL 세그먼트 삭제 전 크래시
         Then: 재시작 시 checkpoint + WAL 중복 적용해도 정상 (idempotent)
         """
         store = KVStore(data_dir=tmp_path)
         store.put("key1", "value1")
         store.put("key2", "value2")
 
-        # rollback을 무효화해서 WAL truncate 안 되게 함
-        with patch.object(store._wal, "rollback"):
+        # 세그먼트 삭제를 무효화해서 WAL truncate 안 되게 함
+        with patch.object(store._wal, "truncate_before"):
             store.checkpoint()
 
         # checkpoint 파일은 저장됨
-        checkpoint_path = tmp_path / "checkpoint.json"
+        checkpoint_path = tmp_path / "checkpoint.dat"
         assert checkpoint_path.exists()
 
         # WAL은 truncate 안 됨 (레코드 여전히 있음)
-        wal_path = tmp_path / "wal.log"
-        assert wal_path.stat().st_size > 0
+        assert wal_size(tmp_path) > 0
 
         store.close()
 
@@ -349,8 +523,7 @@ class TestCheckpoint:
         store.checkpoint()
 
         # checkpoint 후 WAL은 비어있어야 함
-        wal_path = tmp_path / "wal.log"
-        assert wal_path.stat().st_size == 0
+        assert wal_size(tmp_path) == 0
 
         store.close()
 
@@ -461,6 +634,32 @@ class TestBoundaryValues:
         with pytest.raises(ValueError, match="key"):
             store.delete("")
 
+    def test_none_value_is_rejected_on_put(self, tmp_path):
+        """값이 없는 PUT은 WAL에 닿기 전에 거부되고, store는 다시 열린다"""
+        store = KVStore(tmp_path)
+
+        with pytest.raises(TypeError, match="value"):
+            store.put("key1", None)
+        store.put("key2", "value2")
+        store.close()
+
+        store2 = KVStore(tmp_path)
+        assert store2.get("key1") is None
+        assert store2.get("key2") == "value2"
+
+    def test_none_value_record_on_disk_does_not_block_recovery(self, tmp_path):
+        """이미 WAL에 남은 값 없는 PUT은 복구 중에 건너뛴다"""
+        store = KVStore(tmp_path)
+        store.put("key1", "value1")
+        store._wal.append(WALRecord(RecordType.PUT, "key1", None))
+        store._wal.sync()
+        store.put("key2", "value2")
+        store.close()
+
+        store2 = KVStore(tmp_path)
+        assert store2.get("key1") == "value1"
+        assert store2.get("key2") == "value2"
+
     def test_long_key_works(self, tmp_path):
         """긴 키도 정상 동작한다"""
         store = KVStore(data_dir=tmp_path)
@@ -611,3 +810,602 @@ class TestConcurrency:
 
         store2 = KVStore(data_dir=tmp_path)
         assert store2.get("b") == "vb"
+
+
+class TestBinaryWALFormat:
+    """바이너리 WAL 포맷으로 동작하는 KV Store"""
+
+    def test_binary_format_recovers_after_restart(self, tmp_path):
+        """바이너리 포맷으로 기록한 PUT/DEL이 재시작 후 복구된다"""
+        store = KVStore(data_dir=tmp_path, wal_format=WALFormat.BINARY)
+        store.put("key1", "value1")
+        store.put("key2", "value2")
+        store.delete("key1")
+        store.close()
+
+        store2 = KVStore(data_dir=tmp_path, wal_format=WALFormat.BINARY)
+        assert store2.get("key1") is None
+        assert store2.get("key2") == "value2"
+
+
+class TestSegmentedWAL:
+    """세그먼트 WAL 위에서 동작하는 KV Store"""
+
+    def test_small_segments_roll_and_recover(self, tmp_path):
+        """세그먼트가 여러 개로 롤링되어도 재시작 후 모두 복구된다"""
+        store = KVStore(data_dir=tmp_path, wal_segment_size=256)
+        for i in range(50):
+            store.put(f"key{i}", f"value{i}")
+        store.close()
+
+        assert len(list_segments(tmp_path)) > 1
+
+        store2 = KVStore(data_dir=tmp_path, wal_segment_size=256)
+        assert all(store2.get(f"key{i}") == f"value{i}" for i in range(50))
+
+    def test_checkpoint_unlinks_old_segments(self, tmp_path):
+        """checkpoint는 이전 세그먼트를 통째로 삭제한다"""
+        store = KVStore(data_dir=tmp_path, wal_segment_size=256)
+        for i in range(50):
+            store.put(f"key{i}", f"value{i}")
+        old_segments = list_segments(tmp_path)
+
+        store.checkpoint()
+
+        assert all(not path.exists() for _, path in old_segments)
+        store.put("after", "checkpoint")
+        store.close()
+
+        store2 = KVStore(data_dir=tmp_path, wal_segment_size=256)
+        assert store2.get("key0") == "value0"
+        assert store2.get("after") == "checkpoint"
+
+    def test_legacy_wal_log_is_adopted_as_first_segment(self, tmp_path):
+        """단일 wal.log로 기록된 데이터 디렉터리도 복구된다"""
+        from src.wal import WAL
+        from src.wal_record import RecordType, WALRecord
+
+        wal = WAL(tmp_path / "wal.log")
+        wal.append(WALRecord(RecordType.PUT, "key1", "value1"))
+        wal.close()
+
+        store = KVStore(data_dir=tmp_path)
+        assert store.get("key1") == "value1"
+        assert not (tmp_path / "wal.log").exists()
+
+
+class TestPreallocatedWAL:
+    """미리 할당 + 재활용 세그먼트 위에서 동작하는 KV Store"""
+
+    def open_store(self, tmp_path, **kwargs):
+        return KVStore(
+            data_dir=tmp_path,
+            wal_format=WALFormat.BINARY,
+            wal_segment_size=512,
+            wal_preallocate_bytes=4096,
+            **kwargs,
+        )
+
+    def test_recovers_after_restart(self, tmp_path):
+        store = self.open_store(tmp_path)
+        for i in range(50):
+            store.put(f"key{i}", f"value{i}")
+        store.delete("key0")
+        store.close()
+
+        store2 = self.open_store(tmp_path)
+        assert store2.get("key0") is None
+        assert all(store2.get(f"key{i}") == f"value{i}" for i in range(1, 50))
+        store2.close()
+
+    def test_checkpoint_recycles_segments(self, tmp_path):
+        """체크포인트가 지운 세그먼트는 0으로 채워져 재활용되고, 옛 레코드가 다시 replay 되지 않는다"""
+        store = self.open_store(tmp_path, wal_recycle_segments=2)
+        for i in range(50):
+            store.put(f"key{i}", "old")
+        store.checkpoint()
+        assert len(list(tmp_path.glob("wal-free-*.log"))) == 2
+
+        for i in range(30):
+            store.put(f"key{i}", "new")
+        store.delete("key1")
+        # 롤링된 세그먼트가 재활용 파일을 가져갔다
+        assert len(list(tmp_path.glob("wal-free-*.log"))) < 2
+        store.close()
+
+        store2 = self.open_store(tmp_path)
+        assert store2.get("key1") is None
+        assert all(store2.get(f"key{i}") == "new" for i in range(2, 30))
+        assert all(store2.get(f"key{i}") == "old" for i in range(30, 50))
+        store2.close()
+
+    def test_commit_uses_fdatasync(self, tmp_path):
+        """미리 할당된 세그먼트의 커밋 sync는 fdatasync"""
+        store = self.open_store(tmp_path)
+        with patch("os.fdatasync", wraps=os.fdatasync) as fdatasync:
+            store.put("key1", "value1")
+        assert fdatasync.call_count == 1
+        store.close()
+
+    @pytest.mark.parametrize("durability", list(Durability))
+    def test_direct_io_recovers_after_restart(self, tmp_path, durability):
+        """정렬 버퍼 + O_DIRECT 쓰기로도 세그먼트를 넘나들며 기록되고 재시작 후 복구된다"""
+        store = self.open_store(tmp_path, wal_direct_io=True, durability=durability, group_commit=True)
+
+        def writer(worker: int):
+            for i in range(50):
+                store.put(f"w{worker}-{i}", f"value{i}")
+
+        threads = [threading.Thread(target=writer, args=(worker,)) for worker in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        store.checkpoint()
+        store.put("after", "checkpoint")
+        store.close()
+
+        store2 = self.open_store(tmp_path, wal_direct_io=True)
+        assert all(store2.get(f"w{worker}-{i}") == f"value{i}" for worker in range(4) for i in range(50))
+        assert store2.get("after") == "checkpoint"
+        store2.close()
+
+    def test_direct_io_relaxed_commit_reaches_disk_on_wait_durable(self, tmp_path):
+        """INTERVAL 모드의 커밋은 버퍼에 남아 있다가 sync가 쓴다. wal_entries는 그 전에 sync를 기다린다"""
+        store = self.open_store(tmp_path, wal_direct_io=True, durability=Durability.INTERVAL, sync_interval_ms=60_000)
+        store.put("key1", "value1")
+        assert store.durable_lsn < store.lsn
+
+        assert [record.key for _, _, record in store.wal_entries(0, store.lsn)] == ["key1"]
+        assert store.durable_lsn == store.lsn
+        store.close()
+
+
+def wait_until(condition, timeout: float = 5.0) -> bool:
+    import time
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+class TestBackgroundCheckpoint:
+    """백그라운드 체크포인트 - 쓰기를 멈추지 않는 스냅샷"""
+
+    def test_writes_proceed_while_checkpoint_is_written(self, tmp_path):
+        """체크포인트 파일을 쓰는 동안에도 PUT/DEL/GET이 블록되지 않는다"""
+        import threading
+
+        store = KVStore(data_dir=tmp_path)
+        store.put("key1", "value1")
+        store.put("key2", "value2")
+
+        writing = threading.Event()
+        release = threading.Event()
+        original_write = store._write_checkpoint
+
+        def slow_write(snapshot, checkpoint_lsn):
+            writing.set()
+            release.wait(timeout=5)
+            original_write(snapshot, checkpoint_lsn)
+
+        store._write_checkpoint = slow_write
+        checkpointer = threading.Thread(target=store.checkpoint)
+        checkpointer.start()
+        assert writing.wait(timeout=5)
+
+        # 체크포인트 진행 중 쓰기
+        store.put("key3", "value3")
+        store.put("key1", "updated1")
+        store.delete("key2")
+        assert store.get("key1") == "updated1"
+        assert store.get("key2") is None
+        assert store.get("key3") == "value3"
+
+        release.set()
+        checkpointer.join()
+
+        assert store.get("key1") == "updated1"
+        assert store.get("key2") is None
+        assert store.get("key3") == "value3"
+        store.close()
+
+        # 스냅샷에는 체크포인트 시점 상태만, 이후 변경은 WAL에서 복구
+        data, _ = load_checkpoint(tmp_path / "checkpoint.dat")
+        assert data == {"key1": "value1", "key2": "value2"}
+
+        store2 = KVStore(data_dir=tmp_path)
+        assert store2.get("key1") == "updated1"
+        assert store2.get("key2") is None
+        assert store2.get("key3") == "value3"
+
+    def test_failed_checkpoint_keeps_store_consistent(self, tmp_path):
+        """체크포인트 쓰기가 실패해도 메모리 상태와 WAL은 그대로 유지된다"""
+        store = KVStore(data_dir=tmp_path)
+        store.put("key1", "value1")
+
+        with patch.object(store, "_write_checkpoint", side_effect=IOError("Disk full")):
+            with pytest.raises(IOError):
+                store.checkpoint()
+
+        store.put("key2", "value2")
+        assert store.get("key1") == "value1"
+        assert store.get("key2") == "value2"
+        store.close()
+
+        store2 = KVStore(data_dir=tmp_path)
+        assert store2.get("key1") == "value1"
+        assert store2.get("key2") == "value2"
+
+    def test_wal_size_trigger_runs_checkpoint(self, tmp_path):
+        """WAL이 checkpoint_wal_bytes만큼 쌓이면 백그라운드에서 체크포인트한다"""
+        store = KVStore(data_dir=tmp_path, checkpoint_wal_bytes=1024, wal_segment_size=512)
+        for i in range(50):
+            store.put(f"key{i}", f"value{i}")
+
+        assert wait_until(lambda: (tmp_path / "checkpoint.dat").exists())
+        assert wait_until(lambda: wal_size(tmp_path) < 1024)
+        store.close()
+
+        store2 = KVStore(data_dir=tmp_path)
+        assert all(store2.get(f"key{i}") == f"value{i}" for i in range(50))
+
+    def test_interval_trigger_runs_checkpoint(self, tmp_path):
+        """checkpoint_interval_seconds가 지나면 백그라운드에서 체크포인트한다"""
+        store = KVStore(data_dir=tmp_path, checkpoint_interval_seconds=0.05)
+        store.put("key1", "value1")
+
+        assert wait_until(lambda: (tmp_path / "checkpoint.dat").exists())
+        store.close()
+
+        store2 = KVStore(data_dir=tmp_path)
+        assert store2.get("key1") == "value1"
+
+
+class TestStreamingCheckpoint:
+    """스트리밍 바이너리 체크포인트"""
+
+    def test_checkpoint_records_covered_lsn(self, tmp_path):
+        """체크포인트 footer에 커버하는 WAL LSN이 기록된다"""
+        store = KVStore(data_dir=tmp_path)
+        store.put("key1", "value1")
+        store.checkpoint()
+
+        _, lsn = load_checkpoint(tmp_path / "checkpoint.dat")
+        assert lsn == store._wal.segments[0][0]
+        assert lsn > 0
+
+    def test_recovery_skips_segments_covered_by_checkpoint(self, tmp_path):
+        """세그먼트 삭제 전 크래시로 남은 이전 세그먼트는 replay 하지 않는다"""
+        store = KVStore(data_dir=tmp_path)
+        store.put("key1", "value1")
+        store.delete("key1")
+
+        with patch.object(store._wal, "truncate_before"):
+            store.checkpoint()
+        store.close()
+
+        with patch.object(KVStore, "_apply_record") as apply_record:
+            KVStore(data_dir=tmp_path)
+        apply_record.assert_not_called()
+
+    def test_legacy_json_checkpoint_is_loaded_and_replaced(self, tmp_path):
+        """예전 checkpoint.json도 읽고, 새 체크포인트를 쓰면 삭제한다"""
+        import json
+
+        (tmp_path / "checkpoint.json").write_text(json.dumps({"key1": "value1"}))
+
+        store = KVStore(data_dir=tmp_path)
+        assert store.get("key1") == "value1"
+
+        store.put("key2", "value2")
+        store.checkpoint()
+        store.close()
+
+        assert not (tmp_path / "checkpoint.json").exists()
+        store2 = KVStore(data_dir=tmp_path)
+        assert store2.get("key1") == "value1"
+        assert store2.get("key2") == "value2"
+
+
+@pytest.mark.parametrize("memtable_factory", [DictMemTable, SortedMemTable])
+class TestRangeScan:
+    """memtable 교체와 범위 조회"""
+
+    def test_scan_and_prefix(self, tmp_path, memtable_factory):
+        """scan/prefix는 현재 상태를 key 순서대로 보여준다"""
+        store = KVStore(data_dir=tmp_path, memtable_factory=memtable_factory)
+        for key in ["user:2", "user:1", "order:1", "user:3"]:
+            store.put(key, key.upper())
+        store.delete("user:3")
+
+        assert list(store.prefix("user:")) == [("user:1", "USER:1"), ("user:2", "USER:2")]
+        assert [k for k, _ in store.scan(reverse=True)] == ["user:2", "user:1", "order:1"]
+
+    def test_scan_merges_delta_during_checkpoint(self, tmp_path, memtable_factory):
+        """체크포인트 중(frozen 스냅샷 존재)에는 delta의 쓰기/삭제가 스냅샷을 가린다"""
+        store = KVStore(data_dir=tmp_path, memtable_factory=memtable_factory)
+        for i in range(5):
+            store.put(f"k{i}", "old")
+        with store._lock:
+            store._freeze()
+
+        store.put("k1", "new")
+        store.delete("k3")
+        store.put("k9", "new")
+
+        expected = [("k0", "old"), ("k1", "new"), ("k2", "old"), ("k4", "old"), ("k9", "new")]
+        assert list(store.scan()) == expected
+        assert list(store.scan(reverse=True)) == expected[::-1]
+
+        with store._lock:
+            store._unfreeze()
+        assert list(store.scan()) == expected
+
+    def test_recovery_rebuilds_memtable(self, tmp_path, memtable_factory):
+        """체크포인트 + WAL replay 후에도 범위 조회 결과가 같다"""
+        store = KVStore(data_dir=tmp_path, memtable_factory=memtable_factory)
+        store.put("b", "1")
+        store.checkpoint()
+        store.put("a", "2")
+        store.delete("b")
+        store.put("c", "3")
+        store.close()
+
+        store = KVStore(data_dir=tmp_path, memtable_factory=memtable_factory)
+        assert list(store.scan()) == [("a", "2"), ("c", "3")]
+
+
+class TestLSMFlush:
+    """memtable → SSTable flush"""
+
+    def test_flush_writes_table_and_truncates_wal(self, tmp_path):
+        """checkpoint()는 LSM 모드에서 memtable을 SSTable로 flush 하고 이전 WAL 세그먼트를 지운다"""
+        store = KVStore(data_dir=tmp_path, memtable_flush_bytes=1 << 20)
+        for i in range(10):
+            store.put(f"key{i}", f"value{i}")
+        store.checkpoint()
+
+        assert [p.name for p in tmp_path.glob("sst-*.sst")] == ["sst-000001.sst"]
+        assert not (tmp_path / "checkpoint.dat").exists()
+        assert len(store._store_data) == 0
+        assert wal_size(tmp_path) == 0
+        assert store.get("key3") == "value3"
+        store.close()
+
+    def test_get_prefers_newest_table(self, tmp_path):
+        """같은 key는 memtable → 최신 테이블 순으로 찾고, tombstone은 오래된 값을 가린다"""
+        store = KVStore(data_dir=tmp_path, memtable_flush_bytes=1 << 20)
+        store.put("a", "1")
+        store.put("b", "1")
+        store.put("c", "1")
+        store.checkpoint()
+        store.put("a", "2")
+        store.delete("b")
+        store.checkpoint()
+        store.put("c", "3")
+
+        assert (store.get("a"), store.get("b"), store.get("c")) == ("2", None, "3")
+        assert list(store.scan()) == [("a", "2"), ("c", "3")]
+        assert list(store.scan(reverse=True)) == [("c", "3"), ("a", "2")]
+        store.close()
+
+    def test_recovery_reads_tables_and_replays_rest(self, tmp_path):
+        """재시작하면 manifest의 테이블을 열고 flush 이후 WAL만 replay 한다"""
+        store = KVStore(data_dir=tmp_path, memtable_flush_bytes=1 << 20)
+        store.put("a", "1")
+        store.put("b", "1")
+        store.checkpoint()
+        store.delete("a")
+        store.put("c", "2")
+        store.close()
+
+        # 옵션 없이 열어도 manifest가 있으면 LSM 모드
+        store = KVStore(data_dir=tmp_path)
+        assert list(store.scan()) == [("b", "1"), ("c", "2")]
+        assert len(store._store_data) == 2
+        store.close()
+
+    def test_flush_is_triggered_by_memtable_size(self, tmp_path):
+        """memtable이 memtable_flush_bytes를 넘으면 백그라운드에서 flush 한다"""
+        store = KVStore(data_dir=tmp_path, memtable_flush_bytes=200)
+        for i in range(20):
+            store.put(f"key{i:02d}", "v" * 10)
+
+        assert wait_until(lambda: list(tmp_path.glob("sst-*.sst")))
+        assert wait_until(lambda: store._memtable_bytes < 200)
+        assert all(store.get(f"key{i:02d}") == "v" * 10 for i in range(20))
+        store.close()
+
+    def test_existing_checkpoint_is_moved_into_first_table(self, tmp_path):
+        """체크포인트가 있던 디렉터리를 LSM 모드로 열면 첫 flush가 체크포인트를 대체한다"""
+        store = KVStore(data_dir=tmp_path)
+        store.put("a", "1")
+        store.checkpoint()
+        store.put("b", "2")
+        store.close()
+
+        store = KVStore(data_dir=tmp_path, memtable_flush_bytes=1 << 20)
+        store.checkpoint()
+        store.close()
+
+        assert not (tmp_path / "checkpoint.dat").exists()
+        store = KVStore(data_dir=tmp_path)
+        assert list(store.scan()) == [("a", "1"), ("b", "2")]
+        store.close()
+
+    def test_unregistered_table_is_removed_on_open(self, tmp_path):
+        """manifest에 기록되기 전에 크래시로 남은 테이블 파일은 지우고 WAL에서 다시 복구한다"""
+        store = KVStore(data_dir=tmp_path, memtable_flush_bytes=1 << 20)
+        store.put("a", "1")
+        with patch("src.kv_store.Manifest.save", side_effect=OSError("crash")):
+            with pytest.raises(OSError):
+                store.checkpoint()
+        assert store.get("a") == "1"
+        store.close()
+
+        store = KVStore(data_dir=tmp_path, memtable_flush_bytes=1 << 20)
+        assert not list(tmp_path.glob("sst-*.sst"))
+        assert store.get("a") == "1"
+        store.close()
+
+    def test_missing_keys_skip_tables_via_bloom_filter(self, tmp_path):
+        """테이블에 없는 key 조회는 대부분 Bloom filter에서 걸러지고 카운터로 확인할 수 있다"""
+        store = KVStore(data_dir=tmp_path, memtable_flush_bytes=1 << 20, bloom_bits_per_key=10)
+        for batch in range(3):
+            for i in range(100):
+                store.put(f"key{batch}-{i}", "v")
+            store.checkpoint()
+
+        for i in range(200):
+            assert store.get(f"missing{i}") is None
+        stats = store.table_stats()
+        assert stats["tables"] == 3
+        assert stats["filter_checks"] == 600
+        assert stats["block_reads"] == stats["filter_false_positives"] < 30
+        store.close()
+
+
+@pytest.mark.parametrize(
+    "strategy",
+    [LeveledCompaction(l0_trigger=2, base_level_bytes=1 << 20), SizeTieredCompaction(min_threshold=2)],
+    ids=["leveled", "size-tiered"],
+)
+class TestCompaction:
+    """SSTable 컴팩션"""
+
+    def fill(self, store, rounds: int) -> None:
+        for r in range(rounds):
+            for i in range(20):
+                store.put(f"key{i:02d}", f"value{r}")
+            store.delete(f"key{r:02d}")
+            store.checkpoint()
+
+    def test_compact_merges_tables_and_drops_dead_entries(self, tmp_path, strategy):
+        """compact()는 테이블을 합치면서 가려진 값과 tombstone을 버리고, 입력 파일을 지운다"""
+        store = KVStore(data_dir=tmp_path, memtable_flush_bytes=1 << 20, compaction_strategy=strategy)
+        store._checkpoint_stop.set()
+        self.fill(store, 4)
+        expected = list(store.scan())
+
+        assert store.compact() > 0
+        assert store.table_stats()["tables"] == 1
+        assert list(store.scan()) == expected
+        assert store._tables[0].count == len(expected)
+        assert len(list(tmp_path.glob("sst-*.sst"))) == 1
+        store.close()
+
+        store = KVStore(data_dir=tmp_path)
+        assert list(store.scan()) == expected
+        store.close()
+
+    def test_write_amplification_is_reported(self, tmp_path, strategy):
+        """WAL, flush, 컴팩션 출력 바이트와 쓰기 증폭을 보고한다"""
+        store = KVStore(data_dir=tmp_path, memtable_flush_bytes=1 << 20, compaction_strategy=strategy)
+        store._checkpoint_stop.set()
+        self.fill(store, 3)
+        store.compact()
+
+        stats = store.compaction_stats()
+        assert stats["compactions"] >= 1
+        assert stats["compaction_write_bytes"] > 0
+        assert stats["write_amplification"] > 1
+        assert stats["write_amplification"] == pytest.approx(
+            (stats["wal_bytes"] + stats["flush_bytes"] + stats["compaction_write_bytes"]) / stats["user_bytes"]
+        )
+        store.close()
+
+    def test_background_compaction_after_flush(self, tmp_path, strategy):
+        """flush가 끝나면 백그라운드 스레드가 컴팩션을 수행한다"""
+        store = KVStore(
+            data_dir=tmp_path,
+            memtable_flush_bytes=1 << 20,
+            compaction_strategy=strategy,
+            compaction_rate_limit_bytes=10 << 20,
+        )
+        self.fill(store, 4)
+
+        assert wait_until(lambda: store.compaction_stats()["compactions"] >= 1)
+        assert wait_until(lambda: store.table_stats()["tables"] < 4)
+        assert store.get("key10") == "value3"
+        assert store.get("key03") is None
+        store.close()
+
+
+class TestBlockCacheSharing:
+    """여러 KVStore가 블록 캐시 하나를 공유"""
+
+    def test_stores_share_one_budget(self, tmp_path):
+        """두 스토어의 테이블 블록이 같은 캐시에 들어가고 반복 조회는 캐시에서 읽는다"""
+        cache = LRUBlockCache(1 << 20)
+        stores = []
+        for name in ("a", "b"):
+            data_dir = tmp_path / name
+            data_dir.mkdir()
+            store = KVStore(data_dir=data_dir, memtable_flush_bytes=1 << 20, block_cache=cache)
+            store.put("key", name)
+            store.checkpoint()
+            stores.append(store)
+
+        for _ in range(3):
+            assert [store.get("key") for store in stores] == ["a", "b"]
+
+        stats = cache.stats()
+        assert stats["misses"] == 2
+        assert stats["hits"] == 4
+        assert sum(store.table_stats()["block_reads"] for store in stores) == 2
+        for store in stores:
+            store.close()
+
+
+class TestLockFreeReads:
+    """읽기는 쓰기 락도, 체크포인트/flush도 기다리지 않는다"""
+
+    @pytest.mark.parametrize("lsm", [False, True])
+    def test_reads_do_not_wait_for_store_lock(self, tmp_path, lsm):
+        """쓰기가 store 락을 쥐고 있는 동안에도 GET/scan이 바로 반환된다"""
+        store = KVStore(data_dir=tmp_path, memtable_flush_bytes=1 << 20 if lsm else None)
+        store.put("key1", "value1")
+        if lsm:
+            store.checkpoint()
+        store.put("key2", "value2")
+
+        with store._lock:
+            assert store.get("key1") == "value1"
+            assert store.get("key2") == "value2"
+            assert list(store.scan()) == [("key1", "value1"), ("key2", "value2")]
+        store.close()
+
+    def test_reads_proceed_while_flush_is_written(self, tmp_path):
+        """SSTable을 쓰는 동안에도 flush 중인 memtable과 새 쓰기를 읽을 수 있다"""
+        import threading
+
+        store = KVStore(data_dir=tmp_path, memtable_flush_bytes=1 << 20)
+        store.put("key1", "value1")
+
+        writing = threading.Event()
+        release = threading.Event()
+        original_flush = store._flush_memtable
+
+        def slow_flush(snapshot, flush_lsn):
+            writing.set()
+            release.wait(timeout=5)
+            original_flush(snapshot, flush_lsn)
+
+        store._flush_memtable = slow_flush
+        flusher = threading.Thread(target=store.checkpoint)
+        flusher.start()
+        assert writing.wait(timeout=5)
+
+        store.put("key2", "value2")
+        assert store.get("key1") == "value1"
+        assert list(store.scan()) == [("key1", "value1"), ("key2", "value2")]
+
+        release.set()
+        flusher.join()
+        assert store.get("key1") == "value1"
+        assert store.table_stats()["tables"] == 1
+        store.close()
@@ -0,0 +1,35 @@
+"""SSTable manifest 테스트"""
+
+from src.manifest import Manifest, TableMeta, table_file_name
+
+
+class TestManifest:
+    """manifest 저장/복원"""
+
+    def test_missing_manifest_loads_as_none(self, tmp_path):
+        """manifest가 없으면 None"""
+        assert Manifest.load(tmp_path) is None
+
+    def test_roundtrip(self, tmp_path):
+        """테이블 목록, LSN, 다음 테이블 번호를 그대로 복원한다"""
+        manifest = Manifest()
+        table_id = manifest.allocate_table_id()
+        manifest.tables.append(TableMeta(table_id, 3, 100, "a", "c"))
+        manifest.lsn = 42
+        manifest.save(tmp_path)
+
+        loaded = Manifest.load(tmp_path)
+        assert [t.to_dict() for t in loaded.tables] == [t.to_dict() for t in manifest.tables]
+        assert loaded.lsn == 42
+        assert loaded.allocate_table_id() == table_id + 1
+        assert not (tmp_path / "manifest.json.tmp").exists()
+
+    def test_remove_orphan_tables(self, tmp_path):
+        """manifest에 없는 sst 파일과 쓰다 만 tmp 파일을 지운다"""
+        manifest = Manifest([TableMeta(1, 0, 0, None, None)], lsn=0, next_table_id=3)
+        for name in [table_file_name(1), table_file_name(2), table_file_name(3) + ".tmp"]:
+            (tmp_path / name).write_bytes(b"")
+
+        manifest.remove_orphan_tables(tmp_path)
+
+        assert sorted(p.name for p in tmp_path.iterdir()) == [table_file_name(1)]
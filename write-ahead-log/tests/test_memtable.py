@@ -0,0 +1,97 @@
+"""memtable 구현 테스트"""
+
+import pytest
+
+from src.memtable import DictMemTable, SortedMemTable, merge_scans, prefix_end
+
+
+@pytest.fixture(params=[DictMemTable, SortedMemTable])
+def memtable(request):
+    return request.param()
+
+
+class TestPointOperations:
+    """점 조회/쓰기"""
+
+    def test_put_get_delete(self, memtable):
+        """쓰고 읽고 지우는 동작은 dict와 같다"""
+        memtable["b"] = "2"
+        memtable["a"] = "1"
+        memtable["b"] = "3"
+        assert memtable.get("b") == "3"
+        assert memtable.pop("a") == "1"
+        assert memtable.pop("missing", None) is None
+        assert "a" not in memtable
+        assert len(memtable) == 1
+
+    def test_deleted_key_can_be_written_again(self, memtable):
+        """지웠던 key를 다시 쓰면 scan에 한 번만 나온다"""
+        for key in ["a", "b", "c"]:
+            memtable[key] = key
+        list(memtable.scan())
+        del memtable["b"]
+        assert list(memtable.scan()) == [("a", "a"), ("c", "c")]
+
+        memtable["b"] = "again"
+        assert list(memtable.scan()) == [("a", "a"), ("b", "again"), ("c", "c")]
+
+
+class TestRangeScan:
+    """범위 조회"""
+
+    def test_scan_is_sorted_and_half_open(self, memtable):
+        """start 이상 end 미만 key를 정렬 순서로 내보낸다"""
+        for i in [5, 1, 9, 3, 7]:
+            memtable[f"k{i}"] = str(i)
+
+        assert [k for k, _ in memtable.scan()] == ["k1", "k3", "k5", "k7", "k9"]
+        assert [k for k, _ in memtable.scan("k3", "k7")] == ["k3", "k5"]
+        assert [k for k, _ in memtable.scan(start="k4")] == ["k5", "k7", "k9"]
+        assert [k for k, _ in memtable.scan(end="k4")] == ["k1", "k3"]
+
+    def test_reverse_scan(self, memtable):
+        """reverse=True면 같은 범위를 역순으로 내보낸다"""
+        for i in range(10):
+            memtable[f"k{i}"] = str(i)
+
+        assert [k for k, _ in memtable.scan("k2", "k6", reverse=True)] == ["k5", "k4", "k3", "k2"]
+
+    def test_prefix(self, memtable):
+        """prefix로 시작하는 key만 내보낸다"""
+        for key in ["user:1", "user:2", "users", "usea", "order:1"]:
+            memtable[key] = key
+
+        assert [k for k, _ in memtable.prefix("user:")] == ["user:1", "user:2"]
+        assert [k for k, _ in memtable.prefix("user:", reverse=True)] == ["user:2", "user:1"]
+        assert [k for k, _ in memtable.prefix("")] == sorted(["user:1", "user:2", "users", "usea", "order:1"])
+
+    def test_scan_is_lazy_and_tolerates_writes(self, memtable):
+        """scan 도중의 쓰기로 깨지지 않고, 도중에 지워진 key는 건너뛴다"""
+        for i in range(10):
+            memtable[f"k{i}"] = str(i)
+
+        scan = memtable.scan()
+        assert next(scan) == ("k0", "0")
+        del memtable["k1"]
+        memtable["k2"] = "updated"
+        memtable["new"] = "x"
+
+        assert list(scan)[:2] == [("k2", "updated"), ("k3", "3")]
+
+
+class TestHelpers:
+    """범위 조회 보조 함수"""
+
+    def test_prefix_end(self):
+        """prefix_end는 prefix로 시작하는 모든 문자열보다 큰 가장 작은 문자열"""
+        assert prefix_end("ab") == "ac"
+        assert prefix_end("a" + chr(0x10FFFF)) == "b"
+        assert prefix_end("") is None
+
+    def test_merge_scans_prefers_earlier_source(self):
+        """같은 key는 앞쪽 소스 값만 남기고, 정방향/역방향 모두 정렬된다"""
+        newer = [("a", "new"), ("c", "new")]
+        older = [("a", "old"), ("b", "old"), ("c", "old")]
+
+        assert list(merge_scans([newer, older])) == [("a", "new"), ("b", "old"), ("c", "new")]
+        assert list(merge_scans([newer[::-1], older[::-1]], reverse=True)) == [("c", "new"), ("b", "old"), ("a", "new")]
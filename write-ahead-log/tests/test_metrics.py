@@ -0,0 +1,174 @@
+"""계측 (히스토그램, KVStore.stats, Prometheus 내보내기) 테스트"""
+
+import threading
+import urllib.request
+
+import pytest
+
+from src.kv_store import KVStore
+from src.metrics import Histogram, PrometheusExporter, bucket_index, bucket_upper_bound, render_prometheus
+from src.wal_record import RecordType, WALRecord
+
+PHASES = ["lock_wait", "append", "flush", "fsync", "apply", "commit", "checkpoint"]
+
+
+class TestHistogram:
+    def test_small_values_are_exact(self):
+        histogram = Histogram()
+        for value in range(1, 11):
+            histogram.record(value)
+
+        assert histogram.percentile(0.5) == 5
+        assert histogram.percentile(1.0) == 10
+        assert (histogram.count, histogram.sum, histogram.min, histogram.max) == (10, 55, 1, 10)
+
+    def test_buckets_are_contiguous_and_bound_relative_error(self):
+        """버킷 경계가 빈틈없이 이어지고, 상한은 값보다 약 3% 이상 크지 않다"""
+        previous = -1
+        for value in list(range(0, 5000)) + [10**6, 10**9 + 7, 2**40 + 123, 2**63]:
+            index = bucket_index(value)
+            assert index >= previous
+            previous = index
+            upper = bucket_upper_bound(index)
+            assert value <= upper <= value * 1.032 + 1
+        assert bucket_index(bucket_upper_bound(100) + 1) == 101
+
+    def test_percentiles_of_wide_distribution(self):
+        histogram = Histogram()
+        for value in range(1, 100_001):
+            histogram.record(value * 1000)
+
+        assert histogram.percentile(0.5) == pytest.approx(50_000_000, rel=0.035)
+        assert histogram.percentile(0.99) == pytest.approx(99_000_000, rel=0.035)
+        assert histogram.percentile(0.999) == pytest.approx(99_900_000, rel=0.035)
+        # 가장 큰 값보다 크게 보고하지 않는다
+        assert histogram.percentile(1.0) == 100_000_000
+
+    def test_empty_summary(self):
+        assert Histogram().summary() == {
+            "count": 0, "sum": 0.0, "min": 0.0, "max": 0.0, "mean": 0.0,
+            "p50": 0.0, "p90": 0.0, "p99": 0.0, "p999": 0.0,
+        }
+
+
+class TestStoreStats:
+    def test_counters_without_latency_metrics(self, tmp_path):
+        """기본값에서는 카운터만 세고 지연 히스토그램은 없다"""
+        store = KVStore(data_dir=tmp_path)
+        store.put("a", "1")
+        store.delete("a")
+        store.write_batch([WALRecord(RecordType.PUT, "b", "2"), WALRecord(RecordType.PUT, "c", "3")])
+        store.checkpoint()
+
+        stats = store.stats()
+        assert (stats["commits"], stats["records"], stats["checkpoints"]) == (3, 3, 1)
+        # 커밋마다 한 번 + 체크포인트 롤링에서 한 번
+        assert stats["fsyncs"] == 4
+        assert stats["wal_bytes"] == stats["lsn"]
+        assert stats["checkpoint_lsn"] == stats["lsn"]
+        assert "latency_us" not in stats
+        assert stats["tables"]["tables"] == 0
+        store.close()
+
+    def test_latency_histograms_cover_every_phase(self, tmp_path):
+        store = KVStore(data_dir=tmp_path, latency_metrics=True)
+        for i in range(20):
+            store.put(f"k{i}", "v")
+        store.checkpoint()
+
+        latency = store.stats()["latency_us"]
+        assert list(latency) == PHASES
+        for phase in ("lock_wait", "append", "apply", "commit"):
+            assert latency[phase]["count"] == 20
+        # 체크포인트 롤링도 flush + fsync 한 번씩
+        assert latency["flush"]["count"] == latency["fsync"]["count"] == 21
+        assert latency["checkpoint"]["count"] == 1
+        assert 0 < latency["fsync"]["p50"] <= latency["fsync"]["max"]
+        # 커밋 전체는 그 안의 fsync보다 짧을 수 없다
+        assert latency["commit"]["max"] >= latency["fsync"]["p50"]
+        store.close()
+
+    def test_group_commit_batches_are_recorded(self, tmp_path):
+        store = KVStore(data_dir=tmp_path, group_commit=True, latency_metrics=True)
+
+        def writer(worker: int):
+            for i in range(50):
+                store.put(f"w{worker}-{i}", "v")
+
+        threads = [threading.Thread(target=writer, args=(worker,)) for worker in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        stats = store.stats()
+        assert stats["records"] == 200
+        assert stats["batch_records"]["sum"] == 200
+        assert stats["batch_records"]["count"] == stats["commits"] == stats["fsyncs"]
+        store.close()
+
+    def test_user_hooks_still_run_with_metrics(self, tmp_path):
+        calls = []
+        store = KVStore(
+            data_dir=tmp_path,
+            latency_metrics=True,
+            post_append_hook=lambda: calls.append("append"),
+            post_flush_hook=lambda: calls.append("flush"),
+            post_sync_hook=lambda: calls.append("sync"),
+        )
+        store.put("k", "v")
+
+        assert calls == ["append", "flush", "sync"]
+        assert store.stats()["fsyncs"] == 1
+        store.close()
+
+    def test_failed_commit_is_not_counted(self, tmp_path):
+        def fail():
+            raise OSError("disk full")
+
+        store = KVStore(data_dir=tmp_path, post_sync_hook=fail)
+        with pytest.raises(OSError):
+            store.put("k", "v")
+
+        stats = store.stats()
+        assert (stats["commits"], stats["records"], stats["wal_bytes"]) == (0, 0, 0)
+        store.close()
+
+
+class TestPrometheus:
+    def test_render_counters_gauges_and_summaries(self, tmp_path):
+        store = KVStore(data_dir=tmp_path, latency_metrics=True)
+        store.put("k", "v")
+        text = render_prometheus(store.stats())
+        store.close()
+
+        lines = text.splitlines()
+        assert "# TYPE kvstore_commits_total counter" in lines
+        assert "kvstore_commits_total 1" in lines
+        assert "# TYPE kvstore_lsn gauge" in lines
+        assert "# TYPE kvstore_fsync_seconds summary" in lines
+        assert "kvstore_fsync_seconds_count 1" in lines
+        assert any(line.startswith('kvstore_fsync_seconds{quantile="0.99"} ') for line in lines)
+        assert "kvstore_compaction_write_amplification" in text
+        assert "kvstore_batch_records_count 1" in lines
+        # 숫자가 아닌 값이나 주석이 아닌 줄은 "이름 값" 형식
+        for line in lines:
+            if not line.startswith("#"):
+                float(line.rsplit(" ", 1)[1])
+
+    def test_exporter_serves_metrics_over_http(self, tmp_path):
+        store = KVStore(data_dir=tmp_path)
+        store.put("k", "v")
+        exporter = PrometheusExporter(store.stats)
+        host, port = exporter.address
+        try:
+            with urllib.request.urlopen(f"http://{host}:{port}/metrics") as response:
+                body = response.read().decode()
+                assert response.headers["Content-Type"].startswith("text/plain")
+            assert "kvstore_commits_total 1" in body.splitlines()
+
+            with pytest.raises(urllib.error.HTTPError):
+                urllib.request.urlopen(f"http://{host}:{port}/other")
+        finally:
+            exporter.close()
+            store.close()
@@ -0,0 +1,117 @@
+"""병렬 WAL replay 테스트"""
+
+import pytest
+
+from src.kv_store import KVStore
+from src.parallel_replay import read_entries_parallel
+from src.segmented_wal import SegmentedWAL, list_segments
+from src.wal_record import RecordType, WALFormat, WALRecord
+
+
+def write_log(directory, wal_format, count=200, segment_size=2048):
+    wal = SegmentedWAL(directory, segment_size=segment_size, wal_format=wal_format)
+    for i in range(count):
+        if i % 7 == 0:
+            wal.append(WALRecord(RecordType.DEL, f"key{i - 1}"))
+        elif i % 11 == 0:
+            wal.append(WALRecord.batch([
+                WALRecord(RecordType.PUT, f"batch{i}a", "a"),
+                WALRecord(RecordType.PUT, f"batch{i}b", "b\nwith newline"),
+            ]))
+        else:
+            wal.append(WALRecord(RecordType.PUT, f"key{i}", f"value{i}"))
+    wal.close()
+
+
+def as_tuples(entries):
+    return [(lsn, end, r.record_type, r.key, r.value) for lsn, end, r in entries]
+
+
+class TestParallelReplay:
+    """순차 replay와 같은 결과"""
+
+    @pytest.mark.parametrize("wal_format", [WALFormat.JSON, WALFormat.BINARY])
+    def test_matches_sequential_read(self, tmp_path, wal_format):
+        """여러 세그먼트에 걸친 로그를 순차 읽기와 같은 순서/LSN으로 읽는다"""
+        write_log(tmp_path, wal_format)
+        assert len(list_segments(tmp_path)) > 1
+
+        expected = as_tuples(SegmentedWAL.read_entries(tmp_path))
+        actual = as_tuples(read_entries_parallel(tmp_path, workers=2, chunk_size=256))
+
+        assert actual == expected
+
+    @pytest.mark.parametrize("wal_format", [WALFormat.JSON, WALFormat.BINARY])
+    def test_respects_start_lsn(self, tmp_path, wal_format):
+        """start_lsn 이전 레코드는 내보내지 않는다"""
+        write_log(tmp_path, wal_format)
+        start_lsn = [lsn for lsn, _, _ in SegmentedWAL.read_entries(tmp_path)][100]
+
+        expected = as_tuples(SegmentedWAL.read_entries(tmp_path, start_lsn))
+        actual = as_tuples(read_entries_parallel(tmp_path, start_lsn, workers=2, chunk_size=256))
+
+        assert actual == expected
+
+    @pytest.mark.parametrize("wal_format", [WALFormat.JSON, WALFormat.BINARY])
+    def test_stops_at_first_corrupted_record(self, tmp_path, wal_format):
+        """손상된 레코드에서 멈추고 이후 세그먼트도 읽지 않는다"""
+        write_log(tmp_path, wal_format)
+        _, first_path = list_segments(tmp_path)[0]
+        data = bytearray(first_path.read_bytes())
+        data[len(data) // 2] ^= 0xFF
+        first_path.write_bytes(bytes(data))
+
+        expected = as_tuples(SegmentedWAL.read_entries(tmp_path))
+        actual = as_tuples(read_entries_parallel(tmp_path, workers=2, chunk_size=256))
+
+        assert actual == expected
+        assert len(actual) < 200
+
+    @pytest.mark.parametrize("wal_format", [WALFormat.JSON, WALFormat.BINARY])
+    def test_torn_tail_is_ignored(self, tmp_path, wal_format):
+        """끝부분 불완전 레코드는 무시한다"""
+        write_log(tmp_path, wal_format)
+        _, last_path = list_segments(tmp_path)[-1]
+        with open(last_path, "ab") as f:
+            f.write(WALRecord(RecordType.PUT, "torn", "value").serialize_binary()[:-3])
+
+        expected = as_tuples(SegmentedWAL.read_entries(tmp_path))
+        actual = as_tuples(read_entries_parallel(tmp_path, workers=2, chunk_size=256))
+
+        assert actual == expected
+        assert "torn" not in [key for _, _, _, key, _ in actual]
+
+
+    def test_preallocated_segments(self, tmp_path):
+        """미리 할당된 세그먼트의 0 꼬리는 건너뛰고 다음 세그먼트로 이어 읽는다"""
+        wal = SegmentedWAL(tmp_path, segment_size=2048, wal_format=WALFormat.BINARY, preallocate_bytes=4096)
+        for i in range(200):
+            wal.append(WALRecord(RecordType.PUT, f"key{i}", f"value{i}"))
+        wal.close()
+        assert len(list_segments(tmp_path)) > 1
+
+        expected = as_tuples(SegmentedWAL.read_entries(tmp_path))
+        actual = as_tuples(read_entries_parallel(tmp_path, workers=2, chunk_size=256))
+
+        assert len(expected) == 200
+        assert actual == expected
+
+
+class TestKVStoreParallelRecovery:
+    """KVStore recovery_workers 옵션"""
+
+    def test_parallel_recovery_restores_same_state(self, tmp_path):
+        """병렬 복구 결과가 순차 복구와 같다"""
+        store = KVStore(data_dir=tmp_path, wal_segment_size=1024)
+        for i in range(100):
+            store.put(f"key{i}", f"value{i}")
+        for i in range(0, 100, 3):
+            store.delete(f"key{i}")
+        store.close()
+
+        sequential = KVStore(data_dir=tmp_path)
+        sequential_state = {f"key{i}": sequential.get(f"key{i}") for i in range(100)}
+        sequential.close()
+
+        parallel = KVStore(data_dir=tmp_path, recovery_workers=2)
+        assert {f"key{i}": parallel.get(f"key{i}") for i in range(100)} == sequential_state
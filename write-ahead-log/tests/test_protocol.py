@@ -0,0 +1,74 @@
+"""KV 서버 프로토콜 테스트"""
+
+import pytest
+
+from src.protocol import (
+    FRAME_HEADER,
+    MAX_FRAME_BODY,
+    BodyReader,
+    Op,
+    ProtocolError,
+    decode_batch,
+    decode_frames,
+    decode_scan_response,
+    encode_batch,
+    encode_frame,
+    encode_scan_response,
+    encode_str,
+)
+from src.wal_record import RecordType, WALRecord
+
+
+class TestFraming:
+    """프레임 경계 처리"""
+
+    def test_pipelined_frames_are_split(self):
+        """연달아 온 프레임을 각각 꺼내고, 덜 온 프레임은 버퍼에 남긴다"""
+        data = encode_frame(1, Op.GET, b"abc") + encode_frame(2, Op.PING) + encode_frame(3, Op.PUT, b"xyz")
+        buffer = bytearray(data[:-2])
+
+        assert decode_frames(buffer) == [(1, Op.GET, b"abc"), (2, Op.PING, b"")]
+        assert len(buffer) == FRAME_HEADER.size + 1
+
+        buffer += data[-2:]
+        assert decode_frames(buffer) == [(3, Op.PUT, b"xyz")]
+        assert buffer == bytearray()
+
+    def test_oversized_frame_is_rejected(self):
+        buffer = bytearray(FRAME_HEADER.pack(MAX_FRAME_BODY + 1, 1, Op.PUT))
+
+        with pytest.raises(ProtocolError):
+            decode_frames(buffer)
+
+
+class TestBodyEncoding:
+    """body 필드 인코딩"""
+
+    def test_strings_and_none_round_trip(self):
+        reader = BodyReader(encode_str("키") + encode_str(None) + encode_str(""))
+
+        assert (reader.str(), reader.str(), reader.str()) == ("키", None, "")
+
+    def test_truncated_body_is_rejected(self):
+        with pytest.raises(ProtocolError):
+            BodyReader(encode_str("value")[:-1]).str()
+
+    def test_null_key_or_put_value_in_batch_is_rejected(self):
+        for record in (WALRecord(RecordType.PUT, "k1", None), WALRecord(RecordType.DEL, None)):
+            with pytest.raises(ProtocolError, match="cannot be null"):
+                decode_batch(BodyReader(encode_batch([record])))
+
+    def test_batch_round_trip(self):
+        records = [WALRecord(RecordType.PUT, "k1", "v1"), WALRecord(RecordType.DEL, "k2")]
+
+        decoded = decode_batch(BodyReader(encode_batch(records)))
+        assert [(r.record_type, r.key, r.value) for r in decoded] == [
+            (RecordType.PUT, "k1", "v1"),
+            (RecordType.DEL, "k2", None),
+        ]
+
+    def test_scan_response_round_trip(self):
+        entries = [("a", "1"), ("b", "2")]
+
+        assert decode_scan_response(encode_scan_response(entries, True)) == (entries, True)
+        assert decode_scan_response(encode_scan_response([], False)) == ([], False)
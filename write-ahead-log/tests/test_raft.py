@@ -0,0 +1,394 @@
+"""Raft 복제 KVStore 테스트 (모두 localhost Unix 소켓)"""
+
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from src.checkpoint_file import write_checkpoint
+from src.protocol import decode_frames, encode_frame
+from src.raft import (
+    APPEND_ENTRY,
+    APPEND_HEADER,
+    APPEND_RESPONSE,
+    RAFT_APPLIED_KEY,
+    NotLeaderError,
+    RaftClient,
+    RaftNode,
+    RaftOp,
+    Role,
+    _connect,
+)
+from src.wal_record import RecordType, WALRecord
+
+PROJECT_DIR = Path(__file__).resolve().parents[1]
+
+
+class Cluster:
+    """한 프로세스 안에서 노드 여러 개를 띄운다. 노드는 닫았다가 같은 디렉터리로 다시 열 수 있다"""
+
+    def __init__(self, tmp_path: Path, size: int = 3, **options):
+        self.tmp_path = tmp_path
+        self.addresses = {i: str(tmp_path / f"raft-{i}.sock") for i in range(1, size + 1)}
+        self.options = {"election_timeout": (0.2, 0.4), "heartbeat_interval": 0.03, "request_timeout": 5.0, **options}
+        self.nodes: dict[int, RaftNode] = {}
+        for node_id in self.addresses:
+            self.start(node_id)
+
+    def start(self, node_id: int) -> RaftNode:
+        self.nodes[node_id] = RaftNode(node_id, self.addresses, self.tmp_path / f"node-{node_id}", **self.options)
+        return self.nodes[node_id]
+
+    def stop(self, node_id: int) -> None:
+        self.nodes.pop(node_id).close()
+
+    def leader(self, timeout: float = 10.0) -> RaftNode:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            leaders = [node for node in self.nodes.values() if node.role == Role.LEADER]
+            if len(leaders) == 1:
+                return leaders[0]
+            time.sleep(0.01)
+        raise AssertionError("no single leader elected")
+
+    def wait_applied(self, index: int, timeout: float = 10.0) -> None:
+        deadline = time.monotonic() + timeout
+        while any(node.status()["last_applied"] < index for node in self.nodes.values()):
+            assert time.monotonic() < deadline, [node.status() for node in self.nodes.values()]
+            time.sleep(0.01)
+
+    def close(self) -> None:
+        for node_id in list(self.nodes):
+            self.stop(node_id)
+
+
+@pytest.fixture
+def cluster(tmp_path):
+    cluster = Cluster(tmp_path)
+    yield cluster
+    cluster.close()
+
+
+class TestElection:
+    """선출과 역할"""
+
+    def test_single_leader_is_elected_and_known_by_followers(self, cluster):
+        leader = cluster.leader()
+        leader.put("k", "v")
+
+        statuses = [node.status() for node in cluster.nodes.values()]
+        assert sorted(status["role"] for status in statuses) == ["follower", "follower", "leader"]
+        assert {status["term"] for status in statuses} == {leader.status()["term"]}
+        assert all(status["leader"] == leader.node_id for status in statuses)
+
+    def test_followers_reject_requests_with_leader_hint(self, cluster):
+        leader = cluster.leader()
+        leader.put("k", "v")
+        follower = next(node for node in cluster.nodes.values() if node is not leader)
+
+        with pytest.raises(NotLeaderError) as error:
+            follower.put("k", "v2")
+        assert error.value.leader_id == leader.node_id
+        with pytest.raises(NotLeaderError):
+            follower.get("k")
+
+    def test_new_leader_is_elected_after_leader_stops(self, cluster):
+        leader = cluster.leader()
+        for i in range(20):
+            leader.put(f"k{i}", str(i))
+        old_term = leader.status()["term"]
+        cluster.stop(leader.node_id)
+
+        new_leader = cluster.leader()
+        assert new_leader.status()["term"] > old_term
+        # 커밋된 쓰기는 새 leader에도 모두 있다
+        assert [new_leader.get(f"k{i}") for i in range(20)] == [str(i) for i in range(20)]
+        new_leader.put("after", "failover")
+        assert new_leader.get("after") == "failover"
+
+    def test_term_and_vote_survive_restart(self, cluster):
+        leader = cluster.leader()
+        term = leader.status()["term"]
+        node_id = leader.node_id
+        cluster.stop(node_id)
+        cluster.leader()
+
+        restarted = cluster.start(node_id)
+        assert restarted.status()["term"] >= term
+
+    def test_single_node_cluster_elects_itself(self, tmp_path):
+        node = RaftNode(1, {1: str(tmp_path / "raft.sock")}, tmp_path / "node", election_timeout=(0.05, 0.1))
+        deadline = time.monotonic() + 5
+        while node.role != Role.LEADER:
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+
+        node.put("k", "v")
+        assert node.get("k") == "v"
+        node.close()
+
+    def test_leader_steps_down_when_log_fsync_fails(self, tmp_path):
+        """sync 스레드의 fsync가 실패하면 스레드가 조용히 죽지 않고 leader에서 내려와 다시 후보가 되지 않는다"""
+        node = RaftNode(1, {1: str(tmp_path / "raft.sock")}, tmp_path / "node", election_timeout=(0.05, 0.1), request_timeout=1.0)
+        deadline = time.monotonic() + 5
+        while node.role != Role.LEADER:
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+
+        def failing_sync():
+            raise OSError("simulated fsync failure")
+
+        with patch.object(node._log, "detach_sync", return_value=failing_sync):
+            with pytest.raises(NotLeaderError):
+                node.put("k", "v")
+            time.sleep(0.3)
+        assert node.role == Role.FOLLOWER
+        node.close()
+
+
+class TestReplication:
+    """로그 복제, 커밋, 적용"""
+
+    def test_committed_writes_are_applied_on_every_node(self, cluster):
+        leader = cluster.leader()
+        for i in range(50):
+            leader.put(f"k{i:02d}", str(i))
+        leader.delete("k00")
+        leader.write_batch([WALRecord(RecordType.PUT, "b1", "x"), WALRecord(RecordType.DEL, "k01")])
+
+        cluster.wait_applied(leader.status()["commit_index"])
+        for node in cluster.nodes.values():
+            assert node.store.get("k00") is None
+            assert node.store.get("k01") is None
+            assert node.store.get("k49") == "49"
+            assert node.store.get("b1") == "x"
+        assert [key for key, _ in leader.prefix("k0")] == [f"k0{i}" for i in range(2, 10)]
+        assert leader.get(RAFT_APPLIED_KEY) is None
+
+    def test_concurrent_writers_are_pipelined(self, cluster):
+        leader = cluster.leader()
+
+        def writer(worker: int):
+            for i in range(50):
+                leader.put(f"w{worker}-{i}", str(i))
+
+        threads = [threading.Thread(target=writer, args=(worker,)) for worker in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        cluster.wait_applied(leader.status()["commit_index"])
+        for node in cluster.nodes.values():
+            assert len([key for key, _ in node.store.prefix("w")]) == 400
+
+    def test_follower_syncs_before_acking_entries_it_already_has(self, tmp_path):
+        """다른 연결이 쓰고 아직 sync하지 않은 엔트리만 받아도 sync한 뒤에 성공을 알린다"""
+        addresses = {1: str(tmp_path / "raft-1.sock"), 2: str(tmp_path / "raft-2.sock")}
+        node = RaftNode(1, addresses, tmp_path / "node-1", election_timeout=(30.0, 60.0))
+        with node._lock:
+            node._log.append([(1, b"entry")])
+
+        request = APPEND_HEADER.pack(1, 2, 0, 0, 0, 1) + APPEND_ENTRY.pack(1, 5) + b"entry"
+        with patch.object(node._log, "detach_sync", wraps=node._log.detach_sync) as sync:
+            sock = _connect(addresses[1])
+            sock.sendall(encode_frame(0, RaftOp.APPEND_ENTRIES, request))
+            buffer = bytearray()
+            while not (frames := decode_frames(buffer)):
+                buffer += sock.recv(4096)
+            sock.close()
+
+        _, success, match_index = APPEND_RESPONSE.unpack(frames[0][2])
+        assert (success, match_index) == (True, 1)
+        assert sync.called
+        assert node._durable_index == 1
+        node.close()
+
+    def test_write_without_majority_is_not_committed(self, tmp_path):
+        cluster = Cluster(tmp_path, request_timeout=0.3)
+        leader = cluster.leader()
+        leader.put("k", "committed")
+        for node_id in [node_id for node_id in cluster.nodes if node_id != leader.node_id]:
+            cluster.stop(node_id)
+
+        with pytest.raises(TimeoutError):
+            leader.put("k", "uncommitted")
+        assert leader.status()["last_applied"] < leader.status()["last_index"]
+        cluster.close()
+
+    def test_deposed_leader_discards_uncommitted_entries(self, tmp_path):
+        """과반 없이 붙인 엔트리는 새 leader의 로그와 충돌하면 잘려 나간다"""
+        cluster = Cluster(tmp_path, request_timeout=0.3)
+        old = cluster.leader()
+        old.put("k", "committed")
+        others = [node_id for node_id in cluster.nodes if node_id != old.node_id]
+        for node_id in others:
+            cluster.stop(node_id)
+        with pytest.raises(TimeoutError):
+            old.put("k", "uncommitted")
+        cluster.stop(old.node_id)
+
+        for node_id in others:
+            cluster.start(node_id)
+        new = cluster.leader()
+        new.put("k", "new")
+        cluster.start(old.node_id)
+
+        cluster.wait_applied(new.status()["commit_index"])
+        assert cluster.nodes[old.node_id].store.get("k") == "new"
+        assert cluster.nodes[old.node_id].status()["last_index"] == new.status()["last_index"]
+        cluster.close()
+
+    def test_restarted_follower_catches_up_from_log(self, cluster):
+        leader = cluster.leader()
+        follower_id = next(node_id for node_id in cluster.nodes if node_id != leader.node_id)
+        cluster.stop(follower_id)
+        for i in range(30):
+            leader.put(f"k{i}", str(i))
+
+        follower = cluster.start(follower_id)
+        cluster.wait_applied(leader.status()["commit_index"])
+        assert follower.store.get("k29") == "29"
+        assert follower.status()["base_index"] == 0
+
+
+class TestSnapshot:
+    """로그 압축과 스냅샷 설치"""
+
+    def test_log_is_compacted_after_applying(self, tmp_path):
+        cluster = Cluster(tmp_path, snapshot_entries=20)
+        leader = cluster.leader()
+        for i in range(60):
+            leader.put(f"k{i}", str(i))
+
+        cluster.wait_applied(leader.status()["commit_index"])
+        assert leader.status()["base_index"] >= 20
+        cluster.close()
+
+    def test_lagging_follower_installs_snapshot(self, tmp_path):
+        """follower가 필요한 로그가 압축으로 사라졌으면 체크포인트 파일을 받아 상태를 통째로 바꾼다"""
+        cluster = Cluster(tmp_path, snapshot_entries=20)
+        leader = cluster.leader()
+        leader.put("deleted", "x")
+        follower_id = next(node_id for node_id in cluster.nodes if node_id != leader.node_id)
+        cluster.wait_applied(leader.status()["commit_index"])
+        cluster.stop(follower_id)
+
+        leader.delete("deleted")
+        for i in range(100):
+            leader.put(f"k{i:03d}", str(i))
+        cluster.wait_applied(leader.status()["commit_index"])
+        assert leader.status()["base_index"] > 2
+
+        follower = cluster.start(follower_id)
+        cluster.wait_applied(leader.status()["commit_index"])
+        assert follower.status()["base_index"] > 2
+        assert follower.store.get("deleted") is None
+        assert [value for _, value in follower.store.prefix("k")] == [str(i) for i in range(100)]
+
+        # 설치 이후에는 다시 로그로 따라간다
+        leader.put("after", "snapshot")
+        cluster.wait_applied(leader.status()["commit_index"])
+        assert follower.store.get("after") == "snapshot"
+        cluster.close()
+
+
+    def test_snapshot_is_installed_in_bounded_batches_with_applied_index_last(self, tmp_path):
+        """스냅샷은 바뀐 key만 나눠 쓰고, 적용 index는 모든 배치 뒤에 기록한다"""
+        addresses = {1: str(tmp_path / "raft-1.sock"), 2: str(tmp_path / "raft-2.sock")}
+        node = RaftNode(1, addresses, tmp_path / "node-1", election_timeout=(30.0, 60.0))
+        for key, value in [("a", "old"), ("b", "same"), ("stale1", "x"), ("stale2", "x")]:
+            node.store.put(key, value)
+        path = tmp_path / "snapshot.dat"
+        write_checkpoint(path, {"a": "new", "b": "same", "c": "1", "d": "2", "e": "3"}, lsn=5)
+
+        writes = []
+        original_batch, original_put = node.store.write_batch, node.store.put
+        with (
+            patch("src.raft.MAX_APPLY_ENTRIES", 2),
+            patch.object(node.store, "write_batch", side_effect=lambda ops: (writes.append(list(ops)), original_batch(ops))),
+            patch.object(node.store, "put", side_effect=lambda k, v: (writes.append([(k, v)]), original_put(k, v))),
+        ):
+            node._install_snapshot(path, 5, 1)
+
+        assert all(len(batch) <= 2 for batch in writes)
+        assert writes[-1] == [(RAFT_APPLIED_KEY, "5:1")]
+        assert sum(len(batch) for batch in writes[:-1]) == 6
+        state = {key: value for key, value in node.store.scan() if key != RAFT_APPLIED_KEY}
+        assert state == {"a": "new", "b": "same", "c": "1", "d": "2", "e": "3"}
+        assert node.status()["last_applied"] == 5
+        node.close()
+
+
+class TestProcessFaults:
+    """노드를 별도 프로세스로 띄우고 SIGKILL로 죽인다 (crash_test_worker.py와 같은 방식)"""
+
+    def start(self, tmp_path: Path, node_id: int, size: int = 3) -> subprocess.Popen:
+        cluster = ",".join(f"{i}={tmp_path / f'raft-{i}.sock'}" for i in range(1, size + 1))
+        process = subprocess.Popen(
+            [
+                sys.executable, "-m", "src.raft", "--id", str(node_id), "--cluster", cluster,
+                "--data-dir", str(tmp_path / f"node-{node_id}"), "--unix", str(tmp_path / f"kv-{node_id}.sock"),
+                "--election-timeout-ms", "200", "--heartbeat-ms", "30", "--snapshot-entries", "50",
+            ],
+            cwd=PROJECT_DIR, stdout=subprocess.PIPE, text=True,
+        )
+        assert process.stdout.readline().startswith("listening on")
+        return process
+
+    def test_acknowledged_writes_survive_leader_sigkill(self, tmp_path):
+        processes = {node_id: self.start(tmp_path, node_id) for node_id in (1, 2, 3)}
+        client = RaftClient({node_id: tmp_path / f"kv-{node_id}.sock" for node_id in processes}, timeout=20)
+        acknowledged = []
+        try:
+            for round_ in range(2):
+                for i in range(60):
+                    key = f"r{round_}-{i:03d}"
+                    client.put(key, str(i))
+                    acknowledged.append(key)
+
+                    if i == 30:
+                        # 쓰기 도중 leader를 SIGKILL하고 다시 띄운다
+                        victim = client.leader
+                        os.kill(processes[victim].pid, signal.SIGKILL)
+                        processes[victim].wait()
+                        processes[victim] = self.start(tmp_path, victim)
+
+            assert [key for key, _ in client.scan()] == acknowledged
+        finally:
+            client.close()
+            for process in processes.values():
+                process.kill()
+                process.wait()
+
+    def test_cluster_keeps_serving_with_one_follower_killed(self, tmp_path):
+        processes = {node_id: self.start(tmp_path, node_id) for node_id in (1, 2, 3)}
+        client = RaftClient({node_id: tmp_path / f"kv-{node_id}.sock" for node_id in processes}, timeout=20)
+        try:
+            client.put("before", "1")
+            follower = next(node_id for node_id in processes if node_id != client.leader)
+            os.kill(processes[follower].pid, signal.SIGKILL)
+            processes[follower].wait()
+
+            for i in range(100):
+                client.put(f"k{i:03d}", str(i))
+            # 죽은 follower가 돌아오면 (압축된 로그 대신 스냅샷으로) 따라잡고, 그 노드가 leader가 되어도 데이터가 같다
+            processes[follower] = self.start(tmp_path, follower)
+            leader = client.leader
+            os.kill(processes[leader].pid, signal.SIGKILL)
+            processes[leader].wait()
+
+            assert client.get("before") == "1"
+            assert len(client.scan("k", "l")) == 100
+        finally:
+            client.close()
+            for process in processes.values():
+                process.kill()
+                process.wait()
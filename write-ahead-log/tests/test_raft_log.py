@@ -0,0 +1,134 @@
+"""Raft 로그 파일 테스트"""
+
+from unittest.mock import patch
+
+import pytest
+
+from src.raft_log import RaftLog
+
+
+def entries(*terms: int) -> list[tuple[int, bytes]]:
+    return [(term, f"entry-{i}".encode()) for i, term in enumerate(terms)]
+
+
+class TestRaftLog:
+    def test_empty_log(self, tmp_path):
+        log = RaftLog(tmp_path / "raft.log")
+
+        assert (log.base_index, log.last_index, log.last_term) == (0, 0, 0)
+        assert log.term_at(0) == 0
+        assert log.term_at(1) is None
+        log.close()
+
+    def test_entries_survive_reopen(self, tmp_path):
+        log = RaftLog(tmp_path / "raft.log")
+        log.append(entries(1, 1, 2))
+        log.append([(3, b"")])
+        log.sync()
+        log.close()
+
+        reopened = RaftLog(tmp_path / "raft.log")
+        assert reopened.last_index == 4
+        assert [reopened.term_at(i) for i in range(1, 5)] == [1, 1, 2, 3]
+        assert reopened.entries(2, 4) == [(1, b"entry-1"), (2, b"entry-2"), (3, b"")]
+        reopened.close()
+
+    def test_unsynced_tail_is_synced_on_open(self, tmp_path):
+        """sync 전에 죽은 프로세스가 남긴 꼬리도 열 때 fsync해서 durable로 본다"""
+        path = tmp_path / "raft.log"
+        log = RaftLog(path)
+        log.append(entries(1, 1))
+        log.close()
+
+        with patch("src.raft_log.os.fsync") as fsync:
+            reopened = RaftLog(path)
+        assert fsync.called
+        assert reopened.last_index == 2
+        reopened.close()
+
+    def test_torn_tail_is_discarded_on_open(self, tmp_path):
+        """fsync 전에 죽어 일부만 쓰인 마지막 엔트리는 버린다"""
+        path = tmp_path / "raft.log"
+        log = RaftLog(path)
+        log.append(entries(1, 1))
+        log.close()
+        size = path.stat().st_size
+        with open(path, "r+b") as f:
+            f.truncate(size - 3)
+
+        reopened = RaftLog(path)
+        assert reopened.last_index == 1
+        reopened.append(entries(2))
+        reopened.close()
+
+        assert [RaftLog(path).term_at(i) for i in (1, 2)] == [1, 2]
+
+    def test_corrupted_entry_and_everything_after_is_discarded(self, tmp_path):
+        path = tmp_path / "raft.log"
+        log = RaftLog(path)
+        log.append(entries(1))
+        offset = path.stat().st_size
+        log.append(entries(1, 1))
+        log.close()
+        with open(path, "r+b") as f:
+            f.seek(offset + 20)
+            f.write(b"X")
+
+        assert RaftLog(path).last_index == 1
+
+    def test_detached_sync_survives_compaction(self, tmp_path):
+        """락 밖에서 부를 sync 함수는 그 사이 compact가 파일을 교체해도 실패하지 않는다"""
+        log = RaftLog(tmp_path / "raft.log")
+        log.append(entries(1, 1, 1))
+        sync = log.detach_sync()
+        log.compact(2, 1)
+
+        sync()
+        assert (log.base_index, log.last_index) == (2, 3)
+        log.close()
+
+    def test_truncate_after_drops_conflicting_tail(self, tmp_path):
+        log = RaftLog(tmp_path / "raft.log")
+        log.append(entries(1, 1, 2, 2))
+        log.truncate_after(2)
+        log.append(entries(3))
+        log.close()
+
+        reopened = RaftLog(tmp_path / "raft.log")
+        assert [reopened.term_at(i) for i in range(1, 4)] == [1, 1, 3]
+        assert reopened.term_at(4) is None
+        reopened.close()
+
+    def test_first_index_of_term(self, tmp_path):
+        log = RaftLog(tmp_path / "raft.log")
+        log.append(entries(1, 2, 2, 2, 3))
+
+        assert log.first_index_of_term(4) == 2
+        assert log.first_index_of_term(5) == 5
+        assert log.first_index_of_term(1) == 1
+        log.close()
+
+    def test_compact_keeps_suffix_when_term_matches(self, tmp_path):
+        log = RaftLog(tmp_path / "raft.log")
+        log.append(entries(1, 1, 2, 2))
+        log.compact(2, 1)
+        log.append(entries(3))
+        log.close()
+
+        reopened = RaftLog(tmp_path / "raft.log")
+        assert (reopened.base_index, reopened.base_term, reopened.last_index) == (2, 1, 5)
+        assert reopened.entries(3, 5) == [(2, b"entry-2"), (2, b"entry-3"), (3, b"entry-0")]
+        with pytest.raises(IndexError):
+            reopened.entries(2, 3)
+        reopened.close()
+
+    def test_compact_past_the_log_drops_everything(self, tmp_path):
+        """스냅샷 설치: 로그에 없는 (index, term)까지 덮으면 로그를 비우고 그 뒤부터 시작한다"""
+        log = RaftLog(tmp_path / "raft.log")
+        log.append(entries(1, 1))
+        log.compact(10, 4)
+
+        assert (log.base_index, log.last_index, log.last_term) == (10, 10, 4)
+        log.append(entries(5))
+        assert log.term_at(11) == 5
+        log.close()
@@ -0,0 +1,293 @@
+"""leader-follower 복제 테스트 (모두 localhost Unix 소켓)"""
+
+import subprocess
+import sys
+import time
+
+from pathlib import Path
+
+import pytest
+
+from src.client import KVClient, ServerError
+from src.kv_store import KVStore
+from src.replication import (
+    REPLICATION_LSN_KEY,
+    ReadOnlyReplicaError,
+    ReplicationFollower,
+    ReplicationLeader,
+    ReplicationTimeoutError,
+    decode_records,
+    encode_records,
+)
+from src.wal_record import RecordType, WALRecord
+
+PROJECT_DIR = Path(__file__).resolve().parents[1]
+
+
+@pytest.fixture
+def leader_store(tmp_path):
+    (tmp_path / "leader").mkdir()
+    store = KVStore(data_dir=tmp_path / "leader")
+    yield store
+    store.close()
+
+
+def open_leader(store: KVStore, tmp_path: Path, **options) -> ReplicationLeader:
+    return ReplicationLeader(store, tmp_path / "repl.sock", **options)
+
+
+def open_follower(tmp_path: Path, name: str = "follower") -> ReplicationFollower:
+    data_dir = tmp_path / name
+    data_dir.mkdir(exist_ok=True)
+    return ReplicationFollower(data_dir, tmp_path / "repl.sock", retry_interval=0.05)
+
+
+def wait_until(predicate, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "condition not met in time"
+        time.sleep(0.01)
+
+
+class TestRecordEncoding:
+    def test_records_round_trip(self):
+        entries = [
+            (0, 30, WALRecord(RecordType.PUT, "k", "값")),
+            (30, 50, WALRecord(RecordType.DEL, "k")),
+            (50, 90, WALRecord.batch([WALRecord(RecordType.PUT, "a", "1"), WALRecord(RecordType.DEL, "b")])),
+        ]
+
+        decoded = decode_records(encode_records(entries))
+
+        assert [(lsn, end) for lsn, end, _ in decoded] == [(0, 30), (30, 50), (50, 90)]
+        assert decoded[0][2].value == "값"
+        assert [r.key for r in decoded[2][2].records] == ["a", "b"]
+
+
+class TestStreaming:
+    """라이브 스트림과 follower 읽기"""
+
+    def test_follower_applies_committed_records(self, tmp_path, leader_store):
+        leader = open_leader(leader_store, tmp_path)
+        follower = open_follower(tmp_path)
+        wait_until(lambda: leader.follower_lsns() == [leader_store.lsn])
+
+        leader_store.put("k1", "v1")
+        leader_store.put("k2", "v2")
+        leader_store.delete("k1")
+        with leader_store.write_batch() as batch:
+            batch.put("b1", "x")
+            batch.put("b2", "y")
+
+        assert follower.wait_for_lsn(leader_store.lsn, timeout=5)
+        assert follower.get("k1") is None
+        assert follower.get("k2") == "v2"
+        assert list(follower.scan()) == [("b1", "x"), ("b2", "y"), ("k2", "v2")]
+        assert follower.get(REPLICATION_LSN_KEY) is None
+        follower.close()
+        leader.close()
+
+    def test_follower_is_read_only(self, tmp_path, leader_store):
+        leader = open_leader(leader_store, tmp_path)
+        follower = open_follower(tmp_path)
+
+        with pytest.raises(ReadOnlyReplicaError):
+            follower.put("k", "v")
+        with pytest.raises(ReadOnlyReplicaError):
+            follower.delete("k")
+        follower.close()
+        leader.close()
+
+    def test_leader_rejects_reserved_key(self, tmp_path, leader_store):
+        """follower의 재개 위치 key는 leader에서 쓸 수 없다 (복제를 떼면 다시 쓸 수 있음)"""
+        leader = open_leader(leader_store, tmp_path)
+        lsn = leader_store.lsn
+
+        with pytest.raises(ValueError, match="reserved"):
+            leader_store.put(REPLICATION_LSN_KEY, "0")
+        with pytest.raises(ValueError, match="reserved"):
+            leader_store.delete(REPLICATION_LSN_KEY)
+        with pytest.raises(ValueError, match="reserved"):
+            leader_store.write_batch([WALRecord(RecordType.PUT, "k", "v"), WALRecord(RecordType.DEL, REPLICATION_LSN_KEY)])
+        with pytest.raises(ValueError, match="reserved"):
+            leader_store.commit([WALRecord(RecordType.PUT, REPLICATION_LSN_KEY, "0")])
+        assert leader_store.lsn == lsn
+        leader.close()
+
+        leader_store.put(REPLICATION_LSN_KEY, "0")
+
+    def test_lagging_follower_is_disconnected_and_catches_up(self, tmp_path, leader_store):
+        """대기열이 max_lag_records를 넘으면 끊기고, 다시 접속해서 따라잡는다"""
+        leader = open_leader(leader_store, tmp_path, max_lag_records=3)
+        follower = open_follower(tmp_path)
+        wait_until(lambda: len(leader.follower_lsns()) == 1)
+
+        leader_store.write_batch([WALRecord(RecordType.PUT, f"k{i}", str(i)) for i in range(2)])
+        leader_store.commit([WALRecord(RecordType.PUT, f"m{i}", str(i)) for i in range(10)])
+
+        assert follower.wait_for_lsn(leader_store.lsn, timeout=5)
+        assert len(list(follower.scan())) == 12
+        follower.close()
+        leader.close()
+
+
+class TestCatchUp:
+    """접속 시 따라잡기 (WAL tail / 스냅샷)"""
+
+    def test_restarted_follower_catches_up_from_wal_tail(self, tmp_path, leader_store):
+        leader = open_leader(leader_store, tmp_path)
+        follower = open_follower(tmp_path)
+        leader_store.put("before", "1")
+        assert follower.wait_for_lsn(leader_store.lsn, timeout=5)
+        follower.close()
+
+        for i in range(20):
+            leader_store.put(f"offline{i}", str(i))
+        leader_store.delete("before")
+
+        follower = open_follower(tmp_path)
+        assert follower.applied_lsn > 0
+        assert follower.wait_for_lsn(leader_store.lsn, timeout=5)
+        assert follower.get("before") is None
+        assert len(list(follower.scan())) == 20
+        follower.close()
+        leader.close()
+
+    def test_follower_installs_snapshot_when_wal_was_truncated(self, tmp_path, leader_store):
+        """체크포인트가 follower가 필요한 WAL 구간을 지웠으면 스냅샷 전체를 받고, leader에서 지워진 key는 지운다"""
+        leader = open_leader(leader_store, tmp_path)
+        follower = open_follower(tmp_path)
+        leader_store.put("stale", "1")
+        leader_store.put("kept", "1")
+        assert follower.wait_for_lsn(leader_store.lsn, timeout=5)
+        follower.close()
+
+        leader_store.delete("stale")
+        leader_store.put("kept", "2")
+        leader_store.put("new", "3")
+        leader_store.checkpoint()
+
+        follower = open_follower(tmp_path)
+        assert follower.wait_for_lsn(leader_store.lsn, timeout=5)
+        assert list(follower.scan()) == [("kept", "2"), ("new", "3")]
+
+        leader_store.put("after", "4")
+        assert follower.wait_for_lsn(leader_store.lsn, timeout=5)
+        assert follower.get("after") == "4"
+        follower.close()
+        leader.close()
+
+    def test_new_follower_of_fresh_leader_needs_no_catch_up(self, tmp_path, leader_store):
+        leader = open_leader(leader_store, tmp_path)
+        follower = open_follower(tmp_path)
+        wait_until(lambda: len(leader.follower_lsns()) == 1)
+
+        assert follower.applied_lsn == 0
+        assert list(follower.scan()) == []
+        follower.close()
+        leader.close()
+
+
+class TestAckModes:
+    """async / one / quorum"""
+
+    def test_async_does_not_wait_for_followers(self, tmp_path, leader_store):
+        leader = open_leader(leader_store, tmp_path, ack_mode="async")
+
+        leader_store.put("k", "v")
+
+        assert leader_store.get("k") == "v"
+        leader.close()
+
+    def test_one_waits_until_follower_has_the_write(self, tmp_path, leader_store):
+        leader = open_leader(leader_store, tmp_path, ack_mode="one", ack_timeout=5)
+        follower = open_follower(tmp_path)
+        wait_until(lambda: len(leader.follower_lsns()) == 1)
+
+        for i in range(10):
+            leader_store.put(f"k{i}", str(i))
+            # put이 돌아온 시점에 이미 follower에 반영되어 있다
+            assert follower.applied_lsn == leader_store.lsn
+        follower.close()
+        leader.close()
+
+    def test_one_times_out_without_follower(self, tmp_path, leader_store):
+        """ack가 오지 않으면 ReplicationTimeoutError (쓰기는 leader에 남는다)"""
+        leader = open_leader(leader_store, tmp_path, ack_mode="one", ack_timeout=0.1)
+
+        with pytest.raises(ReplicationTimeoutError):
+            leader_store.put("k", "v")
+        assert leader_store.get("k") == "v"
+        leader.close()
+
+    def test_quorum_needs_majority_of_cluster(self, tmp_path, leader_store):
+        """follower 4개 클러스터(N=5)의 quorum은 leader + follower 2개"""
+        leader = open_leader(leader_store, tmp_path, ack_mode="quorum", followers=4, ack_timeout=0.2)
+        first = open_follower(tmp_path, "f1")
+        wait_until(lambda: len(leader.follower_lsns()) == 1)
+
+        with pytest.raises(ReplicationTimeoutError):
+            leader_store.put("k", "1")
+
+        second = open_follower(tmp_path, "f2")
+        wait_until(lambda: len(leader.follower_lsns()) == 2)
+        leader_store.put("k", "2")
+
+        assert first.get("k") == "2" or second.get("k") == "2"
+        first.close()
+        second.close()
+        leader.close()
+
+    def test_invalid_configuration_is_rejected(self, tmp_path, leader_store):
+        with pytest.raises(ValueError):
+            ReplicationLeader(leader_store, tmp_path / "repl.sock", ack_mode="all")
+        with pytest.raises(ValueError):
+            ReplicationLeader(leader_store, tmp_path / "repl.sock", ack_mode="quorum", followers=0)
+
+
+class TestProcesses:
+    """leader와 follower를 별도 프로세스로 띄워 클라이언트로 쓰고 읽는다"""
+
+    def start(self, *args: str) -> subprocess.Popen:
+        process = subprocess.Popen(
+            [sys.executable, "-m", "src.replication", *args],
+            cwd=PROJECT_DIR, stdout=subprocess.PIPE, text=True,
+        )
+        assert process.stdout.readline().startswith("listening on")
+        return process
+
+    def stop(self, process: subprocess.Popen) -> None:
+        process.terminate()
+        assert process.wait(timeout=10) == 0
+
+    def test_reads_scale_out_to_follower_processes(self, tmp_path):
+        leader = self.start(
+            "--data-dir", str(tmp_path / "leader"), "--unix", str(tmp_path / "leader.sock"),
+            "--listen", str(tmp_path / "repl.sock"), "--ack-mode", "quorum", "--followers", "2",
+        )
+        followers = [
+            self.start(
+                "--data-dir", str(tmp_path / f"f{i}"), "--unix", str(tmp_path / f"f{i}.sock"),
+                "--follow", str(tmp_path / "repl.sock"),
+            )
+            for i in range(2)
+        ]
+        try:
+            with KVClient(tmp_path / "leader.sock") as client:
+                # quorum(N=3)이므로 put이 끝나면 follower 하나 이상에 반영되어 있다
+                for i in range(20):
+                    client.put(f"k{i}", str(i))
+
+            readers = [KVClient(tmp_path / f"f{i}.sock") for i in range(2)]
+            deadline = time.monotonic() + 5
+            while any(reader.get("k19") is None for reader in readers):
+                assert time.monotonic() < deadline
+                time.sleep(0.01)
+            for reader in readers:
+                assert [value for _, value in reader.prefix("k")] == sorted(str(i) for i in range(20))
+                with pytest.raises(ServerError):
+                    reader.put("k", "v")
+                reader.close()
+        finally:
+            for process in followers + [leader]:
+                self.stop(process)
@@ -0,0 +1,247 @@
+"""세그먼트 WAL 테스트"""
+
+import pytest
+
+from src.segmented_wal import SegmentedWAL, list_segments, segment_path
+from src.wal_record import RecordType, WALFormat, WALRecord
+
+
+def put(i: int) -> WALRecord:
+    return WALRecord(RecordType.PUT, f"key{i}", f"value{i}")
+
+
+class TestSegmentRolling:
+    """세그먼트 롤링"""
+
+    def test_first_segment_starts_at_lsn_zero(self, tmp_path):
+        """첫 세그먼트는 LSN 0에서 시작한다"""
+        wal = SegmentedWAL(tmp_path)
+        wal.close()
+
+        assert list_segments(tmp_path) == [(0, segment_path(tmp_path, 0))]
+
+    def test_rolls_over_when_segment_is_full(self, tmp_path):
+        """활성 세그먼트가 segment_size를 넘으면 새 세그먼트로 롤링한다"""
+        wal = SegmentedWAL(tmp_path, segment_size=200)
+        for i in range(20):
+            wal.append(put(i))
+        wal.close()
+
+        segments = list_segments(tmp_path)
+        assert len(segments) > 1
+        # 각 세그먼트 이름은 이전 세그먼트가 끝난 LSN
+        for (start, path), (next_start, _) in zip(segments, segments[1:]):
+            assert start + path.stat().st_size == next_start
+
+    def test_append_returns_global_lsn(self, tmp_path):
+        """append는 세그먼트를 넘어 단조 증가하는 LSN을 반환한다"""
+        wal = SegmentedWAL(tmp_path, segment_size=200)
+        lsns = [wal.append(put(i)) for i in range(20)]
+        end_lsn = wal.end_lsn
+        wal.close()
+
+        assert lsns == sorted(lsns)
+        assert [lsn for lsn, _, _ in SegmentedWAL.read_entries(tmp_path)] == lsns
+        assert end_lsn == sum(path.stat().st_size for _, path in list_segments(tmp_path))
+
+    def test_roll_on_empty_segment_is_noop(self, tmp_path):
+        """빈 활성 세그먼트에서는 롤링하지 않는다"""
+        wal = SegmentedWAL(tmp_path)
+        assert wal.roll() == 0
+        wal.close()
+
+        assert len(list_segments(tmp_path)) == 1
+
+    def test_new_segments_use_configured_format(self, tmp_path):
+        """롤링된 세그먼트는 설정된 포맷으로 기록되고 모두 읽힌다"""
+        wal = SegmentedWAL(tmp_path, segment_size=100, wal_format=WALFormat.BINARY)
+        for i in range(10):
+            wal.append(put(i))
+        wal.close()
+
+        assert [r.key for r in SegmentedWAL.read(tmp_path)] == [f"key{i}" for i in range(10)]
+
+    def test_invalid_segment_size_is_rejected(self, tmp_path):
+        """segment_size는 양수여야 한다"""
+        with pytest.raises(ValueError):
+            SegmentedWAL(tmp_path, segment_size=0)
+
+
+class TestSegmentTruncation:
+    """세그먼트 단위 삭제와 롤백"""
+
+    def test_truncate_before_unlinks_covered_segments(self, tmp_path):
+        """truncate_before(lsn)는 lsn 이전 기록만 담긴 세그먼트를 삭제한다"""
+        wal = SegmentedWAL(tmp_path, segment_size=200)
+        for i in range(20):
+            wal.append(put(i))
+        boundary = wal.roll()
+        wal.append(put(100))
+
+        wal.truncate_before(boundary)
+        wal.close()
+
+        assert [start for start, _ in list_segments(tmp_path)] == [boundary]
+        assert [r.key for r in SegmentedWAL.read(tmp_path)] == ["key100"]
+
+    def test_truncate_before_keeps_active_segment(self, tmp_path):
+        """활성 세그먼트는 삭제하지 않는다"""
+        wal = SegmentedWAL(tmp_path)
+        wal.append(put(1))
+
+        wal.truncate_before(wal.end_lsn)
+        wal.close()
+
+        assert [r.key for r in SegmentedWAL.read(tmp_path)] == ["key1"]
+
+    def test_rollback_across_rolled_segments(self, tmp_path):
+        """롤링 이후 세그먼트까지 rollback으로 되돌린다"""
+        wal = SegmentedWAL(tmp_path, segment_size=200)
+        wal.append(put(0))
+        rollback_lsn = wal.end_lsn
+        for i in range(1, 20):
+            wal.append(put(i))
+        assert len(wal.segments) > 1
+
+        wal.rollback(rollback_lsn)
+        wal.append(put(99))
+        wal.close()
+
+        assert len(list_segments(tmp_path)) == 1
+        assert [r.key for r in SegmentedWAL.read(tmp_path)] == ["key0", "key99"]
+
+
+class TestSegmentRead:
+    """세그먼트 읽기"""
+
+    def test_read_from_start_lsn(self, tmp_path):
+        """start_lsn 이후 레코드만 읽는다"""
+        wal = SegmentedWAL(tmp_path, segment_size=200)
+        lsns = [wal.append(put(i)) for i in range(20)]
+        wal.close()
+
+        records = list(SegmentedWAL.read(tmp_path, start_lsn=lsns[10]))
+        assert [r.key for r in records] == [f"key{i}" for i in range(10, 20)]
+
+    def test_corruption_stops_reading_later_segments(self, tmp_path):
+        """중간 세그먼트가 손상되면 이후 세그먼트는 읽지 않는다"""
+        wal = SegmentedWAL(tmp_path, segment_size=200)
+        for i in range(20):
+            wal.append(put(i))
+        wal.close()
+
+        segments = list_segments(tmp_path)
+        first_path = segments[0][1]
+        with open(first_path, "ab") as f:
+            f.write(b"corrupted data\n")
+
+        keys = [r.key for r in SegmentedWAL.read(tmp_path)]
+        assert keys == [f"key{i}" for i in range(len(keys))]
+        assert "key19" not in keys
+
+    def test_reopen_truncates_torn_tail(self, tmp_path):
+        """다시 열 때 활성 세그먼트 끝의 불완전 레코드를 잘라내 새 레코드가 읽히게 한다"""
+        wal = SegmentedWAL(tmp_path)
+        wal.append(put(1))
+        wal.close()
+
+        _, path = list_segments(tmp_path)[-1]
+        with open(path, "ab") as f:
+            f.write(put(2).serialize()[:-5])
+
+        wal = SegmentedWAL(tmp_path)
+        wal.append(put(3))
+        wal.close()
+
+        assert [r.key for r in SegmentedWAL.read(tmp_path)] == ["key1", "key3"]
+
+
+class TestSegmentRecycling:
+    """미리 할당된 세그먼트와 재활용"""
+
+    def open_wal(self, tmp_path, recycle_segments=2):
+        return SegmentedWAL(
+            tmp_path,
+            segment_size=300,
+            wal_format=WALFormat.BINARY,
+            preallocate_bytes=1024,
+            recycle_segments=recycle_segments,
+        )
+
+    def test_preallocation_requires_binary_format(self, tmp_path):
+        with pytest.raises(ValueError):
+            SegmentedWAL(tmp_path, preallocate_bytes=1024)
+        with pytest.raises(ValueError):
+            SegmentedWAL(tmp_path, wal_format=WALFormat.BINARY, recycle_segments=2)
+
+    def test_reads_across_zero_filled_segments(self, tmp_path):
+        """세그먼트 뒤의 0 꼬리를 넘어 다음 세그먼트까지 읽고, LSN은 기록된 바이트 기준이다"""
+        wal = self.open_wal(tmp_path)
+        lsns = [wal.append(put(i)) for i in range(30)]
+        wal.close()
+
+        segments = list_segments(tmp_path)
+        assert len(segments) > 2
+        assert all(path.stat().st_size == 1024 for _, path in segments)
+        entries = list(SegmentedWAL.read_entries(tmp_path))
+        assert [r.key for _, _, r in entries] == [f"key{i}" for i in range(30)]
+        assert [lsn for lsn, _, _ in entries] == lsns
+
+    def test_truncated_segment_is_reused_after_recycle(self, tmp_path):
+        """지운 세그먼트는 0으로 채워진 뒤 다음 롤링의 파일이 되고, 옛 레코드는 읽히지 않는다"""
+        wal = self.open_wal(tmp_path)
+        for i in range(10):
+            wal.append(put(i))
+        boundary = wal.roll()
+        wal.append(put(100))
+        wal.truncate_before(boundary)
+        assert [path.name for path in tmp_path.glob("wal-free-*")] == ["wal-free-000000.tmp"]
+
+        wal.recycle()
+        free = tmp_path / "wal-free-000000.log"
+        assert free.exists()
+        inode = free.stat().st_ino
+
+        new_start = wal.roll()
+        assert not free.exists()
+        assert segment_path(tmp_path, new_start).stat().st_ino == inode
+        wal.append(put(200))
+        wal.close()
+
+        assert [r.key for r in SegmentedWAL.read(tmp_path)] == ["key100", "key200"]
+
+    def test_recycle_keeps_at_most_recycle_segments(self, tmp_path):
+        """재활용 대기는 recycle_segments개까지, 나머지는 삭제한다"""
+        wal = self.open_wal(tmp_path, recycle_segments=1)
+        for i in range(30):
+            wal.append(put(i))
+        boundary = wal.roll()
+        wal.truncate_before(boundary)
+        wal.recycle()
+        wal.close()
+
+        assert [path.name for path in tmp_path.glob("wal-free-*")] == ["wal-free-000000.log"]
+        assert len(list_segments(tmp_path)) == 1
+
+    def test_reopen_keeps_ready_files_and_drops_unfinished(self, tmp_path):
+        """0으로 다 채운 파일은 다시 열어도 재활용하고, 채우다 만 파일은 삭제한다"""
+        wal = self.open_wal(tmp_path)
+        for i in range(30):
+            wal.append(put(i))
+        boundary = wal.roll()
+        wal.truncate_before(boundary)
+        # 첫 번째만 0으로 채운 상태에서 크래시
+        wal._retired[1:] = []
+        wal.recycle()
+        wal.close()
+        (tmp_path / "wal-free-000001.tmp").write_bytes(b"stale")
+
+        wal = self.open_wal(tmp_path)
+        assert [path.name for path in tmp_path.glob("wal-free-*")] == ["wal-free-000000.log"]
+        wal.append(put(100))
+        wal.roll()
+        wal.append(put(101))
+        wal.close()
+
+        assert not list(tmp_path.glob("wal-free-*"))
+        assert [r.key for r in SegmentedWAL.read(tmp_path)] == ["key100", "key101"]
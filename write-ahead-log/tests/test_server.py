@@ -0,0 +1,221 @@
+"""KV 서버/클라이언트 테스트"""
+
+import multiprocessing
+import os
+import signal
+import subprocess
+import sys
+import threading
+
+from pathlib import Path
+
+import pytest
+
+from src.client import KVClient, ServerError
+from src.kv_store import KVStore
+from src.server import DataDirLockedError, KVServer, acquire_dir_lock
+from src.wal_record import RecordType, WALRecord
+
+PROJECT_DIR = Path(__file__).resolve().parents[1]
+
+
+@pytest.fixture
+def served_store(tmp_path):
+    """Unix 소켓으로 KVStore를 내보내는 서버를 스레드에서 돌린다"""
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    store = KVStore(data_dir=data_dir, group_commit=True)
+    server = KVServer(store, tmp_path / "kv.sock")
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield store, server
+    server.shutdown()
+    server.close()
+    store.close()
+
+
+@pytest.fixture
+def client(served_store):
+    _, server = served_store
+    client = KVClient(server.address, pool_size=2)
+    yield client
+    client.close()
+
+
+class TestClientOperations:
+    """클라이언트로 하는 기본 연산"""
+
+    def test_put_get_delete(self, client, served_store):
+        store, _ = served_store
+        client.put("key1", "값1")
+        client.put("key2", "")
+        client.delete("key2")
+
+        assert client.get("key1") == "값1"
+        assert client.get("key2") is None
+        assert client.get("missing") is None
+        assert store.get("key1") == "값1"
+
+    def test_batch_is_committed_atomically(self, client, served_store):
+        store, _ = served_store
+        client.put("key2", "old")
+        client.write_batch([WALRecord(RecordType.PUT, "key1", "v1"), WALRecord(RecordType.DEL, "key2")])
+
+        assert (store.get("key1"), store.get("key2")) == ("v1", None)
+
+    def test_scan_pages_through_results(self, client):
+        """page_size보다 많은 결과도 순서대로 모두 가져온다 (역순, prefix 포함)"""
+        for i in range(10):
+            client.put(f"key{i}", str(i))
+        client.put("other", "x")
+
+        expected = [(f"key{i}", str(i)) for i in range(10)]
+        assert list(client.scan(page_size=3)) == expected + [("other", "x")]
+        assert list(client.prefix("key", reverse=True, page_size=4)) == expected[::-1]
+        assert list(client.scan("key3", "key6", page_size=1)) == expected[3:6]
+
+    def test_server_error_is_raised_and_connection_stays_usable(self, client):
+        """서버 쪽 예외는 ServerError로 올라오고, 같은 연결을 계속 쓸 수 있다"""
+        with pytest.raises(ServerError, match="key cannot be empty"):
+            client.put("", "value")
+
+        client.put("key", "value")
+        assert client.get("key") == "value"
+
+    def test_null_key_or_value_is_rejected_before_the_store(self, client, served_store):
+        """null key와 null PUT 값은 ERROR로 거절되고 WAL에는 아무것도 남지 않는다"""
+        store, _ = served_store
+        client.put("key1", "v1")
+        lsn = store.lsn
+
+        with pytest.raises(ServerError, match="value cannot be null"):
+            client.put("key2", None)
+        with pytest.raises(ServerError, match="key cannot be null"):
+            client.delete(None)
+        with pytest.raises(ServerError, match="value cannot be null"):
+            client.write_batch([WALRecord(RecordType.PUT, "key3", "v3"), WALRecord(RecordType.PUT, "key4", None)])
+
+        assert store.lsn == lsn
+        assert [client.get(key) for key in ("key1", "key2", "key3")] == ["v1", None, None]
+
+
+class TestPipelining:
+    """요청을 모아 보내고 응답을 순서대로 받는다"""
+
+    def test_pipeline_results_are_in_request_order(self, client):
+        with client.pipeline() as pipe:
+            for i in range(100):
+                pipe.put(f"key{i}", str(i))
+            pipe.get("key42")
+            pipe.delete("key0")
+            pipe.get("key0")
+
+        assert len(pipe.results) == 103
+        assert pipe.results[-3:] == ["42", None, None]
+
+    def test_pipeline_error_is_raised_after_all_responses(self, client):
+        pipe = client.pipeline()
+        pipe.put("key1", "v1")
+        pipe.put("", "bad")
+        pipe.put("key2", "v2")
+
+        with pytest.raises(ServerError):
+            pipe.execute()
+        assert (client.get("key1"), client.get("key2")) == ("v1", "v2")
+
+
+class TestConnectionPool:
+    """연결 풀"""
+
+    def test_threads_share_at_most_pool_size_connections(self, client):
+        errors = []
+
+        def worker(worker_id: int):
+            try:
+                for i in range(20):
+                    client.put(f"w{worker_id}-{i}", str(i))
+                    assert client.get(f"w{worker_id}-{i}") == str(i)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        assert client._created <= 2
+        assert len(list(client.scan())) == 120
+
+    def test_tcp_address(self, tmp_path):
+        store = KVStore(data_dir=tmp_path)
+        server = KVServer(store, ("127.0.0.1", 0))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        with KVClient(server.address) as client:
+            client.put("key", "value")
+            assert client.get("key") == "value"
+        server.shutdown()
+        server.close()
+        store.close()
+
+
+class TestDataDirLock:
+    """data_dir 파일 락"""
+
+    def test_second_lock_on_same_dir_fails(self, tmp_path):
+        fd = acquire_dir_lock(tmp_path)
+        with pytest.raises(DataDirLockedError):
+            acquire_dir_lock(tmp_path)
+
+        os.close(fd)
+        os.close(acquire_dir_lock(tmp_path))
+
+
+def _worker_writes(address: str, worker_id: int) -> None:
+    client = KVClient(address, pool_size=1)
+    for i in range(20):
+        client.put(f"p{worker_id}-{i}", str(i))
+    client.close()
+
+
+class TestServerProcess:
+    """서버 프로세스 하나를 여러 워커 프로세스가 공유"""
+
+    def test_worker_processes_share_one_server(self, tmp_path):
+        data_dir = tmp_path / "data"
+        socket_path = tmp_path / "kv.sock"
+        server = subprocess.Popen(
+            [sys.executable, "-m", "src.server", "--data-dir", str(data_dir), "--unix", str(socket_path)],
+            cwd=PROJECT_DIR,
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+        try:
+            assert server.stdout.readline().startswith("listening on")
+
+            # 같은 data_dir로 두 번째 서버는 뜨지 않는다
+            second = subprocess.run(
+                [sys.executable, "-m", "src.server", "--data-dir", str(data_dir), "--unix", str(tmp_path / "b.sock")],
+                cwd=PROJECT_DIR,
+                capture_output=True,
+                text=True,
+                timeout=30,
+            )
+            assert second.returncode != 0
+            assert "DataDirLockedError" in second.stderr
+
+            context = multiprocessing.get_context("fork")
+            workers = [context.Process(target=_worker_writes, args=(str(socket_path), i)) for i in range(3)]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join(timeout=30)
+                assert worker.exitcode == 0
+        finally:
+            server.send_signal(signal.SIGTERM)
+            assert server.wait(timeout=30) == 0
+
+        store = KVStore(data_dir=data_dir)
+        assert len(list(store.scan())) == 60
+        store.close()
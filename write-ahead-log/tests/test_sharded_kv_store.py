@@ -0,0 +1,213 @@
+"""샤딩 store 테스트"""
+
+import threading
+
+from unittest.mock import patch
+
+import pytest
+
+from src.kv_store import KVStore
+from src.sharded_kv_store import INTENT_KEY, ShardedKVStore, shard_index
+from src.wal_record import RecordType, WALRecord
+
+
+def keys_on_distinct_shards(num_shards: int) -> list[str]:
+    """shard마다 하나씩 배치되는 key 목록"""
+    found: dict[int, str] = {}
+    i = 0
+    while len(found) < num_shards:
+        key = f"key{i}"
+        found.setdefault(shard_index(key, num_shards), key)
+        i += 1
+    return [found[index] for index in range(num_shards)]
+
+
+class TestShardRouting:
+    """key 분배와 기본 동작"""
+
+    def test_keys_are_spread_over_shard_directories(self, tmp_path):
+        """각 key는 crc32로 정해진 shard에만 저장된다"""
+        store = ShardedKVStore(tmp_path, num_shards=4)
+        for i in range(100):
+            store.put(f"key{i}", f"value{i}")
+        store.delete("key0")
+
+        for index, shard in enumerate(store.shards):
+            keys = [key for key, _ in shard.scan()]
+            assert keys
+            assert all(shard_index(key, 4) == index for key in keys)
+        assert store.get("key0") is None
+        assert store.get("key42") == "value42"
+        assert sorted(path.name for path in tmp_path.iterdir() if path.name.startswith("shard-")) == [
+            "shard-000", "shard-001", "shard-002", "shard-003",
+        ]
+        store.close()
+
+    def test_data_persists_after_restart(self, tmp_path):
+        """모든 shard가 (병렬로) 복구된다"""
+        store = ShardedKVStore(tmp_path, num_shards=3)
+        for i in range(50):
+            store.put(f"key{i}", f"value{i}")
+        store.close()
+
+        for threads in (None, 1):
+            reopened = ShardedKVStore(tmp_path, num_shards=3, recovery_threads=threads)
+            assert [reopened.get(f"key{i}") for i in range(50)] == [f"value{i}" for i in range(50)]
+            reopened.close()
+
+    def test_reopen_with_different_shard_count_is_rejected(self, tmp_path):
+        """shard 수가 바뀌면 key 위치가 달라지므로 열지 않는다"""
+        ShardedKVStore(tmp_path, num_shards=2).close()
+
+        with pytest.raises(ValueError):
+            ShardedKVStore(tmp_path, num_shards=4)
+
+    def test_scan_merges_shards_in_key_order(self, tmp_path):
+        store = ShardedKVStore(tmp_path, num_shards=4)
+        for i in range(20):
+            store.put(f"k{i:02d}", str(i))
+        store.write_batch([WALRecord(RecordType.PUT, key, "b") for key in keys_on_distinct_shards(4)])
+
+        keys = [key for key, _ in store.scan()]
+        assert keys == sorted(keys)
+        assert INTENT_KEY not in keys
+        assert [key for key, _ in store.prefix("k1", reverse=True)] == [f"k{i}" for i in range(19, 9, -1)]
+        store.close()
+
+    def test_options_are_passed_to_every_shard(self, tmp_path):
+        store = ShardedKVStore(tmp_path, num_shards=2, memtable_flush_bytes=1 << 20)
+        store.put("key", "value")
+        store.checkpoint()
+
+        assert all(shard.table_stats()["tables"] <= 1 for shard in store.shards)
+        assert sum(shard.table_stats()["tables"] for shard in store.shards) == 1
+        store.close()
+
+    def test_concurrent_writers_on_all_shards(self, tmp_path):
+        store = ShardedKVStore(tmp_path, num_shards=4)
+
+        def writer(worker: int):
+            for i in range(25):
+                store.put(f"w{worker}-{i}", str(i))
+
+        threads = [threading.Thread(target=writer, args=(worker,)) for worker in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        store.close()
+
+        reopened = ShardedKVStore(tmp_path, num_shards=4)
+        assert len(list(reopened.scan())) == 100
+        reopened.close()
+
+
+class TestCrossShardBatch:
+    """여러 shard에 걸친 원자적 배치"""
+
+    def test_batch_is_applied_to_all_shards(self, tmp_path):
+        store = ShardedKVStore(tmp_path, num_shards=4)
+        keys = keys_on_distinct_shards(4)
+        store.put(keys[0], "old")
+        with store.write_batch() as batch:
+            for key in keys[1:]:
+                batch.put(key, "new")
+            batch.delete(keys[0])
+        store.close()
+
+        reopened = ShardedKVStore(tmp_path, num_shards=4)
+        assert [reopened.get(key) for key in keys] == [None, "new", "new", "new"]
+        reopened.close()
+
+    def test_single_shard_batch_skips_intent_log(self, tmp_path):
+        """한 shard에만 걸리는 배치는 intent log에 남기지 않는다"""
+        store = ShardedKVStore(tmp_path, num_shards=4)
+        key = keys_on_distinct_shards(4)[0]
+        intent_lsn = store._intents.end_lsn
+        store.write_batch([WALRecord(RecordType.PUT, key, "v")])
+
+        assert store._intents.end_lsn == intent_lsn
+        assert store.shard_for(key).get(INTENT_KEY) is None
+        store.close()
+
+    def test_partially_applied_batch_is_completed_on_reopen(self, tmp_path):
+        """intent 기록 후 일부 shard에만 적용된 채 실패해도 다시 열면 나머지 shard에 적용된다"""
+        store = ShardedKVStore(tmp_path, num_shards=2)
+        first, second = keys_on_distinct_shards(2)
+        original = KVStore.write_batch
+        calls = []
+
+        def fail_on_second_shard(shard, operations=None):
+            calls.append(shard)
+            if len(calls) == 2:
+                raise OSError("simulated crash")
+            return original(shard, operations)
+
+        with patch.object(KVStore, "write_batch", fail_on_second_shard):
+            with pytest.raises(OSError):
+                store.write_batch([WALRecord(RecordType.PUT, first, "a"), WALRecord(RecordType.PUT, second, "b")])
+        assert (store.get(first), store.get(second)) == ("a", None)
+        store.close()
+
+        reopened = ShardedKVStore(tmp_path, num_shards=2)
+        assert (reopened.get(first), reopened.get(second)) == ("a", "b")
+        reopened.close()
+
+    def test_cross_shard_batches_are_refused_until_reopen(self, tmp_path):
+        """적용이 실패한 intent가 있으면 다음 cross-shard 배치가 그 intent를 덮어 지우지 못하게 거부한다"""
+        store = ShardedKVStore(tmp_path, num_shards=2)
+        first, second = keys_on_distinct_shards(2)
+        original = KVStore.write_batch
+        calls = []
+
+        def fail_on_second_shard(shard, operations=None):
+            calls.append(shard)
+            if len(calls) == 2:
+                raise OSError("simulated crash")
+            return original(shard, operations)
+
+        with patch.object(KVStore, "write_batch", fail_on_second_shard):
+            with pytest.raises(OSError):
+                store.write_batch([WALRecord(RecordType.PUT, first, "a"), WALRecord(RecordType.PUT, second, "b")])
+        with pytest.raises(RuntimeError, match="reopen"):
+            store.write_batch([WALRecord(RecordType.PUT, first, "c"), WALRecord(RecordType.PUT, second, "d")])
+        store.put(first, "single")
+        store.close()
+
+        reopened = ShardedKVStore(tmp_path, num_shards=2)
+        assert (reopened.get(first), reopened.get(second)) == ("single", "b")
+        reopened.write_batch([WALRecord(RecordType.PUT, first, "c"), WALRecord(RecordType.PUT, second, "d")])
+        assert (reopened.get(first), reopened.get(second)) == ("c", "d")
+        reopened.close()
+
+    def test_applied_batch_does_not_overwrite_later_writes_on_reopen(self, tmp_path):
+        """이미 적용된 intent는 다시 열어도 재적용되지 않는다"""
+        store = ShardedKVStore(tmp_path, num_shards=2)
+        first, second = keys_on_distinct_shards(2)
+        store.write_batch([WALRecord(RecordType.PUT, first, "batch"), WALRecord(RecordType.PUT, second, "batch")])
+        store.put(first, "later")
+        store.close()
+
+        reopened = ShardedKVStore(tmp_path, num_shards=2)
+        assert (reopened.get(first), reopened.get(second)) == ("later", "batch")
+        reopened.close()
+
+    def test_reserved_key_is_rejected(self, tmp_path):
+        store = ShardedKVStore(tmp_path, num_shards=2)
+
+        with pytest.raises(ValueError):
+            store.put(INTENT_KEY, "x")
+        with pytest.raises(ValueError):
+            store.write_batch([WALRecord(RecordType.PUT, INTENT_KEY, "x")])
+        store.close()
+
+    def test_intent_key_is_hidden_from_reads(self, tmp_path):
+        """shard에 남은 INTENT_KEY는 get/scan에 보이지 않는다"""
+        store = ShardedKVStore(tmp_path, num_shards=2)
+        store.write_batch([WALRecord(RecordType.PUT, key, "v") for key in keys_on_distinct_shards(2)])
+
+        assert any(shard.get(INTENT_KEY) is not None for shard in store.shards)
+        assert store.get(INTENT_KEY) is None
+        assert INTENT_KEY not in dict(store.scan())
+        assert INTENT_KEY not in dict(store.scan(reverse=True))
+        store.close()
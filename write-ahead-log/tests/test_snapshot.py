@@ -0,0 +1,254 @@
+"""시점 스냅샷 테스트"""
+
+import threading
+
+import pytest
+
+from src.checkpoint_file import load_checkpoint
+from src.compaction import LeveledCompaction
+from src.kv_store import KVStore
+from src.memtable import _MISSING, TOMBSTONE, SortedMemTable
+from src.snapshot import VersionStore
+
+
+class TestVersionStore:
+    """VersionStore 단위 테스트"""
+
+    def test_lookup_returns_value_before_first_later_write(self):
+        """스냅샷 LSN 이후 첫 쓰기 직전 값을 돌려준다"""
+        versions = VersionStore()
+        versions.acquire(10)
+        versions.record("k", 10, lambda key: "v0")
+        versions.acquire(20)
+        versions.record("k", 25, lambda key: "v1")
+
+        assert versions.lookup("k", 10) == "v0"
+        assert versions.lookup("k", 20) == "v1"
+        assert versions.lookup("k", 30) is _MISSING
+        assert versions.lookup("other", 10) is _MISSING
+
+    def test_repeated_writes_after_newest_snapshot_record_once(self):
+        """가장 최신 스냅샷 이후 두 번째 쓰기부터는 이전 값을 읽지 않는다"""
+        versions = VersionStore()
+        versions.acquire(5)
+        reads = []
+
+        for lsn in (10, 20, 30):
+            versions.record("k", lsn, lambda key: reads.append(key) or f"v{len(reads)}")
+
+        assert reads == ["k"]
+        assert len(versions) == 1
+
+    def test_release_drops_versions_older_than_oldest_snapshot(self):
+        """가장 오래된 스냅샷보다 앞선 기록만 버리고, 마지막 스냅샷이 놓이면 전부 버린다"""
+        versions = VersionStore()
+        versions.acquire(10)
+        versions.record("a", 10, lambda key: "a0")
+        versions.acquire(20)
+        versions.record("a", 20, lambda key: "a1")
+        versions.record("b", 15, lambda key: TOMBSTONE)
+
+        assert versions.release(10) == ["b"]
+        assert versions.lookup("a", 20) == "a1"
+        assert len(versions) == 1
+
+        assert versions.release(20) == ["a"]
+        assert len(versions) == 0
+        assert not versions.active
+
+    def test_changed_keys_filters_range_and_lsn(self):
+        versions = VersionStore()
+        versions.acquire(10)
+        for key, lsn in (("c", 12), ("a", 11), ("b", 5), ("d", 13)):
+            versions.record(key, lsn, lambda key: "old")
+
+        assert versions.changed_keys(10, "a", "d") == ["a", "c"]
+
+
+@pytest.fixture(params=["memtable", "lsm"])
+def store(request, tmp_path):
+    if request.param == "lsm":
+        store = KVStore(data_dir=tmp_path, memtable_flush_bytes=1 << 20, compaction_strategy=LeveledCompaction(l0_trigger=2))
+    else:
+        store = KVStore(data_dir=tmp_path)
+    yield store
+    store.close()
+
+
+class TestSnapshotReads:
+    """스냅샷은 이후 쓰기와 무관하게 그 시점 상태를 보여준다"""
+
+    def test_get_sees_state_at_snapshot(self, store):
+        """스냅샷 이후 PUT/DEL/새 key는 스냅샷 GET에 보이지 않는다"""
+        store.put("key1", "v1")
+        store.put("key2", "v2")
+        snapshot = store.snapshot()
+
+        store.put("key1", "updated")
+        store.delete("key2")
+        store.put("key3", "new")
+
+        assert (snapshot.get("key1"), snapshot.get("key2"), snapshot.get("key3")) == ("v1", "v2", None)
+        assert (store.get("key1"), store.get("key2"), store.get("key3")) == ("updated", None, "new")
+        snapshot.release()
+
+    def test_scan_sees_state_at_snapshot(self, store):
+        """스냅샷 scan은 이후 지워진 key를 포함하고 새 key는 제외한다 (역순, prefix 포함)"""
+        for i in range(5):
+            store.put(f"key{i}", f"v{i}")
+        with store.snapshot() as snapshot:
+            store.delete("key1")
+            store.put("key2", "updated")
+            store.put("key25", "new")
+            with store.write_batch() as batch:
+                batch.put("key4", "batched")
+                batch.delete("key0")
+
+            expected = [(f"key{i}", f"v{i}") for i in range(5)]
+            assert list(snapshot.scan()) == expected
+            assert list(snapshot.scan(reverse=True)) == expected[::-1]
+            assert list(snapshot.prefix("key2")) == [("key2", "v2")]
+            assert list(snapshot.scan("key1", "key3")) == expected[1:3]
+
+        assert [key for key, _ in store.scan()] == ["key2", "key25", "key3", "key4"]
+
+    def test_snapshot_survives_flush_and_compaction(self, tmp_path):
+        """LSM 모드에서 flush와 컴팩션이 지나가도 스냅샷 값은 그대로다"""
+        store = KVStore(data_dir=tmp_path, memtable_flush_bytes=1 << 20, compaction_strategy=LeveledCompaction(l0_trigger=2))
+        for i in range(10):
+            store.put(f"key{i}", "old")
+        store.checkpoint()
+        snapshot = store.snapshot()
+
+        for i in range(10):
+            if i % 2:
+                store.delete(f"key{i}")
+            else:
+                store.put(f"key{i}", "new")
+        store.checkpoint()
+        store.compact()
+
+        assert snapshot.get("key1") == "old"
+        assert list(snapshot.scan()) == [(f"key{i}", "old") for i in range(10)]
+        assert list(store.scan()) == [(f"key{i}", "new") for i in range(0, 10, 2)]
+        snapshot.release()
+        store.close()
+
+    def test_snapshots_at_different_points(self, store):
+        """여러 스냅샷은 각자의 시점을 본다"""
+        store.put("key", "v1")
+        first = store.snapshot()
+        store.put("key", "v2")
+        second = store.snapshot()
+        store.put("key", "v3")
+
+        assert (first.get("key"), second.get("key"), store.get("key")) == ("v1", "v2", "v3")
+        assert first.lsn < second.lsn < store.lsn
+        first.release()
+        assert second.get("key") == "v2"
+        second.release()
+
+    def test_released_snapshot_cannot_be_read(self, store):
+        snapshot = store.snapshot()
+        snapshot.release()
+        snapshot.release()
+
+        with pytest.raises(RuntimeError):
+            snapshot.get("key")
+
+
+class TestSnapshotConsistency:
+    """쓰기가 계속되는 동안에도 스냅샷 scan은 찢어지지 않는다"""
+
+    def test_deletes_during_scan_do_not_hide_keys(self, store):
+        """scan 도중 아직 지나지 않은 key가 지워져도 스냅샷 값이 나온다"""
+        for i in range(10):
+            store.put(f"key{i}", f"v{i}")
+        with store.snapshot() as snapshot:
+            entries = snapshot.scan()
+            first = next(entries)
+            for i in range(1, 10):
+                store.delete(f"key{i}")
+            store.put("key5", "again")
+
+            assert [first] + list(entries) == [(f"key{i}", f"v{i}") for i in range(10)]
+
+    def test_concurrent_batches_are_seen_atomically(self, tmp_path):
+        """모든 key를 함께 올리는 배치가 계속 커밋되어도 스냅샷 scan은 한 시점의 값만 본다"""
+        store = KVStore(data_dir=tmp_path, memtable_factory=SortedMemTable, group_commit=True)
+        keys = [f"key{i:02d}" for i in range(20)]
+        with store.write_batch() as batch:
+            for key in keys:
+                batch.put(key, "0")
+
+        stop = threading.Event()
+
+        def writer():
+            n = 0
+            while not stop.is_set():
+                n += 1
+                with store.write_batch() as batch:
+                    for key in keys:
+                        batch.put(key, str(n))
+
+        thread = threading.Thread(target=writer)
+        thread.start()
+        try:
+            for _ in range(20):
+                with store.snapshot() as snapshot:
+                    values = {value for _, value in snapshot.scan()}
+                    assert len(values) == 1
+                    assert snapshot.get(keys[-1]) in values
+        finally:
+            stop.set()
+            thread.join()
+        store.close()
+
+
+class TestSnapshotGarbageCollection:
+    """스냅샷을 놓으면 붙잡아 둔 이전 값이 정리된다"""
+
+    def test_versions_are_dropped_after_release(self, store):
+        store.put("key1", "v1")
+        store.put("key2", "v2")
+        with store.snapshot():
+            store.put("key1", "updated")
+            store.delete("key2")
+            assert store.snapshot_stats() == {"snapshots": 1, "versions": 2}
+
+        assert store.snapshot_stats() == {"snapshots": 0, "versions": 0}
+        assert store.get("key2") is None
+
+    def test_writes_without_snapshot_keep_no_versions(self, store):
+        store.put("key1", "v1")
+        store.put("key1", "v2")
+
+        assert store.snapshot_stats()["versions"] == 0
+
+    def test_tombstones_kept_for_snapshot_are_removed(self, tmp_path):
+        """메모리 모드에서 스냅샷 때문에 남긴 tombstone은 release 후 memtable에서 빠진다"""
+        store = KVStore(data_dir=tmp_path)
+        store.put("key1", "v1")
+        with store.snapshot():
+            store.delete("key1")
+            assert store._store_data.get("key1") is TOMBSTONE
+
+        assert "key1" not in store._store_data
+        store.close()
+
+    def test_checkpoint_with_live_snapshot_skips_tombstones(self, tmp_path):
+        """스냅샷이 살아 있을 때 체크포인트해도 지워진 key는 체크포인트에 들어가지 않는다"""
+        store = KVStore(data_dir=tmp_path)
+        store.put("key1", "v1")
+        store.put("key2", "v2")
+        snapshot = store.snapshot()
+        store.delete("key1")
+        store.checkpoint()
+
+        data, _ = load_checkpoint(tmp_path / "checkpoint.dat")
+        assert data == {"key2": "v2"}
+        assert snapshot.get("key1") == "v1"
+        snapshot.release()
+        store.close()
+
+        assert KVStore(data_dir=tmp_path).get("key1") is None
@@ -0,0 +1,130 @@
+"""SSTable 파일 테스트"""
+
+import pytest
+
+from src.memtable import TOMBSTONE
+from src.sstable import SSTable, SSTableCorruptedError, write_sstable
+
+
+def build(path, entries, block_size=64) -> SSTable:
+    write_sstable(path, entries, block_size=block_size)
+    return SSTable(path)
+
+
+class TestSSTable:
+    """SSTable 쓰기/읽기"""
+
+    def test_get_across_blocks(self, tmp_path):
+        """여러 블록으로 나뉜 테이블에서 모든 key를 찾고, 없는 key는 default를 반환한다"""
+        entries = [(f"key{i:04d}", f"value{i}") for i in range(200)]
+        table = build(tmp_path / "t.sst", entries)
+
+        assert len(table._blocks) > 1
+        for key, value in entries:
+            assert table.get(key) == value
+        assert table.get("key0000a") is None
+        assert table.get("a") is None
+        assert table.get("z", "default") == "default"
+        table.close()
+
+    def test_tombstone_roundtrip(self, tmp_path):
+        """tombstone 엔트리는 TOMBSTONE으로 읽힌다"""
+        table = build(tmp_path / "t.sst", [("a", "1"), ("b", TOMBSTONE), ("c", "")])
+
+        assert table.get("b") is TOMBSTONE
+        assert table.get("c") == ""
+        assert table.count == 3
+        table.close()
+
+    def test_scan_range_and_reverse(self, tmp_path):
+        """scan은 블록 경계와 무관하게 start 이상 end 미만을 정방향/역방향으로 내보낸다"""
+        entries = [(f"key{i:04d}", str(i)) for i in range(100)]
+        table = build(tmp_path / "t.sst", entries)
+
+        assert list(table.scan()) == entries
+        assert list(table.scan("key0010", "key0050")) == entries[10:50]
+        assert list(table.scan("key0010", "key0050", reverse=True)) == entries[10:50][::-1]
+        assert list(table.scan("zzz")) == []
+        table.close()
+
+    def test_unsorted_entries_are_rejected(self, tmp_path):
+        """정렬되지 않은 입력은 거부한다"""
+        with pytest.raises(ValueError):
+            write_sstable(tmp_path / "t.sst", [("b", "1"), ("a", "2")])
+
+    def test_empty_table(self, tmp_path):
+        """빈 테이블도 열리고 아무것도 찾지 못한다"""
+        table = build(tmp_path / "t.sst", [])
+
+        assert table.get("a") is None
+        assert list(table.scan()) == []
+        table.close()
+
+    def test_corrupted_block_is_detected(self, tmp_path):
+        """블록 바이트가 바뀌면 읽을 때 SSTableCorruptedError"""
+        path = tmp_path / "t.sst"
+        write_sstable(path, [(f"key{i}", "value") for i in range(10)])
+        data = bytearray(path.read_bytes())
+        data[20] ^= 0xFF
+        path.write_bytes(bytes(data))
+
+        table = SSTable(path)
+        with pytest.raises(SSTableCorruptedError):
+            table.get("key1")
+        table.close()
+
+    def test_truncated_file_is_rejected(self, tmp_path):
+        """footer가 없는 파일은 열 때 거부한다"""
+        path = tmp_path / "t.sst"
+        write_sstable(path, [("a", "1")])
+        path.write_bytes(path.read_bytes()[:-4])
+
+        with pytest.raises(SSTableCorruptedError):
+            SSTable(path)
+
+
+class TestSSTableFilter:
+    """Bloom filter와 조회 카운터"""
+
+    def test_negative_lookup_reads_no_block(self, tmp_path):
+        """filter가 걸러낸 조회는 블록을 읽지 않고, 있는 key는 블록 하나만 읽는다"""
+        table = build(tmp_path / "t.sst", [(f"key{i:04d}", "v") for i in range(500)])
+
+        for i in range(1000):
+            table.get(f"missing{i}")
+        stats = table.stats
+        assert stats.filter_checks == 1000
+        assert stats.filter_negatives + stats.filter_false_positives == 1000
+        assert stats.block_reads == stats.filter_false_positives
+        assert stats.filter_false_positives < 50
+
+        before = stats.block_reads
+        assert table.get("key0123") == "v"
+        assert stats.block_reads == before + 1
+        table.close()
+
+    def test_filter_can_be_disabled(self, tmp_path):
+        """bloom_bits_per_key=0이면 filter 없이 블록을 읽어서 판단한다"""
+        path = tmp_path / "t.sst"
+        write_sstable(path, [("a", "1"), ("c", "3")], bloom_bits_per_key=0)
+        table = SSTable(path)
+
+        assert table.get("b") is None
+        assert table.stats.filter_checks == 0
+        assert table.stats.block_reads == 1
+        table.close()
+
+    def test_reads_version_1_table(self, tmp_path):
+        """filter가 없던 버전 1 파일도 읽는다"""
+        from src.sstable import FOOTER, FOOTER_V1, SSTABLE_HEADER_V1
+
+        path = tmp_path / "t.sst"
+        write_sstable(path, [("a", "1"), ("b", "2")], bloom_bits_per_key=0)
+        data = path.read_bytes()
+        _, _, _, index_offset, index_size, index_crc, count, magic = FOOTER.unpack(data[-FOOTER.size:])
+        body = data[len(SSTABLE_HEADER_V1):-FOOTER.size]
+        path.write_bytes(SSTABLE_HEADER_V1 + body + FOOTER_V1.pack(index_offset, index_size, index_crc, count, magic))
+
+        table = SSTable(path)
+        assert list(table.scan()) == [("a", "1"), ("b", "2")]
+        table.close()
@@ -1,7 +1,9 @@
 """WAL 파일 관리 객체 테스트"""
 
-from src.wal import WAL
-from src.wal_record import RecordType, WALRecord
+import pytest
+
+from src.wal import WAL, detect_format
+from src.wal_record import BINARY_FILE_HEADER, RecordType, WALFormat, WALRecord
 
 
 class TestWALContextManager:
@@ -63,6 +65,25 @@ class TestWALWrite:
         content = wal_path.read_bytes()
         assert len(content) > 0
 
+    def test_hooks_are_called_at_each_write_phase(self, tmp_path):
+        """append 직후, flush 직후(fsync 전), fsync 직후 순서로 훅이 호출된다"""
+        wal_path = tmp_path / "wal.log"
+        calls = []
+        wal = WAL(
+            wal_path,
+            post_append_hook=lambda: calls.append(("append", wal_path.stat().st_size)),
+            post_flush_hook=lambda: calls.append(("flush", wal_path.stat().st_size)),
+            post_sync_hook=lambda: calls.append(("sync", wal_path.stat().st_size)),
+        )
+
+        wal.append(WALRecord(RecordType.PUT, "key1", "value1"))
+        wal.sync()
+        wal.close()
+
+        # append 시점에는 아직 Python 버퍼에만 있다
+        size = wal_path.stat().st_size
+        assert calls == [("append", 0), ("flush", size), ("sync", size)]
+
 
 class TestWALRollback:
     """WAL 롤백 테스트"""
@@ -232,3 +253,218 @@ class TestWALCorruptionHandling:
         records = list(WAL.read(wal_path))
         assert len(records) == 1
         assert records[0].key == "key1"
+
+
+class TestWALBinaryFormat:
+    """바이너리 WAL 포맷 테스트"""
+
+    def test_binary_wal_starts_with_file_header(self, tmp_path):
+        """바이너리 WAL은 파일 헤더로 시작한다"""
+        wal_path = tmp_path / "wal.log"
+        wal = WAL(wal_path, wal_format=WALFormat.BINARY)
+        wal.close()
+
+        assert wal_path.read_bytes() == BINARY_FILE_HEADER
+        assert detect_format(wal_path) == WALFormat.BINARY
+
+    def test_read_detects_binary_format(self, tmp_path):
+        """read()는 파일 헤더로 포맷을 판별해 바이너리 레코드를 읽는다"""
+        wal_path = tmp_path / "wal.log"
+        wal = WAL(wal_path, wal_format=WALFormat.BINARY)
+        wal.append(WALRecord(RecordType.PUT, "key1", "value1"))
+        wal.append(WALRecord(RecordType.DEL, "key1"))
+        wal.close()
+
+        records = list(WAL.read(wal_path))
+
+        assert [(r.record_type, r.key, r.value) for r in records] == [
+            (RecordType.PUT, "key1", "value1"),
+            (RecordType.DEL, "key1", None),
+        ]
+
+    def test_existing_json_log_keeps_json_format(self, tmp_path):
+        """기존 JSON 로그를 바이너리 옵션으로 열어도 JSON으로 계속 기록하고 모두 읽힌다"""
+        wal_path = tmp_path / "wal.log"
+        wal = WAL(wal_path)
+        wal.append(WALRecord(RecordType.PUT, "key1", "value1"))
+        wal.close()
+
+        wal = WAL(wal_path, wal_format=WALFormat.BINARY)
+        assert wal.format == WALFormat.JSON
+        wal.append(WALRecord(RecordType.PUT, "key2", "value2"))
+        wal.close()
+
+        records = list(WAL.read(wal_path))
+        assert [r.key for r in records] == ["key1", "key2"]
+
+    def test_binary_partial_record_at_end_is_ignored(self, tmp_path):
+        """바이너리 WAL 끝부분의 불완전 레코드는 무시한다"""
+        wal_path = tmp_path / "wal.log"
+        wal = WAL(wal_path, wal_format=WALFormat.BINARY)
+        wal.append(WALRecord(RecordType.PUT, "key1", "value1"))
+        wal.close()
+
+        partial = WALRecord(RecordType.PUT, "key2", "value2").serialize_binary()[:-3]
+        with open(wal_path, "ab") as f:
+            f.write(partial)
+
+        records = list(WAL.read(wal_path))
+        assert [r.key for r in records] == ["key1"]
+
+    def test_binary_rollback_keeps_file_header(self, tmp_path):
+        """rollback(0)을 해도 파일 헤더는 남는다"""
+        wal_path = tmp_path / "wal.log"
+        wal = WAL(wal_path, wal_format=WALFormat.BINARY)
+        wal.append(WALRecord(RecordType.PUT, "key1", "value1"))
+        wal.sync()
+
+        wal.rollback(0)
+        wal.append(WALRecord(RecordType.PUT, "key2", "value2"))
+        wal.close()
+
+        records = list(WAL.read(wal_path))
+        assert [r.key for r in records] == ["key2"]
+
+
+class TestWALPreallocation:
+    """미리 할당된 바이너리 WAL"""
+
+    def test_file_size_stays_fixed_while_appending(self, tmp_path):
+        """preallocate_bytes 단위로 미리 늘려 두고, 그 안에서는 크기가 바뀌지 않는다"""
+        wal_path = tmp_path / "wal.log"
+        wal = WAL(wal_path, wal_format=WALFormat.BINARY, preallocate_bytes=4096)
+        assert wal.preallocated
+        assert wal_path.stat().st_size == 4096
+
+        for i in range(10):
+            wal.append(WALRecord(RecordType.PUT, f"key{i}", "value"))
+            wal.sync()
+            assert wal_path.stat().st_size == 4096
+        wal.close()
+
+        assert [r.key for r in WAL.read(wal_path)] == [f"key{i}" for i in range(10)]
+
+    def test_grows_by_preallocation_chunks(self, tmp_path):
+        """할당한 크기를 넘으면 다음 단위까지 늘린다"""
+        wal_path = tmp_path / "wal.log"
+        wal = WAL(wal_path, wal_format=WALFormat.BINARY, preallocate_bytes=256)
+        for i in range(20):
+            wal.append(WALRecord(RecordType.PUT, f"key{i}", "value"))
+        wal.close()
+
+        assert wal_path.stat().st_size % 256 == 0
+        assert wal_path.stat().st_size > 256
+        assert len(list(WAL.read(wal_path))) == 20
+
+    def test_reopen_continues_after_last_record(self, tmp_path):
+        """다시 열면 파일 끝이 아니라 마지막 레코드 뒤부터 이어 쓴다"""
+        wal_path = tmp_path / "wal.log"
+        wal = WAL(wal_path, wal_format=WALFormat.BINARY, preallocate_bytes=4096)
+        wal.append(WALRecord(RecordType.PUT, "key1", "value1"))
+        end = wal.position
+        wal.close()
+
+        wal = WAL(wal_path, wal_format=WALFormat.BINARY, preallocate_bytes=4096)
+        assert wal.position == end
+        wal.append(WALRecord(RecordType.PUT, "key2", "value2"))
+        wal.close()
+
+        assert [r.key for r in WAL.read(wal_path)] == ["key1", "key2"]
+
+    def test_reopen_zeroes_torn_tail(self, tmp_path):
+        """크래시로 일부만 쓰인 레코드는 다시 열 때 0으로 지워져, 새 레코드 뒤에 이어 읽히지 않는다"""
+        wal_path = tmp_path / "wal.log"
+        wal = WAL(wal_path, wal_format=WALFormat.BINARY, preallocate_bytes=4096)
+        wal.append(WALRecord(RecordType.PUT, "key1", "value1"))
+        end = wal.position
+        wal.close()
+
+        torn = WALRecord(RecordType.PUT, "key2", "a much longer value2").serialize_binary()[:-3]
+        with open(wal_path, "r+b") as f:
+            f.seek(end)
+            f.write(torn)
+
+        wal = WAL(wal_path, wal_format=WALFormat.BINARY, preallocate_bytes=4096)
+        assert wal.position == end
+        wal.append(WALRecord(RecordType.PUT, "key3", "v"))
+        end = wal.position
+        wal.close()
+
+        assert [r.key for r in WAL.read(wal_path)] == ["key1", "key3"]
+        assert wal_path.read_bytes()[end:] == bytes(4096 - end)
+
+    def test_rollback_keeps_file_size(self, tmp_path):
+        """rollback은 잘라낸 구간을 0으로 다시 할당해 파일 크기를 유지한다"""
+        wal_path = tmp_path / "wal.log"
+        wal = WAL(wal_path, wal_format=WALFormat.BINARY, preallocate_bytes=4096)
+        wal.append(WALRecord(RecordType.PUT, "key1", "value1"))
+        offset = wal.append(WALRecord(RecordType.PUT, "key2", "value2"))
+        wal.sync()
+
+        wal.rollback(offset)
+        assert wal_path.stat().st_size == 4096
+        wal.append(WALRecord(RecordType.PUT, "key3", "v"))
+        wal.close()
+
+        assert [r.key for r in WAL.read(wal_path)] == ["key1", "key3"]
+
+    def test_json_format_ignores_preallocation(self, tmp_path):
+        """JSON 포맷은 로그 끝을 파일 크기로 판단하므로 미리 할당하지 않는다"""
+        wal_path = tmp_path / "wal.log"
+        wal = WAL(wal_path, preallocate_bytes=4096)
+        wal.append(WALRecord(RecordType.PUT, "key1", "value1"))
+        wal.close()
+
+        assert not wal.preallocated
+        assert wal_path.stat().st_size < 4096
+
+
+class TestWALDirectIO:
+    """정렬 버퍼 + O_DIRECT/O_DSYNC로 쓰는 WAL"""
+
+    def test_records_are_written_on_sync(self, tmp_path):
+        wal_path = tmp_path / "wal.log"
+        wal = WAL(wal_path, wal_format=WALFormat.BINARY, preallocate_bytes=8192, direct_io=True)
+        assert wal.direct_io
+        for i in range(100):
+            wal.append(WALRecord(RecordType.PUT, f"key{i}", "value" * 10))
+        wal.sync()
+
+        assert [r.key for r in WAL.read(wal_path)] == [f"key{i}" for i in range(100)]
+        assert wal_path.stat().st_size % 8192 == 0
+        wal.close()
+
+    def test_reopen_and_rollback(self, tmp_path):
+        """다시 열면 마지막 레코드 뒤부터 이어 쓰고, rollback한 레코드는 남지 않는다"""
+        wal_path = tmp_path / "wal.log"
+        wal = WAL(wal_path, wal_format=WALFormat.BINARY, preallocate_bytes=8192, direct_io=True)
+        wal.append(WALRecord(RecordType.PUT, "key1", "value1"))
+        wal.close()
+
+        wal = WAL(wal_path, wal_format=WALFormat.BINARY, preallocate_bytes=8192, direct_io=True)
+        offset = wal.append(WALRecord(RecordType.PUT, "key2", "value2"))
+        wal.sync()
+        wal.rollback(offset)
+        wal.append(WALRecord(RecordType.PUT, "key3", "value3"))
+        wal.close()
+
+        assert [r.key for r in WAL.read(wal_path)] == ["key1", "key3"]
+        assert wal_path.stat().st_size == 8192
+
+    def test_detach_sync_writes_outside_the_writer(self, tmp_path):
+        """flush만 한 레코드는 detach_sync가 반환한 함수를 부를 때 디스크에 쓰인다"""
+        wal_path = tmp_path / "wal.log"
+        wal = WAL(wal_path, wal_format=WALFormat.BINARY, preallocate_bytes=8192, direct_io=True)
+        wal.append(WALRecord(RecordType.PUT, "key1", "value1"))
+        wal.flush()
+        assert list(WAL.read(wal_path)) == []
+
+        wal.detach_sync()()
+        assert [r.key for r in WAL.read(wal_path)] == ["key1"]
+        wal.close()
+
+    def test_requires_aligned_preallocation(self, tmp_path):
+        with pytest.raises(ValueError):
+            WAL(tmp_path / "wal.log", wal_format=WALFormat.BINARY, direct_io=True)
+        with pytest.raises(ValueError):
+            WAL(tmp_path / "wal.log", wal_format=WALFormat.BINARY, preallocate_bytes=1000, direct_io=True)
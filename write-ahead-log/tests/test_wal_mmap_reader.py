@@ -0,0 +1,170 @@
+"""mmap 기반 WAL 리더 테스트"""
+
+import pytest
+
+from src.segmented_wal import SegmentedWAL, list_segments
+from src.wal import WAL
+from src.wal_mmap_reader import MmapWALReader, main, scan_valid_end
+from src.wal_record import RecordType, WALFormat, WALRecord
+
+
+def write_records(path, records, wal_format):
+    wal = WAL(path, wal_format=wal_format)
+    for record in records:
+        wal.append(record)
+    wal.sync()
+    wal.close()
+
+
+RECORDS = [
+    WALRecord(RecordType.PUT, "key1", "value1"),
+    WALRecord(RecordType.DEL, "key1"),
+    WALRecord(RecordType.PUT, "키2", "값2"),
+    WALRecord.batch([WALRecord(RecordType.PUT, "a", "1"), WALRecord(RecordType.DEL, "b")]),
+]
+
+
+@pytest.mark.parametrize("wal_format", [WALFormat.JSON, WALFormat.BINARY])
+class TestMmapWALReader:
+    """파일 하나 읽기"""
+
+    def test_reads_same_records_as_wal(self, tmp_path, wal_format):
+        """WAL.read_entries와 같은 위치/레코드를 내보낸다"""
+        path = tmp_path / "wal.log"
+        write_records(path, RECORDS, wal_format)
+
+        expected = [(start, end, r.serialize()) for start, end, r in WAL.read_entries(path)]
+        with MmapWALReader(path) as reader:
+            actual = [(v.offset, v.end, v.to_record().serialize()) for v in reader]
+            assert reader.complete
+
+        assert actual == expected
+
+    def test_lazy_key_and_value(self, tmp_path, wal_format):
+        """key/value와 바이트 뷰가 원래 값과 같고, DEL의 value는 None이다"""
+        path = tmp_path / "wal.log"
+        write_records(path, RECORDS[:3], wal_format)
+
+        with MmapWALReader(path) as reader:
+            views = list(reader)
+            assert [v.key for v in views] == ["key1", "key1", "키2"]
+            assert [v.value for v in views] == ["value1", None, "값2"]
+            assert bytes(views[2].key_bytes()) == "키2".encode("utf-8")
+            assert views[1].value_bytes() is None
+            views = None
+
+    def test_torn_tail_stops_reading(self, tmp_path, wal_format):
+        """끝의 불완전 레코드는 건너뛰고 complete=False, valid_end는 마지막 정상 레코드 끝"""
+        path = tmp_path / "wal.log"
+        write_records(path, RECORDS[:1], wal_format)
+        valid_size = path.stat().st_size
+        with open(path, "ab") as f:
+            f.write(RECORDS[2].serialize_binary()[:-3] if wal_format == WALFormat.BINARY else b'{"type": 1')
+
+        with MmapWALReader(path) as reader:
+            assert [v.key for v in reader] == ["key1"]
+            assert not reader.complete
+            assert reader.valid_end == valid_size
+        assert scan_valid_end(path) == valid_size
+
+    def test_empty_file(self, tmp_path, wal_format):
+        """빈 파일에서는 아무 레코드도 내보내지 않는다"""
+        path = tmp_path / "wal.log"
+        WAL(path, wal_format=wal_format).close()
+
+        with MmapWALReader(path) as reader:
+            assert list(reader) == []
+            assert reader.complete
+
+
+class TestPreallocatedFile:
+    """미리 할당된 바이너리 WAL (레코드 뒤가 0으로 채워진 파일)"""
+
+    def test_zero_tail_is_clean_end(self, tmp_path):
+        """0 꼬리는 손상이 아니라 로그의 끝이다"""
+        path = tmp_path / "wal.log"
+        wal = WAL(path, wal_format=WALFormat.BINARY, preallocate_bytes=4096)
+        for record in RECORDS:
+            wal.append(record)
+        end = wal.position
+        wal.close()
+
+        with MmapWALReader(path) as reader:
+            assert len(list(reader)) == len(RECORDS)
+            assert reader.complete
+            assert reader.valid_end == end
+
+    def test_garbage_after_zero_length_is_incomplete(self, tmp_path):
+        """길이 0 뒤에 0이 아닌 바이트가 있으면 complete=False"""
+        path = tmp_path / "wal.log"
+        wal = WAL(path, wal_format=WALFormat.BINARY, preallocate_bytes=4096)
+        wal.append(RECORDS[0])
+        end = wal.position
+        wal.close()
+        with open(path, "r+b") as f:
+            f.seek(end + 100)
+            f.write(b"x")
+
+        with MmapWALReader(path) as reader:
+            assert [v.key for v in reader] == ["key1"]
+            assert not reader.complete
+
+    def test_all_zero_file_has_no_records(self, tmp_path):
+        """헤더도 쓰이지 않은 (0으로 채워진) 파일은 빈 로그"""
+        path = tmp_path / "wal.log"
+        path.write_bytes(bytes(4096))
+
+        with MmapWALReader(path) as reader:
+            assert list(reader) == []
+            assert reader.complete
+
+
+class TestBinaryCorruption:
+    """바이너리 포맷 손상 감지"""
+
+    def test_crc_mismatch_stops_reading(self, tmp_path):
+        """payload 바이트가 바뀐 레코드에서 멈춘다"""
+        path = tmp_path / "wal.log"
+        write_records(path, RECORDS[:3], WALFormat.BINARY)
+        with MmapWALReader(path) as reader:
+            second_offset = [v.offset for v in reader][1]
+
+        data = bytearray(path.read_bytes())
+        data[second_offset + 17] ^= 0xFF
+        path.write_bytes(bytes(data))
+
+        with MmapWALReader(path) as reader:
+            assert [v.key for v in reader] == ["key1"]
+            assert not reader.complete
+
+
+@pytest.mark.parametrize("wal_format", [WALFormat.JSON, WALFormat.BINARY])
+class TestSegmentedReadViews:
+    """세그먼트 디렉터리 읽기"""
+
+    def test_read_views_matches_read_entries(self, tmp_path, wal_format):
+        """여러 세그먼트에 걸쳐 read_entries와 같은 LSN/레코드를 내보낸다"""
+        wal = SegmentedWAL(tmp_path, segment_size=150, wal_format=wal_format)
+        lsns = [wal.append(WALRecord(RecordType.PUT, f"key{i}", f"value{i}")) for i in range(20)]
+        wal.close()
+        assert len(list_segments(tmp_path)) > 1
+
+        views = [(lsn, view.key) for lsn, _, view in SegmentedWAL.read_views(tmp_path, start_lsn=lsns[5])]
+        assert views == [(lsn, f"key{i}") for i, lsn in enumerate(lsns) if i >= 5]
+
+
+class TestCommandLine:
+    """오프라인 덤프 CLI"""
+
+    def test_dumps_directory(self, tmp_path, monkeypatch, capsys):
+        """데이터 디렉터리를 주면 레코드마다 LSN, 길이, 타입, key를 한 줄씩 출력한다"""
+        wal = SegmentedWAL(tmp_path, wal_format=WALFormat.BINARY)
+        wal.append(WALRecord(RecordType.PUT, "key1", "value1"))
+        wal.append(WALRecord(RecordType.DEL, "key1"))
+        wal.close()
+
+        monkeypatch.setattr("sys.argv", ["wal_mmap_reader", str(tmp_path)])
+        main()
+
+        lines = capsys.readouterr().out.splitlines()
+        assert [line.split("\t")[2:] for line in lines] == [["PUT", "key1", "6"], ["DEL", "key1", "-"]]
@@ -114,3 +114,46 @@ class TestWALRecordFraming:
 
         restored = WALRecord.deserialize(data)
         assert restored.value == value_with_newline
+
+
+class TestWALRecordBinary:
+    """바이너리 레코드 포맷 테스트"""
+
+    def test_binary_roundtrip_put_record(self):
+        """PUT 레코드를 바이너리로 직렬화/역직렬화할 수 있다"""
+        original = WALRecord(RecordType.PUT, "key1", "value1")
+
+        restored = WALRecord.deserialize_binary(original.serialize_binary())
+
+        assert restored.record_type == RecordType.PUT
+        assert restored.key == "key1"
+        assert restored.value == "value1"
+
+    def test_binary_distinguishes_none_and_empty_value(self):
+        """DEL의 None 값과 빈 문자열 값을 구분한다"""
+        deleted = WALRecord.deserialize_binary(WALRecord(RecordType.DEL, "key1").serialize_binary())
+        empty = WALRecord.deserialize_binary(WALRecord(RecordType.PUT, "key1", "").serialize_binary())
+
+        assert deleted.value is None
+        assert empty.value == ""
+
+    def test_binary_record_is_smaller_than_json(self):
+        """바이너리 레코드는 JSON 레코드보다 작다"""
+        record = WALRecord(RecordType.PUT, "key1", "value1")
+
+        assert len(record.serialize_binary()) < len(record.serialize())
+
+    def test_binary_corrupted_payload_raises_checksum_error(self):
+        """바이너리 페이로드가 손상되면 ChecksumError"""
+        data = bytearray(WALRecord(RecordType.PUT, "key1", "value1").serialize_binary())
+        data[-1] ^= 0xFF
+
+        with pytest.raises(ChecksumError):
+            WALRecord.deserialize_binary(bytes(data))
+
+    def test_binary_truncated_record_raises_value_error(self):
+        """잘린 바이너리 레코드는 ValueError"""
+        data = WALRecord(RecordType.PUT, "key1", "value1").serialize_binary()
+
+        with pytest.raises(ValueError):
+            WALRecord.deserialize_binary(data[:-1])
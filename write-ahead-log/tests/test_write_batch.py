@@ -0,0 +1,205 @@
+"""쓰기 배치 테스트"""
+
+import pytest
+
+from src.kv_store import KVStore
+from src.segmented_wal import SegmentedWAL, list_segments
+from src.wal_record import RecordType, WALFormat, WALRecord
+from src.write_batch import WriteBatch
+
+
+class TestWriteBatch:
+    """WriteBatch 단위 테스트"""
+
+    def test_commit_passes_single_batch_record(self):
+        """커밋 시 모든 연산을 담은 BATCH 레코드 하나를 넘긴다"""
+        committed = []
+        batch = WriteBatch(committed.append)
+        batch.put("key1", "value1")
+        batch.delete("key2")
+        batch.commit()
+
+        assert len(committed) == 1
+        assert committed[0].record_type == RecordType.BATCH
+        assert [(r.record_type, r.key) for r in committed[0].records] == [
+            (RecordType.PUT, "key1"),
+            (RecordType.DEL, "key2"),
+        ]
+
+    def test_context_manager_discards_on_exception(self):
+        """with 블록에서 예외가 나면 커밋하지 않는다"""
+        committed = []
+
+        with pytest.raises(RuntimeError):
+            with WriteBatch(committed.append) as batch:
+                batch.put("key1", "value1")
+                raise RuntimeError("abort")
+
+        assert committed == []
+
+    def test_empty_batch_commits_nothing(self):
+        """빈 배치는 아무것도 기록하지 않는다"""
+        committed = []
+        WriteBatch(committed.append).commit()
+
+        assert committed == []
+
+    def test_empty_key_is_rejected(self):
+        """빈 키는 거부된다"""
+        batch = WriteBatch(lambda record: None)
+
+        with pytest.raises(ValueError, match="key"):
+            batch.put("", "value")
+
+    def test_none_value_is_rejected(self):
+        """값이 없는 PUT은 거부된다"""
+        batch = WriteBatch(lambda record: None)
+
+        with pytest.raises(TypeError, match="value"):
+            batch.put("key1", None)
+
+    def test_batch_cannot_be_committed_twice(self):
+        """한 번 커밋한 배치는 다시 쓸 수 없다"""
+        batch = WriteBatch(lambda record: None)
+        batch.put("key1", "value1")
+        batch.commit()
+
+        with pytest.raises(RuntimeError):
+            batch.put("key2", "value2")
+
+
+class TestBatchRecordSerialization:
+    """BATCH 레코드 직렬화"""
+
+    @pytest.mark.parametrize("wal_format", [WALFormat.JSON, WALFormat.BINARY])
+    def test_batch_record_roundtrip(self, wal_format):
+        """BATCH 레코드가 두 포맷 모두에서 왕복 직렬화된다"""
+        record = WALRecord.batch([
+            WALRecord(RecordType.PUT, "key1", "value1"),
+            WALRecord(RecordType.DEL, "key2"),
+        ])
+
+        if wal_format == WALFormat.JSON:
+            restored = WALRecord.deserialize(record.serialize())
+        else:
+            restored = WALRecord.deserialize_binary(record.serialize_binary())
+
+        assert restored.record_type == RecordType.BATCH
+        assert [(r.record_type, r.key, r.value) for r in restored.records] == [
+            (RecordType.PUT, "key1", "value1"),
+            (RecordType.DEL, "key2", None),
+        ]
+
+    def test_nested_batch_is_rejected(self):
+        """BATCH 안에 BATCH는 넣을 수 없다"""
+        inner = WALRecord.batch([WALRecord(RecordType.PUT, "key1", "value1")])
+
+        with pytest.raises(ValueError):
+            WALRecord.batch([inner])
+
+
+class TestKVStoreWriteBatch:
+    """KVStore.write_batch()"""
+
+    def test_context_manager_applies_all_operations(self, tmp_path):
+        """with 블록 종료 시 모든 연산이 반영된다"""
+        store = KVStore(data_dir=tmp_path)
+        store.put("key0", "value0")
+
+        with store.write_batch() as batch:
+            batch.put("key1", "value1")
+            batch.put("key2", "value2")
+            batch.delete("key0")
+
+            # 커밋 전에는 보이지 않는다
+            assert store.get("key1") is None
+
+        assert store.get("key0") is None
+        assert store.get("key1") == "value1"
+        assert store.get("key2") == "value2"
+
+    def test_operation_list_is_committed_immediately(self, tmp_path):
+        """연산 목록을 넘기면 바로 커밋된다"""
+        store = KVStore(data_dir=tmp_path)
+
+        store.write_batch([
+            WALRecord(RecordType.PUT, "key1", "value1"),
+            WALRecord(RecordType.PUT, "key2", "value2"),
+        ])
+
+        assert store.get("key1") == "value1"
+        assert store.get("key2") == "value2"
+
+    @pytest.mark.parametrize("wal_format", [WALFormat.JSON, WALFormat.BINARY])
+    def test_batch_uses_one_sync_and_recovers(self, tmp_path, wal_format):
+        """배치는 sync 한 번으로 커밋되고 재시작 후 복구된다"""
+        store = KVStore(data_dir=tmp_path, wal_format=wal_format)
+
+        sync_count = 0
+        original_sync = store._wal.sync
+
+        def counting_sync():
+            nonlocal sync_count
+            sync_count += 1
+            original_sync()
+
+        store._wal.sync = counting_sync
+
+        with store.write_batch() as batch:
+            for i in range(100):
+                batch.put(f"key{i}", f"value{i}")
+
+        assert sync_count == 1
+        store.close()
+
+        store2 = KVStore(data_dir=tmp_path)
+        assert all(store2.get(f"key{i}") == f"value{i}" for i in range(100))
+
+    def test_torn_batch_is_not_applied_on_replay(self, tmp_path):
+        """배치 레코드가 잘리면 replay 시 배치 전체가 적용되지 않는다"""
+        store = KVStore(data_dir=tmp_path)
+        store.put("key0", "value0")
+        store.close()
+
+        _, wal_path = list_segments(tmp_path)[-1]
+        torn = WALRecord.batch([
+            WALRecord(RecordType.PUT, "key1", "value1"),
+            WALRecord(RecordType.PUT, "key2", "value2"),
+        ]).serialize()[:-20]
+        with open(wal_path, "ab") as f:
+            f.write(torn)
+
+        assert [r.key for r in SegmentedWAL.read(tmp_path)] == ["key0"]
+
+        store2 = KVStore(data_dir=tmp_path)
+        assert store2.get("key0") == "value0"
+        assert store2.get("key1") is None
+        assert store2.get("key2") is None
+
+    def test_batch_sync_failure_applies_nothing(self, tmp_path):
+        """배치 sync 실패 시 어떤 연산도 반영되지 않는다"""
+        store = KVStore(data_dir=tmp_path)
+
+        def failing_sync():
+            raise IOError("Disk full")
+
+        store._wal.sync = failing_sync
+        with pytest.raises(IOError):
+            with store.write_batch() as batch:
+                batch.put("key1", "value1")
+                batch.put("key2", "value2")
+
+        assert store.get("key1") is None
+        assert store.get("key2") is None
+
+    def test_batch_with_group_commit(self, tmp_path):
+        """그룹 커밋 모드에서도 배치가 동작한다"""
+        store = KVStore(data_dir=tmp_path, group_commit=True)
+
+        with store.write_batch() as batch:
+            batch.put("key1", "value1")
+            batch.delete("key1")
+            batch.put("key2", "value2")
+
+        assert store.get("key1") is None
+        assert store.get("key2") == "value2"